@@ -0,0 +1,190 @@
+"""Benchmark the availability, hotel context and booking endpoints.
+
+Run from ``backend/api``::
+
+    python -m benchmarks.bench_api --sizes 12,500,2000 --concurrency 1,16 \
+        --requests 200 --output bench_results.json --baseline previous.json
+
+Each dataset size is seeded into a throwaway SQLite database, the app's
+``get_db`` dependency is pointed at it, and every endpoint is driven through
+the ASGI app in-process (no network, no uvicorn). Exit status is 1 when
+``--baseline`` is given and a regression beyond ``--threshold`` is found.
+"""
+
+import argparse
+import asyncio
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from typing import Callable, Dict, List
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from main import app
+from src.database import get_db
+from benchmarks.datasets import seed_dataset
+from benchmarks.harness import (
+    RequestFactory, ScenarioResult, compare_results, run_scenario, write_results
+)
+
+VIEWS = [None, "ocean", "city", "garden", "pool"]
+
+
+def availability_requests(room_count: int, seed: int) -> RequestFactory:
+    """Availability searches spread over the next 45 days."""
+    rng = random.Random(seed)
+
+    def make(index: int) -> Dict:
+        return {
+            "method": "POST",
+            "url": "/api/availability",
+            "json": {
+                "check_in_date": (date.today() + timedelta(days=rng.randint(1, 45))).isoformat(),
+                "room_count": rng.randint(1, 3),
+                "max_budget": rng.choice([None, 120.0, 200.0, 400.0]),
+                "view_preference": rng.choice(VIEWS),
+            },
+        }
+
+    return make
+
+
+def context_requests(room_count: int, seed: int) -> RequestFactory:
+    """Hotel context lookups."""
+    return lambda index: {"method": "GET", "url": "/api/rooms/context"}
+
+
+def booking_requests(room_count: int, seed: int) -> RequestFactory:
+    """Bookings for random rooms far enough out to mostly avoid seeded stays."""
+    rng = random.Random(seed)
+
+    def make(index: int) -> Dict:
+        check_in = date.today() + timedelta(days=rng.randint(90, 300))
+        return {
+            "method": "POST",
+            "url": "/api/bookings",
+            "json": {
+                "customer_email": f"bench.guest{index}@example.com",
+                "room_id": rng.randint(1, room_count),
+                "check_in_date": check_in.isoformat(),
+                "check_out_date": (check_in + timedelta(days=rng.randint(1, 5))).isoformat(),
+                "guest_count": 2,
+            },
+        }
+
+    return make
+
+
+ENDPOINTS: Dict[str, Callable[[int, int], RequestFactory]] = {
+    "/api/availability": availability_requests,
+    "/api/rooms/context": context_requests,
+    "/api/bookings": booking_requests,
+}
+
+
+def _int_list(value: str) -> List[int]:
+    return [int(part) for part in value.split(",") if part.strip()]
+
+
+async def run_benchmarks(args: argparse.Namespace) -> List[ScenarioResult]:
+    """Run every (size, endpoint, concurrency) combination."""
+    results: List[ScenarioResult] = []
+    endpoints = [e.strip() for e in args.endpoints.split(",")]
+    previous_override = app.dependency_overrides.get(get_db)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        for size in _int_list(args.sizes):
+            engine = create_engine(
+                f"sqlite:///{os.path.join(workdir, f'bench_{size}.db')}",
+                connect_args={"check_same_thread": False},
+            )
+            counts = seed_dataset(engine, size, seed=args.seed)
+            print(f"📊 Dataset with {counts['rooms']} rooms, {counts['bookings']} bookings")
+            BenchSession = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+            def override_get_db():
+                db = BenchSession()
+                try:
+                    yield db
+                finally:
+                    db.close()
+
+            app.dependency_overrides[get_db] = override_get_db
+            try:
+                for endpoint in endpoints:
+                    for concurrency in _int_list(args.concurrency):
+                        result = await run_scenario(
+                            app,
+                            engine,
+                            endpoint,
+                            ENDPOINTS[endpoint](size, args.seed),
+                            dataset_rooms=size,
+                            concurrency=concurrency,
+                            total_requests=args.requests,
+                        )
+                        results.append(result)
+                        print(
+                            f"  {endpoint:<22} c={concurrency:<3} "
+                            f"{result.throughput_rps:>9.1f} req/s  "
+                            f"p50={result.p50_ms:.2f}ms p95={result.p95_ms:.2f}ms "
+                            f"p99={result.p99_ms:.2f}ms  q/req={result.queries_per_request}"
+                        )
+            finally:
+                engine.dispose()
+
+    if previous_override is None:
+        app.dependency_overrides.pop(get_db, None)
+    else:
+        app.dependency_overrides[get_db] = previous_override
+    return results
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Command line options for the benchmark runner."""
+    parser = argparse.ArgumentParser(description="Staydesk API benchmark suite")
+    parser.add_argument("--sizes", default="12,200", help="Comma-separated room counts")
+    parser.add_argument("--concurrency", default="1,8", help="Comma-separated concurrency levels")
+    parser.add_argument("--requests", type=int, default=100, help="Requests per scenario")
+    parser.add_argument("--endpoints", default=",".join(ENDPOINTS), help="Endpoints to drive")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for data and requests")
+    parser.add_argument("--output", default="bench_results.json", help="Where to write JSON results")
+    parser.add_argument("--baseline", default=None, help="Previous results file to compare against")
+    parser.add_argument(
+        "--threshold", type=float, default=0.2,
+        help="Allowed relative slowdown before a scenario is flagged (0.2 = 20%%)",
+    )
+    return parser
+
+
+def main(argv: List[str] = None) -> int:
+    """Entry point; returns the process exit status."""
+    args = build_parser().parse_args(argv)
+    results = asyncio.run(run_benchmarks(args))
+
+    metadata = {
+        "timestamp": time.time(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "requests_per_scenario": args.requests,
+        "seed": args.seed,
+    }
+    write_results(args.output, results, metadata)
+    print(f"✅ Results written to {args.output}")
+
+    if args.baseline:
+        regressions = compare_results(results, args.baseline, args.threshold)
+        for regression in regressions:
+            print(f"❌ Regression in {regression['key']}: {'; '.join(regression['problems'])}")
+        if regressions:
+            return 1
+        print("✅ No regressions against baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,76 @@
+"""Benchmark bulk rate/availability upserts.
+
+Run from ``backend/api``::
+
+    python -m benchmarks.bench_bulk --rooms 500 --days 365
+
+Writes ``rooms x days`` room-dates as one price override update (all inserts),
+then rewrites them with a closure (all conflicts/updates), and reports
+room-dates per second for each pass.
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from typing import List
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.schemas import BulkInventoryUpdateRequest
+from src.services import InventoryService
+from benchmarks.datasets import seed_dataset
+
+
+def main(argv: List[str] = None) -> int:
+    """Entry point; returns the process exit status."""
+    parser = argparse.ArgumentParser(description="Bulk inventory update benchmark")
+    parser.add_argument("--rooms", type=int, default=500)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--output", default=None, help="Optional JSON results file")
+    args = parser.parse_args(argv)
+
+    start = date.today() + timedelta(days=1)
+    end = start + timedelta(days=args.days - 1)
+    room_ids = list(range(1, args.rooms + 1))
+    passes = {
+        "insert": {"price_override": 199.0, "notes": "bulk"},
+        "update": {"is_available": False, "is_maintenance": True},
+    }
+
+    results = {"rooms": args.rooms, "days": args.days}
+    with tempfile.TemporaryDirectory() as workdir:
+        engine = create_engine(
+            f"sqlite:///{os.path.join(workdir, 'bulk.db')}",
+            connect_args={"check_same_thread": False},
+        )
+        seed_dataset(engine, args.rooms, horizon_days=1, occupancy_rate=0.0)
+        db = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+        service = InventoryService(db)
+
+        for name, change in passes.items():
+            request = BulkInventoryUpdateRequest(updates=[
+                dict(change, room_ids=room_ids, start_date=start, end_date=end)
+            ])
+            started = time.perf_counter()
+            response = service.bulk_update(request)
+            elapsed = time.perf_counter() - started
+            rate = response.room_dates / elapsed
+            results[f"{name}_room_dates_per_s"] = round(rate)
+            print(f"📦 {name}: {response.room_dates} room-dates in {elapsed * 1000:.0f}ms ({rate:,.0f}/s)")
+
+        db.close()
+        engine.dispose()
+
+    if args.output:
+        with open(args.output, "w") as handle:
+            json.dump(results, handle, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
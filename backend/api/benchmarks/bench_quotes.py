@@ -0,0 +1,114 @@
+"""Benchmark the stay-quote engine against per-night, per-room pricing.
+
+Run from ``backend/api``::
+
+    python -m benchmarks.bench_quotes --rooms 500 --nights 14 --iterations 50
+
+Prices every room for the stay with ``QuoteEngine`` and, for comparison, with
+the per-room/per-night ``_is_room_available`` + ``_calculate_room_price`` path
+that bookings used before, and checks both agree.
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from typing import List
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.models import Room
+from src.quotes import QuoteEngine
+from src.services import RoomService
+from benchmarks.datasets import seed_dataset
+from benchmarks.harness import QueryCounter, percentile
+
+
+def _time_ms(fn, iterations: int) -> List[float]:
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return sorted(samples)
+
+
+def main(argv: List[str] = None) -> int:
+    """Entry point; returns the process exit status."""
+    parser = argparse.ArgumentParser(description="Stay-quote engine benchmark")
+    parser.add_argument("--rooms", type=int, default=500)
+    parser.add_argument("--nights", type=int, default=14)
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--legacy-iterations", type=int, default=1)
+    parser.add_argument("--output", default=None, help="Optional JSON results file")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        engine = create_engine(
+            f"sqlite:///{os.path.join(workdir, 'quotes.db')}",
+            connect_args={"check_same_thread": False},
+        )
+        seed_dataset(engine, args.rooms, horizon_days=args.nights + 10)
+        db = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+
+        check_in = date.today() + timedelta(days=3)
+        check_out = check_in + timedelta(days=args.nights)
+        quote_engine = QuoteEngine(db)
+        quote_engine.quote(check_in, check_out)  # warm the catalog
+
+        with QueryCounter(engine) as queries:
+            quote = quote_engine.quote(check_in, check_out)
+        vectorized = _time_ms(lambda: quote_engine.quote(check_in, check_out), args.iterations)
+
+        room_service = RoomService(db)
+        rooms = db.query(Room).filter(Room.is_active == True).order_by(Room.id).all()
+
+        def legacy():
+            totals = []
+            for room in rooms:
+                total = 0.0
+                for offset in range(args.nights):
+                    night = check_in + timedelta(days=offset)
+                    room_service._is_room_available(room.id, night)
+                    total += room_service._calculate_room_price(room, night)
+                totals.append(total)
+            return totals
+
+        legacy_totals = legacy()
+        legacy_ms = _time_ms(legacy, args.legacy_iterations)
+        mismatches = sum(
+            1 for a, b in zip(legacy_totals, quote.totals.tolist()) if abs(a - b) > 1e-6
+        )
+        db.close()
+        engine.dispose()
+
+    results = {
+        "rooms": args.rooms,
+        "nights": args.nights,
+        "cells": args.rooms * args.nights,
+        "queries_per_quote": queries.count,
+        "vectorized_p50_ms": round(percentile(vectorized, 50), 3),
+        "vectorized_p95_ms": round(percentile(vectorized, 95), 3),
+        "legacy_p50_ms": round(percentile(legacy_ms, 50), 3),
+        "total_mismatches": mismatches,
+    }
+    print(
+        f"💰 {args.rooms} rooms x {args.nights} nights: "
+        f"p50={results['vectorized_p50_ms']}ms p95={results['vectorized_p95_ms']}ms "
+        f"({queries.count} queries); per-night loop p50={results['legacy_p50_ms']}ms"
+    )
+    if args.output:
+        with open(args.output, "w") as handle:
+            json.dump(results, handle, indent=2)
+    if mismatches:
+        print(f"❌ {mismatches} room totals differ from the per-night path")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,192 @@
+"""Benchmark API startup: time to first request per startup mode.
+
+Run from ``backend/api``::
+
+    python -m benchmarks.bench_startup --rooms 500 --runs 5 --output startup_results.json
+
+A synthetic hotel is seeded into a throwaway SQLite database once. Every run
+then starts ``uvicorn main:app`` in a fresh process against it, as a rolling
+restart or a new autoscaled worker would, and measures:
+
+- ``ready_ms``: process start to the first successful ``/health`` response
+  (time to first request: interpreter, imports and the lifespan startup)
+- ``first_search_ms``: the first availability search right after that, which
+  pays for any cache that was not prewarmed
+
+Modes: ``development`` (table creation and sample data check on every boot),
+``production`` (neither) and ``production+prewarm``.
+"""
+
+import argparse
+import os
+import platform
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Dict, List
+
+import httpx
+from sqlalchemy import create_engine
+
+from benchmarks.datasets import seed_dataset
+from benchmarks.harness import percentile, write_results
+
+API_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODES: Dict[str, Dict[str, str]] = {
+    "development": {"STARTUP_MODE": "development", "STARTUP_PREWARM": "false"},
+    "production": {"STARTUP_MODE": "production", "STARTUP_PREWARM": "false"},
+    "production+prewarm": {"STARTUP_MODE": "production", "STARTUP_PREWARM": "true"},
+}
+
+
+@dataclass
+class StartupResult:
+    """Startup measurements for one mode."""
+
+    mode: str
+    dataset_rooms: int
+    runs: int
+    ready_p50_ms: float
+    ready_max_ms: float
+    first_search_p50_ms: float
+    first_search_max_ms: float
+
+    @property
+    def key(self) -> str:
+        """Identity used to match results across runs."""
+        return f"startup|{self.mode}|rooms={self.dataset_rooms}"
+
+
+def summarize(mode: str, dataset_rooms: int, ready_ms: List[float], first_search_ms: List[float]) -> StartupResult:
+    """Summarise the samples of one mode."""
+    ready_ms, first_search_ms = sorted(ready_ms), sorted(first_search_ms)
+    return StartupResult(
+        mode=mode,
+        dataset_rooms=dataset_rooms,
+        runs=len(ready_ms),
+        ready_p50_ms=round(percentile(ready_ms, 50), 1),
+        ready_max_ms=round(ready_ms[-1], 1) if ready_ms else 0.0,
+        first_search_p50_ms=round(percentile(first_search_ms, 50), 2),
+        first_search_max_ms=round(first_search_ms[-1], 2) if first_search_ms else 0.0,
+    )
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def measure_start(database_path: str, mode_env: Dict[str, str], timeout: float = 60.0) -> Dict[str, float]:
+    """Start one worker, wait for its first response, then time the first search."""
+    port = _free_port()
+    env = dict(
+        os.environ,
+        DATABASE_URL=f"sqlite:///{database_path}",
+        DATABASE_READ_URL="",
+        HOTEL_PARTITIONS="",
+        INVENTORY_SNAPSHOT="false",
+        **mode_env,
+    )
+    command = [
+        sys.executable, "-m", "uvicorn", "main:app",
+        "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning",
+    ]
+    base_url = f"http://127.0.0.1:{port}"
+
+    started = time.perf_counter()
+    process = subprocess.Popen(command, cwd=API_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        with httpx.Client(base_url=base_url, timeout=5.0) as client:
+            while True:
+                if process.poll() is not None:
+                    raise RuntimeError(f"Worker exited with status {process.returncode}")
+                if time.perf_counter() - started > timeout:
+                    raise RuntimeError(f"Worker not ready after {timeout}s")
+                try:
+                    if client.get("/health").status_code == 200:
+                        break
+                except httpx.TransportError:
+                    time.sleep(0.005)
+            ready_ms = (time.perf_counter() - started) * 1000
+
+            search_started = time.perf_counter()
+            response = client.post("/api/availability", json={
+                "check_in_date": (date.today() + timedelta(days=10)).isoformat(), "room_count": 1,
+            })
+            first_search_ms = (time.perf_counter() - search_started) * 1000
+            if response.status_code not in (200, 404):
+                raise RuntimeError(f"First search failed with {response.status_code}")
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+    return {"ready_ms": ready_ms, "first_search_ms": first_search_ms}
+
+
+def run_benchmarks(args: argparse.Namespace) -> List[StartupResult]:
+    """Measure every requested mode ``args.runs`` times, interleaving modes."""
+    modes = [mode.strip() for mode in args.modes.split(",") if mode.strip()]
+    samples: Dict[str, Dict[str, List[float]]] = {mode: {"ready_ms": [], "first_search_ms": []} for mode in modes}
+
+    with tempfile.TemporaryDirectory() as workdir:
+        database_path = os.path.join(workdir, "startup.db")
+        engine = create_engine(f"sqlite:///{database_path}")
+        counts = seed_dataset(engine, args.rooms, seed=args.seed)
+        engine.dispose()
+        print(f"📊 Dataset with {counts['rooms']} rooms, {counts['bookings']} bookings")
+
+        for run in range(args.runs):
+            for mode in modes:
+                measurement = measure_start(database_path, MODES[mode])
+                for name, value in measurement.items():
+                    samples[mode][name].append(value)
+
+    results = []
+    for mode in modes:
+        result = summarize(mode, args.rooms, samples[mode]["ready_ms"], samples[mode]["first_search_ms"])
+        results.append(result)
+        print(
+            f"  {mode:<20} ready p50={result.ready_p50_ms:.0f}ms max={result.ready_max_ms:.0f}ms  "
+            f"first search p50={result.first_search_p50_ms:.1f}ms max={result.first_search_max_ms:.1f}ms"
+        )
+    return results
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Command line options for the startup benchmark."""
+    parser = argparse.ArgumentParser(description="Staydesk API startup benchmark")
+    parser.add_argument("--rooms", type=int, default=200, help="Rooms in the synthetic hotel")
+    parser.add_argument("--runs", type=int, default=3, help="Worker starts per mode")
+    parser.add_argument("--modes", default=",".join(MODES), help="Comma-separated startup modes")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for the dataset")
+    parser.add_argument("--output", default="startup_results.json", help="Where to write JSON results")
+    return parser
+
+
+def main(argv: List[str] = None) -> int:
+    """Entry point; returns the process exit status."""
+    args = build_parser().parse_args(argv)
+    results = run_benchmarks(args)
+
+    metadata = {
+        "timestamp": time.time(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "runs_per_mode": args.runs,
+        "seed": args.seed,
+    }
+    write_results(args.output, results, metadata)
+    print(f"✅ Results written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
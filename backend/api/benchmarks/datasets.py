@@ -0,0 +1,119 @@
+"""Synthetic datasets for benchmarking the API at different inventory sizes."""
+
+import random
+from datetime import date, timedelta
+from typing import Dict
+
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import sessionmaker
+
+from src.database import Base
+from src.models import (
+    Booking, BookingStatus, Customer, Room, RoomAvailability, RoomType, ViewType
+)
+
+# Price bands per room type: (base_price range, weekend premium, max occupancy)
+ROOM_TYPE_PROFILES = {
+    RoomType.STANDARD: ((75.0, 110.0), 15.0, 2),
+    RoomType.DELUXE: ((110.0, 160.0), 20.0, 3),
+    RoomType.SUITE: ((170.0, 260.0), 40.0, 4),
+    RoomType.PENTHOUSE: ((350.0, 500.0), 100.0, 6),
+}
+
+AMENITY_POOL = [
+    "WiFi", "Air Conditioning", "Mini Bar", "Balcony", "Jacuzzi",
+    "Kitchenette", "Work Desk", "Room Service", "Mini Fridge", "Butler Service",
+]
+
+
+def seed_dataset(
+    engine: Engine,
+    room_count: int,
+    horizon_days: int = 60,
+    occupancy_rate: float = 0.35,
+    seed: int = 42,
+) -> Dict[str, int]:
+    """Create tables on ``engine`` and fill them with a synthetic hotel.
+
+    Rooms are spread over floors of 50, bookings are generated so that roughly
+    ``occupancy_rate`` of room-nights within ``horizon_days`` are taken, and a
+    handful of price overrides and maintenance closures are sprinkled in.
+    """
+    rng = random.Random(seed)
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    db = Session()
+    try:
+        room_types = list(ROOM_TYPE_PROFILES)
+        view_types = list(ViewType)
+        rooms = []
+        for index in range(room_count):
+            room_type = room_types[index % len(room_types)] if index % 7 else RoomType.STANDARD
+            (low, high), weekend_premium, occupancy = ROOM_TYPE_PROFILES[room_type]
+            base_price = round(rng.uniform(low, high), 2)
+            floor, slot = divmod(index, 50)
+            rooms.append(Room(
+                room_number=f"{floor + 1}{slot + 1:02d}",
+                room_type=room_type,
+                view_type=view_types[index % len(view_types)],
+                base_price=base_price,
+                weekend_price=base_price + weekend_premium,
+                max_occupancy=occupancy,
+                bed_count=max(1, occupancy // 2),
+                bathroom_count=max(1, occupancy // 3),
+                has_balcony=rng.random() < 0.5,
+                has_kitchenette=room_type in (RoomType.SUITE, RoomType.PENTHOUSE),
+                has_jacuzzi=room_type != RoomType.STANDARD and rng.random() < 0.3,
+                square_feet=250 + 100 * room_types.index(room_type) + rng.randint(0, 60),
+                amenities=",".join(rng.sample(AMENITY_POOL, k=rng.randint(2, 6))),
+                description=f"Synthetic {room_type.value} room {index + 1}",
+            ))
+        db.add_all(rooms)
+        db.flush()
+
+        customers = [Customer(email=f"bench{i}@example.com") for i in range(max(10, room_count // 5))]
+        db.add_all(customers)
+        db.flush()
+
+        today = date.today()
+        bookings = []
+        booking_number = 0
+        for room in rooms:
+            night = rng.randint(0, 3)
+            while night < horizon_days:
+                if rng.random() < occupancy_rate:
+                    length = rng.randint(1, 4)
+                    booking_number += 1
+                    bookings.append(Booking(
+                        confirmation_number=f"BCH-{booking_number:07d}",
+                        customer_id=rng.choice(customers).id,
+                        room_id=room.id,
+                        check_in_date=today + timedelta(days=night + 1),
+                        check_out_date=today + timedelta(days=night + 1 + length),
+                        guest_count=1,
+                        total_amount=room.base_price * length,
+                        status=BookingStatus.CONFIRMED,
+                        booking_source="benchmark",
+                    ))
+                    night += length
+                night += 1
+        db.add_all(bookings)
+
+        overrides = 0
+        for room in rng.sample(rooms, k=max(1, room_count // 10)):
+            override_date = today + timedelta(days=rng.randint(1, horizon_days))
+            db.add(RoomAvailability(
+                room_id=room.id,
+                date=override_date,
+                is_available=rng.random() < 0.8,
+                is_maintenance=rng.random() < 0.2,
+                price_override=round(room.base_price * 1.5, 2),
+            ))
+            overrides += 1
+
+        db.commit()
+        return {"rooms": len(rooms), "bookings": len(bookings), "overrides": overrides}
+    finally:
+        db.close()
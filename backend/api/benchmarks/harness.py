@@ -0,0 +1,169 @@
+"""Load harness that drives the ASGI app in-process and collects latency stats."""
+
+import asyncio
+import json
+import math
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+import httpx
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+RequestFactory = Callable[[int], Dict[str, Any]]
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """Return the ``q`` percentile (0-100) of an already sorted list.
+
+    Uses linear interpolation between closest ranks, like ``numpy.percentile``.
+    """
+    if not sorted_values:
+        return 0.0
+    if len(sorted_values) == 1:
+        return sorted_values[0]
+    rank = (len(sorted_values) - 1) * q / 100.0
+    lower = math.floor(rank)
+    upper = math.ceil(rank)
+    if lower == upper:
+        return sorted_values[lower]
+    weight = rank - lower
+    return sorted_values[lower] * (1 - weight) + sorted_values[upper] * weight
+
+
+class QueryCounter:
+    """Count SQL statements executed on an engine while attached."""
+
+    def __init__(self, engine: Engine):
+        self.engine = engine
+        self.count = 0
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+
+    def __enter__(self) -> "QueryCounter":
+        event.listen(self.engine, "before_cursor_execute", self._on_execute)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        event.remove(self.engine, "before_cursor_execute", self._on_execute)
+
+
+@dataclass
+class ScenarioResult:
+    """Measurements for one endpoint at one dataset size and concurrency level."""
+
+    endpoint: str
+    dataset_rooms: int
+    concurrency: int
+    requests: int
+    duration_s: float
+    throughput_rps: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    max_ms: float
+    queries_total: int
+    queries_per_request: float
+    status_codes: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def key(self) -> str:
+        """Identity used to match results across runs."""
+        return f"{self.endpoint}|rooms={self.dataset_rooms}|c={self.concurrency}"
+
+
+async def run_scenario(
+    app,
+    engine: Engine,
+    endpoint: str,
+    make_request: RequestFactory,
+    dataset_rooms: int,
+    concurrency: int,
+    total_requests: int,
+) -> ScenarioResult:
+    """Fire ``total_requests`` requests at ``concurrency`` and summarise them.
+
+    ``make_request(i)`` returns the keyword arguments for ``httpx.AsyncClient.request``
+    (``method``, ``url`` and optionally ``json``/``params``) for request number ``i``.
+    """
+    transport = httpx.ASGITransport(app=app)
+    latencies: List[float] = []
+    status_codes: Dict[str, int] = {}
+    counter = iter(range(total_requests))
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+
+        async def worker() -> None:
+            for index in counter:
+                started = time.perf_counter()
+                response = await client.request(**make_request(index))
+                latencies.append((time.perf_counter() - started) * 1000)
+                code = str(response.status_code)
+                status_codes[code] = status_codes.get(code, 0) + 1
+
+        with QueryCounter(engine) as queries:
+            started = time.perf_counter()
+            await asyncio.gather(*(worker() for _ in range(concurrency)))
+            duration = time.perf_counter() - started
+
+    latencies.sort()
+    return ScenarioResult(
+        endpoint=endpoint,
+        dataset_rooms=dataset_rooms,
+        concurrency=concurrency,
+        requests=total_requests,
+        duration_s=round(duration, 4),
+        throughput_rps=round(total_requests / duration, 2) if duration else 0.0,
+        p50_ms=round(percentile(latencies, 50), 3),
+        p95_ms=round(percentile(latencies, 95), 3),
+        p99_ms=round(percentile(latencies, 99), 3),
+        max_ms=round(latencies[-1], 3) if latencies else 0.0,
+        queries_total=queries.count,
+        queries_per_request=round(queries.count / total_requests, 2) if total_requests else 0.0,
+        status_codes=status_codes,
+    )
+
+
+def write_results(path: str, results: List[ScenarioResult], metadata: Dict[str, Any]) -> None:
+    """Write results as JSON so runs can be diffed and compared later."""
+    payload = {
+        "metadata": metadata,
+        "results": [dict(asdict(result), key=result.key) for result in results],
+    }
+    with open(path, "w") as handle:
+        json.dump(payload, handle, indent=2)
+
+
+def compare_results(
+    current: List[ScenarioResult],
+    baseline_path: str,
+    threshold: float = 0.2,
+) -> List[Dict[str, Any]]:
+    """Compare against a previous results file and return the regressions.
+
+    A scenario regresses when its p95 latency grows, or its throughput drops,
+    by more than ``threshold`` (a fraction), or when it issues more queries
+    per request than before.
+    """
+    with open(baseline_path) as handle:
+        baseline = {entry["key"]: entry for entry in json.load(handle)["results"]}
+
+    regressions = []
+    for result in current:
+        previous: Optional[Dict[str, Any]] = baseline.get(result.key)
+        if previous is None:
+            continue
+        problems = []
+        if previous["p95_ms"] and result.p95_ms > previous["p95_ms"] * (1 + threshold):
+            problems.append(f"p95 {previous['p95_ms']}ms -> {result.p95_ms}ms")
+        if previous["throughput_rps"] and result.throughput_rps < previous["throughput_rps"] * (1 - threshold):
+            problems.append(f"throughput {previous['throughput_rps']} -> {result.throughput_rps} req/s")
+        if result.queries_per_request > previous["queries_per_request"]:
+            problems.append(
+                f"queries/request {previous['queries_per_request']} -> {result.queries_per_request}"
+            )
+        if problems:
+            regressions.append({"key": result.key, "problems": problems})
+    return regressions
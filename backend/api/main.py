@@ -7,9 +7,15 @@ from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
+from src.admission import AdmissionMiddleware, get_admission_controller
+from src.change_feed import start_change_feed, stop_change_feed
 from src.config import get_settings
-from src.database import create_tables
-from src.routers import availability, bookings
+from src.database import SessionLocal, create_tables, get_replica, partition_engines
+from src.holds import start_hold_expiry, stop_hold_expiry
+from src.replicas import SESSION_TOKEN_HEADER, SessionTokenMiddleware
+from src.routers import availability, bookings, events, holds, inventory, links, metrics, properties, quotes, waitlist
+from src.snapshot import get_inventory_snapshot
+from src.waitlist import register_waitlist
 
 settings = get_settings()
 
@@ -20,14 +26,54 @@ async def lifespan(app: FastAPI):
     # Startup
     print("🏨 Starting Staydesk API...")
     
-    # Create database tables
-    create_tables()
-    print("✅ Database initialized")
+    if settings.startup_mode == "production":
+        # Schema and data are deploy steps; workers only connect
+        print("✅ Production startup: skipping table creation and sample data")
+    else:
+        # Create database tables
+        create_tables()
+        print("✅ Database initialized")
+        
+        # Initialize sample data
+        from src.utils.seed_data import initialize_sample_data
+        initialize_sample_data()
+        print("✅ Sample data initialized")
     
-    # Initialize sample data
-    from src.utils.seed_data import initialize_sample_data
-    initialize_sample_data()
-    print("✅ Sample data initialized")
+    # Map (building if needed) the host-wide inventory snapshot
+    if settings.inventory_snapshot:
+        with SessionLocal() as db:
+            get_inventory_snapshot(db).ensure_current(db)
+        print("✅ Inventory snapshot mapped")
+    
+    # Every hotel partition gets its own feed, expiry sweeps and waitlist
+    engines = partition_engines()
+    if len(engines) > 1:
+        print(f"✅ Routing {len(engines)} hotels: {', '.join(engines)}")
+    replicated = [code for code, engine in engines.items() if get_replica(engine) is not None]
+    if replicated:
+        print(f"✅ Read replicas for: {', '.join(replicated)}")
+    
+    # Learn about other workers' writes
+    if settings.change_feed:
+        feeds = [start_change_feed(engine) for engine in engines.values()]
+        if any(feed is not None for feed in feeds):
+            print("✅ Change feed started")
+    
+    # Put expired booking-link holds back on sale on time
+    expiries = [start_hold_expiry(engine) for engine in engines.values()]
+    if any(expiry is not None for expiry in expiries):
+        print("✅ Hold expiry started")
+    
+    # Offer released inventory to waitlisted requests
+    for engine in engines.values():
+        register_waitlist(engine)
+    print("✅ Waitlist matching enabled")
+    
+    # Build caches in the background instead of on the first requests
+    if settings.startup_prewarm:
+        from src.prewarm import start_prewarm
+        start_prewarm(lambda results, elapsed_ms: print(f"✅ Caches prewarmed in {elapsed_ms:.0f} ms"))
+        print("✅ Cache prewarm started")
     
     print("🚀 Staydesk API is ready!")
     
@@ -35,6 +81,9 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     print("⏹️ Shutting down Staydesk API...")
+    stop_hold_expiry()
+    if settings.change_feed:
+        stop_change_feed()
 
 
 # Create FastAPI application
@@ -47,6 +96,13 @@ app = FastAPI(
     redoc_url="/redoc"
 )
 
+# Add admission control (inside CORS so 503 responses carry CORS headers)
+if settings.admission_control:
+    app.add_middleware(AdmissionMiddleware, controller=get_admission_controller())
+
+# Hand clients that wrote a token for reading their writes from replicas
+app.add_middleware(SessionTokenMiddleware)
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -54,6 +110,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[SESSION_TOKEN_HEADER],
 )
 
 
@@ -70,7 +127,15 @@ async def add_process_time_header(request: Request, call_next):
 
 # Include routers
 app.include_router(availability.router)
+app.include_router(properties.router)
 app.include_router(bookings.router)
+app.include_router(holds.router)
+app.include_router(links.router)
+app.include_router(quotes.router)
+app.include_router(inventory.router)
+app.include_router(events.router)
+app.include_router(waitlist.router)
+app.include_router(metrics.router)
 
 
 # Root endpoints
@@ -85,8 +150,22 @@ async def root():
         "location": settings.hotel_location,
         "endpoints": {
             "availability": "/api/availability",
+            "availability_search": "/api/availability/search",
+            "availability_export": "/api/availability/export",
+            "properties": "/api/properties",
+            "property_availability": "/api/properties/availability",
             "hotel_context": "/api/rooms/context",
             "bookings": "/api/bookings",
+            "customer_bookings": "/api/customers/{email}/bookings",
+            "holds": "/api/holds",
+            "booking_links": "/api/links/{token}",
+            "quotes": "/api/quotes",
+            "inventory_bulk": "/api/inventory/bulk",
+            "inventory_ari": "/api/inventory/ari",
+            "calendar": "/api/calendar",
+            "events": "/api/events",
+            "events_stream": "/api/events/stream",
+            "metrics": "/api/metrics",
             "health": "/health",
             "docs": "/docs"
         }
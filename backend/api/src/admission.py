@@ -0,0 +1,269 @@
+"""Admission control and load shedding for API requests.
+
+Requests are sorted into classes with their own concurrency limit, bounded
+wait queue and queueing-time budget, all drawing from one shared pool of
+slots. When the pool is saturated, freed slots go to the highest-priority
+waiter first, so bookings overtake read-only searches. A request that cannot
+be queued, or is not admitted within its budget, is rejected immediately
+with 503 and ``Retry-After`` instead of timing out after doing wasted work.
+"""
+
+import asyncio
+import bisect
+import itertools
+import json
+import math
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from .config import get_settings
+
+settings = get_settings()
+
+# Request classes (lower priority value is served first)
+BOOKINGS = "bookings"  # Booking and hold writes
+STANDARD = "standard"
+
+# Paths never subject to admission control (the event stream would hold a slot forever)
+EXEMPT_PATHS = ("/health", "/api/metrics", "/api/events/stream")
+
+
+@dataclass(frozen=True)
+class RouteLimit:
+    """Limits for one request class."""
+    
+    name: str
+    priority: int
+    max_concurrent: int
+    max_queue: int
+    queue_timeout: float  # seconds
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request is shed; ``retry_after`` is in whole seconds."""
+    
+    def __init__(self, reason: str, retry_after: int):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class _ClassState:
+    """Counters for one request class."""
+    
+    __slots__ = ("active", "queued", "admitted", "rejected", "timed_out", "queue_time_total", "service_time_avg")
+    
+    def __init__(self):
+        self.active = 0
+        self.queued = 0
+        self.admitted = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self.queue_time_total = 0.0
+        self.service_time_avg = 0.0
+
+
+class AdmissionController:
+    """Priority admission over a shared pool of slots (one event loop per instance)."""
+    
+    def __init__(self, max_concurrency: int, limits: List[RouteLimit]):
+        self.max_concurrency = max_concurrency
+        self.limits = {limit.name: limit for limit in limits}
+        self._state = {limit.name: _ClassState() for limit in limits}
+        self._active = 0
+        self._waiters: List[Tuple[int, int, str, asyncio.Future]] = []
+        self._sequence = itertools.count()
+    
+    async def acquire(self, name: str) -> float:
+        """Wait for a slot for class ``name``; returns seconds spent queued."""
+        limit = self.limits[name]
+        state = self._state[name]
+        
+        # Freed slots are handed to waiters as soon as they can run, so a free
+        # slot with nobody of this class queued means nobody is ahead of us
+        if self._can_admit(name) and state.queued == 0:
+            self._admit(name)
+            return 0.0
+        
+        if state.queued >= limit.max_queue:
+            state.rejected += 1
+            raise AdmissionRejected("Wait queue is full", self._retry_after(name))
+        
+        future = asyncio.get_running_loop().create_future()
+        entry = (limit.priority, next(self._sequence), name, future)
+        bisect.insort(self._waiters, entry)
+        state.queued += 1
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(asyncio.shield(future), timeout=limit.queue_timeout)
+        except asyncio.TimeoutError:
+            if not future.done():
+                self._remove_waiter(entry)
+                state.timed_out += 1
+                state.rejected += 1
+                raise AdmissionRejected("Queueing-time budget exceeded", self._retry_after(name))
+        except asyncio.CancelledError:
+            # Client went away: give the slot back if it was granted in the meantime
+            if future.done():
+                self.release(name)
+            else:
+                self._remove_waiter(entry)
+            raise
+        
+        waited = time.perf_counter() - started
+        state.queue_time_total += waited
+        return waited
+    
+    def release(self, name: str, service_time: Optional[float] = None) -> None:
+        """Return a slot and hand it to the best waiter that may run."""
+        state = self._state[name]
+        state.active -= 1
+        self._active -= 1
+        if service_time is not None:
+            # Exponentially weighted average, used for Retry-After estimates
+            state.service_time_avg = 0.8 * state.service_time_avg + 0.2 * service_time
+        self._dispatch()
+    
+    def stats(self) -> Dict[str, Dict]:
+        """Per-class counters and configured limits."""
+        result = {}
+        for name, limit in self.limits.items():
+            state = self._state[name]
+            admitted = state.admitted or 1
+            result[name] = {
+                "priority": limit.priority,
+                "max_concurrent": limit.max_concurrent,
+                "max_queue": limit.max_queue,
+                "queue_timeout_ms": round(limit.queue_timeout * 1000, 1),
+                "active": state.active,
+                "queued": state.queued,
+                "admitted": state.admitted,
+                "rejected": state.rejected,
+                "timed_out": state.timed_out,
+                "avg_queue_ms": round(state.queue_time_total / admitted * 1000, 2),
+            }
+        return result
+    
+    # Internals
+    
+    def _can_admit(self, name: str) -> bool:
+        return (
+            self._active < self.max_concurrency
+            and self._state[name].active < self.limits[name].max_concurrent
+        )
+    
+    def _admit(self, name: str) -> None:
+        state = self._state[name]
+        state.active += 1
+        state.admitted += 1
+        self._active += 1
+    
+    def _dispatch(self) -> None:
+        index = 0
+        while index < len(self._waiters) and self._active < self.max_concurrency:
+            _, _, name, future = self._waiters[index]
+            if future.done() or not self._can_admit(name):
+                index += 1
+                continue
+            del self._waiters[index]
+            self._state[name].queued -= 1
+            self._admit(name)
+            future.set_result(None)
+    
+    def _remove_waiter(self, entry: Tuple) -> None:
+        index = bisect.bisect_left(self._waiters, entry)
+        if index < len(self._waiters) and self._waiters[index] is entry:
+            del self._waiters[index]
+            self._state[entry[2]].queued -= 1
+    
+    def _retry_after(self, name: str) -> int:
+        """Rough time until the queue ahead of a new request drains."""
+        limit = self.limits[name]
+        state = self._state[name]
+        service_time = state.service_time_avg or limit.queue_timeout
+        return max(1, math.ceil(service_time * (state.queued + 1) / limit.max_concurrent))
+
+
+def classify_request(method: str, path: str) -> Optional[str]:
+    """Request class for a method and path, or None when exempt."""
+    if not path.startswith("/api/") or path.startswith(EXEMPT_PATHS):
+        return None
+    if path.startswith(("/api/bookings", "/api/holds", "/api/links")) and method not in ("GET", "HEAD"):
+        return BOOKINGS
+    return STANDARD
+
+
+class AdmissionMiddleware:
+    """ASGI middleware applying an :class:`AdmissionController` to HTTP requests."""
+    
+    def __init__(self, app, controller: AdmissionController):
+        self.app = app
+        self.controller = controller
+    
+    async def __call__(self, scope, receive, send):
+        name = classify_request(scope["method"], scope["path"]) if scope["type"] == "http" else None
+        if name is None:
+            await self.app(scope, receive, send)
+            return
+        
+        try:
+            await self.controller.acquire(name)
+        except AdmissionRejected as e:
+            await self._reject(send, e)
+            return
+        
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.controller.release(name, time.perf_counter() - started)
+    
+    @staticmethod
+    async def _reject(send, rejection: AdmissionRejected) -> None:
+        body = json.dumps({
+            "error": "Service overloaded",
+            "details": f"{rejection.reason}; retry in {rejection.retry_after}s"
+        }).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 503,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(rejection.retry_after).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+
+def build_admission_controller() -> AdmissionController:
+    """Controller configured from settings."""
+    return AdmissionController(
+        max_concurrency=settings.admission_max_concurrency,
+        limits=[
+            RouteLimit(
+                name=BOOKINGS,
+                priority=0,
+                max_concurrent=settings.admission_booking_concurrency,
+                max_queue=settings.admission_booking_queue,
+                queue_timeout=settings.admission_booking_timeout_ms / 1000,
+            ),
+            RouteLimit(
+                name=STANDARD,
+                priority=1,
+                max_concurrent=settings.admission_standard_concurrency,
+                max_queue=settings.admission_standard_queue,
+                queue_timeout=settings.admission_standard_timeout_ms / 1000,
+            ),
+        ],
+    )
+
+
+# Global controller instance
+admission_controller = build_admission_controller()
+
+
+def get_admission_controller() -> AdmissionController:
+    """Get the process-wide admission controller."""
+    return admission_controller
@@ -0,0 +1,372 @@
+"""Room allocation for multi-room requests.
+
+A party asking for several rooms wants a set that works together: enough
+beds for everyone, within budget, ideally on one floor, side by side and
+with the same view. Sets are ranked by score, lower is better:
+
+    total nightly price
+    + GAP_PENALTY per unchosen position between chosen rooms on a floor
+    + VIEW_PENALTY per view beyond the first
+    + FLOOR_PENALTY for a second floor, plus FLOOR_DISTANCE_PENALTY per
+      floor between the two
+
+Floor and position come from the room number ("1204" is position 4 on
+floor 12). The search is bounded to sets on at most two floors. Per floor
+and set size it keeps a handful of blocks: the cheapest rooms, the cheapest
+rooms with one view, the roomiest rooms, the best run of neighbouring rooms
+and the best run with one view, all computed for every floor at once with
+NumPy. Single-floor sets
+are those blocks; two-floor sets pair the best blocks of two sizes adding
+up to the room count, scored exhaustively as one array, so the cost is a
+few array passes over the candidates regardless of inventory size. Parties
+that fit on no two floors get the cheapest rooms that seat them.
+"""
+
+from typing import List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+GAP_PENALTY = 1.0
+VIEW_PENALTY = 10.0
+FLOOR_PENALTY = 20.0
+FLOOR_DISTANCE_PENALTY = 5.0
+
+# Blocks per set size carried into pairing, by score and by occupancy
+PAIRING_BLOCKS = 16
+
+# Block kinds
+CHEAPEST, ROOMIEST, RUN, SAME_VIEW_RUN, CHEAPEST_SAME_VIEW = range(5)
+KINDS = 5
+
+
+class AllocationCandidate(NamedTuple):
+    """An available room offered to the optimizer."""
+    
+    room_id: int
+    room_number: str
+    price: float
+    max_occupancy: int
+    view_type: str
+
+
+class RoomSet(NamedTuple):
+    """A ranked combination of rooms."""
+    
+    rooms: Tuple[AllocationCandidate, ...]
+    total_price: float
+    total_occupancy: int
+    floors: Tuple[int, ...]
+    views: Tuple[str, ...]
+    gaps: int
+    score: float
+
+
+def room_location(room_number: str) -> Tuple[Optional[int], Optional[int]]:
+    """(floor, position) encoded in a room number, (None, None) when it is not numeric."""
+    if not room_number.isdigit():
+        return None, None
+    return divmod(int(room_number), 100)
+
+
+def allocate_rooms(
+    candidates: Sequence[AllocationCandidate],
+    room_count: int,
+    guest_count: Optional[int] = None,
+    max_sets: int = 3,
+) -> List[RoomSet]:
+    """Up to ``max_sets`` best sets of ``room_count`` rooms seating ``guest_count``, best first."""
+    if room_count < 1 or len(candidates) < room_count:
+        return []
+    return _Allocation(candidates, room_count, guest_count or room_count, max_sets).best_sets()
+
+
+class _Allocation:
+    """Block tables and set scoring for one request."""
+    
+    def __init__(self, candidates: Sequence[AllocationCandidate], room_count: int, guest_count: int, max_sets: int):
+        self.candidates = candidates
+        self.room_count = room_count
+        self.guest_count = guest_count
+        self.max_sets = max_sets
+        # Options beyond the per-floor tables: (score, kind, start) of the best whole-set runs
+        self.run_options: List[Tuple[np.ndarray, int, np.ndarray]] = []
+        
+        _, numbers, prices, occupancies, views = zip(*candidates)
+        self.prices = np.asarray(prices, dtype=float)
+        self.occupancies = np.asarray(occupancies, dtype=np.int64)
+        codes = {}
+        self.view_codes = np.array([codes.setdefault(view, len(codes)) for view in views])
+        self.view_names = list(codes)
+        # Number of views in each view bitmask
+        self.view_count = np.array([bin(mask).count("1") for mask in range(1 << len(codes))])
+        levels, self.positions = self._locations(numbers)
+        self.floor_levels, self.floors = np.unique(levels, return_inverse=True)
+        self.floors = self.floors.reshape(-1)
+        self._build_blocks()
+    
+    @staticmethod
+    def _locations(numbers: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+        try:
+            values = np.fromiter(map(int, numbers), dtype=np.int64, count=len(numbers))
+        except ValueError:
+            # Rooms without a numeric number each get a floor of their own, below every real one
+            locations = [room_location(number) for number in numbers]
+            levels = np.array([
+                floor if floor is not None else -1 - index
+                for index, (floor, _) in enumerate(locations)
+            ])
+            positions = np.array([position or 0 for _, position in locations])
+            return levels, positions
+        return values // 100, values % 100
+    
+    # Blocks
+    
+    def _build_blocks(self) -> None:
+        """Fill (floor, size, kind) tables of block cost, occupancy, views, gaps and members."""
+        shape = (len(self.floor_levels), self.room_count + 1, KINDS)
+        self.cost = np.full(shape, np.inf)
+        self.occupancy = np.zeros(shape, dtype=np.int64)
+        self.view_mask = np.zeros(shape, dtype=np.int64)
+        self.gaps = np.zeros(shape, dtype=np.int64)
+        self.start = np.zeros(shape, dtype=np.int64)
+        self.orders = [
+            np.lexsort((self.prices, self.floors)),
+            np.lexsort((self.prices, -self.occupancies, self.floors)),
+            np.lexsort((self.prices, self.positions, self.floors)),
+            np.lexsort((self.prices, self.positions, self.view_codes, self.floors)),
+            np.lexsort((self.prices, self.view_codes, self.floors)),
+        ]
+        floor_views = self.floors * len(self.view_names) + self.view_codes
+        self._fill_prefixes(CHEAPEST, self.floors)
+        self._fill_prefixes(ROOMIEST, self.floors)
+        self._fill_prefixes(CHEAPEST_SAME_VIEW, floor_views)
+        self._fill_runs(RUN, self.floors)
+        self._fill_runs(SAME_VIEW_RUN, floor_views, single_view=True)
+    
+    def _fill_prefixes(self, kind: int, groups: np.ndarray) -> None:
+        """Per floor and size, the best block of the first n rooms of one of ``groups`` in ``kind`` order."""
+        order = self.orders[kind]
+        groups = groups[order]
+        floors = self.floors[order]
+        group_start = np.searchsorted(groups, groups)
+        size = np.arange(len(order)) - group_start + 1
+        
+        # Running sums and extremes restart at each group: offsets push every group above the last
+        offset = groups * 1000
+        positions = self.positions[order]
+        highest = np.maximum.accumulate(positions + offset) - offset
+        lowest = offset - np.maximum.accumulate(offset - positions)
+        gaps = highest - lowest + 1 - size
+        cost = self._group_cumsum(self.prices[order], group_start)
+        
+        keep = np.flatnonzero(size <= self.room_count)
+        if len(keep) and np.any(groups != floors):
+            # Several groups per floor: keep the best of each floor and size
+            ranked = keep[np.lexsort((cost[keep] + GAP_PENALTY * gaps[keep], size[keep], floors[keep]))]
+            keep = ranked[np.concatenate(([True], (np.diff(floors[ranked]) != 0) | (np.diff(size[ranked]) != 0)))]
+        
+        index = (floors[keep], size[keep], kind)
+        self.cost[index] = cost[keep]
+        self.occupancy[index] = self._group_cumsum(self.occupancies[order], group_start)[keep]
+        self.view_mask[index] = self._prefix_view_mask(order, group_start)[keep]
+        self.gaps[index] = gaps[keep]
+        self.start[index] = group_start[keep]
+    
+    def _fill_runs(self, kind: int, groups: np.ndarray, single_view: bool = False) -> None:
+        """Per floor and size, the best-scoring run of neighbouring rooms within one of ``groups``."""
+        order = self.orders[kind]
+        count = len(order)
+        groups = groups[order]
+        floors = self.floors[order]
+        positions = self.positions[order]
+        floor_starts = np.flatnonzero(np.concatenate(([True], np.diff(floors) != 0)))
+        cumulative_price = np.concatenate(([0.0], np.cumsum(self.prices[order])))
+        cumulative_occupancy = np.concatenate(([0], np.cumsum(self.occupancies[order])))
+        
+        # Every (size, start) window at once, one row per size
+        sizes = np.arange(1, self.room_count + 1)[:, None]
+        starts = np.arange(count)[None, :]
+        ends = np.minimum(starts + sizes, count)
+        cost = cumulative_price[ends] - cumulative_price[starts]
+        gaps = positions[ends - 1] - positions[starts] + 1 - sizes
+        masks = np.left_shift(1, self.view_codes[order])
+        if single_view:
+            view_mask = np.broadcast_to(masks, ends.shape)
+        else:
+            view_mask = _window_or(masks, self.room_count)
+        occupancy = cumulative_occupancy[ends] - cumulative_occupancy[starts]
+        # A run must seat its share of the party, so that runs can be paired into sets that seat it all
+        seats_share = occupancy * self.room_count >= self.guest_count * sizes
+        inside = (starts + sizes <= count) & (groups[starts] == groups[ends - 1]) & seats_share
+        score = np.where(inside, cost + GAP_PENALTY * gaps + VIEW_PENALTY * (self.view_count[view_mask] - 1), np.inf)
+        
+        # Lowest score per size and floor: the first window matching its floor's minimum
+        lowest = np.minimum.reduceat(score, floor_starts, axis=1)
+        lengths = np.diff(np.append(floor_starts, count))
+        size_index, start = np.nonzero((score == np.repeat(lowest, lengths, axis=1)) & np.isfinite(score))
+        key = size_index * len(self.floor_levels) + floors[start]
+        first = np.diff(key, prepend=-1) != 0
+        
+        # Runs of the whole set are options of their own, so one floor can offer several
+        whole = np.flatnonzero(np.isfinite(score[-1]))
+        whole = whole[np.argsort(score[-1, whole], kind="stable")[:self.max_sets]]
+        self.run_options.append((score[-1, whole], kind, whole))
+        
+        size_index, start = size_index[first], start[first]
+        
+        size = size_index + 1
+        index = (floors[start], size, kind)
+        self.cost[index] = cost[size_index, start]
+        self.occupancy[index] = occupancy[size_index, start]
+        self.view_mask[index] = view_mask[size_index, start]
+        self.gaps[index] = gaps[size_index, start]
+        self.start[index] = start
+    
+    def _prefix_view_mask(self, order: np.ndarray, group_start: np.ndarray) -> np.ndarray:
+        codes = self.view_codes[order]
+        counts = np.vstack([
+            self._group_cumsum((codes == code).astype(np.int64), group_start)
+            for code in range(len(self.view_names))
+        ])
+        return _mask_from_counts(counts)
+    
+    @staticmethod
+    def _group_cumsum(values: np.ndarray, group_start: np.ndarray) -> np.ndarray:
+        cumulative = np.cumsum(values)
+        before = np.concatenate(([0], cumulative))[group_start]
+        return cumulative - before
+    
+    # Sets
+    
+    def best_sets(self) -> List[RoomSet]:
+        k = self.room_count
+        # Each option is one or two blocks: score, then (kind, start, size) per block, size 0 when absent
+        options = []
+        
+        # One floor: whole blocks
+        single = (
+            self.cost[:, k, :] + GAP_PENALTY * self.gaps[:, k, :]
+            + VIEW_PENALTY * (self.view_count[self.view_mask[:, k, :]] - 1)
+        )
+        single[self.occupancy[:, k, :] < self.guest_count] = np.inf
+        floor, kind = np.nonzero(np.isfinite(single))
+        none = np.zeros_like(floor)
+        options.append((single[floor, kind], kind, self.start[floor, k, kind], np.full_like(floor, k), none, none, none))
+        for score, kind, start in self.run_options:
+            none = np.zeros_like(start)
+            options.append((score, np.full_like(start, kind), start, np.full_like(start, k), none, none, none))
+        
+        # Two floors: the leading blocks of complementary sizes, every pair scored at once
+        for size in range(1, k // 2 + 1):
+            left, right = self._pairing_blocks(size), self._pairing_blocks(k - size)
+            fa, ka = np.divmod(left, KINDS)
+            fb, kb = np.divmod(right, KINDS)
+            fa, ka, fb, kb = fa[:, None], ka[:, None], fb[None, :], kb[None, :]
+            level_a, level_b = self.floor_levels[fa], self.floor_levels[fb]
+            distance = np.where((level_a < 0) | (level_b < 0), 0, np.abs(level_a - level_b) - 1)
+            views = self.view_mask[fa, size, ka] | self.view_mask[fb, k - size, kb]
+            score = (
+                self.cost[fa, size, ka] + self.cost[fb, k - size, kb]
+                + GAP_PENALTY * (self.gaps[fa, size, ka] + self.gaps[fb, k - size, kb])
+                + VIEW_PENALTY * (self.view_count[views] - 1)
+                + FLOOR_PENALTY + FLOOR_DISTANCE_PENALTY * distance
+            )
+            occupancy = self.occupancy[fa, size, ka] + self.occupancy[fb, k - size, kb]
+            valid = (fa != fb) & (occupancy >= self.guest_count)
+            if size * 2 == k:
+                # Equal sizes would list every pair twice
+                valid &= fa < fb
+            ia, ib = np.nonzero(valid)
+            fa, ka, fb, kb = fa[ia, 0], ka[ia, 0], fb[0, ib], kb[0, ib]
+            options.append((
+                score[ia, ib],
+                ka, self.start[fa, size, ka], np.full_like(ia, size),
+                kb, self.start[fb, k - size, kb], np.full_like(ib, k - size),
+            ))
+        
+        scores, *blocks = (np.concatenate(column) for column in zip(*options))
+        room_sets, seen = [], set()
+        for index in np.argsort(scores, kind="stable").tolist():
+            ka, sa, na, kb, sb, nb = (int(column[index]) for column in blocks)
+            members = tuple(sorted(
+                self.orders[ka][sa:sa + na].tolist() + self.orders[kb][sb:sb + nb].tolist()
+            ))
+            if members not in seen:
+                seen.add(members)
+                room_sets.append(self._room_set(members))
+                if len(room_sets) == self.max_sets:
+                    break
+        if not room_sets:
+            fallback = self._fallback()
+            if fallback is not None:
+                room_sets.append(self._room_set(fallback))
+        return room_sets
+    
+    def _pairing_blocks(self, size: int) -> np.ndarray:
+        """Flat (floor * KINDS + kind) indexes of the best and roomiest blocks of one size."""
+        cost = self.cost[:, size, :].reshape(-1)
+        feasible = np.flatnonzero(np.isfinite(cost))
+        if len(feasible) <= 2 * PAIRING_BLOCKS:
+            return feasible
+        cheap = feasible[np.argpartition(cost[feasible], PAIRING_BLOCKS)[:PAIRING_BLOCKS]]
+        roomy = self.occupancy[:, size, :].reshape(-1)[feasible]
+        spacious = feasible[np.argpartition(-roomy, PAIRING_BLOCKS)[:PAIRING_BLOCKS]]
+        return np.union1d(cheap, spacious)
+    
+    def _fallback(self) -> Optional[Tuple[int, ...]]:
+        """The cheapest rooms, or else the roomiest, when they seat the party."""
+        k = self.room_count
+        for order in (np.argsort(self.prices, kind="stable"), np.lexsort((self.prices, -self.occupancies))):
+            members = order[:k]
+            if self.occupancies[members].sum() >= self.guest_count:
+                return tuple(sorted(members.tolist()))
+        return None
+    
+    def _room_set(self, members: Tuple[int, ...]) -> RoomSet:
+        rooms = tuple(sorted((self.candidates[i] for i in members), key=lambda room: room.room_number))
+        floors = self.floors[list(members)]
+        positions = self.positions[list(members)]
+        gaps = 0
+        for floor in np.unique(floors):
+            on_floor = positions[floors == floor]
+            gaps += int(on_floor.max() - on_floor.min() + 1 - len(on_floor))
+        levels = sorted(set(self.floor_levels[floors].tolist()))
+        numbered = [level for level in levels if level >= 0]
+        views = tuple(sorted({room.view_type for room in rooms}))
+        total_price = round(float(self.prices[list(members)].sum()), 2)
+        score = total_price + GAP_PENALTY * gaps + VIEW_PENALTY * (len(views) - 1)
+        if len(levels) > 1:
+            score += FLOOR_PENALTY * (len(levels) - 1)
+        if len(numbered) > 1:
+            score += FLOOR_DISTANCE_PENALTY * (numbered[-1] - numbered[0] - 1)
+        return RoomSet(
+            rooms=rooms,
+            total_price=total_price,
+            total_occupancy=sum(room.max_occupancy for room in rooms),
+            floors=tuple(numbered),
+            views=views,
+            gaps=gaps,
+            score=round(score, 2),
+        )
+
+
+def _mask_from_counts(counts: np.ndarray) -> np.ndarray:
+    """Bitmask of the views (rows) with a positive count."""
+    weights = np.left_shift(1, np.arange(counts.shape[0], dtype=np.int64))
+    return (counts > 0).astype(np.int64).T @ weights
+
+
+def _window_or(values: np.ndarray, max_width: int) -> np.ndarray:
+    """Bitwise OR of every window of ``values``, one row per width 1..max_width (sparse table)."""
+    count = len(values)
+    levels = [values]
+    while 2 ** len(levels) <= max_width:
+        half = 2 ** (len(levels) - 1)
+        previous = levels[-1]
+        levels.append(previous | np.concatenate((previous[half:], np.zeros(half, dtype=values.dtype)))[:count])
+    rows = []
+    for width in range(1, max_width + 1):
+        level = width.bit_length() - 1
+        table, shift = levels[level], width - 2 ** level
+        rows.append(table | np.concatenate((table[shift:], np.zeros(shift, dtype=values.dtype)))[:count])
+    return np.vstack(rows)
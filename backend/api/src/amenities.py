@@ -0,0 +1,130 @@
+"""Amenity vocabulary and bitmask helpers.
+
+Free-text amenity names ("Hot Tub", "Full Kitchen", "wi-fi") are normalized to
+a fixed vocabulary of codes, each with a stable bit position. A room's
+amenities are then a single integer, and "has all of these amenities" is
+``room_mask & required == required``.
+"""
+
+import re
+from typing import Dict, Iterable, List, Optional
+
+# Canonical amenity codes. Bit positions are the list index, so only append.
+AMENITY_CODES: List[str] = [
+    "wifi",
+    "air_conditioning",
+    "mini_bar",
+    "balcony",
+    "jacuzzi",
+    "kitchenette",
+    "work_desk",
+    "room_service",
+    "mini_fridge",
+    "butler_service",
+    "terrace",
+    "ocean_view",
+    "city_view",
+    "garden_view",
+    "pool_view",
+]
+
+AMENITY_BITS: Dict[str, int] = {code: 1 << index for index, code in enumerate(AMENITY_CODES)}
+
+# Display names and common guest phrasings mapped to codes
+AMENITY_SYNONYMS: Dict[str, str] = {
+    "wifi": "wifi",
+    "wi-fi": "wifi",
+    "internet": "wifi",
+    "air conditioning": "air_conditioning",
+    "ac": "air_conditioning",
+    "a/c": "air_conditioning",
+    "mini bar": "mini_bar",
+    "minibar": "mini_bar",
+    "balcony": "balcony",
+    "jacuzzi": "jacuzzi",
+    "hot tub": "jacuzzi",
+    "whirlpool": "jacuzzi",
+    "kitchenette": "kitchenette",
+    "kitchen": "kitchenette",
+    "full kitchen": "kitchenette",
+    "work desk": "work_desk",
+    "desk": "work_desk",
+    "room service": "room_service",
+    "mini fridge": "mini_fridge",
+    "fridge": "mini_fridge",
+    "butler service": "butler_service",
+    "butler": "butler_service",
+    "terrace": "terrace",
+    "private terrace": "terrace",
+    "ocean view": "ocean_view",
+    "city view": "city_view",
+    "garden view": "garden_view",
+    "pool view": "pool_view",
+}
+
+# Names that are amenities in an amenity list but often mean something else in
+# prose ("ask the front desk"); free text has to say "work desk" or "a/c"
+AMBIGUOUS_IN_TEXT = frozenset({"desk", "ac"})
+
+# Any other known phrase as whole words, longest first so "full kitchen" wins over "kitchen"
+_AMENITY_PHRASE_RE = re.compile(
+    r"\b(" + "|".join(
+        re.escape(phrase).replace(r"\ ", r"\s+")
+        for phrase in sorted(set(AMENITY_SYNONYMS) - AMBIGUOUS_IN_TEXT, key=len, reverse=True)
+    ) + r")\b",
+    re.IGNORECASE,
+)
+
+
+def normalize_amenity(name: str) -> Optional[str]:
+    """Map an amenity name to its vocabulary code, or None if unknown."""
+    key = " ".join(name.strip().lower().replace("_", " ").split())
+    if not key:
+        return None
+    return AMENITY_SYNONYMS.get(key)
+
+
+def amenity_mask(names: Optional[Iterable[str]], strict: bool = False) -> int:
+    """Combine amenity names into a bitmask.
+
+    Unknown names are ignored, or raise ``ValueError`` when ``strict`` is set.
+    """
+    mask = 0
+    for name in names or ():
+        code = normalize_amenity(name)
+        if code is None:
+            if strict:
+                raise ValueError(f"Unknown amenity: {name}")
+            continue
+        mask |= AMENITY_BITS[code]
+    return mask
+
+
+def room_amenity_mask(
+    amenities: Optional[str],
+    has_balcony: Optional[bool] = False,
+    has_kitchenette: Optional[bool] = False,
+    has_jacuzzi: Optional[bool] = False,
+) -> int:
+    """Bitmask for a room from its comma-separated amenities and feature flags."""
+    mask = amenity_mask(amenities.split(",") if amenities else ())
+    if has_balcony:
+        mask |= AMENITY_BITS["balcony"]
+    if has_kitchenette:
+        mask |= AMENITY_BITS["kitchenette"]
+    if has_jacuzzi:
+        mask |= AMENITY_BITS["jacuzzi"]
+    return mask
+
+
+def mask_to_codes(mask: int) -> List[str]:
+    """Expand a bitmask back into vocabulary codes."""
+    return [code for code in AMENITY_CODES if mask & AMENITY_BITS[code]]
+
+
+def amenity_mask_from_text(text: Optional[str]) -> int:
+    """Bitmask of the amenities mentioned anywhere in free text ("a room with a hot tub, please")."""
+    mask = 0
+    for match in _AMENITY_PHRASE_RE.finditer(text or ""):
+        mask |= AMENITY_BITS[AMENITY_SYNONYMS[" ".join(match.group(1).lower().split())]]
+    return mask
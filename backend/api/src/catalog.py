@@ -0,0 +1,224 @@
+"""Immutable, process-wide snapshot of the room catalog.
+
+Rooms change rarely, yet every availability search used to re-read them through
+the ORM (identity map, full column hydration, amenity string parsing). The
+catalog is loaded once per database with a single column query into compact
+tuples, shared read-only across requests, and rebuilt and swapped in atomically
+whenever the catalog version changes.
+"""
+
+import threading
+import time
+import weakref
+from datetime import date
+from types import MappingProxyType
+from typing import Dict, Mapping, NamedTuple, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from .config import get_settings
+from .change_feed import record_change
+from .database import hotel_code_for, primary_engine, primary_session
+from .invalidation import CATALOG_CHANGED, RESYNC, InventoryChange, get_invalidation_bus
+from .models import Room, RoomType, ViewType
+from .ranking import RoomFeatures
+from .schemas import RoomResponse
+
+settings = get_settings()
+
+
+class CatalogRoom(NamedTuple):
+    """A room as seen by search: pre-parsed and ready to render."""
+    
+    id: int
+    room_number: str
+    room_type: RoomType
+    view_type: ViewType
+    base_price: float
+    weekend_price: Optional[float]
+    max_occupancy: int
+    square_feet: Optional[int]
+    has_balcony: bool
+    has_kitchenette: bool
+    has_jacuzzi: bool
+    amenities: Tuple[str, ...]
+    amenity_mask: int
+    room_type_display: str
+    description: str
+    
+    def to_response(self, availability_date: date, price: float, match_score: Optional[float] = None) -> RoomResponse:
+        """Render the room for an availability response without re-validating."""
+        return RoomResponse.model_construct(
+            room_id=self.room_number,
+            room_type=self.room_type_display,
+            price_per_night=price,
+            view_type=self.view_type.value,
+            amenities=list(self.amenities),
+            availability_date=availability_date,
+            description=self.description,
+            max_occupancy=self.max_occupancy,
+            square_feet=self.square_feet,
+            has_balcony=self.has_balcony,
+            has_kitchenette=self.has_kitchenette,
+            has_jacuzzi=self.has_jacuzzi,
+            match_score=match_score,
+        )
+
+
+def room_type_display(room_type: RoomType) -> str:
+    """Format a room type for display ("suite" -> "Suite")."""
+    return room_type.value.replace('_', ' ').title()
+
+
+def parse_amenities(raw: Optional[str]) -> Tuple[str, ...]:
+    """Split the comma-separated amenities column into a tuple."""
+    if not raw:
+        return ()
+    return tuple(a.strip() for a in raw.split(',') if a.strip())
+
+
+class RoomCatalog:
+    """Read-only collection of active rooms, ordered by room id."""
+    
+    __slots__ = ("version", "loaded_at", "rooms", "by_id", "by_type", "features")
+    
+    def __init__(self, version: int, rooms: Tuple[CatalogRoom, ...]):
+        self.version = version
+        self.loaded_at = time.monotonic()
+        self.rooms = rooms
+        self.by_id: Mapping[int, CatalogRoom] = MappingProxyType({r.id: r for r in rooms})
+        by_type: Dict[RoomType, Tuple[CatalogRoom, ...]] = {}
+        for room_type in RoomType:
+            members = tuple(r for r in rooms if r.room_type == room_type)
+            if members:
+                by_type[room_type] = members
+        self.by_type: Mapping[RoomType, Tuple[CatalogRoom, ...]] = MappingProxyType(by_type)
+        self.features = RoomFeatures.from_rooms(rooms)
+    
+    def __len__(self) -> int:
+        return len(self.rooms)
+    
+    @classmethod
+    def load(cls, db: Session, version: int) -> "RoomCatalog":
+        """Load active rooms with one column-only query (no ORM identity map)."""
+        rows = (
+            db.query(
+                Room.id, Room.room_number, Room.room_type, Room.view_type,
+                Room.base_price, Room.weekend_price, Room.max_occupancy,
+                Room.square_feet, Room.has_balcony, Room.has_kitchenette,
+                Room.has_jacuzzi, Room.amenities, Room.amenity_mask, Room.description,
+            )
+            .filter(Room.is_active == True)
+            .order_by(Room.id)
+            .all()
+        )
+        
+        rooms = []
+        for row in rows:
+            display = room_type_display(row.room_type)
+            rooms.append(CatalogRoom(
+                id=row.id,
+                room_number=str(row.room_number),
+                room_type=row.room_type,
+                view_type=row.view_type,
+                base_price=row.base_price,
+                weekend_price=row.weekend_price,
+                max_occupancy=row.max_occupancy,
+                square_feet=row.square_feet,
+                has_balcony=row.has_balcony,
+                has_kitchenette=row.has_kitchenette,
+                has_jacuzzi=row.has_jacuzzi,
+                amenities=parse_amenities(row.amenities),
+                amenity_mask=row.amenity_mask or 0,
+                room_type_display=display,
+                description=row.description or f"{display} with {row.view_type.value} view",
+            ))
+        return cls(version, tuple(rooms))
+
+
+# Bumped whenever a Room row is written in this process; snapshots built for an
+# older version are replaced on next access.
+_catalog_version = 0
+_version_lock = threading.Lock()
+
+_snapshots: "weakref.WeakKeyDictionary[Engine, RoomCatalog]" = weakref.WeakKeyDictionary()
+_load_lock = threading.Lock()
+
+
+def catalog_version() -> int:
+    """Current catalog version for this process."""
+    return _catalog_version
+
+
+def bump_catalog_version() -> int:
+    """Mark every loaded catalog as stale."""
+    global _catalog_version
+    with _version_lock:
+        _catalog_version += 1
+        return _catalog_version
+
+
+def get_room_catalog(db: Session) -> RoomCatalog:
+    """Return the catalog for the session's database (shared with its replica), reloading it if stale."""
+    engine = primary_engine(db.get_bind())
+    snapshot = _snapshots.get(engine)
+    if snapshot is not None and _is_fresh(snapshot):
+        return snapshot
+    
+    with _load_lock:
+        snapshot = _snapshots.get(engine)
+        if snapshot is None or not _is_fresh(snapshot):
+            with primary_session(db) as source:
+                snapshot = RoomCatalog.load(source, _catalog_version)
+            _snapshots[engine] = snapshot
+    return snapshot
+
+
+def _is_fresh(snapshot: RoomCatalog) -> bool:
+    if snapshot.version != _catalog_version:
+        return False
+    ttl = settings.catalog_ttl_seconds
+    return ttl <= 0 or time.monotonic() - snapshot.loaded_at < ttl
+
+
+def _has_room_writes(session: Session) -> bool:
+    return any(isinstance(obj, Room) for obj in (*session.new, *session.dirty, *session.deleted))
+
+
+@event.listens_for(Session, "before_flush")
+def _log_room_write(session: Session, flush_context, instances) -> None:
+    """Record room changes in the event log within the same transaction."""
+    if not session.info.get("catalog_changed") and _has_room_writes(session):
+        record_change(session, InventoryChange(kind=CATALOG_CHANGED))
+        session.info["catalog_changed"] = True
+
+
+@event.listens_for(Session, "after_flush")
+def _invalidate_on_room_write(session: Session, flush_context) -> None:
+    """Bump the catalog version when rooms are inserted, updated or deleted."""
+    if _has_room_writes(session):
+        bump_catalog_version()
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_room_write(session: Session) -> None:
+    """Tell other workers (through the change feed) that the catalog changed."""
+    if session.info.pop("catalog_changed", False):
+        get_invalidation_bus().publish(InventoryChange(kind=CATALOG_CHANGED, hotel_code=hotel_code_for(session.get_bind())))
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_room_write(session: Session) -> None:
+    session.info.pop("catalog_changed", None)
+
+
+def _on_inventory_change(change: InventoryChange) -> None:
+    # Our own writes already bumped the version during flush; the version is
+    # process-wide, so another hotel's room change reloads every catalog
+    if change.origin is not None and change.kind in (CATALOG_CHANGED, RESYNC):
+        bump_catalog_version()
+
+
+get_invalidation_bus().subscribe(_on_inventory_change)
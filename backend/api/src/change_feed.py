@@ -0,0 +1,244 @@
+"""Cross-worker delivery of inventory changes through a database change table.
+
+Writers record each change in ``inventory_events`` in the same transaction as
+the change itself (see :func:`record_change`), so the log holds exactly the
+committed changes in sequence order. Every worker polls the table for rows
+written by other workers and re-publishes them on its own invalidation bus so
+every cache sees every committed write. The table is in the application
+database, so this works the same on SQLite and PostgreSQL without extra
+infrastructure.
+
+Event ids come from a never-reused sequence, so a gap between the last id a
+worker applied and the next one it reads means an event is missing. Only on
+SQLite, where writers are serialized, is id order also commit order. On
+PostgreSQL a transaction can commit after one that took a later id, and a
+rolled-back insert leaves a hole for good. A worker therefore holds its
+cursor at a gap for ``CHANGE_FEED_GAP_GRACE_MS``, so an event that commits
+late is still applied in order. Only a gap that outlives the window counts
+as lost (pruned before the worker polled, a rollback or a failed append):
+the worker then publishes a ``RESYNC`` change and caches drop everything
+rather than serve stale data.
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, Optional
+
+from sqlalchemy import create_engine, delete, func, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import NullPool, StaticPool
+
+from .config import get_settings
+from .database import hotel_code_for, is_in_memory
+from .invalidation import (
+    RESYNC, WORKER_ID, InvalidationBus, InventoryChange, get_invalidation_bus
+)
+from .models import InventoryEvent
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+LATENCY_WINDOW = 1024
+
+
+def record_change(
+    db: Session, change: InventoryChange, origin: Optional[str] = None, waitlist_entry_id: Optional[int] = None
+) -> None:
+    """Add a change to the event log as part of the caller's transaction."""
+    db.add(InventoryEvent(
+        kind=change.kind,
+        room_ids=",".join(str(room_id) for room_id in change.room_ids),
+        start_date=change.start_date,
+        end_date=change.end_date,
+        origin=origin or WORKER_ID,
+        created_at=time.time(),
+        waitlist_entry_id=waitlist_entry_id,
+    ))
+
+
+class ChangeFeed:
+    """Apply other workers' changes from the change table to the local bus."""
+    
+    def __init__(
+        self,
+        engine: Engine,
+        worker_id: str = WORKER_ID,
+        bus: Optional[InvalidationBus] = None,
+        poll_interval: float = 0.1,
+        retention_seconds: float = 3600,
+        batch_size: int = 500,
+        gap_grace_seconds: float = 2.0,
+        hotel_code: Optional[str] = None,
+    ):
+        self.engine = engine
+        self.hotel_code = hotel_code or hotel_code_for(engine)
+        self.worker_id = worker_id
+        self.bus = bus or get_invalidation_bus()
+        self.poll_interval = poll_interval
+        self.retention_seconds = retention_seconds
+        self.batch_size = batch_size
+        self.gap_grace_seconds = gap_grace_seconds
+        self.last_seen_id: Optional[int] = None
+        self._gap_since: Optional[float] = None
+        self._latencies: Deque[float] = deque(maxlen=LATENCY_WINDOW)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._last_prune = 0.0
+        self._backlog = False
+        self.counters = {"received": 0, "missed": 0, "resyncs": 0, "polls": 0, "errors": 0}
+    
+    # Lifecycle
+    
+    def start(self, background: bool = True) -> None:
+        """Skip history and start polling."""
+        with self.engine.connect() as conn:
+            self.last_seen_id = conn.execute(select(func.max(InventoryEvent.id))).scalar() or 0
+        if background:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="change-feed", daemon=True)
+            self._thread.start()
+    
+    def stop(self) -> None:
+        """Stop polling."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+    
+    # Consuming
+    
+    def poll(self) -> int:
+        """Apply events written since the last poll; returns how many were applied."""
+        self.counters["polls"] += 1
+        with self.engine.connect() as conn:
+            rows = conn.execute(
+                select(InventoryEvent)
+                .where(InventoryEvent.id > self.last_seen_id)
+                .order_by(InventoryEvent.id)
+                .limit(self.batch_size)
+            ).all()
+        self._backlog = len(rows) == self.batch_size
+        
+        applied = 0
+        received_at = time.time()
+        for row in rows:
+            if row.id != self.last_seen_id + 1:
+                if not self._gap_outlived_grace(received_at):
+                    # The missing events may still commit; wait for them at the cursor
+                    self._backlog = False
+                    break
+                self._resync(row.id - self.last_seen_id - 1)
+            self._gap_since = None
+            self.last_seen_id = row.id
+            if row.origin == self.worker_id:
+                continue
+            
+            self._latencies.append(received_at - row.created_at)
+            self.counters["received"] += 1
+            self.bus.publish(InventoryChange(
+                kind=row.kind,
+                room_ids=tuple(int(room_id) for room_id in row.room_ids.split(",")) if row.room_ids else (),
+                start_date=row.start_date,
+                end_date=row.end_date,
+                origin=row.origin,
+                hotel_code=self.hotel_code,
+            ))
+            applied += 1
+        
+        if received_at - self._last_prune >= 60:
+            self.prune()
+        return applied
+    
+    def prune(self) -> int:
+        """Delete events older than the retention period."""
+        self._last_prune = time.time()
+        with self.engine.begin() as conn:
+            result = conn.execute(
+                delete(InventoryEvent).where(InventoryEvent.created_at < self._last_prune - self.retention_seconds)
+            )
+        return result.rowcount
+    
+    def stats(self) -> Dict:
+        """Delivery counters and latency percentiles (milliseconds)."""
+        latencies = sorted(self._latencies)
+        
+        def percentile(q: float) -> float:
+            if not latencies:
+                return 0.0
+            return round(latencies[round(q * (len(latencies) - 1))] * 1000, 2)
+        
+        return {
+            "worker_id": self.worker_id,
+            "last_seen_id": self.last_seen_id or 0,
+            **self.counters,
+            "latency_p50_ms": percentile(0.5),
+            "latency_p99_ms": percentile(0.99),
+            "latency_max_ms": round(latencies[-1] * 1000, 2) if latencies else 0.0,
+        }
+    
+    # Internals
+    
+    def _gap_outlived_grace(self, now: float) -> bool:
+        if self._gap_since is None:
+            self._gap_since = now
+        return now - self._gap_since >= self.gap_grace_seconds
+    
+    def _resync(self, missed: int) -> None:
+        self.counters["missed"] += missed
+        self.counters["resyncs"] += 1
+        logger.warning("Change feed missed %d event(s); resynchronizing caches", missed)
+        self.bus.publish(InventoryChange(kind=RESYNC, origin=self.worker_id, hotel_code=self.hotel_code))
+    
+    def _run(self) -> None:
+        while not self._stop.wait(self.poll_interval):
+            try:
+                # Drain a backlog without waiting between batches
+                self.poll()
+                while self._backlog:
+                    self.poll()
+            except Exception:
+                self.counters["errors"] += 1
+                logger.exception("Change feed poll failed")
+
+
+# Feeds for the hotel partitions' databases, started with the app
+_feeds: Dict[str, ChangeFeed] = {}
+
+
+def start_change_feed(engine: Engine) -> Optional[ChangeFeed]:
+    """Start the change feed for ``engine``'s database (None for in-memory SQLite)."""
+    if is_in_memory(engine):
+        # Only this process can see an in-memory database
+        return None
+    key = engine.url.render_as_string(hide_password=False)
+    hotel_code = hotel_code_for(engine)
+    if isinstance(engine.pool, StaticPool):
+        # The poller must not share (and reset) the request handlers' single connection
+        engine = create_engine(engine.url, connect_args={"check_same_thread": False}, poolclass=NullPool)
+    feed = _feeds.get(key)
+    if feed is None:
+        feed = ChangeFeed(
+            engine,
+            poll_interval=settings.change_feed_poll_ms / 1000,
+            retention_seconds=settings.change_feed_retention_seconds,
+            gap_grace_seconds=settings.change_feed_gap_grace_ms / 1000,
+            hotel_code=hotel_code,
+        )
+        feed.start()
+        _feeds[key] = feed
+    return feed
+
+
+def stop_change_feed() -> None:
+    """Stop every change feed."""
+    for feed in list(_feeds.values()):
+        feed.stop()
+    _feeds.clear()
+
+
+def get_change_feed() -> Optional[ChangeFeed]:
+    """The application database's change feed (the first started), if any."""
+    return next(iter(_feeds.values()), None)
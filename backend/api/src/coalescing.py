@@ -0,0 +1,111 @@
+"""Single-flight coalescing of identical concurrent requests.
+
+A burst of guests asking about the same dates produces many identical
+availability searches at once. The first request for a key runs the
+computation; requests with the same key that arrive while it is in flight
+await the same result instead of running their own.
+
+Once started, a computation belongs to the group, not to the request that
+started it: that request disconnecting does not cancel the search for the
+requests that joined it.
+"""
+
+import asyncio
+from functools import partial
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from .schemas import AvailabilityRequest
+
+
+class SingleFlight:
+    """Deduplicate concurrent awaitables by key (one event loop per instance)."""
+    
+    def __init__(self):
+        self._in_flight: Dict[Hashable, asyncio.Future] = {}
+        self.requests = 0
+        self.executions = 0
+        self.coalesced = 0
+    
+    async def do(self, key: Hashable, compute: Callable[[], Awaitable[Any]]) -> Any:
+        """Return the result for ``key``, joining an in-flight computation if there is one.
+        
+        The computation runs in a task owned by the group rather than by the
+        request that started it, so any caller (the first one included) can
+        disconnect without cancelling it for the others. If the task itself is
+        cancelled, its waiters start over.
+        """
+        self.requests += 1
+        joined = False
+        while True:
+            task = self._in_flight.get(key)
+            if task is None:
+                self.executions += 1
+                task = asyncio.ensure_future(compute())
+                self._in_flight[key] = task
+                task.add_done_callback(partial(self._finished, key))
+            elif not joined:
+                joined = True
+                self.coalesced += 1
+            try:
+                return await asyncio.shield(task)
+            except asyncio.CancelledError:
+                if not task.cancelled():
+                    # This caller was cancelled; the computation goes on for the others
+                    raise
+    
+    def _finished(self, key: Hashable, task: asyncio.Future) -> None:
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        if not task.cancelled():
+            # Mark retrieved so an error nobody is waiting for any more is not logged as lost
+            task.exception()
+    
+    @property
+    def in_flight(self) -> int:
+        """Number of computations currently running."""
+        return len(self._in_flight)
+    
+    @property
+    def coalescing_ratio(self) -> float:
+        """Share of requests served by another request's computation."""
+        return self.coalesced / self.requests if self.requests else 0.0
+    
+    def stats(self) -> Dict[str, float]:
+        """Counters for the metrics endpoint."""
+        return {
+            "requests": self.requests,
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "in_flight": self.in_flight,
+            "coalescing_ratio": round(self.coalescing_ratio, 4),
+        }
+    
+    def reset(self) -> None:
+        """Zero the counters (in-flight computations are unaffected)."""
+        self.requests = self.executions = self.coalesced = 0
+
+
+def availability_key(request: AvailabilityRequest, partition: Optional[str] = None) -> Tuple:
+    """Normalized key: requests that must produce the same response share it."""
+    view = request.view_preference.strip().lower() if request.view_preference else None
+    return (
+        partition,
+        request.check_in_date,
+        request.room_count,
+        request.max_budget,
+        view or None,
+        tuple(sorted(request.amenities or ())),
+        request.guest_count,
+        request.nights,
+        " ".join(request.special_requests.lower().split()) if request.special_requests else None,
+        request.sort_by,
+    )
+
+
+# Global instance for availability searches
+availability_flight = SingleFlight()
+
+
+def get_availability_flight() -> SingleFlight:
+    """Get the process-wide availability single-flight group."""
+    return availability_flight
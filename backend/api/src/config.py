@@ -3,26 +3,40 @@
 import os
 from typing import List
 
-from pydantic import Field
+from pydantic import Field, validator
 from pydantic_settings import BaseSettings
 
+STARTUP_MODES = ("development", "production")
+
 
 class Settings(BaseSettings):
     """Application settings loaded from environment variables."""
     
     # Database Configuration
     database_url: str = Field("sqlite:///./staydesk.db", env="DATABASE_URL")
+    database_read_url: str = Field("", env="DATABASE_READ_URL")
     
     # API Configuration
     api_host: str = Field("0.0.0.0", env="API_HOST")
     api_port: int = Field(8000, env="API_PORT")
     api_reload: bool = Field(True, env="API_RELOAD")
     
+    # Startup ("development" creates tables and sample data on boot, "production" skips both:
+    # run ``python -m src.utils.setup_database`` as a deploy step instead)
+    startup_mode: str = Field("development", env="STARTUP_MODE")
+    startup_prewarm: bool = Field(False, env="STARTUP_PREWARM")
+    
     # Hotel Configuration
+    hotel_code: str = Field("staydesk", env="HOTEL_CODE")
     hotel_name: str = Field("Staydesk Resort", env="HOTEL_NAME")
     hotel_location: str = Field("Miami Beach, FL", env="HOTEL_LOCATION")
     hotel_timezone: str = Field("America/New_York", env="HOTEL_TIMEZONE")
     
+    # Multi-Property
+    hotel_partitions: str = Field("", env="HOTEL_PARTITIONS")
+    hotel_read_partitions: str = Field("", env="HOTEL_READ_PARTITIONS")
+    property_search_timeout_ms: int = Field(5000, env="PROPERTY_SEARCH_TIMEOUT_MS")
+    
     # NLP Service Integration
     nlp_service_url: str = Field("http://nlp-service:8001", env="NLP_SERVICE_URL")
     nlp_timeout: int = Field(30, env="NLP_TIMEOUT")
@@ -47,6 +61,51 @@ class Settings(BaseSettings):
     max_advance_booking_days: int = Field(365, env="MAX_ADVANCE_BOOKING_DAYS")
     max_rooms_per_booking: int = Field(10, env="MAX_ROOMS_PER_BOOKING")
     cancellation_hours: int = Field(24, env="CANCELLATION_HOURS")
+    hold_ttl_minutes: int = Field(30, env="HOLD_TTL_MINUTES")
+    
+    # Caching
+    catalog_ttl_seconds: int = Field(300, env="CATALOG_TTL_SECONDS")
+    
+    # Dynamic Pricing ("static" or "dynamic")
+    pricing_mode: str = Field("static", env="PRICING_MODE")
+    pricing_horizon_days: int = Field(365, env="PRICING_HORIZON_DAYS")
+    pricing_occupancy_tiers: str = Field("0:0.9,0.5:1.0,0.75:1.15,0.9:1.3", env="PRICING_OCCUPANCY_TIERS")
+    pricing_lead_time_tiers: str = Field("0:1.1,3:1.0,60:0.95", env="PRICING_LEAD_TIME_TIERS")
+    pricing_weekday_multipliers: str = Field("1.0,1.0,1.0,1.0,1.05,1.1,1.0", env="PRICING_WEEKDAY_MULTIPLIERS")
+    pricing_min_multiplier: float = Field(0.7, env="PRICING_MIN_MULTIPLIER")
+    pricing_max_multiplier: float = Field(2.0, env="PRICING_MAX_MULTIPLIER")
+    
+    # Concurrency
+    availability_coalescing: bool = Field(True, env="AVAILABILITY_COALESCING")
+    
+    # Cross-Worker Change Feed
+    change_feed: bool = Field(True, env="CHANGE_FEED")
+    change_feed_poll_ms: int = Field(100, env="CHANGE_FEED_POLL_MS")
+    change_feed_retention_seconds: int = Field(3600, env="CHANGE_FEED_RETENTION_SECONDS")
+    change_feed_gap_grace_ms: int = Field(2000, env="CHANGE_FEED_GAP_GRACE_MS")
+    
+    # Shared Inventory Snapshot
+    inventory_snapshot: bool = Field(False, env="INVENTORY_SNAPSHOT")
+    inventory_snapshot_path: str = Field("./inventory.snap", env="INVENTORY_SNAPSHOT_PATH")
+    inventory_snapshot_days: int = Field(365, env="INVENTORY_SNAPSHOT_DAYS")
+    
+    # Admission Control
+    admission_control: bool = Field(True, env="ADMISSION_CONTROL")
+    admission_max_concurrency: int = Field(32, env="ADMISSION_MAX_CONCURRENCY")
+    admission_booking_concurrency: int = Field(16, env="ADMISSION_BOOKING_CONCURRENCY")
+    admission_booking_queue: int = Field(128, env="ADMISSION_BOOKING_QUEUE")
+    admission_booking_timeout_ms: int = Field(5000, env="ADMISSION_BOOKING_TIMEOUT_MS")
+    admission_standard_concurrency: int = Field(24, env="ADMISSION_STANDARD_CONCURRENCY")
+    admission_standard_queue: int = Field(256, env="ADMISSION_STANDARD_QUEUE")
+    admission_standard_timeout_ms: int = Field(2000, env="ADMISSION_STANDARD_TIMEOUT_MS")
+    
+    @validator('startup_mode')
+    def validate_startup_mode(cls, v):
+        """Reject unknown startup modes rather than starting as development."""
+        mode = v.strip().lower()
+        if mode not in STARTUP_MODES:
+            raise ValueError(f"STARTUP_MODE must be one of: {', '.join(STARTUP_MODES)}")
+        return mode
     
     @property
     def cors_origins_list(self) -> List[str]:
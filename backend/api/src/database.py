@@ -1,51 +1,258 @@
-"""Database configuration and session management."""
+"""Database configuration and session management.
 
+Each hotel property is a partition with its own database. The application
+database (``DATABASE_URL``) is the partition of ``HOTEL_CODE``; the others come
+from ``HOTEL_PARTITIONS``. Requests pick a partition with the ``X-Hotel-Code``
+header, so every query, cache and change feed only ever sees one property.
+
+A partition may also have a read replica (``DATABASE_READ_URL``,
+``HOTEL_READ_PARTITIONS``); read-only endpoints use it through
+``replicas.get_read_db``, everything else writes to the primary.
+"""
+
+import threading
+import weakref
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+from fastapi import Header, HTTPException
 from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import NullPool, StaticPool
 
 from .config import get_settings
 
 settings = get_settings()
 
-# Create database engine
-if settings.database_url.startswith("sqlite"):
-    # SQLite configuration for development
-    engine = create_engine(
-        settings.database_url,
-        connect_args={"check_same_thread": False},
-        poolclass=StaticPool,
-        echo=settings.log_level == "DEBUG"
-    )
-else:
+
+def create_database_engine(database_url: str) -> Engine:
+    """Engine for a database URL."""
+    if database_url.startswith("sqlite"):
+        # SQLite configuration for development
+        return create_engine(
+            database_url,
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+            echo=settings.log_level == "DEBUG"
+        )
     # PostgreSQL configuration for production
-    engine = create_engine(
-        settings.database_url,
+    return create_engine(
+        database_url,
         echo=settings.log_level == "DEBUG"
     )
 
+
+# Create database engine
+engine = create_database_engine(settings.database_url)
+
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 # Create declarative base
 Base = declarative_base()
 
+# Hotel partitions: hotel code -> session factory, and engine -> hotel code
+_partitions: Dict[str, sessionmaker] = {}
+_engine_hotels: "weakref.WeakKeyDictionary[Engine, str]" = weakref.WeakKeyDictionary()
+_partitions_lock = threading.Lock()
+
+# Read replicas: primary engine -> replica session factory, and replica engine -> primary engine
+_replicas: "weakref.WeakKeyDictionary[Engine, sessionmaker]" = weakref.WeakKeyDictionary()
+_replica_engines: "weakref.WeakKeyDictionary[Engine, Engine]" = weakref.WeakKeyDictionary()
+
+# Own-connection engines for StaticPool databases: engine -> NullPool engine on the same file
+_thread_engines: "weakref.WeakKeyDictionary[Engine, Engine]" = weakref.WeakKeyDictionary()
+
+
+def parse_partitions(spec: str) -> Dict[str, str]:
+    """Parse ``code=database_url,...`` into hotel code -> database URL."""
+    partitions = {}
+    for item in spec.split(","):
+        if not item.strip():
+            continue
+        code, _, database_url = item.partition("=")
+        if not code.strip() or not database_url.strip():
+            raise ValueError(f"Invalid hotel partition: {item.strip()}")
+        partitions[code.strip().lower()] = database_url.strip()
+    return partitions
+
+
+def register_partition(
+    hotel_code: str, partition_engine: Engine, read_engine: Optional[Engine] = None
+) -> sessionmaker:
+    """Route ``hotel_code`` to a database; rows written through it are stamped with the code.
+    
+    Read-only endpoints use ``read_engine`` when given.
+    """
+    hotel_code = hotel_code.lower()
+    factory = sessionmaker(autocommit=False, autoflush=False, bind=partition_engine)
+    with _partitions_lock:
+        _partitions[hotel_code] = factory
+        _engine_hotels[partition_engine] = hotel_code
+        if read_engine is not None:
+            _replicas[partition_engine] = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+            _replica_engines[read_engine] = partition_engine
+            _engine_hotels[read_engine] = hotel_code
+    return factory
+
+
+def unregister_partition(hotel_code: str) -> None:
+    """Stop routing ``hotel_code`` (the application database cannot be removed)."""
+    hotel_code = hotel_code.lower()
+    if hotel_code == settings.hotel_code.lower():
+        raise ValueError("The application database partition cannot be removed")
+    with _partitions_lock:
+        factory = _partitions.pop(hotel_code, None)
+        if factory is not None:
+            _engine_hotels.pop(factory.kw["bind"], None)
+            replica = _replicas.pop(factory.kw["bind"], None)
+            if replica is not None:
+                _engine_hotels.pop(replica.kw["bind"], None)
+                _replica_engines.pop(replica.kw["bind"], None)
+
+
+def partition_codes() -> List[str]:
+    """Codes of every routed hotel, the application database's first."""
+    with _partitions_lock:
+        return list(_partitions)
+
+
+def get_partition(hotel_code: str) -> sessionmaker:
+    """Session factory for a hotel's database."""
+    factory = _partitions.get(hotel_code.lower())
+    if factory is None:
+        raise ValueError(f"Hotel {hotel_code} not found")
+    return factory
+
+
+def get_read_partition(hotel_code: str) -> sessionmaker:
+    """Session factory for reading a hotel's data: its replica, or the primary without one."""
+    factory = get_partition(hotel_code)
+    return _replicas.get(factory.kw["bind"]) or factory
+
+
+def partition_engines() -> Dict[str, Engine]:
+    """Engine of every routed hotel."""
+    with _partitions_lock:
+        return {code: factory.kw["bind"] for code, factory in _partitions.items()}
+
+
+def get_replica(bind: Optional[Engine]) -> Optional[sessionmaker]:
+    """Replica session factory for a primary engine, if it has one."""
+    return _replicas.get(bind) if bind is not None else None
+
+
+def primary_engine(bind: Engine) -> Engine:
+    """The engine to write through for ``bind``'s data: its primary if ``bind`` is a replica."""
+    return _replica_engines.get(bind, bind)
+
+
+def hotel_code_for(bind: Optional[Engine]) -> str:
+    """Hotel whose partition ``bind`` is (unregistered databases belong to ``HOTEL_CODE``)."""
+    hotel_code = _engine_hotels.get(bind) if bind is not None else None
+    return hotel_code or settings.hotel_code.lower()
+
+
+def partition_key(bind: Optional[Engine]) -> str:
+    """The hotel, plus whether ``bind`` is its replica (which may lag the primary)."""
+    hotel_code = hotel_code_for(bind)
+    return f"{hotel_code}/replica" if bind is not None and bind in _replica_engines else hotel_code
+
+
+_read_urls = parse_partitions(settings.hotel_read_partitions)
+register_partition(
+    settings.hotel_code, engine,
+    create_database_engine(settings.database_read_url) if settings.database_read_url else None
+)
+for _code, _database_url in parse_partitions(settings.hotel_partitions).items():
+    if _code != settings.hotel_code.lower():
+        register_partition(
+            _code, create_database_engine(_database_url),
+            create_database_engine(_read_urls[_code]) if _code in _read_urls else None
+        )
+
+
+def is_in_memory(bind: Engine) -> bool:
+    """Whether ``bind`` is an in-memory SQLite database (one connection, this process only)."""
+    return bind.dialect.name == "sqlite" and bind.url.database in (None, "", ":memory:")
+
+
+def get_thread_session(bind: Engine) -> Optional[Session]:
+    """New session for work on a worker thread, on its own connection (None if it cannot have one).
+    
+    A StaticPool engine hands every session the same connection, so a session
+    used from a worker thread would interleave with the event loop's sessions.
+    Such sessions query through a NullPool engine on the same file instead,
+    while ``get_bind()`` still returns ``bind``, so per-database caches and
+    partition routing are unchanged. An in-memory database has no second
+    connection.
+    """
+    if not isinstance(bind.pool, StaticPool):
+        return Session(bind=bind, autoflush=False)
+    if is_in_memory(bind):
+        return None
+    thread_engine = _thread_engines.get(bind)
+    if thread_engine is None:
+        with _partitions_lock:
+            thread_engine = _thread_engines.get(bind)
+            if thread_engine is None:
+                thread_engine = create_engine(bind.url, connect_args={"check_same_thread": False}, poolclass=NullPool)
+                # Rows written through it belong to the same hotel
+                _engine_hotels[thread_engine] = hotel_code_for(bind)
+                if bind in _replica_engines:
+                    _replica_engines[thread_engine] = _replica_engines[bind]
+                _thread_engines[bind] = thread_engine
+    return Session(bind=bind, binds={Base: thread_engine}, autoflush=False)
+
+
+@contextmanager
+def primary_session(db: Session) -> Iterator[Session]:
+    """``db`` itself, or a session of its own on the primary when ``db`` reads a replica.
+    
+    Caches a hotel's primary and replica share load through it: the replica
+    may not have applied the change that invalidated them yet.
+    """
+    bind = db.get_bind()
+    primary = primary_engine(bind)
+    if primary is bind:
+        yield db
+        return
+    session = get_thread_session(primary)
+    if session is None:
+        session = Session(bind=primary)
+    with session:
+        yield session
+
 
-def get_db() -> Session:
-    """Get database session."""
-    db = SessionLocal()
+def get_db(x_hotel_code: Optional[str] = Header(None, description="Hotel to route to (defaults to HOTEL_CODE)")) -> Session:
+    """Get database session for the requested hotel's partition."""
+    factory = SessionLocal
+    if isinstance(x_hotel_code, str) and x_hotel_code.strip():
+        try:
+            factory = get_partition(x_hotel_code.strip())
+        except ValueError as e:
+            raise HTTPException(
+                status_code=404,
+                detail={
+                    "error": "Not found",
+                    "details": str(e)
+                }
+            )
+    db = factory()
     try:
         yield db
     finally:
         db.close()
 
 
-def create_tables():
-    """Create all database tables."""
-    Base.metadata.create_all(bind=engine)
+def create_tables(bind: Optional[Engine] = None):
+    """Create all database tables (in every partition unless ``bind`` is given)."""
+    for partition_engine in ([bind] if bind is not None else partition_engines().values()):
+        Base.metadata.create_all(bind=partition_engine)
 
 
 def drop_tables():
     """Drop all database tables."""
-    Base.metadata.drop_all(bind=engine) 
\ No newline at end of file
+    Base.metadata.drop_all(bind=engine) 
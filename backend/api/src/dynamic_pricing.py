@@ -0,0 +1,253 @@
+"""Occupancy-driven dynamic pricing backed by a precomputed factor cache.
+
+In dynamic mode the nightly rate is the static rate (weekend or base price)
+times a factor that depends on the room type's occupancy for that date, the
+lead time and the day of week. Factors are precomputed for every
+(room_type, date) in the pricing horizon; bookings only recompute the dates
+they touch, and search merely looks factors up.
+"""
+
+import threading
+import weakref
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+from sqlalchemy import and_
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from .catalog import get_room_catalog
+from .config import Settings, get_settings
+from .database import hotel_code_for, primary_engine, primary_session
+from .invalidation import OCCUPANCY_KINDS, InventoryChange, get_invalidation_bus
+from .models import Booking, BookingStatus, RoomType
+
+settings = get_settings()
+
+ACTIVE_BOOKING_STATUSES = (BookingStatus.CONFIRMED, BookingStatus.PENDING)
+
+
+def _parse_tiers(raw: str) -> Tuple[np.ndarray, np.ndarray]:
+    """Parse "threshold:multiplier,..." into sorted threshold and multiplier arrays."""
+    pairs = sorted(
+        (float(threshold), float(multiplier))
+        for threshold, multiplier in (item.split(":") for item in raw.split(",") if item.strip())
+    )
+    if not pairs:
+        return np.array([0.0]), np.array([1.0])
+    thresholds, multipliers = zip(*pairs)
+    return np.array(thresholds), np.array(multipliers)
+
+
+@dataclass(frozen=True)
+class PricingRules:
+    """Configurable factor = occupancy tier x lead-time tier x day-of-week, clamped."""
+    
+    occupancy_thresholds: np.ndarray
+    occupancy_multipliers: np.ndarray
+    lead_time_thresholds: np.ndarray
+    lead_time_multipliers: np.ndarray
+    weekday_multipliers: np.ndarray
+    min_multiplier: float
+    max_multiplier: float
+    
+    @classmethod
+    def from_settings(cls, config: Settings) -> "PricingRules":
+        """Build rules from the PRICING_* settings."""
+        occ_t, occ_m = _parse_tiers(config.pricing_occupancy_tiers)
+        lead_t, lead_m = _parse_tiers(config.pricing_lead_time_tiers)
+        weekdays = [float(v) for v in config.pricing_weekday_multipliers.split(",")]
+        if len(weekdays) != 7:
+            raise ValueError("PRICING_WEEKDAY_MULTIPLIERS needs 7 values (Monday first)")
+        return cls(
+            occupancy_thresholds=occ_t,
+            occupancy_multipliers=occ_m,
+            lead_time_thresholds=lead_t,
+            lead_time_multipliers=lead_m,
+            weekday_multipliers=np.array(weekdays),
+            min_multiplier=config.pricing_min_multiplier,
+            max_multiplier=config.pricing_max_multiplier,
+        )
+    
+    @staticmethod
+    def _tier(values: np.ndarray, thresholds: np.ndarray, multipliers: np.ndarray) -> np.ndarray:
+        # Highest threshold <= value; values below the first threshold use the first tier
+        index = np.searchsorted(thresholds, values, side="right") - 1
+        return multipliers[np.clip(index, 0, len(multipliers) - 1)]
+    
+    def factors(self, occupancy: np.ndarray, lead_days: np.ndarray, weekdays: np.ndarray) -> np.ndarray:
+        """Vectorized factors for aligned occupancy (0-1), lead time (days) and weekday arrays."""
+        factor = (
+            self._tier(occupancy, self.occupancy_thresholds, self.occupancy_multipliers)
+            * self._tier(lead_days, self.lead_time_thresholds, self.lead_time_multipliers)
+            * self.weekday_multipliers[weekdays]
+        )
+        return np.clip(factor, self.min_multiplier, self.max_multiplier)
+
+
+class PriceCache:
+    """Precomputed price factors per (room_type, date) over the pricing horizon."""
+    
+    def __init__(self, rules: PricingRules, horizon_days: int):
+        self.rules = rules
+        self.horizon_days = horizon_days
+        self.as_of: Optional[date] = None
+        self.catalog_version: Optional[int] = None
+        self.room_counts: Dict[RoomType, int] = {}
+        self.occupied: Dict[RoomType, np.ndarray] = {}
+        self.factors: Dict[RoomType, np.ndarray] = {}
+        self._dirty: List[Tuple[Tuple[int, ...], Optional[date], Optional[date]]] = []
+        self._full_rebuild = True
+        self._lock = threading.Lock()
+        self.stats = {"full_rebuilds": 0, "partial_refreshes": 0, "dates_recomputed": 0}
+    
+    # Invalidation
+    
+    def invalidate(self, change: InventoryChange) -> None:
+        """Queue the dates touched by a change for recomputation."""
+        with self._lock:
+            if change.start_date is None or change.end_date is None:
+                self._full_rebuild = True
+            else:
+                self._dirty.append((change.room_ids, change.start_date, change.end_date))
+    
+    def ensure_current(self, db: Session) -> None:
+        """Apply pending recomputation; rebuild on day rollover or catalog change."""
+        catalog = get_room_catalog(db)
+        with self._lock:
+            if (
+                self._full_rebuild
+                or self.as_of != date.today()
+                or self.catalog_version != catalog.version
+            ):
+                self._rebuild(db)
+                return
+            dirty, self._dirty = self._dirty, []
+            for room_ids, start, end in dirty:
+                types = {catalog.by_id[r].room_type for r in room_ids if r in catalog.by_id}
+                self._refresh(db, types or set(self.room_counts), start, end)
+    
+    # Lookups (no rule evaluation)
+    
+    def factor(self, room_type: RoomType, night: date) -> float:
+        """Factor for one room type and night (1.0 outside the horizon)."""
+        offset = (night - self.as_of).days
+        factors = self.factors.get(room_type)
+        if factors is None or offset < 0 or offset >= self.horizon_days:
+            return 1.0
+        return float(factors[offset])
+    
+    def factor_matrix(self, room_types: Sequence[RoomType], dates: Sequence[date]) -> np.ndarray:
+        """Factors for (rooms x nights) by gathering precomputed rows."""
+        offsets = np.array([(d - self.as_of).days for d in dates], dtype=np.int64)
+        in_range = (offsets >= 0) & (offsets < self.horizon_days)
+        clipped = np.clip(offsets, 0, self.horizon_days - 1)
+        ones = np.ones(len(dates))
+        rows = [
+            np.where(in_range, self.factors[rt][clipped], 1.0) if rt in self.factors else ones
+            for rt in room_types
+        ]
+        return np.vstack(rows) if rows else np.empty((0, len(dates)))
+    
+    # Computation
+    
+    def _rebuild(self, db: Session) -> None:
+        catalog = get_room_catalog(db)
+        self.as_of = date.today()
+        self.catalog_version = catalog.version
+        self.room_counts = {rt: len(rooms) for rt, rooms in catalog.by_type.items()}
+        self.occupied = {rt: np.zeros(self.horizon_days) for rt in self.room_counts}
+        self._count_bookings(db, set(self.room_counts), 0, self.horizon_days)
+        self.factors = {rt: np.ones(self.horizon_days) for rt in self.room_counts}
+        for room_type in self.room_counts:
+            self._recompute(room_type, 0, self.horizon_days)
+        self._dirty = []
+        self._full_rebuild = False
+        self.stats["full_rebuilds"] += 1
+    
+    def _refresh(self, db: Session, room_types: Set[RoomType], start: date, end: date) -> None:
+        lo = max((start - self.as_of).days, 0)
+        hi = min((end - self.as_of).days, self.horizon_days)
+        if lo >= hi:
+            return
+        room_types = {rt for rt in room_types if rt in self.occupied}
+        for room_type in room_types:
+            self.occupied[room_type][lo:hi] = 0
+        self._count_bookings(db, room_types, lo, hi)
+        for room_type in room_types:
+            self._recompute(room_type, lo, hi)
+        self.stats["partial_refreshes"] += 1
+        self.stats["dates_recomputed"] += (hi - lo) * len(room_types)
+    
+    def _count_bookings(self, db: Session, room_types: Set[RoomType], lo: int, hi: int) -> None:
+        """Add occupied room-nights in offsets [lo, hi) for the given types (one query)."""
+        catalog = get_room_catalog(db)
+        start = self.as_of + timedelta(days=lo)
+        end = self.as_of + timedelta(days=hi)
+        rows = (
+            db.query(Booking.room_id, Booking.check_in_date, Booking.check_out_date)
+            .filter(
+                and_(
+                    Booking.check_in_date < end,
+                    Booking.check_out_date > start,
+                    Booking.status.in_(ACTIVE_BOOKING_STATUSES),
+                )
+            )
+            .all()
+        )
+        for row in rows:
+            room = catalog.by_id.get(row.room_id)
+            if room is None or room.room_type not in room_types:
+                continue
+            first = max((row.check_in_date - self.as_of).days, lo)
+            last = min((row.check_out_date - self.as_of).days, hi)
+            self.occupied[room.room_type][first:last] += 1
+    
+    def _recompute(self, room_type: RoomType, lo: int, hi: int) -> None:
+        offsets = np.arange(lo, hi)
+        weekdays = (self.as_of.weekday() + offsets) % 7
+        occupancy = self.occupied[room_type][lo:hi] / max(self.room_counts[room_type], 1)
+        self.factors[room_type][lo:hi] = self.rules.factors(occupancy, offsets, weekdays)
+
+
+_caches: "weakref.WeakKeyDictionary[Engine, PriceCache]" = weakref.WeakKeyDictionary()
+_caches_lock = threading.Lock()
+
+
+def dynamic_pricing_enabled() -> bool:
+    """Whether nightly rates are adjusted by the dynamic pricing factors."""
+    return settings.pricing_mode == "dynamic"
+
+
+def get_price_cache(db: Session) -> Optional[PriceCache]:
+    """Current price cache for the session's database, or None in static mode."""
+    if not dynamic_pricing_enabled():
+        return None
+    # Replica reads share the primary's factors, computed from the primary's occupancy
+    engine = primary_engine(db.get_bind())
+    cache = _caches.get(engine)
+    if cache is None:
+        with _caches_lock:
+            cache = _caches.get(engine)
+            if cache is None:
+                cache = PriceCache(
+                    PricingRules.from_settings(settings), settings.pricing_horizon_days
+                )
+                _caches[engine] = cache
+    with primary_session(db) as source:
+        cache.ensure_current(source)
+    return cache
+
+
+def _on_inventory_change(change: InventoryChange) -> None:
+    # Factors depend on occupancy only; overrides are applied on top of them
+    if change.kind not in OCCUPANCY_KINDS:
+        return
+    for engine, cache in list(_caches.items()):
+        if change.concerns(hotel_code_for(engine)):
+            cache.invalidate(change)
+
+
+get_invalidation_bus().subscribe(_on_inventory_change)
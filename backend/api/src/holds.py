@@ -0,0 +1,213 @@
+"""Bulk expiry of time-limited inventory holds.
+
+A hold keeps a room's nights off sale between emailing a guest a booking
+link and the guest booking. Search and quotes treat unexpired holds like
+bookings, so correctness never depends on expiry having run. Expiry exists
+to reopen the nights everywhere else: each worker keeps the deadlines of
+the holds it knows about in a min-heap, and once the earliest one has
+passed, every expired hold is deleted in one statement and a
+``hold_released`` change is recorded and published for each, so caches,
+the snapshot and the event log catch up. Checking for due holds is a peek
+at the top of the heap; the holds table is never scanned.
+"""
+
+import heapq
+import logging
+import threading
+import time
+import weakref
+from typing import List, Optional, Tuple
+
+from sqlalchemy import create_engine, delete, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import NullPool, StaticPool
+
+from .change_feed import record_change
+from .database import hotel_code_for, is_in_memory, primary_engine
+from .invalidation import HOLD_CREATED, HOLD_RELEASED, InventoryChange, get_invalidation_bus
+from .models import InventoryHold
+
+logger = logging.getLogger(__name__)
+
+
+class HoldExpiry:
+    """Min-heap of hold deadlines for one database."""
+    
+    def __init__(self, engine: Engine, max_sleep: float = 30.0, hotel_code: Optional[str] = None):
+        self.engine = engine
+        self.hotel_code = hotel_code or hotel_code_for(engine)
+        self.max_sleep = max_sleep
+        self._heap: List[Tuple[float, int]] = []
+        self._loaded = False
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.stats = {"scheduled": 0, "sweeps": 0, "expired": 0}
+    
+    # Scheduling
+    
+    def schedule(self, hold_id: int, expires_at: float) -> None:
+        """Track a committed hold's deadline."""
+        with self._lock:
+            heapq.heappush(self._heap, (expires_at, hold_id))
+            self.stats["scheduled"] += 1
+            earliest = self._heap[0][1] == hold_id
+        if earliest:
+            self._wake.set()
+    
+    def mark_stale(self) -> None:
+        """Reload deadlines from the database before the next check (another worker added holds)."""
+        with self._lock:
+            self._loaded = False
+        self._wake.set()
+    
+    def next_deadline(self) -> Optional[float]:
+        """Earliest tracked deadline, if any."""
+        with self._lock:
+            if not self._loaded:
+                self._load()
+            return self._heap[0][0] if self._heap else None
+    
+    # Expiry
+    
+    def expire_due(self, now: Optional[float] = None) -> int:
+        """Release every expired hold if a tracked deadline has passed; returns how many."""
+        now = time.time() if now is None else now
+        with self._lock:
+            if not self._loaded:
+                self._load()
+            if not self._heap or self._heap[0][0] > now:
+                return 0
+            # Converted and already-swept holds are popped here too; the sweep ignores them
+            while self._heap and self._heap[0][0] <= now:
+                heapq.heappop(self._heap)
+        return self._sweep(now)
+    
+    def start(self) -> None:
+        """Expire holds on time in a background thread."""
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="hold-expiry", daemon=True)
+        self._thread.start()
+    
+    def stop(self) -> None:
+        """Stop the background thread."""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+    
+    # Internals
+    
+    def _load(self) -> None:
+        with self.engine.connect() as conn:
+            rows = conn.execute(select(InventoryHold.expires_at, InventoryHold.id)).all()
+        self._heap = [tuple(row) for row in rows]
+        heapq.heapify(self._heap)
+        self._loaded = True
+    
+    def _sweep(self, now: float) -> int:
+        session = Session(bind=self.engine)
+        try:
+            # RETURNING makes concurrent sweeps by several workers release each hold once
+            rows = session.execute(
+                delete(InventoryHold)
+                .where(InventoryHold.expires_at <= now)
+                .returning(InventoryHold.room_id, InventoryHold.check_in_date, InventoryHold.check_out_date)
+            ).all()
+            changes = [
+                InventoryChange(HOLD_RELEASED, (row.room_id,), row.check_in_date, row.check_out_date)
+                for row in rows
+            ]
+            for change in changes:
+                record_change(session, change)
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+        
+        self.stats["sweeps"] += 1
+        self.stats["expired"] += len(changes)
+        bus = get_invalidation_bus()
+        for change in changes:
+            bus.publish(change.in_hotel(self.hotel_code))
+        return len(changes)
+    
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                deadline = self.next_deadline()
+            except Exception:
+                logger.exception("Loading hold deadlines failed")
+                deadline = None
+            timeout = self.max_sleep if deadline is None else min(max(deadline - time.time(), 0), self.max_sleep)
+            if self._wake.wait(timeout):
+                # An earlier deadline was scheduled (or we are stopping)
+                self._wake.clear()
+                continue
+            try:
+                self.expire_due()
+            except Exception:
+                logger.exception("Hold expiry sweep failed")
+
+
+# Per-engine expiry heaps (tests use several in-memory databases)
+_expiries: "weakref.WeakKeyDictionary[Engine, HoldExpiry]" = weakref.WeakKeyDictionary()
+_expiries_lock = threading.Lock()
+
+
+def _new_expiry(engine: Engine) -> HoldExpiry:
+    sweep_engine = engine
+    if isinstance(engine.pool, StaticPool) and not is_in_memory(engine):
+        # Sweeps must not commit on (or reset) the request handlers' single connection
+        sweep_engine = create_engine(engine.url, connect_args={"check_same_thread": False}, poolclass=NullPool)
+    return HoldExpiry(sweep_engine, hotel_code=hotel_code_for(engine))
+
+
+def get_hold_expiry(db: Session) -> HoldExpiry:
+    """Hold expiry heap for the session's database (its primary when the session reads a replica)."""
+    # Replicas are read-only; their reads skip expired holds and replication brings the deletes
+    engine = primary_engine(db.get_bind())
+    expiry = _expiries.get(engine)
+    if expiry is None:
+        with _expiries_lock:
+            expiry = _expiries.get(engine)
+            if expiry is None:
+                expiry = _new_expiry(engine)
+                _expiries[engine] = expiry
+    return expiry
+
+
+def start_hold_expiry(engine: Engine) -> Optional[HoldExpiry]:
+    """Start on-time expiry for ``engine`` (None for in-memory SQLite)."""
+    if is_in_memory(engine):
+        # The sweeping thread would need the request handlers' only connection
+        return None
+    with _expiries_lock:
+        expiry = _expiries.get(engine)
+        if expiry is None:
+            expiry = _new_expiry(engine)
+            _expiries[engine] = expiry
+    expiry.start()
+    return expiry
+
+
+def stop_hold_expiry() -> None:
+    """Stop every background expiry thread."""
+    for expiry in list(_expiries.values()):
+        expiry.stop()
+
+
+def _on_inventory_change(change: InventoryChange) -> None:
+    # Holds created by other workers are unknown to our heaps until reloaded
+    if change.kind == HOLD_CREATED and change.origin is not None:
+        for expiry in list(_expiries.values()):
+            if change.concerns(expiry.hotel_code):
+                expiry.mark_stale()
+
+
+get_invalidation_bus().subscribe(_on_inventory_change)
@@ -0,0 +1,111 @@
+"""In-process publication of inventory changes to caches.
+
+Writers publish an ``InventoryChange`` after their transaction commits; caches
+subscribe and invalidate only the rooms and dates the change touched. Changes
+made by other workers arrive through the change feed (see ``change_feed.py``)
+and are re-published here with their ``origin`` set.
+"""
+
+import logging
+import os
+import socket
+import threading
+from dataclasses import dataclass, replace
+from datetime import date
+from typing import Callable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Change kinds
+BOOKING_CREATED = "booking_created"
+BOOKING_CANCELLED = "booking_cancelled"
+OVERRIDES_CHANGED = "overrides_changed"
+CATALOG_CHANGED = "catalog_changed"
+HOLD_CREATED = "hold_created"
+HOLD_RELEASED = "hold_released"  # Expired; converted holds become booking_created
+RESTRICTIONS_CHANGED = "restrictions_changed"  # Stay rules (min stay, closed to arrival/departure)
+WAITLIST_MATCHED = "waitlist_matched"  # Released inventory now satisfies a waitlist entry
+RESYNC = "resync"  # Events may have been missed: drop everything
+
+# Kinds that change how many rooms are occupied on a date
+OCCUPANCY_KINDS = frozenset({BOOKING_CREATED, BOOKING_CANCELLED, RESYNC})
+
+# Kinds that leave every room's nightly status and price unchanged
+CELL_NEUTRAL_KINDS = frozenset({RESTRICTIONS_CHANGED, WAITLIST_MATCHED})
+
+# Identity of this worker process, recorded as the origin of published changes
+LOCAL_HOST = socket.gethostname()
+WORKER_ID = f"{LOCAL_HOST}/{os.getpid()}"
+
+
+@dataclass(frozen=True)
+class InventoryChange:
+    """A committed change to bookings, overrides or rooms.
+    
+    ``room_ids`` empty means "all rooms"; ``start_date``/``end_date`` (end
+    exclusive) of None mean "all dates". ``origin`` is None for changes made
+    in this process and the publishing worker's id for ones from the feed.
+    ``hotel_code`` is the partition whose database changed; None means every
+    hotel. Room ids only identify a room within its hotel, so subscribers
+    must skip changes of other hotels.
+    """
+    
+    kind: str
+    room_ids: Tuple[int, ...] = ()
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+    origin: Optional[str] = None
+    hotel_code: Optional[str] = None
+    
+    def in_hotel(self, hotel_code: str) -> "InventoryChange":
+        """The same change, attributed to a hotel partition."""
+        return replace(self, hotel_code=hotel_code)
+    
+    def concerns(self, hotel_code: str) -> bool:
+        """Whether the change applies to a hotel's data."""
+        return self.hotel_code is None or self.hotel_code == hotel_code
+    
+    @property
+    def from_this_host(self) -> bool:
+        """Whether the change was made by a worker on this machine."""
+        return self.origin is None or self.origin.split("/", 1)[0] == LOCAL_HOST
+
+
+Subscriber = Callable[[InventoryChange], None]
+
+
+class InvalidationBus:
+    """Synchronous fan-out of inventory changes to subscribers."""
+    
+    def __init__(self):
+        self._subscribers: List[Subscriber] = []
+        self._lock = threading.Lock()
+    
+    def subscribe(self, subscriber: Subscriber) -> None:
+        """Register a callback for every published change."""
+        with self._lock:
+            if subscriber not in self._subscribers:
+                self._subscribers.append(subscriber)
+    
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        """Remove a previously registered callback."""
+        with self._lock:
+            if subscriber in self._subscribers:
+                self._subscribers.remove(subscriber)
+    
+    def publish(self, change: InventoryChange) -> None:
+        """Deliver a change to every subscriber; one failing subscriber does not stop the rest."""
+        for subscriber in list(self._subscribers):
+            try:
+                subscriber(change)
+            except Exception:
+                logger.exception("Invalidation subscriber failed for %s", change.kind)
+
+
+# Global bus instance
+bus = InvalidationBus()
+
+
+def get_invalidation_bus() -> InvalidationBus:
+    """Get the process-wide invalidation bus."""
+    return bus
@@ -0,0 +1,132 @@
+"""Stateless, signed booking-link tokens.
+
+A booking link carries everything the booking page needs to show the offer
+(room, dates, guests, quoted total, expiry) in a compact binary payload
+signed with HMAC-SHA256 under a key derived from ``Settings.secret_key``.
+Opening a link only verifies the signature, so it needs no database access;
+only the final booking step touches the database.
+
+Token layout (base64url, no padding): version (1 byte), hold id, room id,
+check-in as a proleptic ordinal, expiry in epoch seconds (4 bytes each),
+nights (2), guests (1), quoted total in cents (4), the hold's nonce (8),
+the hotel code (UTF-8, the rest of the payload), then the first 16 bytes of
+the MAC over all of that: 48 bytes plus the hotel code.
+
+Hold ids are not unique: they repeat across hotel partitions and a database
+may reuse one after a hold is deleted. The nonce (the first bytes of the
+hold's random ``hold_token``) and the hotel code tie a link to exactly one
+hold, and booking checks the hold still matches the signed offer.
+"""
+
+import base64
+import hashlib
+import hmac
+import struct
+import time
+from dataclasses import dataclass
+from datetime import date, timedelta
+from functools import lru_cache
+from typing import Optional
+
+from .config import get_settings
+
+settings = get_settings()
+
+TOKEN_VERSION = 2
+MAC_BYTES = 16
+NONCE_BYTES = 8
+MAX_HOTEL_CODE_BYTES = 64
+_PAYLOAD = struct.Struct(">BIIIIHBI8s")
+
+
+class InvalidLinkToken(ValueError):
+    """Raised for tokens that are malformed, forged or expired."""
+
+
+@dataclass(frozen=True)
+class BookingLink:
+    """The offer a booking link was issued for."""
+    
+    hold_id: int
+    room_id: int
+    check_in_date: date
+    check_out_date: date
+    guest_count: int
+    quoted_total: float
+    expires_at: int  # Epoch seconds
+    hold_nonce: bytes  # See hold_nonce()
+    hotel_code: str
+    
+    @property
+    def nights(self) -> int:
+        return (self.check_out_date - self.check_in_date).days
+
+
+def hold_nonce(hold_token: str) -> bytes:
+    """Nonce identifying a hold in its links: the first bytes of its random token."""
+    return base64.urlsafe_b64decode(hold_token + "=" * (-len(hold_token) % 4))[:NONCE_BYTES].ljust(NONCE_BYTES, b"\0")
+
+
+@lru_cache(maxsize=4)
+def _signing_key(secret: str) -> bytes:
+    # A purpose-specific key, so link MACs cannot be replayed elsewhere
+    return hmac.new(secret.encode(), b"staydesk booking link", hashlib.sha256).digest()
+
+
+def _mac(payload: bytes, secret: Optional[str]) -> bytes:
+    key = _signing_key(secret or settings.secret_key)
+    return hmac.new(key, payload, hashlib.sha256).digest()[:MAC_BYTES]
+
+
+def sign_link(link: BookingLink, secret: Optional[str] = None) -> str:
+    """Encode and sign a booking link."""
+    hotel_code = link.hotel_code.encode()
+    if not 0 < len(hotel_code) <= MAX_HOTEL_CODE_BYTES:
+        raise ValueError(f"Hotel code must be 1 to {MAX_HOTEL_CODE_BYTES} bytes")
+    payload = _PAYLOAD.pack(
+        TOKEN_VERSION,
+        link.hold_id,
+        link.room_id,
+        link.check_in_date.toordinal(),
+        link.expires_at,
+        link.nights,
+        link.guest_count,
+        round(link.quoted_total * 100),
+        link.hold_nonce,
+    ) + hotel_code
+    return base64.urlsafe_b64encode(payload + _mac(payload, secret)).rstrip(b"=").decode()
+
+
+def verify_link(token: str, now: Optional[float] = None, secret: Optional[str] = None) -> BookingLink:
+    """Decode a booking link, checking its signature and expiry."""
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+    except (ValueError, TypeError):
+        raise InvalidLinkToken("Invalid booking link")
+    if not _PAYLOAD.size + MAC_BYTES < len(raw) <= _PAYLOAD.size + MAX_HOTEL_CODE_BYTES + MAC_BYTES:
+        raise InvalidLinkToken("Invalid booking link")
+    
+    payload, mac = raw[:-MAC_BYTES], raw[-MAC_BYTES:]
+    if not hmac.compare_digest(mac, _mac(payload, secret)):
+        raise InvalidLinkToken("Invalid booking link")
+    
+    version, hold_id, room_id, check_in, expires_at, nights, guests, cents, nonce = _PAYLOAD.unpack(
+        payload[:_PAYLOAD.size]
+    )
+    if version != TOKEN_VERSION:
+        raise InvalidLinkToken("Invalid booking link")
+    if expires_at <= (time.time() if now is None else now):
+        raise InvalidLinkToken("Booking link has expired")
+    
+    check_in_date = date.fromordinal(check_in)
+    return BookingLink(
+        hold_id=hold_id,
+        room_id=room_id,
+        check_in_date=check_in_date,
+        check_out_date=check_in_date + timedelta(days=nights),
+        guest_count=guests,
+        quoted_total=cents / 100,
+        expires_at=expires_at,
+        hold_nonce=nonce,
+        hotel_code=payload[_PAYLOAD.size:].decode(),
+    )
@@ -6,13 +6,20 @@ from typing import List, Optional
 
 from sqlalchemy import (
     Boolean, Column, Date, DateTime, Float, ForeignKey, 
-    Integer, String, Text, Enum as SQLEnum, UniqueConstraint
+    Integer, String, Text, Enum as SQLEnum, UniqueConstraint, Index,
+    event, inspect
 )
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import sqlalchemy
 
-from .database import Base
+from .amenities import mask_to_codes, room_amenity_mask
+from .database import Base, hotel_code_for
+
+
+def _partition_hotel_code(context) -> str:
+    """Stamp rows with the hotel whose partition they are written to."""
+    return hotel_code_for(context.connection.engine)
 
 
 class RoomType(str, Enum):
@@ -40,12 +47,29 @@ class BookingStatus(str, Enum):
     COMPLETED = "completed"
 
 
+class Hotel(Base):
+    """Hotel property model (one row per partition, see database.py)."""
+    
+    __tablename__ = "hotels"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    code = Column(String(32), unique=True, index=True, nullable=False)
+    name = Column(String(200), nullable=False)
+    location = Column(String(200), nullable=True)
+    timezone = Column(String(50), nullable=True)
+    
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+
 class Room(Base):
     """Room model."""
     
     __tablename__ = "rooms"
     
     id = Column(Integer, primary_key=True, index=True)
+    hotel_code = Column(String(32), nullable=False, index=True, default=_partition_hotel_code)
     room_number = Column(String(10), unique=True, index=True, nullable=False)
     room_type = Column(SQLEnum(RoomType), nullable=False)
     view_type = Column(SQLEnum(ViewType), nullable=False)
@@ -67,6 +91,7 @@ class Room(Base):
     
     # Amenities (JSON-like string storage)
     amenities = Column(Text, nullable=True)  # Comma-separated amenities
+    amenity_mask = Column(Integer, nullable=False, default=0)  # Normalized, see amenities.py
     
     # Description
     description = Column(Text, nullable=True)
@@ -81,6 +106,60 @@ class Room(Base):
     # Relationships
     bookings = relationship("Booking", back_populates="room")
     availability = relationship("RoomAvailability", back_populates="room")
+    amenity_links = relationship("RoomAmenity", back_populates="room", viewonly=True)
+
+
+class RoomAmenity(Base):
+    """Normalized room amenity (one row per room and vocabulary code)."""
+    
+    __tablename__ = "room_amenities"
+    
+    room_id = Column(Integer, ForeignKey("rooms.id"), primary_key=True)
+    amenity = Column(String(50), primary_key=True)
+    
+    # Relationships
+    room = relationship("Room", back_populates="amenity_links")
+    
+    # Lookup rooms by amenity for SQL-side filtering
+    __table_args__ = (
+        Index("ix_room_amenities_amenity_room", "amenity", "room_id"),
+    )
+
+
+_AMENITY_SOURCE_ATTRS = ("amenities", "has_balcony", "has_kitchenette", "has_jacuzzi")
+
+
+@event.listens_for(Room, "before_insert")
+@event.listens_for(Room, "before_update")
+def _set_room_amenity_mask(mapper, connection, target):
+    """Keep the amenity bitmask in step with the amenity text and flags."""
+    target.amenity_mask = room_amenity_mask(
+        target.amenities, target.has_balcony, target.has_kitchenette, target.has_jacuzzi
+    )
+
+
+@event.listens_for(Room, "after_insert")
+@event.listens_for(Room, "after_update")
+def _sync_room_amenities(mapper, connection, target):
+    """Rewrite the normalized amenity rows when a room's amenities change."""
+    state = inspect(target)
+    if state.persistent and not any(
+        state.attrs[attr].history.has_changes() for attr in _AMENITY_SOURCE_ATTRS
+    ):
+        return
+    
+    table = RoomAmenity.__table__
+    connection.execute(table.delete().where(table.c.room_id == target.id))
+    codes = mask_to_codes(target.amenity_mask)
+    if codes:
+        connection.execute(table.insert(), [{"room_id": target.id, "amenity": code} for code in codes])
+
+
+@event.listens_for(Room, "after_delete")
+def _delete_room_amenities(mapper, connection, target):
+    """Drop normalized amenity rows of a deleted room."""
+    table = RoomAmenity.__table__
+    connection.execute(table.delete().where(table.c.room_id == target.id))
 
 
 class RoomAvailability(Base):
@@ -89,6 +168,7 @@ class RoomAvailability(Base):
     __tablename__ = "room_availability"
     
     id = Column(Integer, primary_key=True, index=True)
+    hotel_code = Column(String(32), nullable=False, index=True, default=_partition_hotel_code)
     room_id = Column(Integer, ForeignKey("rooms.id"), nullable=False)
     date = Column(Date, nullable=False, index=True)
     
@@ -115,6 +195,27 @@ class RoomAvailability(Base):
     )
 
 
+class StayRestriction(Base):
+    """Stay rule for a room type (or every room type) over a date range."""
+    
+    __tablename__ = "stay_restrictions"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    room_type = Column(SQLEnum(RoomType), nullable=True)  # None applies to every room type
+    start_date = Column(Date, nullable=False, index=True)
+    end_date = Column(Date, nullable=False, index=True)  # Inclusive
+    weekdays = Column(Integer, nullable=False, default=0b1111111)  # Bit 0 is Monday
+    
+    # Rules for the dates covered; arrival rules apply to the check-in date,
+    # departure rules to the check-out date
+    min_stay = Column(Integer, nullable=True)  # Nights, for arrivals on the date
+    closed_to_arrival = Column(Boolean, nullable=False, default=False)
+    closed_to_departure = Column(Boolean, nullable=False, default=False)
+    
+    notes = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
 class Customer(Base):
     """Customer model."""
     
@@ -150,6 +251,7 @@ class Booking(Base):
     __tablename__ = "bookings"
     
     id = Column(Integer, primary_key=True, index=True)
+    hotel_code = Column(String(32), nullable=False, index=True, default=_partition_hotel_code)
     confirmation_number = Column(String(20), unique=True, index=True, nullable=False)
     
     # Foreign keys
@@ -182,6 +284,11 @@ class Booking(Base):
     # Relationships
     customer = relationship("Customer", back_populates="bookings")
     room = relationship("Room", back_populates="bookings")
+    
+    # Customer history is listed newest first with keyset pagination on (created_at, id)
+    __table_args__ = (
+        Index("ix_bookings_customer_created", "customer_id", "created_at", "id"),
+    )
 
 
 class EmailLog(Base):
@@ -190,6 +297,7 @@ class EmailLog(Base):
     __tablename__ = "email_logs"
     
     id = Column(Integer, primary_key=True, index=True)
+    hotel_code = Column(String(32), nullable=False, index=True, default=_partition_hotel_code)
     message_id = Column(String(255), unique=True, index=True, nullable=False)
     
     # Email details
@@ -220,4 +328,70 @@ class EmailLog(Base):
     # Timestamps
     received_at = Column(DateTime(timezone=True), nullable=False)
     processed_at = Column(DateTime(timezone=True), server_default=func.now())
-    responded_at = Column(DateTime(timezone=True), nullable=True) 
\ No newline at end of file
+    responded_at = Column(DateTime(timezone=True), nullable=True) 
+
+
+class InventoryEvent(Base):
+    """Committed inventory change, polled by every API worker to invalidate caches."""
+    
+    __tablename__ = "inventory_events"
+    __table_args__ = {"sqlite_autoincrement": True}  # Ids are never reused (commit order only on SQLite)
+    
+    id = Column(Integer, primary_key=True)
+    kind = Column(String(50), nullable=False)
+    room_ids = Column(Text, nullable=True)  # Comma-separated; empty means all rooms
+    start_date = Column(Date, nullable=True)
+    end_date = Column(Date, nullable=True)  # Exclusive
+    origin = Column(String(100), nullable=False)  # Worker that published the change
+    created_at = Column(Float, nullable=False, index=True)  # Epoch seconds, for delivery latency
+    waitlist_entry_id = Column(Integer, nullable=True)  # Set on waitlist_matched events
+
+
+class InventoryHold(Base):
+    """Short-lived hold on a room's nights for a guest who was sent a booking link."""
+    
+    __tablename__ = "inventory_holds"
+    __table_args__ = {"sqlite_autoincrement": True}  # Booking links name holds by id; never reuse one
+    
+    id = Column(Integer, primary_key=True)
+    hold_token = Column(String(32), unique=True, index=True, nullable=False)
+    room_id = Column(Integer, ForeignKey("rooms.id"), nullable=False, index=True)
+    check_in_date = Column(Date, nullable=False)
+    check_out_date = Column(Date, nullable=False)
+    guest_count = Column(Integer, nullable=False, default=1)
+    quoted_total = Column(Float, nullable=False)  # Honoured when the hold is converted
+    customer_email = Column(String(255), nullable=True)
+    created_at = Column(Float, nullable=False)  # Epoch seconds
+    expires_at = Column(Float, nullable=False, index=True)  # Epoch seconds
+
+
+class WaitlistStatus(str, Enum):
+    """Waitlist entry status enumeration."""
+    WAITING = "waiting"
+    MATCHED = "matched"
+    CANCELLED = "cancelled"
+
+
+class WaitlistEntry(Base):
+    """Availability request that could not be met, waiting for inventory to free up."""
+    
+    __tablename__ = "waitlist_entries"
+    
+    id = Column(Integer, primary_key=True)
+    check_in_date = Column(Date, nullable=False)
+    check_out_date = Column(Date, nullable=False)
+    room_count = Column(Integer, nullable=False, default=1)
+    max_budget = Column(Float, nullable=True)  # Per room per night
+    view_type = Column(SQLEnum(ViewType), nullable=True)
+    customer_email = Column(String(255), nullable=True)
+    
+    status = Column(SQLEnum(WaitlistStatus), nullable=False, default=WaitlistStatus.WAITING)
+    matched_room_ids = Column(Text, nullable=True)  # Comma-separated rooms free when matched
+    
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    matched_at = Column(DateTime(timezone=True), nullable=True)
+    
+    # Workers load waiting entries incrementally by id
+    __table_args__ = (
+        Index("ix_waitlist_entries_status_id", "status", "id"),
+    )
@@ -0,0 +1,97 @@
+"""Background cache prewarming after startup.
+
+A new worker builds its caches (room catalog, compiled stay restrictions,
+dynamic price factors, waitlist index) lazily, so the first requests that
+need them pay for the build, and so does the first execution of the search
+queries. With ``STARTUP_PREWARM`` a daemon thread builds them right after
+startup for every hotel partition and its replica, while the worker is
+already answering requests, on connections of their own; a failing step is
+logged and skipped.
+"""
+
+import logging
+import threading
+import time
+from datetime import date, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session, sessionmaker
+
+from .catalog import get_room_catalog
+from .database import get_partition, get_read_partition, get_thread_session, partition_codes
+from .dynamic_pricing import get_price_cache
+from .restrictions import get_restrictions
+from .schemas import AvailabilityRequest
+from .services import RoomService
+from .waitlist import get_waitlist_index
+
+logger = logging.getLogger(__name__)
+
+
+def _warm_search(db: Session) -> None:
+    # Compiles the availability statements and builds the response models once
+    request = AvailabilityRequest(check_in_date=date.today() + timedelta(days=1), room_count=1)
+    RoomService(db).search_available_rooms(request)
+
+
+# Steps for every database a partition reads from, then those only its primary needs
+READ_STEPS: List[Tuple[str, Callable[[Session], object]]] = [
+    ("catalog", get_room_catalog),
+    ("restrictions", get_restrictions),
+    ("pricing", get_price_cache),
+    ("search", _warm_search),
+]
+PRIMARY_STEPS: List[Tuple[str, Callable[[Session], object]]] = [
+    ("waitlist", lambda db: get_waitlist_index(db).refresh(db)),
+]
+
+
+def prewarm_database(factory: sessionmaker, primary: bool = True) -> Dict[str, float]:
+    """Build one database's caches; milliseconds per step (failed steps are left out).
+    
+    The steps run on a connection of their own, so they never reset the
+    connection a StaticPool engine shares with request sessions. In-memory
+    SQLite has no second connection and is not prewarmed.
+    """
+    timings: Dict[str, float] = {}
+    steps = READ_STEPS + PRIMARY_STEPS if primary else READ_STEPS
+    db = get_thread_session(factory.kw["bind"])
+    if db is None:
+        return timings
+    try:
+        for name, step in steps:
+            started = time.perf_counter()
+            try:
+                step(db)
+            except Exception:
+                logger.exception("Prewarm step %s failed", name)
+                db.rollback()
+                continue
+            timings[name] = round((time.perf_counter() - started) * 1000, 2)
+    finally:
+        db.close()
+    return timings
+
+
+def prewarm_all() -> Dict[str, Dict[str, float]]:
+    """Prewarm every hotel partition, and its replica when it has one."""
+    results = {}
+    for hotel_code in partition_codes():
+        primary, replica = get_partition(hotel_code), get_read_partition(hotel_code)
+        results[hotel_code] = prewarm_database(primary)
+        if replica is not primary:
+            results[f"{hotel_code}/replica"] = prewarm_database(replica, primary=False)
+    return results
+
+
+def start_prewarm(on_done: Optional[Callable[[Dict[str, Dict[str, float]], float], None]] = None) -> threading.Thread:
+    """Prewarm in a daemon thread; ``on_done(results, elapsed_ms)`` runs when it finishes."""
+    def run() -> None:
+        started = time.perf_counter()
+        results = prewarm_all()
+        if on_done is not None:
+            on_done(results, round((time.perf_counter() - started) * 1000, 2))
+    
+    thread = threading.Thread(target=run, name="cache-prewarm", daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,125 @@
+"""Availability search across hotel properties.
+
+Every property is its own database partition (see ``database.py``), with its
+own sessions, caches and change feed, so a single-property query never touches
+another property's data. A cross-property search runs the ordinary
+single-property search in every requested partition concurrently on the
+threadpool (inline for in-memory SQLite, which has a single connection), on
+the partitions' read replicas where configured, and k-way merges the already
+sorted room lists. A property that fails or misses
+``PROPERTY_SEARCH_TIMEOUT_MS`` is reported in its result instead of failing
+the search, so one slow property cannot hold up the rest.
+"""
+
+import asyncio
+import heapq
+import logging
+import time
+from typing import Any, Callable, List, Optional, Tuple
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+
+from .config import get_settings
+from .database import get_partition, get_read_partition, get_thread_session, is_in_memory, partition_codes
+from .schemas import (
+    SORT_BY_BEST_MATCH, AvailabilityResponse, HotelResponse, HotelsResponse,
+    PropertyAvailabilityRequest, PropertyAvailabilityResponse, PropertyRoomResponse, PropertySearchResult
+)
+from .services import PropertyService, RoomService
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+def _read_session(hotel_code: str) -> Session:
+    # Off the event loop, a StaticPool partition must not share (and reset) the requests' connection
+    factory = get_read_partition(hotel_code)
+    session = get_thread_session(factory.kw["bind"])
+    return session if session is not None else factory()
+
+
+def _describe_partition(hotel_code: str) -> HotelResponse:
+    with _read_session(hotel_code) as db:
+        return PropertyService(db).get_hotel()
+
+
+def _search_partition(hotel_code: str, request: PropertyAvailabilityRequest) -> Tuple[HotelResponse, AvailabilityResponse]:
+    with _read_session(hotel_code) as db:
+        return PropertyService(db).get_hotel(), RoomService(db).search_available_rooms(request)
+
+
+async def _in_partition(work: Callable[..., Any], hotel_code: str, *args) -> Any:
+    """Run ``work(hotel_code, *args)`` on the threadpool, or inline for an in-memory partition."""
+    if is_in_memory(get_read_partition(hotel_code).kw["bind"]):
+        # Its only connection is the one the event loop's sessions use
+        return work(hotel_code, *args)
+    return await run_in_threadpool(work, hotel_code, *args)
+
+
+async def list_hotels() -> HotelsResponse:
+    """Every routed hotel, described by its own partition."""
+    hotels = await asyncio.gather(*(_in_partition(_describe_partition, code) for code in partition_codes()))
+    return HotelsResponse(hotels=list(hotels))
+
+
+async def _search_one(
+    hotel_code: str, request: PropertyAvailabilityRequest
+) -> Tuple[PropertySearchResult, List[PropertyRoomResponse]]:
+    started = time.perf_counter()
+    timeout_ms = settings.property_search_timeout_ms
+    hotel = None
+    rooms: List[PropertyRoomResponse] = []
+    total_count = 0
+    error: Optional[str] = None
+    try:
+        hotel, response = await asyncio.wait_for(
+            _in_partition(_search_partition, hotel_code, request), timeout_ms / 1000
+        )
+        total_count = response.total_count
+        rooms = [
+            PropertyRoomResponse(**room.model_dump(), hotel_code=hotel.code, hotel_name=hotel.name)
+            for room in response.available_rooms
+        ]
+    except asyncio.TimeoutError:
+        error = f"Timed out after {timeout_ms} ms"
+    except ValueError as e:
+        error = str(e)
+    except Exception:
+        logger.exception("Availability search failed for hotel %s", hotel_code)
+        error = "Search failed"
+    
+    result = PropertySearchResult(
+        hotel_code=hotel_code,
+        hotel_name=hotel.name if hotel else None,
+        location=hotel.location if hotel else None,
+        total_count=total_count,
+        elapsed_ms=round((time.perf_counter() - started) * 1000, 2),
+        error=error
+    )
+    return result, rooms
+
+
+def merge_rooms(room_lists: List[List[PropertyRoomResponse]], sort_by: str, limit: int) -> List[PropertyRoomResponse]:
+    """Merge per-hotel room lists, each already in ``sort_by`` order, keeping the best ``limit``."""
+    if sort_by == SORT_BY_BEST_MATCH:
+        key = lambda room: (-(room.match_score or 0.0), room.price_per_night)
+    else:
+        key = lambda room: room.price_per_night
+    merged = heapq.merge(*room_lists, key=key)
+    return [room for _, room in zip(range(limit), merged)]
+
+
+async def search_properties(request: PropertyAvailabilityRequest) -> PropertyAvailabilityResponse:
+    """Search every requested hotel concurrently and merge the rooms."""
+    hotel_codes = request.hotel_codes or partition_codes()
+    for hotel_code in hotel_codes:
+        get_partition(hotel_code)  # Unknown hotels fail the request up front
+    
+    outcomes = await asyncio.gather(*(_search_one(hotel_code, request) for hotel_code in hotel_codes))
+    results = [result for result, _ in outcomes]
+    return PropertyAvailabilityResponse(
+        available_rooms=merge_rooms([rooms for _, rooms in outcomes], request.sort_by, RoomService.result_limit(request)),
+        total_count=sum(result.total_count for result in results),
+        properties=results
+    )
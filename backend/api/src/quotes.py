@@ -0,0 +1,227 @@
+"""Vectorized whole-stay pricing for many rooms at once.
+
+A quote is a (rooms x nights) price matrix. Base and weekend prices come from
+the room catalog, overrides and closures for the whole range are loaded in one
+query, bookings and unexpired holds in two more, and the nightly rule (override, else weekend price
+on Sat/Sun, else base price, times the dynamic pricing factor when enabled) is
+applied as array operations. Stay restrictions (min stay, closed to arrival or
+departure) come from their compiled per-date bitsets.
+"""
+
+import time
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import List, Optional, Sequence
+
+import numpy as np
+from sqlalchemy import and_
+from sqlalchemy.orm import Session
+
+from .catalog import CatalogRoom, get_room_catalog
+from .dynamic_pricing import get_price_cache
+from .models import Booking, BookingStatus, InventoryHold, RoomAvailability
+from .restrictions import ROOM_TYPE_BITS, get_restrictions
+
+ACTIVE_BOOKING_STATUSES = (BookingStatus.CONFIRMED, BookingStatus.PENDING)
+
+# Cell status codes used by calendars and exports
+STATUS_AVAILABLE = 0
+STATUS_BOOKED = 1
+STATUS_CLOSED = 2
+STATUS_MAINTENANCE = 3
+STATUS_HELD = 4
+STATUS_LEGEND = {
+    STATUS_AVAILABLE: "available",
+    STATUS_BOOKED: "booked",
+    STATUS_CLOSED: "closed",
+    STATUS_MAINTENANCE: "maintenance",
+    STATUS_HELD: "held",
+}
+
+
+@dataclass
+class QuoteMatrix:
+    """Prices and availability for a set of rooms over a date range."""
+    
+    rooms: List[CatalogRoom]
+    dates: List[date]
+    prices: np.ndarray      # float64, shape (rooms, nights)
+    booked: np.ndarray      # bool, shape (rooms, nights)
+    closed: np.ndarray      # bool, shape (rooms, nights); closures and maintenance
+    maintenance: np.ndarray  # bool, shape (rooms, nights)
+    held: np.ndarray        # bool, shape (rooms, nights); unexpired inventory holds
+    restricted: np.ndarray  # bool, shape (rooms,); stay breaks min stay or closed to arrival/departure
+    
+    @property
+    def available(self) -> np.ndarray:
+        """Bookable cells."""
+        return ~(self.booked | self.held | self.closed)
+    
+    @property
+    def totals(self) -> np.ndarray:
+        """Whole-stay price per room."""
+        return self.prices.sum(axis=1)
+    
+    @property
+    def fully_available(self) -> np.ndarray:
+        """Rooms bookable for every night of the stay, within the stay restrictions."""
+        return self.available.all(axis=1) & ~self.restricted
+    
+    @property
+    def status(self) -> np.ndarray:
+        """Per-cell status code (booked > held > maintenance > closed > available)."""
+        status = np.full(self.prices.shape, STATUS_AVAILABLE, dtype=np.int8)
+        status[self.closed] = STATUS_CLOSED
+        status[self.maintenance] = STATUS_MAINTENANCE
+        status[self.held] = STATUS_HELD
+        status[self.booked] = STATUS_BOOKED
+        return status
+    
+    def unavailable_dates(self, index: int) -> List[date]:
+        """Nights on which room ``index`` cannot be booked."""
+        return [self.dates[i] for i in np.flatnonzero(~self.available[index])]
+
+
+def stay_dates(check_in: date, check_out: date) -> List[date]:
+    """Nights of a stay (check-out day excluded)."""
+    return [check_in + timedelta(days=offset) for offset in range((check_out - check_in).days)]
+
+
+class QuoteEngine:
+    """Price whole stays for many rooms in a fixed number of queries."""
+    
+    def __init__(self, db: Session):
+        self.db = db
+    
+    def quote(
+        self,
+        check_in: date,
+        check_out: date,
+        room_ids: Optional[Sequence[int]] = None,
+        exclude_booking_id: Optional[int] = None,
+        exclude_hold_id: Optional[int] = None,
+        stay_rules: bool = True,
+    ) -> QuoteMatrix:
+        """Quote ``room_ids`` (all active rooms when None) for a stay.
+        
+        ``exclude_booking_id`` ignores one booking's occupancy, e.g. when
+        re-pricing an existing booking; ``exclude_hold_id`` likewise ignores
+        one hold, e.g. when converting it into a booking. ``stay_rules`` off
+        skips the stay restrictions, for callers that want per-night cells
+        rather than a bookable stay (calendars, partial date changes).
+        """
+        nights = (check_out - check_in).days
+        if nights <= 0:
+            raise ValueError("Check-out date must be after check-in date")
+        
+        catalog = get_room_catalog(self.db)
+        if room_ids is None:
+            rooms = list(catalog.rooms)
+        else:
+            rooms = []
+            for room_id in room_ids:
+                room = catalog.by_id.get(room_id)
+                if room is None:
+                    raise ValueError(f"Room with ID {room_id} not found")
+                rooms.append(room)
+        
+        dates = stay_dates(check_in, check_out)
+        row_of = {room.id: row for row, room in enumerate(rooms)}
+        shape = (len(rooms), nights)
+        
+        # Base rule: weekend price on Saturday/Sunday when the room has one
+        base = np.fromiter((r.base_price for r in rooms), dtype=np.float64, count=len(rooms))
+        weekend = np.fromiter(
+            (r.weekend_price or np.nan for r in rooms), dtype=np.float64, count=len(rooms)
+        )
+        is_weekend = np.fromiter((d.weekday() >= 5 for d in dates), dtype=bool, count=nights)
+        use_weekend = is_weekend[np.newaxis, :] & ~np.isnan(weekend)[:, np.newaxis]
+        prices = np.where(use_weekend, weekend[:, np.newaxis], base[:, np.newaxis])
+        
+        # Dynamic pricing scales the static rate by precomputed (room_type, date) factors
+        price_cache = get_price_cache(self.db)
+        if price_cache is not None:
+            factors = price_cache.factor_matrix([r.room_type for r in rooms], dates)
+            prices = np.round(prices * factors, 2)
+        
+        # Overrides and closures for the whole range in one query
+        overrides = np.full(shape, np.nan)
+        closed = np.zeros(shape, dtype=bool)
+        maintenance = np.zeros(shape, dtype=bool)
+        query = self.db.query(
+            RoomAvailability.room_id,
+            RoomAvailability.date,
+            RoomAvailability.is_available,
+            RoomAvailability.is_maintenance,
+            RoomAvailability.price_override,
+        ).filter(and_(RoomAvailability.date >= check_in, RoomAvailability.date < check_out))
+        if room_ids is not None:
+            query = query.filter(RoomAvailability.room_id.in_(list(row_of)))
+        for row in query.all():
+            r = row_of.get(row.room_id)
+            if r is None:
+                continue
+            n = (row.date - check_in).days
+            if row.price_override:
+                overrides[r, n] = row.price_override
+            if not row.is_available or row.is_maintenance:
+                closed[r, n] = True
+            if row.is_maintenance:
+                maintenance[r, n] = True
+        prices = np.where(np.isnan(overrides), prices, overrides)
+        
+        # Occupied nights from bookings overlapping the range in one query
+        booked = np.zeros(shape, dtype=bool)
+        query = self.db.query(Booking.room_id, Booking.check_in_date, Booking.check_out_date).filter(
+            and_(
+                Booking.check_in_date < check_out,
+                Booking.check_out_date > check_in,
+                Booking.status.in_(ACTIVE_BOOKING_STATUSES),
+            )
+        )
+        if exclude_booking_id is not None:
+            query = query.filter(Booking.id != exclude_booking_id)
+        if room_ids is not None:
+            query = query.filter(Booking.room_id.in_(list(row_of)))
+        for row in query.all():
+            r = row_of.get(row.room_id)
+            if r is None:
+                continue
+            start = max((row.check_in_date - check_in).days, 0)
+            end = min((row.check_out_date - check_in).days, nights)
+            booked[r, start:end] = True
+        
+        # Nights held for guests who were sent a booking link
+        held = np.zeros(shape, dtype=bool)
+        query = self.db.query(
+            InventoryHold.room_id, InventoryHold.check_in_date, InventoryHold.check_out_date
+        ).filter(
+            and_(
+                InventoryHold.check_in_date < check_out,
+                InventoryHold.check_out_date > check_in,
+                InventoryHold.expires_at > time.time(),
+            )
+        )
+        if exclude_hold_id is not None:
+            query = query.filter(InventoryHold.id != exclude_hold_id)
+        if room_ids is not None:
+            query = query.filter(InventoryHold.room_id.in_(list(row_of)))
+        for row in query.all():
+            r = row_of.get(row.room_id)
+            if r is None:
+                continue
+            start = max((row.check_in_date - check_in).days, 0)
+            end = min((row.check_out_date - check_in).days, nights)
+            held[r, start:end] = True
+        
+        # Stay restrictions: one bitset lookup for the stay, masked against each room's type bit
+        restricted = np.zeros(len(rooms), dtype=bool)
+        if stay_rules:
+            type_bits = np.fromiter((ROOM_TYPE_BITS[r.room_type] for r in rooms), dtype=np.uint16, count=len(rooms))
+            restricted = get_restrictions(self.db).blocked_rooms(type_bits, check_in, check_out)
+        
+        return QuoteMatrix(
+            rooms=rooms, dates=dates, prices=prices,
+            booked=booked, closed=closed, maintenance=maintenance, held=held,
+            restricted=restricted,
+        )
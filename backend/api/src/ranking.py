@@ -0,0 +1,160 @@
+"""Multi-criteria room ranking over precomputed feature arrays.
+
+Every catalog snapshot carries a :class:`RoomFeatures` table: one NumPy array
+per feature (view, amenity bitmask, size, occupancy, base price), row-aligned
+with the rooms sorted by id. Ranking a search looks the candidate rooms up in
+that table, builds a (rooms x criteria) matrix of per-criterion scores in
+[0, 1], takes its dot product with the preference weights, and picks the top
+``k`` with a partial selection, so only the returned rooms are ever sorted.
+"""
+
+from typing import NamedTuple, Optional, Sequence
+
+import numpy as np
+
+from .amenities import AMENITY_CODES
+from .models import ViewType
+
+# Stable integer code per view, used in the view feature array
+VIEW_CODES = {view: code for code, view in enumerate(ViewType)}
+
+# Relative weight of each criterion; criteria the guest expressed no preference
+# for are dropped, and the remaining weights are normalized to sum to one
+VIEW_WEIGHT = 3.0
+AMENITY_WEIGHT = 2.0
+PRICE_WEIGHT = 2.0
+OCCUPANCY_WEIGHT = 1.5
+SIZE_WEIGHT = 0.5
+
+
+class RankingPreferences(NamedTuple):
+    """What a guest asked for, as ranking inputs."""
+    
+    view_type: Optional[ViewType] = None
+    amenity_mask: int = 0  # Wanted, not required, amenities
+    guest_count: Optional[int] = None
+    target_price: Optional[float] = None  # Budget to stay close to; cheaper is better when unset
+
+
+class RoomFeatures:
+    """Column-oriented room features, row-aligned with ``room_ids`` (ascending)."""
+    
+    __slots__ = ("room_ids", "view_codes", "amenity_masks", "square_feet", "max_occupancy", "base_prices")
+    
+    def __init__(self, room_ids, view_codes, amenity_masks, square_feet, max_occupancy, base_prices):
+        self.room_ids = room_ids
+        self.view_codes = view_codes
+        self.amenity_masks = amenity_masks
+        self.square_feet = square_feet
+        self.max_occupancy = max_occupancy
+        self.base_prices = base_prices
+    
+    def __len__(self) -> int:
+        return len(self.room_ids)
+    
+    @classmethod
+    def from_rooms(cls, rooms: Sequence) -> "RoomFeatures":
+        """Build the arrays from catalog rooms (anything with the CatalogRoom fields)."""
+        rooms = sorted(rooms, key=lambda room: room.id)
+        return cls(
+            room_ids=np.fromiter((r.id for r in rooms), dtype=np.int64, count=len(rooms)),
+            view_codes=np.fromiter((VIEW_CODES[r.view_type] for r in rooms), dtype=np.int8, count=len(rooms)),
+            amenity_masks=np.fromiter((r.amenity_mask for r in rooms), dtype=np.int64, count=len(rooms)),
+            square_feet=np.fromiter((r.square_feet or 0 for r in rooms), dtype=np.float64, count=len(rooms)),
+            max_occupancy=np.fromiter((r.max_occupancy for r in rooms), dtype=np.float64, count=len(rooms)),
+            base_prices=np.fromiter((r.base_price for r in rooms), dtype=np.float64, count=len(rooms)),
+        )
+    
+    def rows_for(self, room_ids: np.ndarray) -> np.ndarray:
+        """Row index of each room id; raises ``KeyError`` for rooms not in the table."""
+        rows = np.searchsorted(self.room_ids, room_ids)
+        rows = np.minimum(rows, max(len(self.room_ids) - 1, 0))
+        if len(room_ids) and (not len(self.room_ids) or np.any(self.room_ids[rows] != room_ids)):
+            raise KeyError("Room not in feature table")
+        return rows
+
+
+def _amenity_match(masks: np.ndarray, wanted: int) -> np.ndarray:
+    """Fraction of the wanted amenities each room has."""
+    bits = [1 << index for index in range(len(AMENITY_CODES)) if wanted & (1 << index)]
+    matched = np.zeros(len(masks), dtype=np.float64)
+    for bit in bits:
+        matched += (masks & bit) != 0
+    return matched / len(bits)
+
+
+def score_rooms(
+    features: RoomFeatures,
+    rows: np.ndarray,
+    prices: np.ndarray,
+    preferences: RankingPreferences,
+) -> np.ndarray:
+    """Match score in [0, 1] for each selected row, given its nightly price."""
+    n = len(rows)
+    if n == 0:
+        return np.zeros(0)
+    
+    columns = []
+    weights = []
+    
+    if preferences.view_type is not None:
+        columns.append(features.view_codes[rows] == VIEW_CODES[preferences.view_type])
+        weights.append(VIEW_WEIGHT)
+    
+    if preferences.amenity_mask:
+        columns.append(_amenity_match(features.amenity_masks[rows], preferences.amenity_mask))
+        weights.append(AMENITY_WEIGHT)
+    
+    if preferences.guest_count:
+        # Rooms that seat the party score higher the less space goes unused
+        occupancy = features.max_occupancy[rows]
+        fits = occupancy >= preferences.guest_count
+        columns.append(np.where(fits, preferences.guest_count / np.maximum(occupancy, 1), 0.0))
+        weights.append(OCCUPANCY_WEIGHT)
+    
+    if preferences.target_price:
+        closeness = 1.0 - np.abs(prices - preferences.target_price) / preferences.target_price
+        columns.append(np.clip(closeness, 0.0, 1.0))
+    else:
+        low, high = prices.min(), prices.max()
+        columns.append((high - prices) / (high - low) if high > low else np.ones(n))
+    weights.append(PRICE_WEIGHT)
+    
+    square_feet = features.square_feet[rows]
+    largest = square_feet.max()
+    columns.append(square_feet / largest if largest > 0 else np.zeros(n))
+    weights.append(SIZE_WEIGHT)
+    
+    matrix = np.column_stack(columns).astype(np.float64, copy=False)
+    weights = np.asarray(weights)
+    return matrix @ (weights / weights.sum())
+
+
+def top_k(scores: np.ndarray, prices: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the ``k`` best scores, best first (cheaper first on ties)."""
+    n = len(scores)
+    if k <= 0 or n == 0:
+        return np.zeros(0, dtype=np.intp)
+    if k < n:
+        # Keep every room tied with the k-th score so ties still go to the cheaper room
+        kth = -np.partition(-scores, k - 1)[k - 1]
+        selected = np.flatnonzero(scores >= kth)
+    else:
+        selected = np.arange(n)
+    order = np.lexsort((prices[selected], -scores[selected]))
+    return selected[order[:k]]
+
+
+def rank_rooms(
+    features: RoomFeatures,
+    room_ids: Sequence[int],
+    prices: Sequence[float],
+    preferences: RankingPreferences,
+    k: int,
+):
+    """The ``k`` best-matching rooms as (room id, price, score) tuples, best first."""
+    room_ids = np.asarray(room_ids, dtype=np.int64)
+    prices = np.asarray(prices, dtype=np.float64)
+    scores = score_rooms(features, features.rows_for(room_ids), prices, preferences)
+    best = top_k(scores, prices, k)
+    return [(int(room_ids[i]), float(prices[i]), round(float(scores[i]), 4)) for i in best]
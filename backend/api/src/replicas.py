@@ -0,0 +1,151 @@
+"""Read replicas with read-your-writes session tokens.
+
+Read-only endpoints take their session from :func:`get_read_db`, which reads
+from the hotel partition's replica when it has one. Replicas lag the primary,
+so a client that just wrote could otherwise miss its own write. Every
+committed write is already an inventory event with an increasing sequence
+number, so the sequence doubles as the replication position:
+
+- When a request commits inventory events, the response carries an
+  ``X-Session-Token`` header with the highest sequence it wrote, per hotel
+  (``staydesk.42``), merged with the token the client sent.
+- A read that sends the token back is served by the replica only once the
+  replica has applied that sequence, and by the primary until then.
+
+Clients without a token (the NLP service, anonymous searches) always read
+from the replica.
+"""
+
+import threading
+import weakref
+from contextvars import ContextVar
+from typing import Dict, Optional
+
+from fastapi import Depends, Header
+from sqlalchemy import event, func, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from .database import get_db, get_replica, hotel_code_for
+from .models import InventoryEvent
+
+SESSION_TOKEN_HEADER = "X-Session-Token"
+
+# Sequences committed while handling the current request, per hotel
+_request_writes: ContextVar[Optional[Dict[str, int]]] = ContextVar("request_writes", default=None)
+
+
+def encode_token(writes: Dict[str, int]) -> str:
+    """Session token for the last sequence written per hotel."""
+    return ",".join(f"{hotel_code}.{sequence}" for hotel_code, sequence in sorted(writes.items()))
+
+
+def decode_token(token: Optional[str]) -> Dict[str, int]:
+    """Last sequence written per hotel; malformed parts are ignored."""
+    writes: Dict[str, int] = {}
+    for part in (token or "").split(","):
+        hotel_code, _, sequence = part.strip().rpartition(".")
+        if hotel_code and sequence.isdigit():
+            writes[hotel_code.lower()] = max(writes.get(hotel_code.lower(), 0), int(sequence))
+    return writes
+
+
+class ReplicaProgress:
+    """Highest event sequence each replica is known to have applied."""
+    
+    def __init__(self):
+        self._applied: "weakref.WeakKeyDictionary[Engine, int]" = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+        self.stats = {"checks": 0, "lagging": 0}
+    
+    def caught_up(self, replica_engine: Engine, sequence: int) -> bool:
+        """Whether the replica has applied ``sequence`` (queries it only if not known yet)."""
+        if sequence <= self._applied.get(replica_engine, 0):
+            return True
+        with replica_engine.connect() as conn:
+            applied = conn.execute(select(func.max(InventoryEvent.id))).scalar() or 0
+        with self._lock:
+            applied = max(applied, self._applied.get(replica_engine, 0))
+            self._applied[replica_engine] = applied
+            self.stats["checks"] += 1
+            if applied < sequence:
+                self.stats["lagging"] += 1
+        return sequence <= applied
+
+
+# Global instance
+replica_progress = ReplicaProgress()
+
+
+def get_read_db(
+    primary: Session = Depends(get_db),
+    x_session_token: Optional[str] = Header(None, description="Token from a previous write, for read-your-writes")
+) -> Session:
+    """Session for read-only endpoints: the replica, unless it has not caught up with the client's writes."""
+    bind = primary.get_bind()
+    replica = get_replica(bind)
+    if replica is not None and isinstance(x_session_token, str):
+        written = decode_token(x_session_token).get(hotel_code_for(bind), 0)
+        if written and not replica_progress.caught_up(replica.kw["bind"], written):
+            replica = None
+    if replica is None:
+        yield primary
+        return
+    
+    db = replica()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+class SessionTokenMiddleware:
+    """ASGI middleware adding ``X-Session-Token`` to responses of requests that committed writes."""
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        writes: Dict[str, int] = {}
+        
+        async def send_with_token(message):
+            if message["type"] == "http.response.start" and writes:
+                headers = dict(scope["headers"])
+                merged = decode_token(headers.get(SESSION_TOKEN_HEADER.lower().encode(), b"").decode("latin-1"))
+                for hotel_code, sequence in writes.items():
+                    merged[hotel_code] = max(merged.get(hotel_code, 0), sequence)
+                token = (SESSION_TOKEN_HEADER.lower().encode(), encode_token(merged).encode("latin-1"))
+                message = {**message, "headers": [*message.get("headers", []), token]}
+            await send(message)
+        
+        reset = _request_writes.set(writes)
+        try:
+            await self.app(scope, receive, send_with_token)
+        finally:
+            _request_writes.reset(reset)
+
+
+@event.listens_for(Session, "after_flush")
+def _note_written_events(session: Session, flush_context) -> None:
+    sequences = [obj.id for obj in session.new if isinstance(obj, InventoryEvent)]
+    if sequences:
+        session.info["written_sequence"] = max(session.info.get("written_sequence", 0), *sequences)
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_written_sequence(session: Session) -> None:
+    sequence = session.info.pop("written_sequence", None)
+    writes = _request_writes.get()
+    if sequence is None or writes is None:
+        return
+    hotel_code = hotel_code_for(session.get_bind())
+    writes[hotel_code] = max(writes.get(hotel_code, 0), sequence)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_written_sequence(session: Session) -> None:
+    session.info.pop("written_sequence", None)
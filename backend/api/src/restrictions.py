@@ -0,0 +1,195 @@
+"""Stay restrictions compiled into per-date room-type bitsets.
+
+Restrictions are stored as rules (``StayRestriction`` rows: a room type or
+every type, a date range, weekdays, and any of min stay, closed to arrival and
+closed to departure). Rules are compiled once into arrays over the booking
+horizon where each cell is a bitset over room types, so checking a stay is a
+few array lookups and bit operations, never a per-room or per-date query:
+
+    blocked = closed_to_arrival[check_in]
+            | closed_to_departure[check_out]
+            | min_stay_exceeds[nights, check_in]
+
+``min_stay_exceeds[n, d]`` holds the types whose minimum stay for arrivals on
+``d`` is longer than ``n`` nights. Search turns the blocked types into one
+more SQL predicate on the availability query, and quotes and bookings mask
+room rows with it in the same pass as the availability check.
+"""
+
+import threading
+import weakref
+from datetime import date, timedelta
+from typing import Dict, List, Optional
+
+import numpy as np
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from .config import get_settings
+from .database import hotel_code_for, primary_engine, primary_session
+from .invalidation import RESTRICTIONS_CHANGED, RESYNC, InventoryChange, get_invalidation_bus
+from .models import RoomType, StayRestriction
+
+settings = get_settings()
+
+# Row and bit of each room type in the compiled arrays and bitsets
+ROOM_TYPE_INDEX: Dict[RoomType, int] = {room_type: index for index, room_type in enumerate(RoomType)}
+ROOM_TYPE_BITS: Dict[RoomType, int] = {room_type: 1 << index for room_type, index in ROOM_TYPE_INDEX.items()}
+ALL_ROOM_TYPES = sum(ROOM_TYPE_BITS.values())
+
+# Longest minimum stay a rule may set (rows of ``min_stay_exceeds``)
+MAX_MIN_STAY = 30
+
+# Departures up to this many nights past the booking horizon are still checked
+DEPARTURE_MARGIN_DAYS = MAX_MIN_STAY + 1
+
+
+def room_types_in(bits: int) -> List[RoomType]:
+    """Room types whose bit is set."""
+    return [room_type for room_type, bit in ROOM_TYPE_BITS.items() if bits & bit]
+
+
+class RestrictionTable:
+    """Rules compiled into per-date bitsets starting at ``as_of``."""
+    
+    def __init__(self, as_of: date, days: int):
+        self.as_of = as_of
+        self.days = days
+        self.arrival_closed = np.zeros(days, dtype=np.uint16)
+        self.departure_closed = np.zeros(days, dtype=np.uint16)
+        self.min_stay = np.zeros((len(ROOM_TYPE_BITS), days), dtype=np.uint8)
+        self.min_stay_exceeds = np.zeros((MAX_MIN_STAY + 1, days), dtype=np.uint16)
+        self.rule_count = 0
+    
+    @classmethod
+    def compile(cls, rules: List[StayRestriction], as_of: date, days: int) -> "RestrictionTable":
+        """Fold every rule into the arrays (rules combine: strictest wins)."""
+        table = cls(as_of, days)
+        weekday_of = (as_of.weekday() + np.arange(days)) % 7
+        for rule in rules:
+            lo = max((rule.start_date - as_of).days, 0)
+            hi = min((rule.end_date - as_of).days + 1, days)
+            if lo >= hi:
+                continue
+            weekdays = rule.weekdays if rule.weekdays is not None else 0b1111111
+            offsets = lo + np.flatnonzero((weekdays >> weekday_of[lo:hi]) & 1)
+            bits = ROOM_TYPE_BITS[rule.room_type] if rule.room_type is not None else ALL_ROOM_TYPES
+            if rule.closed_to_arrival:
+                table.arrival_closed[offsets] |= bits
+            if rule.closed_to_departure:
+                table.departure_closed[offsets] |= bits
+            if rule.min_stay and rule.min_stay > 1:
+                for room_type in room_types_in(bits):
+                    row = table.min_stay[ROOM_TYPE_INDEX[room_type]]
+                    row[offsets] = np.maximum(row[offsets], min(rule.min_stay, MAX_MIN_STAY))
+            table.rule_count += 1
+        
+        # Row n: types whose minimum stay is longer than n nights
+        type_bits = np.array(list(ROOM_TYPE_BITS.values()), dtype=np.uint16)[:, np.newaxis]
+        for nights in range(MAX_MIN_STAY + 1):
+            table.min_stay_exceeds[nights] = np.bitwise_or.reduce(
+                np.where(table.min_stay > nights, type_bits, 0).astype(np.uint16), axis=0
+            )
+        return table
+    
+    def _offset(self, day: date) -> Optional[int]:
+        offset = (day - self.as_of).days
+        return offset if 0 <= offset < self.days else None
+    
+    def blocked_types(self, check_in: date, check_out: date) -> int:
+        """Bitset of room types that cannot be booked for the stay."""
+        arrival = self._offset(check_in)
+        departure = self._offset(check_out)
+        nights = min((check_out - check_in).days, MAX_MIN_STAY)
+        blocked = 0
+        if arrival is not None:
+            blocked |= int(self.arrival_closed[arrival] | self.min_stay_exceeds[nights, arrival])
+        if departure is not None:
+            blocked |= int(self.departure_closed[departure])
+        return blocked
+    
+    def blocked_rooms(self, room_type_bits: np.ndarray, check_in: date, check_out: date) -> np.ndarray:
+        """Mask of rooms (given their type bits) that cannot be booked for the stay."""
+        return (room_type_bits & self.blocked_types(check_in, check_out)) != 0
+    
+    def violation(self, room_type: RoomType, check_in: date, check_out: date) -> Optional[str]:
+        """Why a stay breaks the rules for a room type, or None if it is allowed."""
+        bit = ROOM_TYPE_BITS[room_type]
+        if not self.blocked_types(check_in, check_out) & bit:
+            return None
+        arrival = self._offset(check_in)
+        if arrival is not None and self.arrival_closed[arrival] & bit:
+            return f"Arrival on {check_in} is closed for {room_type.value} rooms"
+        departure = self._offset(check_out)
+        if departure is not None and self.departure_closed[departure] & bit:
+            return f"Departure on {check_out} is closed for {room_type.value} rooms"
+        min_stay = int(self.min_stay[ROOM_TYPE_INDEX[room_type], arrival])
+        return f"Stays arriving on {check_in} require at least {min_stay} nights for {room_type.value} rooms"
+
+
+class RestrictionCache:
+    """Compiled restriction table for one database, recompiled when rules change."""
+    
+    def __init__(self, days: int):
+        self.days = days
+        self.table: Optional[RestrictionTable] = None
+        self._stale = True
+        self._lock = threading.Lock()
+        self.stats = {"compiles": 0}
+    
+    def invalidate(self) -> None:
+        """Recompile before the next lookup."""
+        self._stale = True
+    
+    def current(self, db: Session) -> RestrictionTable:
+        """The compiled table, recompiling on rule changes and day rollover."""
+        table = self.table
+        if table is not None and not self._stale and table.as_of == date.today():
+            return table
+        with self._lock:
+            table = self.table
+            if table is None or self._stale or table.as_of != date.today():
+                # Cleared before reading, so a change committed meanwhile triggers another compile
+                self._stale = False
+                as_of = date.today()
+                with primary_session(db) as source:
+                    rules = (
+                        source.query(StayRestriction)
+                        .filter(
+                            StayRestriction.end_date >= as_of,
+                            StayRestriction.start_date < as_of + timedelta(days=self.days)
+                        )
+                        .all()
+                    )
+                table = RestrictionTable.compile(rules, as_of, self.days)
+                self.table = table
+                self.stats["compiles"] += 1
+        return table
+
+
+_caches: "weakref.WeakKeyDictionary[Engine, RestrictionCache]" = weakref.WeakKeyDictionary()
+_caches_lock = threading.Lock()
+
+
+def get_restrictions(db: Session) -> RestrictionTable:
+    """Compiled stay restrictions for the session's database (shared with its replica)."""
+    engine = primary_engine(db.get_bind())
+    cache = _caches.get(engine)
+    if cache is None:
+        with _caches_lock:
+            cache = _caches.get(engine)
+            if cache is None:
+                cache = RestrictionCache(settings.max_advance_booking_days + DEPARTURE_MARGIN_DAYS)
+                _caches[engine] = cache
+    return cache.current(db)
+
+
+def _on_inventory_change(change: InventoryChange) -> None:
+    if change.kind not in (RESTRICTIONS_CHANGED, RESYNC):
+        return
+    for engine, cache in list(_caches.items()):
+        if change.concerns(hotel_code_for(engine)):
+            cache.invalidate()
+
+
+get_invalidation_bus().subscribe(_on_inventory_change)
@@ -1,13 +1,36 @@
 """Availability API router."""
 
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
-from ..database import get_db
-from ..schemas import AvailabilityRequest, AvailabilityResponse, ErrorResponse, HotelContextResponse
+from ..coalescing import availability_key, get_availability_flight
+from ..config import get_settings
+from ..database import get_thread_session, partition_key
+from ..replicas import get_read_db
+from ..schemas import (
+    AvailabilityRequest, AvailabilityResponse, ErrorResponse, HotelContextResponse,
+    AvailabilityPageRequest, AvailabilityPageResponse
+)
 from ..services import RoomService
 
 router = APIRouter(prefix="/api", tags=["availability"])
+settings = get_settings()
+
+
+async def _search_in_threadpool(db: Session, request: AvailabilityRequest) -> AvailabilityResponse:
+    """Run a search on a worker thread, with its own session and connection when the database allows one."""
+    session = get_thread_session(db.get_bind())
+    if session is None:
+        # In-memory SQLite: the request's session holds the only connection
+        return await run_in_threadpool(RoomService(db).search_available_rooms, request)
+    
+    def search() -> AvailabilityResponse:
+        with session:
+            return RoomService(session).search_available_rooms(request)
+    
+    return await run_in_threadpool(search)
 
 
 @router.post(
@@ -23,12 +46,18 @@ router = APIRouter(prefix="/api", tags=["availability"])
 )
 async def check_availability(
     request: AvailabilityRequest,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Check room availability based on customer criteria."""
     try:
-        room_service = RoomService(db)
-        response = room_service.search_available_rooms(request)
+        if settings.availability_coalescing:
+            # Identical in-flight searches await the first one's result
+            response = await get_availability_flight().do(
+                availability_key(request, partition_key(db.get_bind())),
+                lambda: _search_in_threadpool(db, request)
+            )
+        else:
+            response = RoomService(db).search_available_rooms(request)
         
         if response.total_count == 0:
             raise HTTPException(
@@ -41,6 +70,8 @@ async def check_availability(
         
         return response
         
+    except HTTPException:
+        raise
     except ValueError as e:
         raise HTTPException(
             status_code=400,
@@ -59,6 +90,65 @@ async def check_availability(
         )
 
 
+@router.post(
+    "/availability/search",
+    response_model=AvailabilityPageResponse,
+    responses={
+        400: {"model": ErrorResponse, "description": "Invalid request"},
+        500: {"model": ErrorResponse, "description": "Server error"}
+    },
+    summary="Search Room Availability (Paginated)",
+    description="Available rooms cheapest first, one page at a time. Pass next_cursor back as cursor for the next page."
+)
+async def search_availability(
+    request: AvailabilityPageRequest,
+    db: Session = Depends(get_read_db)
+):
+    """Get one price-ordered page of available rooms."""
+    try:
+        room_service = RoomService(db)
+        return room_service.search_available_rooms_page(request)
+        
+    except ValueError as e:
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "error": "Invalid request",
+                "details": str(e)
+            }
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail={
+                "error": "Server error",
+                "details": "An unexpected error occurred while checking availability"
+            }
+        )
+
+
+@router.post(
+    "/availability/export",
+    responses={
+        200: {"content": {"application/x-ndjson": {}}, "description": "One available room per line"},
+        400: {"model": ErrorResponse, "description": "Invalid request"}
+    },
+    summary="Export Room Availability",
+    description="Stream every available room, cheapest first, as newline-delimited JSON."
+)
+async def export_availability(
+    request: AvailabilityRequest,
+    db: Session = Depends(get_read_db)
+):
+    """Stream all available rooms as NDJSON."""
+    room_service = RoomService(db)
+    rooms = room_service.stream_available_rooms(request)
+    return StreamingResponse(
+        (room.model_dump_json() + "\n" for room in rooms),
+        media_type="application/x-ndjson"
+    )
+
+
 @router.get(
     "/rooms/context",
     response_model=HotelContextResponse,
@@ -68,7 +158,7 @@ async def check_availability(
     summary="Get Hotel Context",
     description="Get general information about the hotel for better responses. Used by NLP service."
 )
-async def get_hotel_context(db: Session = Depends(get_db)):
+async def get_hotel_context(db: Session = Depends(get_read_db)):
     """Get hotel context information."""
     try:
         room_service = RoomService(db)
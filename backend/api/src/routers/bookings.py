@@ -1,10 +1,14 @@
 """Bookings API router."""
 
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 
 from ..database import get_db
-from ..schemas import CreateBookingRequest, BookingResponse, ErrorResponse
+from ..schemas import (
+    CreateBookingRequest, BookingResponse, CustomerBookingsResponse, ErrorResponse, ModifyBookingRequest
+)
 from ..services import BookingService
 
 router = APIRouter(prefix="/api", tags=["bookings"])
@@ -66,4 +70,186 @@ async def create_booking(
                 "error": "Server error",
                 "details": "An unexpected error occurred while creating the booking"
             }
-        ) 
\ No newline at end of file
+        )
+
+
+def _booking_change_error(e: ValueError, action: str) -> HTTPException:
+    """Map a booking change failure to an HTTP error."""
+    error_msg = str(e)
+    
+    if "not found" in error_msg:
+        return HTTPException(
+            status_code=404,
+            detail={
+                "error": "Booking not found",
+                "details": error_msg
+            }
+        )
+    elif "not available" in error_msg or "cannot be changed" in error_msg:
+        return HTTPException(
+            status_code=409,
+            detail={
+                "error": f"Booking cannot be {action}",
+                "details": error_msg
+            }
+        )
+    return HTTPException(
+        status_code=400,
+        detail={
+            "error": "Invalid request",
+            "details": error_msg
+        }
+    )
+
+
+@router.post(
+    "/bookings/{confirmation_number}/cancel",
+    response_model=BookingResponse,
+    responses={
+        404: {"model": ErrorResponse, "description": "Booking not found"},
+        409: {"model": ErrorResponse, "description": "Booking already cancelled or completed"},
+        500: {"model": ErrorResponse, "description": "Server error"}
+    },
+    summary="Cancel Booking",
+    description="Cancel a booking and release its nights."
+)
+async def cancel_booking(
+    confirmation_number: str,
+    db: Session = Depends(get_db)
+):
+    """Cancel a booking."""
+    try:
+        booking_service = BookingService(db)
+        return booking_service.cancel_booking(confirmation_number)
+        
+    except ValueError as e:
+        raise _booking_change_error(e, "cancelled")
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail={
+                "error": "Server error",
+                "details": "An unexpected error occurred while cancelling the booking"
+            }
+        )
+
+
+@router.patch(
+    "/bookings/{confirmation_number}",
+    response_model=BookingResponse,
+    responses={
+        400: {"model": ErrorResponse, "description": "Invalid request"},
+        404: {"model": ErrorResponse, "description": "Booking not found"},
+        409: {"model": ErrorResponse, "description": "Room not available or booking closed"},
+        500: {"model": ErrorResponse, "description": "Server error"}
+    },
+    summary="Change Booking Dates",
+    description="Move a booking to new dates; only nights that differ are checked, priced and released."
+)
+async def modify_booking(
+    confirmation_number: str,
+    request: ModifyBookingRequest,
+    db: Session = Depends(get_db)
+):
+    """Change the dates of a booking."""
+    try:
+        booking_service = BookingService(db)
+        return booking_service.modify_booking_dates(confirmation_number, request)
+        
+    except ValueError as e:
+        raise _booking_change_error(e, "modified")
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail={
+                "error": "Server error",
+                "details": "An unexpected error occurred while modifying the booking"
+            }
+        )
+
+
+@router.get(
+    "/bookings/{confirmation_number}",
+    response_model=BookingResponse,
+    responses={
+        404: {"model": ErrorResponse, "description": "Booking not found"},
+        500: {"model": ErrorResponse, "description": "Server error"}
+    },
+    summary="Get Booking",
+    description="Look up a booking by its confirmation number."
+)
+async def get_booking(
+    confirmation_number: str,
+    db: Session = Depends(get_db)
+):
+    """Get a booking by confirmation number."""
+    try:
+        booking_service = BookingService(db)
+        return booking_service.get_booking(confirmation_number)
+        
+    except ValueError as e:
+        raise HTTPException(
+            status_code=404,
+            detail={
+                "error": "Booking not found",
+                "details": str(e)
+            }
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail={
+                "error": "Server error",
+                "details": "An unexpected error occurred while retrieving the booking"
+            }
+        )
+
+
+@router.get(
+    "/customers/{customer_email}/bookings",
+    response_model=CustomerBookingsResponse,
+    responses={
+        400: {"model": ErrorResponse, "description": "Invalid cursor"},
+        404: {"model": ErrorResponse, "description": "Customer not found"},
+        500: {"model": ErrorResponse, "description": "Server error"}
+    },
+    summary="List Customer Bookings",
+    description="A customer's bookings, newest first, paginated with next_cursor."
+)
+async def get_customer_bookings(
+    customer_email: str,
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(20, ge=1, le=100, description="Bookings per page"),
+    db: Session = Depends(get_db)
+):
+    """List a customer's bookings."""
+    try:
+        booking_service = BookingService(db)
+        return booking_service.get_customer_bookings(customer_email, cursor, limit)
+        
+    except ValueError as e:
+        error_msg = str(e)
+        
+        if "not found" in error_msg:
+            raise HTTPException(
+                status_code=404,
+                detail={
+                    "error": "Customer not found",
+                    "details": error_msg
+                }
+            )
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "error": "Invalid request",
+                "details": error_msg
+            }
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail={
+                "error": "Server error",
+                "details": "An unexpected error occurred while listing bookings"
+            }
+        )
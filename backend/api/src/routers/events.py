@@ -0,0 +1,72 @@
+"""Inventory event log API router."""
+
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from ..config import get_settings
+from ..database import get_db
+from ..schemas import ErrorResponse, InventoryEventsResponse
+from ..services import EventService
+
+router = APIRouter(prefix="/api", tags=["events"])
+settings = get_settings()
+
+
+@router.get(
+    "/events",
+    response_model=InventoryEventsResponse,
+    responses={
+        500: {"model": ErrorResponse, "description": "Server error"}
+    },
+    summary="Get Inventory Changes",
+    description="Inventory events (bookings created/cancelled, overrides and rooms changed) after sequence number since."
+)
+async def get_events(
+    since: int = Query(0, ge=0, description="Last sequence number already seen"),
+    limit: int = Query(100, ge=1, le=1000, description="Maximum events to return"),
+    db: Session = Depends(get_db)
+):
+    """Get inventory events after a sequence number."""
+    try:
+        event_service = EventService(db)
+        return event_service.get_events_since(since, limit)
+        
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail={
+                "error": "Server error",
+                "details": "An unexpected error occurred while reading events"
+            }
+        )
+
+
+@router.get(
+    "/events/stream",
+    responses={
+        200: {"content": {"text/event-stream": {}}, "description": "Server-Sent Events, one per inventory event"}
+    },
+    summary="Stream Inventory Changes",
+    description="Server-Sent Events for inventory events after since (or the Last-Event-ID header when reconnecting)."
+)
+async def stream_events(
+    request: Request,
+    since: int = Query(0, ge=0, description="Last sequence number already seen"),
+    last_event_id: Optional[str] = Header(None, description="Set by EventSource when reconnecting"),
+    db: Session = Depends(get_db)
+):
+    """Stream inventory events as they are committed."""
+    if last_event_id and last_event_id.isdigit():
+        since = int(last_event_id)
+    
+    event_service = EventService(db)
+    return StreamingResponse(
+        event_service.stream_events(
+            since, request.is_disconnected, poll_interval=settings.change_feed_poll_ms / 1000
+        ),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
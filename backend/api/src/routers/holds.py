@@ -0,0 +1,167 @@
+"""Inventory holds API router."""
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+
+from ..database import get_db
+from ..schemas import BookHoldRequest, BookingResponse, CreateHoldRequest, ErrorResponse, HoldResponse
+from ..services import BookingService, HoldService
+
+router = APIRouter(prefix="/api", tags=["holds"])
+
+
+def _hold_error(e: ValueError) -> HTTPException:
+    """Map a hold failure to an HTTP error."""
+    error_msg = str(e)
+    
+    if "not found" in error_msg:
+        return HTTPException(
+            status_code=404,
+            detail={
+                "error": "Not found",
+                "details": error_msg
+            }
+        )
+    elif "not available" in error_msg:
+        return HTTPException(
+            status_code=409,
+            detail={
+                "error": "Room not available",
+                "details": error_msg
+            }
+        )
+    return HTTPException(
+        status_code=400,
+        detail={
+            "error": "Invalid request",
+            "details": error_msg
+        }
+    )
+
+
+@router.post(
+    "/holds",
+    response_model=HoldResponse,
+    responses={
+        404: {"model": ErrorResponse, "description": "Room not found"},
+        409: {"model": ErrorResponse, "description": "Room not available"},
+        500: {"model": ErrorResponse, "description": "Server error"}
+    },
+    summary="Create Inventory Hold",
+    description="Keep a quoted room off sale, at the quoted price, while a booking link is outstanding."
+)
+async def create_hold(
+    request: CreateHoldRequest,
+    db: Session = Depends(get_db)
+):
+    """Create an inventory hold."""
+    try:
+        hold_service = HoldService(db)
+        return hold_service.create_hold(request)
+        
+    except ValueError as e:
+        raise _hold_error(e)
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail={
+                "error": "Server error",
+                "details": "An unexpected error occurred while creating the hold"
+            }
+        )
+
+
+@router.get(
+    "/holds/{hold_token}",
+    response_model=HoldResponse,
+    responses={
+        404: {"model": ErrorResponse, "description": "Hold not found or expired"},
+        500: {"model": ErrorResponse, "description": "Server error"}
+    },
+    summary="Get Inventory Hold",
+    description="Get an unexpired hold by the token from its booking link."
+)
+async def get_hold(
+    hold_token: str,
+    db: Session = Depends(get_db)
+):
+    """Get an inventory hold."""
+    try:
+        hold_service = HoldService(db)
+        return hold_service.get_hold(hold_token)
+        
+    except ValueError as e:
+        raise _hold_error(e)
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail={
+                "error": "Server error",
+                "details": "An unexpected error occurred while retrieving the hold"
+            }
+        )
+
+
+@router.delete(
+    "/holds/{hold_token}",
+    status_code=204,
+    responses={
+        404: {"model": ErrorResponse, "description": "Hold not found or expired"},
+        500: {"model": ErrorResponse, "description": "Server error"}
+    },
+    summary="Release Inventory Hold",
+    description="Put the held nights back on sale before the hold expires."
+)
+async def release_hold(
+    hold_token: str,
+    db: Session = Depends(get_db)
+):
+    """Release an inventory hold."""
+    try:
+        hold_service = HoldService(db)
+        hold_service.release_hold(hold_token)
+        
+    except ValueError as e:
+        raise _hold_error(e)
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail={
+                "error": "Server error",
+                "details": "An unexpected error occurred while releasing the hold"
+            }
+        )
+
+
+@router.post(
+    "/holds/{hold_token}/book",
+    response_model=BookingResponse,
+    responses={
+        400: {"model": ErrorResponse, "description": "Invalid request"},
+        404: {"model": ErrorResponse, "description": "Hold not found or expired"},
+        409: {"model": ErrorResponse, "description": "Room not available"},
+        500: {"model": ErrorResponse, "description": "Server error"}
+    },
+    summary="Book Held Room",
+    description="Convert a hold into a confirmed booking at the held price."
+)
+async def book_hold(
+    hold_token: str,
+    request: BookHoldRequest,
+    db: Session = Depends(get_db)
+):
+    """Convert an inventory hold into a booking."""
+    try:
+        booking_service = BookingService(db)
+        return booking_service.book_hold(hold_token, request)
+        
+    except ValueError as e:
+        raise _hold_error(e)
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail={
+                "error": "Server error",
+                "details": "An unexpected error occurred while booking the held room"
+            }
+        )
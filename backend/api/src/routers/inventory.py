@@ -0,0 +1,303 @@
+"""Inventory (rates and availability) API router."""
+
+from datetime import date, timedelta
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from ..database import get_db
+from ..models import RoomType
+from ..schemas import (
+    BulkInventoryUpdateRequest, BulkInventoryUpdateResponse, ErrorResponse,
+    RoomCalendarResponse, CalendarGridResponse, ARIDeltaResponse,
+    StayRestrictionRequest, StayRestrictionResponse, StayRestrictionsResponse
+)
+from ..services import InventoryService
+
+router = APIRouter(prefix="/api", tags=["inventory"])
+
+
+@router.post(
+    "/inventory/bulk",
+    response_model=BulkInventoryUpdateResponse,
+    responses={
+        400: {"model": ErrorResponse, "description": "Invalid request"},
+        404: {"model": ErrorResponse, "description": "Room not found"},
+        500: {"model": ErrorResponse, "description": "Server error"}
+    },
+    summary="Bulk Update Rates and Availability",
+    description="Apply price overrides, closures and maintenance to many room-dates in one transaction."
+)
+async def bulk_update_inventory(
+    request: BulkInventoryUpdateRequest,
+    db: Session = Depends(get_db)
+):
+    """Apply bulk rate and availability changes."""
+    try:
+        inventory_service = InventoryService(db)
+        return inventory_service.bulk_update(request)
+        
+    except ValueError as e:
+        error_msg = str(e)
+        
+        if "not found" in error_msg:
+            raise HTTPException(
+                status_code=404,
+                detail={
+                    "error": "Room not found",
+                    "details": error_msg
+                }
+            )
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "error": "Invalid request",
+                "details": error_msg
+            }
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail={
+                "error": "Server error",
+                "details": "An unexpected error occurred while updating inventory"
+            }
+        )
+
+
+@router.get(
+    "/inventory/ari",
+    response_model=ARIDeltaResponse,
+    responses={
+        400: {"model": ErrorResponse, "description": "Invalid request"},
+        500: {"model": ErrorResponse, "description": "Server error"}
+    },
+    summary="Get ARI Changes",
+    description="Availability, rates and inventory changed since a version, run-length encoded for channel managers."
+)
+async def get_ari_delta(
+    since: int = Query(0, ge=0, description="Version from the previous sync (0 for a full export)"),
+    max_events: int = Query(1000, ge=1, le=10000, description="Maximum change-log entries to apply"),
+    db: Session = Depends(get_db)
+):
+    """Get availability and rate changes since a version."""
+    try:
+        inventory_service = InventoryService(db)
+        return inventory_service.get_ari_delta(since, max_events)
+        
+    except ValueError as e:
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "error": "Invalid request",
+                "details": str(e)
+            }
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail={
+                "error": "Server error",
+                "details": "An unexpected error occurred while exporting inventory changes"
+            }
+        )
+
+
+@router.post(
+    "/inventory/restrictions",
+    response_model=StayRestrictionResponse,
+    responses={
+        400: {"model": ErrorResponse, "description": "Invalid request"},
+        500: {"model": ErrorResponse, "description": "Server error"}
+    },
+    summary="Add Stay Restriction",
+    description="Add a min stay, closed to arrival or closed to departure rule for a room type and date range."
+)
+async def create_restriction(
+    request: StayRestrictionRequest,
+    db: Session = Depends(get_db)
+):
+    """Add a stay restriction rule."""
+    try:
+        inventory_service = InventoryService(db)
+        return inventory_service.create_restriction(request)
+        
+    except ValueError as e:
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "error": "Invalid request",
+                "details": str(e)
+            }
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail={
+                "error": "Server error",
+                "details": "An unexpected error occurred while adding the restriction"
+            }
+        )
+
+
+@router.get(
+    "/inventory/restrictions",
+    response_model=StayRestrictionsResponse,
+    responses={
+        500: {"model": ErrorResponse, "description": "Server error"}
+    },
+    summary="List Stay Restrictions",
+    description="Stay restriction rules overlapping a date range."
+)
+async def list_restrictions(
+    start_date: Optional[date] = Query(None, description="First date (defaults to today)"),
+    end_date: Optional[date] = Query(None, description="Last date, inclusive (defaults to 30 days)"),
+    room_type: Optional[RoomType] = Query(None, description="Only rules for this type (and every type)"),
+    db: Session = Depends(get_db)
+):
+    """List stay restriction rules."""
+    try:
+        inventory_service = InventoryService(db)
+        return inventory_service.list_restrictions(*_calendar_range(start_date, end_date), room_type)
+        
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail={
+                "error": "Server error",
+                "details": "An unexpected error occurred while listing restrictions"
+            }
+        )
+
+
+@router.delete(
+    "/inventory/restrictions/{restriction_id}",
+    status_code=204,
+    responses={
+        404: {"model": ErrorResponse, "description": "Restriction not found"},
+        500: {"model": ErrorResponse, "description": "Server error"}
+    },
+    summary="Remove Stay Restriction",
+    description="Remove a stay restriction rule."
+)
+async def delete_restriction(
+    restriction_id: int,
+    db: Session = Depends(get_db)
+):
+    """Remove a stay restriction rule."""
+    try:
+        inventory_service = InventoryService(db)
+        inventory_service.delete_restriction(restriction_id)
+        
+    except ValueError as e:
+        raise HTTPException(
+            status_code=404,
+            detail={
+                "error": "Restriction not found",
+                "details": str(e)
+            }
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail={
+                "error": "Server error",
+                "details": "An unexpected error occurred while removing the restriction"
+            }
+        )
+
+
+def _calendar_range(start_date: Optional[date], end_date: Optional[date]):
+    """Default to a 30-day window starting today."""
+    start_date = start_date or date.today()
+    return start_date, end_date or start_date + timedelta(days=29)
+
+
+@router.get(
+    "/rooms/{room_id}/calendar",
+    response_model=RoomCalendarResponse,
+    responses={
+        400: {"model": ErrorResponse, "description": "Invalid request"},
+        404: {"model": ErrorResponse, "description": "Room not found"},
+        500: {"model": ErrorResponse, "description": "Server error"}
+    },
+    summary="Get Room Calendar",
+    description="Availability status and nightly price per date for one room, as columnar arrays."
+)
+async def get_room_calendar(
+    room_id: int,
+    start_date: Optional[date] = Query(None, description="First date (defaults to today)"),
+    end_date: Optional[date] = Query(None, description="Last date, inclusive (defaults to 30 days)"),
+    db: Session = Depends(get_db)
+):
+    """Get the availability and rate calendar for a room."""
+    try:
+        inventory_service = InventoryService(db)
+        return inventory_service.get_room_calendar(room_id, *_calendar_range(start_date, end_date))
+        
+    except ValueError as e:
+        error_msg = str(e)
+        
+        if "not found" in error_msg:
+            raise HTTPException(
+                status_code=404,
+                detail={
+                    "error": "Room not found",
+                    "details": error_msg
+                }
+            )
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "error": "Invalid request",
+                "details": error_msg
+            }
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail={
+                "error": "Server error",
+                "details": "An unexpected error occurred while building the calendar"
+            }
+        )
+
+
+@router.get(
+    "/calendar",
+    response_model=CalendarGridResponse,
+    responses={
+        400: {"model": ErrorResponse, "description": "Invalid request"},
+        500: {"model": ErrorResponse, "description": "Server error"}
+    },
+    summary="Get Hotel Calendar Grid",
+    description="Availability status and nightly price per room and date, as columnar arrays."
+)
+async def get_calendar_grid(
+    start_date: Optional[date] = Query(None, description="First date (defaults to today)"),
+    end_date: Optional[date] = Query(None, description="Last date, inclusive (defaults to 30 days)"),
+    room_type: Optional[RoomType] = Query(None, description="Only rooms of this type"),
+    db: Session = Depends(get_db)
+):
+    """Get the hotel-wide availability and rate grid."""
+    try:
+        inventory_service = InventoryService(db)
+        return inventory_service.get_calendar_grid(*_calendar_range(start_date, end_date), room_type)
+        
+    except ValueError as e:
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "error": "Invalid request",
+                "details": str(e)
+            }
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail={
+                "error": "Server error",
+                "details": "An unexpected error occurred while building the calendar"
+            }
+        )
@@ -0,0 +1,124 @@
+"""Booking links API router."""
+
+from datetime import datetime, timezone
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+
+from ..database import get_db
+from ..links import InvalidLinkToken, verify_link
+from ..schemas import BookHoldRequest, BookingLinkResponse, BookingResponse, ErrorResponse
+from ..services import BookingService
+
+router = APIRouter(prefix="/api", tags=["links"])
+
+
+def _link_error(e: InvalidLinkToken) -> HTTPException:
+    """Map a token failure to an HTTP error."""
+    error_msg = str(e)
+    
+    if "expired" in error_msg:
+        return HTTPException(
+            status_code=410,
+            detail={
+                "error": "Link expired",
+                "details": error_msg
+            }
+        )
+    return HTTPException(
+        status_code=400,
+        detail={
+            "error": "Invalid link",
+            "details": error_msg
+        }
+    )
+
+
+@router.get(
+    "/links/{token}",
+    response_model=BookingLinkResponse,
+    responses={
+        400: {"model": ErrorResponse, "description": "Invalid link"},
+        410: {"model": ErrorResponse, "description": "Link expired"}
+    },
+    summary="Open Booking Link",
+    description="Verify a booking link and return its offer, without touching the database."
+)
+async def open_booking_link(token: str):
+    """Decode a signed booking link."""
+    try:
+        link = verify_link(token)
+    except InvalidLinkToken as e:
+        raise _link_error(e)
+    
+    return BookingLinkResponse(
+        hotel_code=link.hotel_code,
+        room_id=link.room_id,
+        check_in_date=link.check_in_date,
+        check_out_date=link.check_out_date,
+        guest_count=link.guest_count,
+        quoted_total=link.quoted_total,
+        expires_at=datetime.fromtimestamp(link.expires_at, tz=timezone.utc)
+    )
+
+
+@router.post(
+    "/links/{token}/book",
+    response_model=BookingResponse,
+    responses={
+        400: {"model": ErrorResponse, "description": "Invalid link or request"},
+        404: {"model": ErrorResponse, "description": "Offer no longer held"},
+        409: {"model": ErrorResponse, "description": "Room not available"},
+        410: {"model": ErrorResponse, "description": "Link expired"},
+        500: {"model": ErrorResponse, "description": "Server error"}
+    },
+    summary="Book From Link",
+    description="Book the offer of a booking link at its quoted price."
+)
+async def book_from_link(
+    token: str,
+    request: BookHoldRequest,
+    db: Session = Depends(get_db)
+):
+    """Book the offer of a signed booking link."""
+    try:
+        link = verify_link(token)
+        booking_service = BookingService(db)
+        return booking_service.book_link(link, request)
+        
+    except InvalidLinkToken as e:
+        raise _link_error(e)
+    except ValueError as e:
+        error_msg = str(e)
+        
+        if "not found" in error_msg:
+            raise HTTPException(
+                status_code=404,
+                detail={
+                    "error": "Offer not found",
+                    "details": error_msg
+                }
+            )
+        elif "not available" in error_msg:
+            raise HTTPException(
+                status_code=409,
+                detail={
+                    "error": "Room not available",
+                    "details": error_msg
+                }
+            )
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "error": "Invalid request",
+                "details": error_msg
+            }
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail={
+                "error": "Server error",
+                "details": "An unexpected error occurred while booking from the link"
+            }
+        )
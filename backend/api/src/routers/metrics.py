@@ -0,0 +1,28 @@
+"""Runtime metrics API router."""
+
+from fastapi import APIRouter
+
+from ..admission import get_admission_controller
+from ..change_feed import get_change_feed
+from ..coalescing import get_availability_flight
+from ..config import get_settings
+from ..schemas import MetricsResponse
+
+router = APIRouter(prefix="/api", tags=["metrics"])
+settings = get_settings()
+
+
+@router.get(
+    "/metrics",
+    response_model=MetricsResponse,
+    summary="Get Runtime Metrics",
+    description="In-process counters for this API worker."
+)
+async def get_metrics():
+    """Get runtime metrics for this worker."""
+    feed = get_change_feed()
+    return MetricsResponse(
+        coalescing=get_availability_flight().stats(),
+        admission=get_admission_controller().stats() if settings.admission_control else {},
+        change_feed=feed.stats() if feed is not None else None
+    )
@@ -0,0 +1,76 @@
+"""Hotel properties API router."""
+
+from fastapi import APIRouter, HTTPException
+
+from ..properties import list_hotels, search_properties
+from ..schemas import ErrorResponse, HotelsResponse, PropertyAvailabilityRequest, PropertyAvailabilityResponse
+
+router = APIRouter(prefix="/api", tags=["properties"])
+
+
+@router.get(
+    "/properties",
+    response_model=HotelsResponse,
+    responses={
+        500: {"model": ErrorResponse, "description": "Server error"}
+    },
+    summary="List Hotel Properties",
+    description="Every hotel property; send its code as X-Hotel-Code to route other endpoints to it."
+)
+async def get_properties():
+    """List hotel properties."""
+    try:
+        return await list_hotels()
+        
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail={
+                "error": "Server error",
+                "details": "An unexpected error occurred while listing hotels"
+            }
+        )
+
+
+@router.post(
+    "/properties/availability",
+    response_model=PropertyAvailabilityResponse,
+    responses={
+        400: {"model": ErrorResponse, "description": "Invalid request"},
+        404: {"model": ErrorResponse, "description": "Hotel not found"},
+        500: {"model": ErrorResponse, "description": "Server error"}
+    },
+    summary="Check Availability Across Hotels",
+    description="Search several hotel properties concurrently and merge the available rooms. "
+                "Hotels that fail or time out are reported per hotel instead of failing the search."
+)
+async def check_property_availability(request: PropertyAvailabilityRequest):
+    """Check room availability across hotel properties."""
+    try:
+        return await search_properties(request)
+        
+    except ValueError as e:
+        error_msg = str(e)
+        if "not found" in error_msg:
+            raise HTTPException(
+                status_code=404,
+                detail={
+                    "error": "Not found",
+                    "details": error_msg
+                }
+            )
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "error": "Invalid request",
+                "details": error_msg
+            }
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail={
+                "error": "Server error",
+                "details": "An unexpected error occurred while checking availability"
+            }
+        )
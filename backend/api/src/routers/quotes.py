@@ -0,0 +1,58 @@
+"""Quotes API router."""
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+
+from ..database import get_db
+from ..schemas import QuoteRequest, QuoteResponse, ErrorResponse
+from ..services import QuoteService
+
+router = APIRouter(prefix="/api", tags=["quotes"])
+
+
+@router.post(
+    "/quotes",
+    response_model=QuoteResponse,
+    responses={
+        400: {"model": ErrorResponse, "description": "Invalid request"},
+        404: {"model": ErrorResponse, "description": "Room not found"},
+        500: {"model": ErrorResponse, "description": "Server error"}
+    },
+    summary="Quote Stays",
+    description="Get per-night and total prices for a stay across many rooms in one call."
+)
+async def get_quotes(
+    request: QuoteRequest,
+    db: Session = Depends(get_db)
+):
+    """Quote a stay for a set of rooms."""
+    try:
+        quote_service = QuoteService(db)
+        return quote_service.get_quotes(request)
+        
+    except ValueError as e:
+        error_msg = str(e)
+        
+        if "not found" in error_msg:
+            raise HTTPException(
+                status_code=404,
+                detail={
+                    "error": "Room not found",
+                    "details": error_msg
+                }
+            )
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "error": "Invalid request",
+                "details": error_msg
+            }
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail={
+                "error": "Server error",
+                "details": "An unexpected error occurred while quoting"
+            }
+        )
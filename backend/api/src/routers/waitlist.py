@@ -0,0 +1,124 @@
+"""Waitlist API router."""
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+
+from ..database import get_db
+from ..schemas import ErrorResponse, WaitlistEntryResponse, WaitlistRequest
+from ..services import WaitlistService
+
+router = APIRouter(prefix="/api", tags=["waitlist"])
+
+
+def _waitlist_error(e: ValueError) -> HTTPException:
+    """Map a waitlist failure to an HTTP error."""
+    error_msg = str(e)
+    
+    if "not found" in error_msg:
+        return HTTPException(
+            status_code=404,
+            detail={
+                "error": "Not found",
+                "details": error_msg
+            }
+        )
+    return HTTPException(
+        status_code=400,
+        detail={
+            "error": "Invalid request",
+            "details": error_msg
+        }
+    )
+
+
+@router.post(
+    "/waitlist",
+    response_model=WaitlistEntryResponse,
+    responses={
+        400: {"model": ErrorResponse, "description": "Invalid request"},
+        500: {"model": ErrorResponse, "description": "Server error"}
+    },
+    summary="Join Waitlist",
+    description="Wait for a stay that cannot be met now; a waitlist_matched event is emitted when released inventory satisfies it."
+)
+async def join_waitlist(
+    request: WaitlistRequest,
+    db: Session = Depends(get_db)
+):
+    """Create a waitlist entry."""
+    try:
+        waitlist_service = WaitlistService(db)
+        return waitlist_service.join_waitlist(request)
+    
+    except ValueError as e:
+        raise _waitlist_error(e)
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail={
+                "error": "Server error",
+                "details": "An unexpected error occurred while joining the waitlist"
+            }
+        )
+
+
+@router.get(
+    "/waitlist/{entry_id}",
+    response_model=WaitlistEntryResponse,
+    responses={
+        404: {"model": ErrorResponse, "description": "Waitlist entry not found"},
+        500: {"model": ErrorResponse, "description": "Server error"}
+    },
+    summary="Get Waitlist Entry",
+    description="Get a waitlist entry, including the rooms it matched."
+)
+async def get_waitlist_entry(
+    entry_id: int,
+    db: Session = Depends(get_db)
+):
+    """Get a waitlist entry."""
+    try:
+        waitlist_service = WaitlistService(db)
+        return waitlist_service.get_entry(entry_id)
+    
+    except ValueError as e:
+        raise _waitlist_error(e)
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail={
+                "error": "Server error",
+                "details": "An unexpected error occurred while retrieving the waitlist entry"
+            }
+        )
+
+
+@router.delete(
+    "/waitlist/{entry_id}",
+    response_model=WaitlistEntryResponse,
+    responses={
+        404: {"model": ErrorResponse, "description": "Waitlist entry not found"},
+        500: {"model": ErrorResponse, "description": "Server error"}
+    },
+    summary="Leave Waitlist",
+    description="Stop waiting for a stay. Entries that already matched are returned unchanged."
+)
+async def leave_waitlist(
+    entry_id: int,
+    db: Session = Depends(get_db)
+):
+    """Cancel a waitlist entry."""
+    try:
+        waitlist_service = WaitlistService(db)
+        return waitlist_service.leave_waitlist(entry_id)
+    
+    except ValueError as e:
+        raise _waitlist_error(e)
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail={
+                "error": "Server error",
+                "details": "An unexpected error occurred while leaving the waitlist"
+            }
+        )
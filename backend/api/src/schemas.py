@@ -6,9 +6,16 @@ from enum import Enum
 
 from pydantic import BaseModel, Field, validator
 
+from .amenities import normalize_amenity
 from .models import RoomType, ViewType, BookingStatus
 
 
+# Result orderings for availability searches
+SORT_BY_PRICE = "price"
+SORT_BY_BEST_MATCH = "best_match"
+SORT_ORDERS = (SORT_BY_PRICE, SORT_BY_BEST_MATCH)
+
+
 # Request schemas (matching NLP expectations)
 class AvailabilityRequest(BaseModel):
     """Room availability request schema."""
@@ -17,6 +24,11 @@ class AvailabilityRequest(BaseModel):
     room_count: int = Field(..., ge=1, le=10, description="Number of rooms needed")
     max_budget: Optional[float] = Field(None, gt=0, description="Maximum budget per room per night")
     view_preference: Optional[str] = Field(None, description="Preferred view type")
+    amenities: Optional[List[str]] = Field(None, description="Amenities every room must have")
+    guest_count: Optional[int] = Field(None, ge=1, le=60, description="Guests the rooms must seat together")
+    nights: int = Field(1, ge=1, le=90, description="Length of stay, checked against stay restrictions")
+    special_requests: Optional[str] = Field(None, max_length=1000, description="Free-text wishes, used by best_match ranking")
+    sort_by: str = Field(SORT_BY_PRICE, description="'price' (cheapest first) or 'best_match' (preference ranking)")
     
     @validator('check_in_date')
     def validate_check_in_date(cls, v):
@@ -25,6 +37,28 @@ class AvailabilityRequest(BaseModel):
             raise ValueError("Check-in date cannot be in the past")
         return v
     
+    @validator('amenities')
+    def validate_amenities(cls, v):
+        """Normalize amenity names to vocabulary codes."""
+        if v is None:
+            return v
+        codes = []
+        for name in v:
+            code = normalize_amenity(name)
+            if code is None:
+                raise ValueError(f"Unknown amenity: {name}")
+            if code not in codes:
+                codes.append(code)
+        return codes
+    
+    @validator('sort_by')
+    def validate_sort_by(cls, v):
+        """Validate the result ordering."""
+        v = v.strip().lower()
+        if v not in SORT_ORDERS:
+            raise ValueError(f"sort_by must be one of: {', '.join(SORT_ORDERS)}")
+        return v
+    
     class Config:
         """Pydantic configuration."""
         schema_extra = {
@@ -32,7 +66,12 @@ class AvailabilityRequest(BaseModel):
                 "check_in_date": "2025-08-15",
                 "room_count": 2,
                 "max_budget": 150.0,
-                "view_preference": "ocean"
+                "view_preference": "ocean",
+                "amenities": ["jacuzzi", "balcony"],
+                "guest_count": 5,
+                "nights": 3,
+                "special_requests": "Quiet room with a hot tub if possible",
+                "sort_by": "best_match"
             }
         }
 
@@ -55,6 +94,7 @@ class RoomResponse(BaseModel):
     has_balcony: Optional[bool] = Field(None, description="Has balcony")
     has_kitchenette: Optional[bool] = Field(None, description="Has kitchenette")
     has_jacuzzi: Optional[bool] = Field(None, description="Has jacuzzi")
+    match_score: Optional[float] = Field(None, description="Preference match in [0, 1] when sorted by best match")
     
     class Config:
         """Pydantic configuration."""
@@ -94,11 +134,27 @@ class AlternativeDateResponse(BaseModel):
         }
 
 
+class RoomSetResponse(BaseModel):
+    """A ranked combination of rooms for a multi-room request."""
+    
+    rooms: List[RoomResponse] = Field(..., description="Rooms in the set")
+    total_price_per_night: float = Field(..., description="Combined price per night in USD")
+    total_occupancy: int = Field(..., description="Guests the rooms seat together")
+    floors: List[int] = Field(default_factory=list, description="Floors the rooms are on")
+    views: List[str] = Field(default_factory=list, description="Views of the rooms")
+    adjacent: bool = Field(..., description="All rooms are side by side on one floor")
+    score: float = Field(..., description="Ranking score: price plus floor, view and spacing penalties (lower is better)")
+
+
 class AvailabilityResponse(BaseModel):
     """Room availability response schema (matching NLP expectations)."""
     
     available_rooms: List[RoomResponse] = Field(default_factory=list, description="Available rooms")
     total_count: int = Field(..., ge=0, description="Total number of available rooms")
+    room_sets: List[RoomSetResponse] = Field(
+        default_factory=list,
+        description="Best combinations of rooms for multi-room requests, best first"
+    )
     suggested_alternatives: List[AlternativeDateResponse] = Field(
         default_factory=list, 
         description="Alternative dates/options if limited availability"
@@ -133,6 +189,21 @@ class AvailabilityResponse(BaseModel):
         }
 
 
+class AvailabilityPageRequest(AvailabilityRequest):
+    """Price-ordered, keyset-paginated availability search."""
+    
+    cursor: Optional[str] = Field(None, description="next_cursor from the previous page")
+    limit: int = Field(10, ge=1, le=100, description="Rooms per page")
+
+
+class AvailabilityPageResponse(BaseModel):
+    """One page of available rooms, cheapest first."""
+    
+    available_rooms: List[RoomResponse] = Field(default_factory=list, description="Available rooms on this page")
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page, if any")
+    has_more: bool = Field(..., description="Whether more rooms follow this page")
+
+
 class RoomTypeInfo(BaseModel):
     """Room type information schema."""
     
@@ -269,6 +340,7 @@ class BookingResponse(BaseModel):
     status: str = Field(..., description="Booking status")
     special_requests: Optional[str] = Field(None, description="Special requests")
     created_at: datetime = Field(..., description="Booking creation timestamp")
+    cancelled_at: Optional[datetime] = Field(None, description="Cancellation timestamp")
     
     class Config:
         """Pydantic configuration."""
@@ -289,6 +361,562 @@ class BookingResponse(BaseModel):
         }
 
 
+class CustomerBookingsResponse(BaseModel):
+    """One page of a customer's bookings, newest first."""
+    
+    customer_email: str = Field(..., description="Customer email")
+    bookings: List[BookingResponse] = Field(default_factory=list, description="Bookings on this page")
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page, if any")
+    has_more: bool = Field(..., description="Whether older bookings follow this page")
+
+
+class ModifyBookingRequest(BaseModel):
+    """Change booking dates request schema."""
+    
+    check_in_date: date = Field(..., description="New check-in date")
+    check_out_date: date = Field(..., description="New check-out date")
+    
+    @validator('check_out_date')
+    def validate_check_out_after_check_in(cls, v, values):
+        """Validate check-out date is after check-in date."""
+        if 'check_in_date' in values and v <= values['check_in_date']:
+            raise ValueError("Check-out date must be after check-in date")
+        return v
+    
+    class Config:
+        """Pydantic configuration."""
+        schema_extra = {
+            "example": {
+                "check_in_date": "2025-08-16",
+                "check_out_date": "2025-08-19"
+            }
+        }
+
+
+# Hold schemas
+class CreateHoldRequest(BaseModel):
+    """Hold a quoted room while a booking link is outstanding."""
+    
+    room_id: int = Field(..., description="Room ID to hold")
+    check_in_date: date = Field(..., description="Check-in date")
+    check_out_date: date = Field(..., description="Check-out date")
+    guest_count: int = Field(1, ge=1, le=10, description="Number of guests")
+    customer_email: Optional[str] = Field(None, description="Guest the link was sent to")
+    ttl_minutes: Optional[int] = Field(None, ge=1, le=1440, description="Hold duration (defaults to HOLD_TTL_MINUTES)")
+    
+    @validator('check_out_date')
+    def validate_check_out_after_check_in(cls, v, values):
+        """Validate check-out date is after check-in date."""
+        if 'check_in_date' in values and v <= values['check_in_date']:
+            raise ValueError("Check-out date must be after check-in date")
+        return v
+    
+    class Config:
+        """Pydantic configuration."""
+        schema_extra = {
+            "example": {
+                "room_id": 7,
+                "check_in_date": "2025-08-15",
+                "check_out_date": "2025-08-17",
+                "guest_count": 2,
+                "customer_email": "john.doe@example.com"
+            }
+        }
+
+
+class HoldResponse(BaseModel):
+    """Inventory hold response schema."""
+    
+    hold_token: str = Field(..., description="Token identifying the hold")
+    link_token: str = Field(..., description="Signed token for the booking link (see /api/links)")
+    room_id: int = Field(..., description="Room ID")
+    room_number: str = Field(..., description="Room number")
+    check_in_date: date = Field(..., description="Check-in date")
+    check_out_date: date = Field(..., description="Check-out date")
+    guest_count: int = Field(..., description="Number of guests")
+    quoted_total: float = Field(..., description="Whole-stay price honoured until expiry")
+    customer_email: Optional[str] = Field(None, description="Guest the link was sent to")
+    expires_at: datetime = Field(..., description="When the room goes back on sale")
+
+
+class BookingLinkResponse(BaseModel):
+    """Offer carried by a verified booking link."""
+    
+    hotel_code: str = Field(..., description="Hotel the offer is for (send it as X-Hotel-Code to book)")
+    room_id: int = Field(..., description="Room ID")
+    check_in_date: date = Field(..., description="Check-in date")
+    check_out_date: date = Field(..., description="Check-out date")
+    guest_count: int = Field(..., description="Number of guests")
+    quoted_total: float = Field(..., description="Whole-stay price")
+    expires_at: datetime = Field(..., description="When the offer lapses")
+
+
+class BookHoldRequest(BaseModel):
+    """Convert a hold into a booking."""
+    
+    customer_email: Optional[str] = Field(None, description="Customer email (defaults to the hold's)")
+    special_requests: Optional[str] = Field(None, description="Special requests")
+
+
+# Waitlist schemas
+class WaitlistRequest(BaseModel):
+    """Join the waitlist with an availability request that could not be met."""
+    
+    check_in_date: date = Field(..., description="Check-in date")
+    check_out_date: date = Field(..., description="Check-out date")
+    room_count: int = Field(1, ge=1, le=10, description="Number of rooms needed")
+    max_budget: Optional[float] = Field(None, gt=0, description="Maximum budget per room per night")
+    view_preference: Optional[str] = Field(None, description="Required view type")
+    customer_email: Optional[str] = Field(None, description="Guest to notify when rooms free up")
+    
+    @validator('check_in_date')
+    def validate_check_in_date(cls, v):
+        """Validate check-in date is not in the past."""
+        if v < date.today():
+            raise ValueError("Check-in date cannot be in the past")
+        return v
+    
+    @validator('check_out_date')
+    def validate_check_out_after_check_in(cls, v, values):
+        """Validate check-out date is after check-in date."""
+        if 'check_in_date' in values and v <= values['check_in_date']:
+            raise ValueError("Check-out date must be after check-in date")
+        return v
+    
+    class Config:
+        """Pydantic configuration."""
+        schema_extra = {
+            "example": {
+                "check_in_date": "2025-08-15",
+                "check_out_date": "2025-08-17",
+                "room_count": 2,
+                "max_budget": 200.0,
+                "view_preference": "ocean",
+                "customer_email": "john.doe@example.com"
+            }
+        }
+
+
+class WaitlistEntryResponse(BaseModel):
+    """Waitlist entry response schema."""
+    
+    id: int = Field(..., description="Waitlist entry ID")
+    status: str = Field(..., description="waiting, matched or cancelled")
+    check_in_date: date = Field(..., description="Check-in date")
+    check_out_date: date = Field(..., description="Check-out date")
+    room_count: int = Field(..., description="Number of rooms needed")
+    max_budget: Optional[float] = Field(None, description="Maximum budget per room per night")
+    view_type: Optional[str] = Field(None, description="Required view type")
+    customer_email: Optional[str] = Field(None, description="Guest to notify")
+    matched_room_ids: List[int] = Field(default_factory=list, description="Rooms that were free when the entry matched")
+    created_at: Optional[datetime] = Field(None, description="When the entry was added")
+    matched_at: Optional[datetime] = Field(None, description="When released inventory matched the entry")
+
+
+# Multi-property schemas
+class HotelResponse(BaseModel):
+    """Hotel property response schema."""
+    
+    code: str = Field(..., description="Hotel code (X-Hotel-Code routes requests to it)")
+    name: str = Field(..., description="Hotel name")
+    location: Optional[str] = Field(None, description="Hotel location")
+    timezone: Optional[str] = Field(None, description="Hotel timezone")
+
+
+class HotelsResponse(BaseModel):
+    """Every hotel property."""
+    
+    hotels: List[HotelResponse] = Field(default_factory=list, description="Hotels, the application database's first")
+
+
+class PropertyAvailabilityRequest(AvailabilityRequest):
+    """Availability search across several hotel properties."""
+    
+    hotel_codes: Optional[List[str]] = Field(None, description="Hotels to search (every hotel when omitted)")
+    
+    @validator('hotel_codes')
+    def validate_hotel_codes(cls, v):
+        """Normalize codes and drop duplicates, keeping order."""
+        if v is None:
+            return v
+        codes = list(dict.fromkeys(code.strip().lower() for code in v if code.strip()))
+        if not codes:
+            raise ValueError("At least one hotel code is required")
+        return codes
+    
+    class Config:
+        """Pydantic configuration."""
+        schema_extra = {
+            "example": {
+                "check_in_date": "2025-08-15",
+                "room_count": 1,
+                "max_budget": 200.0,
+                "view_preference": "ocean",
+                "hotel_codes": ["staydesk", "harbor"]
+            }
+        }
+
+
+class PropertyRoomResponse(RoomResponse):
+    """An available room and the hotel it belongs to."""
+    
+    hotel_code: str = Field(..., description="Hotel code")
+    hotel_name: str = Field(..., description="Hotel name")
+
+
+class PropertySearchResult(BaseModel):
+    """How one hotel's part of a cross-property search went."""
+    
+    hotel_code: str = Field(..., description="Hotel code")
+    hotel_name: Optional[str] = Field(None, description="Hotel name (absent when the search failed)")
+    location: Optional[str] = Field(None, description="Hotel location")
+    total_count: int = Field(0, ge=0, description="Available rooms at this hotel")
+    elapsed_ms: float = Field(..., ge=0, description="Time this hotel took")
+    error: Optional[str] = Field(None, description="Why this hotel returned no rooms, if it failed or timed out")
+
+
+class PropertyAvailabilityResponse(BaseModel):
+    """Availability merged across hotel properties."""
+    
+    available_rooms: List[PropertyRoomResponse] = Field(
+        default_factory=list, description="Rooms from every hotel, in the requested sort order"
+    )
+    total_count: int = Field(..., ge=0, description="Available rooms across hotels")
+    properties: List[PropertySearchResult] = Field(default_factory=list, description="Per-hotel results, in request order")
+
+
+# Quote schemas
+class QuoteRequest(BaseModel):
+    """Whole-stay quote request schema."""
+    
+    check_in_date: date = Field(..., description="Check-in date")
+    check_out_date: date = Field(..., description="Check-out date")
+    room_ids: Optional[List[int]] = Field(None, description="Rooms to quote (all active rooms if omitted)")
+    only_available: bool = Field(False, description="Only return rooms bookable for every night")
+    
+    @validator('check_out_date')
+    def validate_stay_length(cls, v, values):
+        """Validate check-out is after check-in and the stay is not excessively long."""
+        if 'check_in_date' in values:
+            nights = (v - values['check_in_date']).days
+            if nights <= 0:
+                raise ValueError("Check-out date must be after check-in date")
+            if nights > 90:
+                raise ValueError("Quotes are limited to 90 nights")
+        return v
+    
+    class Config:
+        """Pydantic configuration."""
+        schema_extra = {
+            "example": {
+                "check_in_date": "2025-08-15",
+                "check_out_date": "2025-08-18",
+                "room_ids": [1, 2, 7],
+                "only_available": True
+            }
+        }
+
+
+class RoomQuoteResponse(BaseModel):
+    """Whole-stay quote for one room."""
+    
+    room_id: int = Field(..., description="Room ID")
+    room_number: str = Field(..., description="Room number")
+    nightly_prices: List[float] = Field(..., description="Price for each night, aligned with dates")
+    total_price: float = Field(..., description="Total price for the stay")
+    available: bool = Field(..., description="Whether the room is bookable for every night")
+
+
+class QuoteResponse(BaseModel):
+    """Whole-stay quote response schema."""
+    
+    check_in_date: date = Field(..., description="Check-in date")
+    check_out_date: date = Field(..., description="Check-out date")
+    dates: List[date] = Field(..., description="Nights covered by the quote")
+    quotes: List[RoomQuoteResponse] = Field(default_factory=list, description="Per-room quotes")
+    
+    class Config:
+        """Pydantic configuration."""
+        schema_extra = {
+            "example": {
+                "check_in_date": "2025-08-15",
+                "check_out_date": "2025-08-17",
+                "dates": ["2025-08-15", "2025-08-16"],
+                "quotes": [
+                    {
+                        "room_id": 7,
+                        "room_number": "105",
+                        "nightly_prices": [80.0, 95.0],
+                        "total_price": 175.0,
+                        "available": True
+                    }
+                ]
+            }
+        }
+
+
+# Inventory schemas
+class InventoryUpdateItem(BaseModel):
+    """One rate/availability change applied to many room-dates."""
+    
+    room_ids: Optional[List[int]] = Field(None, description="Rooms to update")
+    room_type: Optional[RoomType] = Field(None, description="Update every active room of this type")
+    start_date: Optional[date] = Field(None, description="First date of the range (inclusive)")
+    end_date: Optional[date] = Field(None, description="Last date of the range (inclusive)")
+    dates: Optional[List[date]] = Field(None, description="Explicit dates (instead of a range)")
+    price_override: Optional[float] = Field(None, ge=0, description="Nightly price override; 0 clears it")
+    is_available: Optional[bool] = Field(None, description="Open or close the room-dates for sale")
+    is_maintenance: Optional[bool] = Field(None, description="Mark the room-dates as under maintenance")
+    notes: Optional[str] = Field(None, description="Notes stored with the room-dates")
+    
+    @validator('notes', always=True)
+    def validate_targets(cls, v, values):
+        """Validate that rooms, dates and at least one change are given."""
+        if not values.get('room_ids') and values.get('room_type') is None:
+            raise ValueError("Either room_ids or room_type is required")
+        has_range = values.get('start_date') is not None and values.get('end_date') is not None
+        if not has_range and not values.get('dates'):
+            raise ValueError("Either start_date/end_date or dates is required")
+        if has_range and values['end_date'] < values['start_date']:
+            raise ValueError("end_date must not be before start_date")
+        changes = ('price_override', 'is_available', 'is_maintenance')
+        if v is None and all(values.get(field) is None for field in changes):
+            raise ValueError("At least one of price_override, is_available, is_maintenance or notes is required")
+        return v
+
+
+class BulkInventoryUpdateRequest(BaseModel):
+    """Bulk rate and availability update request schema."""
+    
+    updates: List[InventoryUpdateItem] = Field(..., min_length=1, description="Changes, applied in order")
+    
+    class Config:
+        """Pydantic configuration."""
+        schema_extra = {
+            "example": {
+                "updates": [
+                    {
+                        "room_type": "suite",
+                        "start_date": "2025-12-20",
+                        "end_date": "2026-01-02",
+                        "price_override": 320.0,
+                        "notes": "Holiday pricing"
+                    },
+                    {
+                        "room_ids": [4, 5],
+                        "dates": ["2025-09-03"],
+                        "is_available": False,
+                        "is_maintenance": True
+                    }
+                ]
+            }
+        }
+
+
+class BulkInventoryUpdateResponse(BaseModel):
+    """Bulk rate and availability update response schema."""
+    
+    updates_applied: int = Field(..., description="Number of update items applied")
+    room_dates: int = Field(..., description="Number of room-date cells written")
+    processing_time_ms: float = Field(..., description="Time spent applying the updates")
+
+
+class RoomCalendarResponse(BaseModel):
+    """Columnar availability and rate calendar for one room."""
+    
+    room_id: int = Field(..., description="Room ID")
+    room_number: str = Field(..., description="Room number")
+    dates: List[date] = Field(..., description="Calendar dates")
+    status: List[int] = Field(..., description="Status code per date (see status_legend)")
+    prices: List[float] = Field(..., description="Nightly price per date")
+    status_legend: Dict[int, str] = Field(..., description="Meaning of the status codes")
+    
+    class Config:
+        """Pydantic configuration."""
+        schema_extra = {
+            "example": {
+                "room_id": 1,
+                "room_number": "101",
+                "dates": ["2025-08-15", "2025-08-16", "2025-08-17"],
+                "status": [0, 1, 1],
+                "prices": [180.0, 220.0, 220.0],
+                "status_legend": {"0": "available", "1": "booked", "2": "closed", "3": "maintenance"}
+            }
+        }
+
+
+class CalendarGridResponse(BaseModel):
+    """Columnar hotel-wide availability and rate grid (one row per room)."""
+    
+    dates: List[date] = Field(..., description="Calendar dates (columns)")
+    room_ids: List[int] = Field(..., description="Room IDs (rows)")
+    room_numbers: List[str] = Field(..., description="Room numbers (rows)")
+    status: List[List[int]] = Field(..., description="Status codes, one list per room")
+    prices: List[List[float]] = Field(..., description="Nightly prices, one list per room")
+    status_legend: Dict[int, str] = Field(..., description="Meaning of the status codes")
+
+
+class ARIRun(BaseModel):
+    """Consecutive nights of one room with the same status and price."""
+    
+    start_date: date = Field(..., description="First night of the run")
+    nights: int = Field(..., description="Number of consecutive nights")
+    status: int = Field(..., description="Status code (see status_legend)")
+    price: float = Field(..., description="Nightly price")
+
+
+class ARIRoomDelta(BaseModel):
+    """Changed availability and rates for one room, run-length encoded."""
+    
+    room_id: int = Field(..., description="Room ID")
+    room_number: str = Field(..., description="Room number")
+    runs: List[ARIRun] = Field(..., description="Runs in date order")
+
+
+class ARIDeltaResponse(BaseModel):
+    """Availability, rates and inventory changed since a version."""
+    
+    since: int = Field(..., description="Version the delta starts from")
+    version: int = Field(..., description="Pass as since on the next sync")
+    full_sync: bool = Field(..., description="Rooms hold the full horizon; replace local state instead of merging")
+    has_more: bool = Field(..., description="Whether more changes are already available")
+    rooms: List[ARIRoomDelta] = Field(default_factory=list, description="Rooms with changed nights")
+    status_legend: Dict[int, str] = Field(..., description="Meaning of the status codes")
+    
+    class Config:
+        """Pydantic configuration."""
+        schema_extra = {
+            "example": {
+                "since": 40,
+                "version": 42,
+                "full_sync": False,
+                "has_more": False,
+                "rooms": [
+                    {
+                        "room_id": 7,
+                        "room_number": "203",
+                        "runs": [
+                            {"start_date": "2025-08-15", "nights": 3, "status": 1, "price": 220.0}
+                        ]
+                    }
+                ],
+                "status_legend": {"0": "available", "1": "booked", "2": "closed", "3": "maintenance"}
+            }
+        }
+
+
+class StayRestrictionRequest(BaseModel):
+    """Min stay and closed to arrival/departure rule for a date range."""
+    
+    room_type: Optional[RoomType] = Field(None, description="Room type the rule applies to (every type if omitted)")
+    start_date: date = Field(..., description="First date of the range (inclusive)")
+    end_date: date = Field(..., description="Last date of the range (inclusive)")
+    weekdays: Optional[List[int]] = Field(None, description="Days of the week the rule applies on (0 = Monday; all if omitted)")
+    min_stay: Optional[int] = Field(None, ge=1, le=30, description="Minimum nights for arrivals on these dates")
+    closed_to_arrival: bool = Field(False, description="No check-ins on these dates")
+    closed_to_departure: bool = Field(False, description="No check-outs on these dates")
+    notes: Optional[str] = Field(None, description="Why the rule exists")
+    
+    @validator('weekdays')
+    def validate_weekdays(cls, v):
+        """Validate weekday numbers."""
+        if v is not None and (not v or any(day < 0 or day > 6 for day in v)):
+            raise ValueError("weekdays must be a non-empty list of numbers from 0 (Monday) to 6 (Sunday)")
+        return v
+    
+    @validator('notes', always=True)
+    def validate_rule(cls, v, values):
+        """Validate the date range and that the rule restricts something."""
+        if 'start_date' in values and 'end_date' in values and values['end_date'] < values['start_date']:
+            raise ValueError("end_date must not be before start_date")
+        restricts = (
+            (values.get('min_stay') or 1) > 1
+            or values.get('closed_to_arrival')
+            or values.get('closed_to_departure')
+        )
+        if not restricts:
+            raise ValueError("At least one of min_stay (over 1 night), closed_to_arrival or closed_to_departure is required")
+        return v
+    
+    class Config:
+        """Pydantic configuration."""
+        schema_extra = {
+            "example": {
+                "room_type": "suite",
+                "start_date": "2025-12-20",
+                "end_date": "2026-01-02",
+                "weekdays": [4, 5],
+                "min_stay": 3,
+                "closed_to_arrival": False,
+                "closed_to_departure": False,
+                "notes": "Holiday weekends"
+            }
+        }
+
+
+class StayRestrictionResponse(BaseModel):
+    """A stored stay restriction rule."""
+    
+    id: int = Field(..., description="Rule ID")
+    room_type: Optional[RoomType] = Field(None, description="Room type (every type if null)")
+    start_date: date = Field(..., description="First date of the range (inclusive)")
+    end_date: date = Field(..., description="Last date of the range (inclusive)")
+    weekdays: List[int] = Field(..., description="Days of the week the rule applies on (0 = Monday)")
+    min_stay: Optional[int] = Field(None, description="Minimum nights for arrivals on these dates")
+    closed_to_arrival: bool = Field(..., description="No check-ins on these dates")
+    closed_to_departure: bool = Field(..., description="No check-outs on these dates")
+    notes: Optional[str] = Field(None, description="Why the rule exists")
+
+
+class StayRestrictionsResponse(BaseModel):
+    """Stay restriction rules overlapping a date range."""
+    
+    restrictions: List[StayRestrictionResponse] = Field(default_factory=list, description="Rules, by start date")
+
+
+class InventoryEventResponse(BaseModel):
+    """One entry of the inventory event log."""
+    
+    sequence: int = Field(..., description="Monotonically increasing sequence number")
+    kind: str = Field(..., description="booking_created, booking_cancelled, overrides_changed, catalog_changed, waitlist_matched, ...")
+    room_ids: List[int] = Field(default_factory=list, description="Affected rooms (empty means all)")
+    start_date: Optional[date] = Field(None, description="First affected date (None means all)")
+    end_date: Optional[date] = Field(None, description="Day after the last affected date")
+    created_at: datetime = Field(..., description="When the change was committed")
+    waitlist_entry_id: Optional[int] = Field(None, description="Matched waitlist entry (waitlist_matched events)")
+
+
+class InventoryEventsResponse(BaseModel):
+    """Inventory events after a sequence number."""
+    
+    events: List[InventoryEventResponse] = Field(default_factory=list, description="Events in sequence order")
+    last_sequence: int = Field(..., description="Pass as since to continue")
+    has_more: bool = Field(..., description="Whether more events are already available")
+    reset_required: bool = Field(
+        False, description="Events after since were pruned; reload full state, then continue from last_sequence"
+    )
+    
+    class Config:
+        """Pydantic configuration."""
+        schema_extra = {
+            "example": {
+                "events": [
+                    {
+                        "sequence": 42,
+                        "kind": "booking_created",
+                        "room_ids": [7],
+                        "start_date": "2025-08-15",
+                        "end_date": "2025-08-18",
+                        "created_at": "2025-08-01T12:00:00Z"
+                    }
+                ],
+                "last_sequence": 42,
+                "has_more": False,
+                "reset_required": False
+            }
+        }
+
+
 # Statistics and monitoring schemas
 class APIStatsResponse(BaseModel):
     """API statistics response schema."""
@@ -309,4 +937,54 @@ class APIStatsResponse(BaseModel):
                 "error_rate": 2.5,
                 "average_response_time_ms": 85.3
             }
-        } 
\ No newline at end of file
+        }
+
+
+class CoalescingMetrics(BaseModel):
+    """Single-flight coalescing counters for availability searches."""
+    
+    requests: int = Field(..., description="Searches received")
+    executions: int = Field(..., description="Searches actually computed")
+    coalesced: int = Field(..., description="Searches that awaited another search's result")
+    in_flight: int = Field(..., description="Computations currently running")
+    coalescing_ratio: float = Field(..., description="coalesced / requests")
+
+
+class AdmissionClassMetrics(BaseModel):
+    """Admission control limits and counters for one request class."""
+    
+    priority: int = Field(..., description="Lower is admitted first when saturated")
+    max_concurrent: int = Field(..., description="Concurrency limit")
+    max_queue: int = Field(..., description="Wait queue limit")
+    queue_timeout_ms: float = Field(..., description="Queueing-time budget")
+    active: int = Field(..., description="Requests currently running")
+    queued: int = Field(..., description="Requests currently waiting")
+    admitted: int = Field(..., description="Requests admitted")
+    rejected: int = Field(..., description="Requests shed with 503")
+    timed_out: int = Field(..., description="Rejections due to the queueing-time budget")
+    avg_queue_ms: float = Field(..., description="Average wait of admitted requests")
+
+
+class ChangeFeedMetrics(BaseModel):
+    """Cross-worker change feed delivery counters."""
+    
+    worker_id: str = Field(..., description="This worker's id (host/pid)")
+    last_seen_id: int = Field(..., description="Last change table id applied")
+    received: int = Field(..., description="Other workers' changes applied")
+    missed: int = Field(..., description="Events lost to gaps in the id sequence")
+    resyncs: int = Field(..., description="Full cache resynchronizations after missed events")
+    polls: int = Field(..., description="Poll rounds")
+    errors: int = Field(..., description="Failed poll rounds")
+    latency_p50_ms: float = Field(..., description="Median commit-to-apply latency")
+    latency_p99_ms: float = Field(..., description="99th percentile commit-to-apply latency")
+    latency_max_ms: float = Field(..., description="Worst recent commit-to-apply latency")
+
+
+class MetricsResponse(BaseModel):
+    """Runtime metrics for one API worker."""
+    
+    coalescing: CoalescingMetrics = Field(..., description="Availability request coalescing")
+    admission: Dict[str, AdmissionClassMetrics] = Field(
+        default_factory=dict, description="Admission control per request class (empty when disabled)"
+    )
+    change_feed: Optional[ChangeFeedMetrics] = Field(None, description="Change feed (absent when not running)")
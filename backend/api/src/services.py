@@ -1,23 +1,122 @@
 """Business logic services for room availability and bookings."""
 
+import asyncio
+import base64
+import hmac
+import json
 import random
+import secrets
 import string
-from datetime import date, datetime, timedelta
-from typing import List, Optional, Tuple
+import time
+from datetime import date, datetime, timedelta, timezone
+from typing import AsyncIterator, Awaitable, Callable, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
 
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, func
+from sqlalchemy import and_, or_, case, func, literal, select
 
-from .models import Room, RoomAvailability, Booking, Customer, RoomType, ViewType, BookingStatus
+from .amenities import amenity_mask, amenity_mask_from_text, mask_to_codes
+from .models import (
+    Room, RoomAmenity, RoomAvailability, Booking, Customer, RoomType, ViewType, BookingStatus,
+    InventoryEvent, InventoryHold, StayRestriction, WaitlistEntry, WaitlistStatus, Hotel
+)
 from .schemas import (
-    AvailabilityRequest, AvailabilityResponse, RoomResponse, 
-    AlternativeDateResponse, CreateBookingRequest, BookingResponse,
-    HotelContextResponse, RoomTypeInfo, HotelPolicies
+    SORT_BY_BEST_MATCH, SORT_BY_PRICE,
+    AvailabilityRequest, AvailabilityResponse, RoomResponse, RoomSetResponse,
+    AvailabilityPageRequest, AvailabilityPageResponse,
+    AlternativeDateResponse, CreateBookingRequest, BookingResponse, ModifyBookingRequest,
+    CustomerBookingsResponse,
+    CreateHoldRequest, HoldResponse, BookHoldRequest,
+    WaitlistRequest, WaitlistEntryResponse, HotelResponse,
+    HotelContextResponse, RoomTypeInfo, HotelPolicies,
+    QuoteRequest, QuoteResponse, RoomQuoteResponse,
+    InventoryUpdateItem, BulkInventoryUpdateRequest, BulkInventoryUpdateResponse,
+    StayRestrictionRequest, StayRestrictionResponse, StayRestrictionsResponse,
+    RoomCalendarResponse, CalendarGridResponse,
+    InventoryEventResponse, InventoryEventsResponse,
+    ARIRun, ARIRoomDelta, ARIDeltaResponse
 )
 from .config import get_settings
+from .database import hotel_code_for
+from .allocation import AllocationCandidate, RoomSet, allocate_rooms
+from .catalog import get_room_catalog, room_type_display
+from .dynamic_pricing import get_price_cache
+from .change_feed import record_change
+from .invalidation import (
+    BOOKING_CANCELLED, BOOKING_CREATED, CELL_NEUTRAL_KINDS, HOLD_CREATED, HOLD_RELEASED, OCCUPANCY_KINDS,
+    OVERRIDES_CHANGED, RESTRICTIONS_CHANGED, InventoryChange, get_invalidation_bus
+)
+from .holds import get_hold_expiry
+from .links import BookingLink, hold_nonce, sign_link
+from .quotes import STATUS_LEGEND, QuoteEngine
+from .ranking import RankingPreferences, rank_rooms
+from .restrictions import get_restrictions, room_types_in
+from .snapshot import get_inventory_snapshot
+from .waitlist import WaitingRequest, get_waitlist_index
 
 settings = get_settings()
 
+# Map common view preferences to our enum values
+VIEW_PREFERENCE_MAPPING = {
+    'ocean': ViewType.OCEAN,
+    'sea': ViewType.OCEAN,
+    'water': ViewType.OCEAN,
+    'city': ViewType.CITY,
+    'garden': ViewType.GARDEN,
+    'pool': ViewType.POOL,
+    'mountain': ViewType.MOUNTAIN,
+}
+
+
+def amenity_filter_clause(required_mask: int):
+    """SQL filter for rooms having every amenity in the mask (uses the amenity index)."""
+    codes = mask_to_codes(required_mask)
+    return Room.id.in_(
+        select(RoomAmenity.room_id)
+        .where(RoomAmenity.amenity.in_(codes))
+        .group_by(RoomAmenity.room_id)
+        .having(func.count() == len(codes))
+    )
+
+
+def encode_cursor(check_date: date, price: float, room_id: int) -> str:
+    """Opaque keyset cursor for the position after (price, room_id) on a date."""
+    payload = json.dumps([check_date.isoformat(), price, room_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, check_date: date) -> Tuple[float, int]:
+    """Decode a cursor from :func:`encode_cursor`, checking it belongs to the date."""
+    try:
+        payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        cursor_date, price, room_id = json.loads(payload)
+        price, room_id = float(price), int(room_id)
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+    if cursor_date != check_date.isoformat():
+        raise ValueError("Cursor was issued for a different check-in date")
+    return price, room_id
+
+
+def encode_booking_cursor(customer_id: int, booking_id: int) -> str:
+    """Opaque keyset cursor for the position after a booking in a customer's history."""
+    payload = json.dumps([customer_id, booking_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_booking_cursor(cursor: str, customer_id: int) -> int:
+    """Decode a cursor from :func:`encode_booking_cursor`, checking it belongs to the customer."""
+    try:
+        payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        cursor_customer_id, booking_id = json.loads(payload)
+        cursor_customer_id, booking_id = int(cursor_customer_id), int(booking_id)
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+    if cursor_customer_id != customer_id:
+        raise ValueError("Cursor was issued for a different customer")
+    return booking_id
+
 
 class RoomService:
     """Service for room-related operations."""
@@ -27,64 +126,24 @@ class RoomService:
     
     def search_available_rooms(self, request: AvailabilityRequest) -> AvailabilityResponse:
         """Search for available rooms based on criteria."""
+        limit = self.result_limit(request)
         
-        # Base query for available rooms
-        query = (
-            self.db.query(Room)
-            .filter(Room.is_active == True)
-        )
-        
-        # Filter by view preference if specified
-        if request.view_preference:
-            view_preference_lower = request.view_preference.lower()
-            # Map common view preferences to our enum values
-            view_mapping = {
-                'ocean': ViewType.OCEAN,
-                'sea': ViewType.OCEAN,
-                'water': ViewType.OCEAN,
-                'city': ViewType.CITY,
-                'garden': ViewType.GARDEN,
-                'pool': ViewType.POOL,
-                'mountain': ViewType.MOUNTAIN,
-            }
-            
-            if view_preference_lower in view_mapping:
-                query = query.filter(Room.view_type == view_mapping[view_preference_lower])
-        
-        # Filter by budget if specified
-        if request.max_budget:
-            query = query.filter(
-                or_(
-                    Room.base_price <= request.max_budget,
-                    Room.weekend_price <= request.max_budget
-                )
+        if request.sort_by == SORT_BY_BEST_MATCH:
+            available_rooms, total_count = self._best_matching_rooms(request, limit)
+        else:
+            # Sort, limit and count in SQL; only the returned rooms get materialized
+            query, price = self._available_rooms_query(request)
+            query = query.add_columns(func.count().over()).order_by(price, Room.id).limit(limit)
+            rows = self.db.execute(query).all()
+            total_count = rows[0][2] if rows else 0
+            available_rooms = self._rows_to_responses(
+                [(room_id, room_price) for room_id, room_price, _ in rows], request.check_in_date
             )
         
-        # Check availability for the specific date
-        available_rooms = []
-        for room in query.all():
-            if self._is_room_available(room.id, request.check_in_date):
-                # Calculate price for the date
-                price = self._calculate_room_price(room, request.check_in_date)
-                
-                # Apply budget filter to calculated price
-                if request.max_budget and price > request.max_budget:
-                    continue
-                
-                # Convert to response format
-                room_response = self._room_to_response(room, request.check_in_date, price)
-                available_rooms.append(room_response)
-        
-        # Sort by price and limit results
-        available_rooms.sort(key=lambda r: r.price_per_night)
-        total_count = len(available_rooms)
-        
-        # Return top 10 rooms for the requested count
-        if request.room_count > 1:
-            # For multi-room requests, ensure we have enough rooms
-            available_rooms = available_rooms[:min(10, request.room_count * 2)]
-        else:
-            available_rooms = available_rooms[:10]
+        # Multi-room requests also get ranked combinations that seat the party
+        room_sets = []
+        if request.room_count > 1 and total_count >= request.room_count:
+            room_sets = self._allocate_room_sets(request)
         
         # Generate suggested alternatives if limited availability
         suggested_alternatives = []
@@ -102,10 +161,230 @@ class RoomService:
         return AvailabilityResponse(
             available_rooms=available_rooms,
             total_count=total_count,
+            room_sets=room_sets,
             suggested_alternatives=suggested_alternatives,
             message=message
         )
     
+    @staticmethod
+    def result_limit(request: AvailabilityRequest) -> int:
+        """How many rooms a search returns."""
+        # Return top 10 rooms for the requested count
+        if request.room_count > 1:
+            # For multi-room requests, ensure we have enough rooms
+            return min(10, request.room_count * 2)
+        return 10
+    
+    def search_available_rooms_page(self, request: AvailabilityPageRequest) -> AvailabilityPageResponse:
+        """One price-ordered page of available rooms, resuming after ``request.cursor``."""
+        if request.sort_by != SORT_BY_PRICE:
+            raise ValueError("Paginated search is ordered by price only")
+        after = decode_cursor(request.cursor, request.check_in_date) if request.cursor else None
+        
+        # Fetch one extra row to know whether another page follows
+        rows = self._available_room_rows(request, request.limit + 1, after)
+        has_more = len(rows) > request.limit
+        rows = rows[:request.limit]
+        
+        next_cursor = None
+        if has_more:
+            last_room_id, last_price = rows[-1]
+            next_cursor = encode_cursor(request.check_in_date, last_price, last_room_id)
+        
+        return AvailabilityPageResponse(
+            available_rooms=self._rows_to_responses(rows, request.check_in_date),
+            next_cursor=next_cursor,
+            has_more=has_more
+        )
+    
+    def stream_available_rooms(self, request: AvailabilityRequest, batch_size: int = 500) -> Iterator[RoomResponse]:
+        """Every available room, cheapest first, fetched in keyset batches."""
+        after = None
+        while True:
+            rows = self._available_room_rows(request, batch_size, after)
+            yield from self._rows_to_responses(rows, request.check_in_date)
+            if len(rows) < batch_size:
+                return
+            last_room_id, last_price = rows[-1]
+            after = (last_price, last_room_id)
+    
+    def _available_rooms_query(self, request: AvailabilityRequest, view_filter: bool = True):
+        """Select (room id, nightly price) of rooms matching the criteria, plus the price expression.
+        
+        With ``view_filter`` off, the view preference is left to ranking instead of excluding rooms.
+        """
+        check_date = request.check_in_date
+        get_hold_expiry(self.db).expire_due()
+        
+        # Dynamic pricing factors per room type for the date (cache lookups only)
+        price_cache = get_price_cache(self.db)
+        factor = literal(1.0)
+        if price_cache is not None:
+            factor = case(
+                *[
+                    (Room.room_type == room_type, price_cache.factor(room_type, check_date))
+                    for room_type in RoomType
+                ],
+                else_=1.0
+            )
+        
+        # Override, else weekend price on Sat/Sun, else base price
+        nightly = Room.base_price
+        if check_date.weekday() >= 5:
+            nightly = func.coalesce(func.nullif(Room.weekend_price, 0), Room.base_price)
+        price = case(
+            (RoomAvailability.price_override > 0, RoomAvailability.price_override),
+            else_=func.round(nightly * factor, 2)
+        )
+        
+        # Uncorrelated, so the booked set for the date is computed once
+        booked_room_ids = (
+            select(Booking.room_id)
+            .where(
+                Booking.check_in_date <= check_date,
+                Booking.check_out_date > check_date,
+                Booking.status.in_([BookingStatus.CONFIRMED, BookingStatus.PENDING])
+            )
+        )
+        held_room_ids = (
+            select(InventoryHold.room_id)
+            .where(
+                InventoryHold.check_in_date <= check_date,
+                InventoryHold.check_out_date > check_date,
+                InventoryHold.expires_at > time.time()
+            )
+        )
+        query = (
+            select(Room.id, price)
+            .outerjoin(
+                RoomAvailability,
+                and_(RoomAvailability.room_id == Room.id, RoomAvailability.date == check_date)
+            )
+            .where(
+                Room.is_active.is_(True),
+                Room.id.notin_(booked_room_ids),
+                Room.id.notin_(held_room_ids),
+                or_(
+                    RoomAvailability.id.is_(None),
+                    and_(
+                        RoomAvailability.is_available.is_(True),
+                        func.coalesce(RoomAvailability.is_maintenance, False).is_(False)
+                    )
+                )
+            )
+        )
+        
+        # Filter by view preference if specified
+        if request.view_preference and view_filter:
+            view_type = VIEW_PREFERENCE_MAPPING.get(request.view_preference.lower())
+            if view_type is not None:
+                query = query.where(Room.view_type == view_type)
+        
+        # Filter by budget if specified
+        if request.max_budget:
+            query = query.where(
+                or_(
+                    Room.base_price * factor <= request.max_budget,
+                    and_(
+                        Room.weekend_price.isnot(None),
+                        Room.weekend_price * factor <= request.max_budget
+                    )
+                ),
+                price <= request.max_budget
+            )
+        
+        # Filter by required amenities
+        if request.amenities:
+            query = query.where(amenity_filter_clause(amenity_mask(request.amenities)))
+        
+        # Room types whose stay restrictions rule out the stay (compiled bitsets, no extra query)
+        blocked = get_restrictions(self.db).blocked_types(check_date, check_date + timedelta(days=request.nights))
+        if blocked:
+            query = query.where(Room.room_type.notin_(room_types_in(blocked)))
+        
+        return query, price
+    
+    def _available_room_rows(
+        self, request: AvailabilityRequest, limit: int, after: Optional[Tuple[float, int]] = None
+    ) -> List[Tuple[int, float]]:
+        """Up to ``limit`` (room id, price) rows ordered by price then id, after a keyset position."""
+        query, price = self._available_rooms_query(request)
+        if after is not None:
+            after_price, after_id = after
+            query = query.where(
+                or_(price > after_price, and_(price == after_price, Room.id > after_id))
+            )
+        query = query.order_by(price, Room.id).limit(limit)
+        return [tuple(row) for row in self.db.execute(query).all()]
+    
+    def _best_matching_rooms(self, request: AvailabilityRequest, limit: int) -> Tuple[List[RoomResponse], int]:
+        """Top ``limit`` rooms by preference match (see ranking.py), and how many rooms qualified."""
+        query, _ = self._available_rooms_query(request, view_filter=False)
+        rows = self.db.execute(query).all()
+        catalog = get_room_catalog(self.db)
+        rows = [(room_id, price) for room_id, price in rows if room_id in catalog.by_id]
+        if not rows:
+            return [], 0
+        
+        room_ids, prices = zip(*rows)
+        ranked = rank_rooms(catalog.features, room_ids, prices, self._ranking_preferences(request), limit)
+        check_date = request.check_in_date
+        return [
+            catalog.by_id[room_id].to_response(check_date, price, score) for room_id, price, score in ranked
+        ], len(rows)
+    
+    @staticmethod
+    def _ranking_preferences(request: AvailabilityRequest) -> RankingPreferences:
+        """Soft preferences of a request: view, amenities named in special requests, party size, budget."""
+        view_type = None
+        if request.view_preference:
+            view_type = VIEW_PREFERENCE_MAPPING.get(request.view_preference.strip().lower())
+        guests_per_room = None
+        if request.guest_count:
+            guests_per_room = -(-request.guest_count // request.room_count)
+        return RankingPreferences(
+            view_type=view_type,
+            amenity_mask=amenity_mask_from_text(request.special_requests),
+            guest_count=guests_per_room,
+            target_price=request.max_budget,
+        )
+    
+    def _allocate_room_sets(self, request: AvailabilityRequest) -> List[RoomSetResponse]:
+        """Best combinations of ``request.room_count`` available rooms (see allocation.py)."""
+        query, _ = self._available_rooms_query(request)
+        by_id = get_room_catalog(self.db).by_id
+        candidates = []
+        for room_id, price in self.db.execute(query).all():
+            room = by_id.get(room_id)
+            if room is not None:
+                candidates.append(AllocationCandidate(
+                    room_id, room.room_number, price, room.max_occupancy, room.view_type.value
+                ))
+        room_sets = allocate_rooms(candidates, request.room_count, request.guest_count)
+        return [self._room_set_response(room_set, request.check_in_date) for room_set in room_sets]
+    
+    def _room_set_response(self, room_set: RoomSet, check_date: date) -> RoomSetResponse:
+        """Render an allocated room set."""
+        return RoomSetResponse(
+            rooms=self._rows_to_responses([(room.room_id, room.price) for room in room_set.rooms], check_date),
+            total_price_per_night=room_set.total_price,
+            total_occupancy=room_set.total_occupancy,
+            floors=list(room_set.floors),
+            views=list(room_set.views),
+            adjacent=len(room_set.floors) == 1 and room_set.gaps == 0,
+            score=room_set.score
+        )
+    
+    def _count_available_rooms(self, request: AvailabilityRequest) -> int:
+        """Number of rooms matching the criteria."""
+        query, _ = self._available_rooms_query(request)
+        return self.db.execute(select(func.count()).select_from(query.subquery())).scalar_one()
+    
+    def _rows_to_responses(self, rows: List[Tuple[int, float]], check_date: date) -> List[RoomResponse]:
+        """Render (room id, price) rows through the catalog snapshot."""
+        by_id = get_room_catalog(self.db).by_id
+        return [by_id[room_id].to_response(check_date, price) for room_id, price in rows if room_id in by_id]
+    
     def _is_room_available(self, room_id: int, check_date: date) -> bool:
         """Check if a room is available on a specific date."""
         
@@ -163,36 +442,16 @@ class RoomService:
             return availability.price_override
         
         # Use weekend pricing if applicable and available
+        price = room.base_price
         if check_date.weekday() >= 5 and room.weekend_price:  # Saturday or Sunday
-            return room.weekend_price
+            price = room.weekend_price
         
-        return room.base_price
-    
-    def _room_to_response(self, room: Room, availability_date: date, price: float) -> RoomResponse:
-        """Convert Room model to RoomResponse schema."""
-        
-        # Parse amenities from string
-        amenities = []
-        if room.amenities:
-            amenities = [a.strip() for a in room.amenities.split(',') if a.strip()]
+        # Apply the precomputed dynamic pricing factor, if enabled
+        price_cache = get_price_cache(self.db)
+        if price_cache is not None:
+            price = round(price * price_cache.factor(room.room_type, check_date), 2)
         
-        # Format room type for display
-        room_type_display = room.room_type.value.replace('_', ' ').title()
-        
-        return RoomResponse(
-            room_id=str(room.room_number),
-            room_type=room_type_display,
-            price_per_night=price,
-            view_type=room.view_type.value,
-            amenities=amenities,
-            availability_date=availability_date,
-            description=room.description or f"{room_type_display} with {room.view_type.value} view",
-            max_occupancy=room.max_occupancy,
-            square_feet=room.square_feet,
-            has_balcony=room.has_balcony,
-            has_kitchenette=room.has_kitchenette,
-            has_jacuzzi=room.has_jacuzzi
-        )
+        return price
     
     def _get_alternative_dates(self, request: AvailabilityRequest, days_ahead: int = 7) -> List[AlternativeDateResponse]:
         """Get alternative dates with better availability."""
@@ -206,20 +465,21 @@ class RoomService:
                 check_in_date=alt_date,
                 room_count=request.room_count,
                 max_budget=request.max_budget,
-                view_preference=request.view_preference
+                view_preference=request.view_preference,
+                amenities=request.amenities
             )
             
-            # Get available rooms for this date
-            alt_response = self.search_available_rooms(alt_request)
+            # Count available rooms for this date (without nested alternatives)
+            alt_count = self._count_available_rooms(alt_request)
             
-            if alt_response.total_count >= request.room_count:
+            if alt_count >= request.room_count:
                 message = f"Better availability on {alt_date.strftime('%B %d')}"
-                if alt_response.total_count > request.room_count * 2:
+                if alt_count > request.room_count * 2:
                     message = f"Excellent availability on {alt_date.strftime('%B %d')}"
                 
                 alternatives.append(AlternativeDateResponse(
                     check_in_date=alt_date,
-                    available_rooms=alt_response.total_count,
+                    available_rooms=alt_count,
                     message=message
                 ))
                 
@@ -232,27 +492,15 @@ class RoomService:
     def get_hotel_context(self) -> HotelContextResponse:
         """Get hotel context information."""
         
-        # Get room type statistics
+        # Get room type statistics from the catalog snapshot
         room_types = []
-        for room_type in RoomType:
-            rooms = (
-                self.db.query(Room)
-                .filter(
-                    and_(
-                        Room.room_type == room_type,
-                        Room.is_active == True
-                    )
-                )
-                .all()
-            )
-            
-            if rooms:
-                prices = [room.base_price for room in rooms]
-                room_types.append(RoomTypeInfo(
-                    type=room_type.value.replace('_', ' ').title(),
-                    base_price_range=[min(prices), max(prices)],
-                    capacity=max(room.max_occupancy for room in rooms)
-                ))
+        for room_type, rooms in get_room_catalog(self.db).by_type.items():
+            prices = [room.base_price for room in rooms]
+            room_types.append(RoomTypeInfo(
+                type=room_type_display(room_type),
+                base_price_range=[min(prices), max(prices)],
+                capacity=max(room.max_occupancy for room in rooms)
+            ))
         
         # Hotel amenities
         amenities = [
@@ -268,15 +516,715 @@ class RoomService:
             cancellation_policy=f"Free cancellation up to {settings.cancellation_hours} hours before check-in"
         )
         
+        hotel = PropertyService(self.db).get_hotel()
         return HotelContextResponse(
-            hotel_name=settings.hotel_name,
-            location=settings.hotel_location,
+            hotel_name=hotel.name,
+            location=hotel.location or "",
             amenities=amenities,
             room_types=room_types,
             policies=policies
         )
 
 
+class PropertyService:
+    """Service for the hotel property a database partition holds."""
+    
+    def __init__(self, db: Session):
+        self.db = db
+    
+    def get_hotel(self) -> HotelResponse:
+        """The partition's hotel, falling back to the configured one for the application database."""
+        hotel_code = hotel_code_for(self.db.get_bind())
+        hotel = self.db.query(Hotel).filter(Hotel.code == hotel_code).first()
+        if hotel:
+            return HotelResponse(code=hotel.code, name=hotel.name, location=hotel.location, timezone=hotel.timezone)
+        if hotel_code == settings.hotel_code.lower():
+            return HotelResponse(
+                code=hotel_code,
+                name=settings.hotel_name,
+                location=settings.hotel_location,
+                timezone=settings.hotel_timezone
+            )
+        return HotelResponse(code=hotel_code, name=hotel_code)
+
+
+class QuoteService:
+    """Service for whole-stay quotes."""
+    
+    def __init__(self, db: Session):
+        self.db = db
+    
+    def get_quotes(self, request: QuoteRequest) -> QuoteResponse:
+        """Quote a stay for the requested rooms (or every active room)."""
+        room_ids = list(dict.fromkeys(request.room_ids)) if request.room_ids is not None else None
+        quote = QuoteEngine(self.db).quote(request.check_in_date, request.check_out_date, room_ids)
+        
+        totals = quote.totals.round(2).tolist()
+        prices = quote.prices.round(2).tolist()
+        available = quote.fully_available.tolist()
+        
+        quotes = [
+            RoomQuoteResponse(
+                room_id=room.id,
+                room_number=room.room_number,
+                nightly_prices=prices[index],
+                total_price=totals[index],
+                available=available[index]
+            )
+            for index, room in enumerate(quote.rooms)
+            if available[index] or not request.only_available
+        ]
+        
+        return QuoteResponse(
+            check_in_date=request.check_in_date,
+            check_out_date=request.check_out_date,
+            dates=quote.dates,
+            quotes=quotes
+        )
+
+
+class InventoryService:
+    """Service for rate and availability (RoomAvailability) management."""
+    
+    UPDATABLE_FIELDS = ("price_override", "is_available", "is_maintenance", "notes")
+    
+    def __init__(self, db: Session):
+        self.db = db
+    
+    def bulk_update(self, request: BulkInventoryUpdateRequest) -> BulkInventoryUpdateResponse:
+        """Apply rate/availability changes with set-based upserts in one transaction."""
+        started = time.perf_counter()
+        catalog = get_room_catalog(self.db)
+        changes = []
+        room_dates = 0
+        
+        try:
+            for item in request.updates:
+                room_ids = self._resolve_rooms(item, catalog)
+                dates = self._resolve_dates(item)
+                columns = [field for field in self.UPDATABLE_FIELDS if getattr(item, field) is not None]
+                values = {field: getattr(item, field) for field in columns}
+                if values.get("price_override") == 0:
+                    values["price_override"] = None
+                
+                if not room_ids:
+                    # No active room of the type; an empty room set would mean every room to the caches
+                    continue
+                rows = self._upsert(room_ids, dates, columns, values)
+                room_dates += rows
+                changes.append(InventoryChange(
+                    kind=OVERRIDES_CHANGED,
+                    room_ids=tuple(room_ids),
+                    start_date=dates[0],
+                    end_date=dates[-1] + timedelta(days=1)
+                ))
+                record_change(self.db, changes[-1])
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        
+        # Invalidate caches for the affected rooms and dates only
+        bus = get_invalidation_bus()
+        hotel_code = hotel_code_for(self.db.get_bind())
+        for change in changes:
+            bus.publish(change.in_hotel(hotel_code))
+        
+        return BulkInventoryUpdateResponse(
+            updates_applied=len(request.updates),
+            room_dates=room_dates,
+            processing_time_ms=round((time.perf_counter() - started) * 1000, 2)
+        )
+    
+    def create_restriction(self, request: StayRestrictionRequest) -> StayRestrictionResponse:
+        """Store a stay restriction rule; search and bookings pick it up once committed."""
+        weekdays = 0
+        for day in request.weekdays if request.weekdays is not None else range(7):
+            weekdays |= 1 << day
+        rule = StayRestriction(
+            room_type=request.room_type,
+            start_date=request.start_date,
+            end_date=request.end_date,
+            weekdays=weekdays,
+            min_stay=request.min_stay,
+            closed_to_arrival=request.closed_to_arrival,
+            closed_to_departure=request.closed_to_departure,
+            notes=request.notes
+        )
+        self.db.add(rule)
+        change = self._restriction_change(rule)
+        record_change(self.db, change)
+        try:
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        self.db.refresh(rule)
+        get_invalidation_bus().publish(change.in_hotel(hotel_code_for(self.db.get_bind())))
+        return self._restriction_to_response(rule)
+    
+    def list_restrictions(
+        self, start_date: date, end_date: date, room_type: Optional[RoomType] = None
+    ) -> StayRestrictionsResponse:
+        """Rules overlapping ``start_date``..``end_date`` (inclusive), including all-type rules."""
+        query = self.db.query(StayRestriction).filter(
+            StayRestriction.start_date <= end_date,
+            StayRestriction.end_date >= start_date
+        )
+        if room_type is not None:
+            query = query.filter(or_(StayRestriction.room_type == room_type, StayRestriction.room_type.is_(None)))
+        rules = query.order_by(StayRestriction.start_date, StayRestriction.id).all()
+        return StayRestrictionsResponse(restrictions=[self._restriction_to_response(rule) for rule in rules])
+    
+    def delete_restriction(self, restriction_id: int) -> None:
+        """Remove a stay restriction rule."""
+        rule = self.db.query(StayRestriction).filter(StayRestriction.id == restriction_id).first()
+        if not rule:
+            raise ValueError(f"Restriction {restriction_id} not found")
+        change = self._restriction_change(rule)
+        self.db.delete(rule)
+        record_change(self.db, change)
+        try:
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        get_invalidation_bus().publish(change.in_hotel(hotel_code_for(self.db.get_bind())))
+    
+    def _restriction_change(self, rule: StayRestriction) -> InventoryChange:
+        """Change event covering the rooms and dates a rule applies to."""
+        catalog = get_room_catalog(self.db)
+        rooms = catalog.by_type.get(rule.room_type, ()) if rule.room_type is not None else catalog.rooms
+        return InventoryChange(
+            kind=RESTRICTIONS_CHANGED,
+            room_ids=tuple(room.id for room in rooms),
+            start_date=rule.start_date,
+            end_date=rule.end_date + timedelta(days=1)
+        )
+    
+    @staticmethod
+    def _restriction_to_response(rule: StayRestriction) -> StayRestrictionResponse:
+        return StayRestrictionResponse(
+            id=rule.id,
+            room_type=rule.room_type,
+            start_date=rule.start_date,
+            end_date=rule.end_date,
+            weekdays=[day for day in range(7) if rule.weekdays & (1 << day)],
+            min_stay=rule.min_stay,
+            closed_to_arrival=rule.closed_to_arrival,
+            closed_to_departure=rule.closed_to_departure,
+            notes=rule.notes
+        )
+    
+    def get_room_calendar(self, room_id: int, start_date: date, end_date: date) -> RoomCalendarResponse:
+        """Availability and price per date for one room (end date inclusive)."""
+        rooms, dates, status, prices = self._calendar_window(start_date, end_date, room_ids=[room_id])
+        return RoomCalendarResponse(
+            room_id=rooms[0].id,
+            room_number=rooms[0].room_number,
+            dates=dates,
+            status=status[0].tolist(),
+            prices=prices[0].round(2).tolist(),
+            status_legend=STATUS_LEGEND
+        )
+    
+    def get_calendar_grid(
+        self, start_date: date, end_date: date, room_type: Optional[RoomType] = None
+    ) -> CalendarGridResponse:
+        """Availability and price grid for every active room (end date inclusive)."""
+        room_ids = None
+        if room_type is not None:
+            room_ids = [room.id for room in get_room_catalog(self.db).by_type.get(room_type, ())]
+        rooms, dates, status, prices = self._calendar_window(start_date, end_date, room_ids=room_ids)
+        return CalendarGridResponse(
+            dates=dates,
+            room_ids=[room.id for room in rooms],
+            room_numbers=[room.room_number for room in rooms],
+            status=status.tolist(),
+            prices=prices.round(2).tolist(),
+            status_legend=STATUS_LEGEND
+        )
+    
+    def get_ari_delta(self, since: int = 0, max_events: int = 1000) -> ARIDeltaResponse:
+        """Availability and rates changed after version ``since``, run-length encoded.
+        
+        Versions are inventory event sequence numbers, so the work done is
+        proportional to the events since the client's last sync. The whole
+        booking horizon is exported instead when ``since`` is 0, when events
+        after it were pruned, or when an event is not scoped to rooms and
+        dates (room catalog changes).
+        """
+        today = date.today()
+        horizon = today + timedelta(days=settings.max_advance_booking_days)
+        catalog = get_room_catalog(self.db)
+        get_hold_expiry(self.db).expire_due()
+        
+        page = EventService(self.db).get_events_since(since, max_events) if since > 0 else None
+        full_sync = page is None or page.reset_required
+        ranges: Dict[int, List[Tuple[date, date]]] = {}
+        for event in page.events if page else ():
+            if event.kind in CELL_NEUTRAL_KINDS:
+                continue
+            if not event.room_ids or event.start_date is None:
+                full_sync = True
+                break
+            start, end = max(event.start_date, today), min(event.end_date, horizon)
+            if start >= end:
+                continue
+            for room_id in self._ari_rooms(event, catalog):
+                ranges.setdefault(room_id, []).append((start, end))
+        
+        if full_sync:
+            # State read after the version, so later events may be replayed once (harmlessly)
+            version = self.db.query(func.max(InventoryEvent.id)).scalar() or 0
+            ranges = {room.id: [(today, horizon)] for room in catalog.rooms}
+        else:
+            version = page.last_sequence
+        
+        # Quote rooms that share a changed date range together
+        groups: Dict[Tuple[date, date], List[int]] = {}
+        for room_id, room_ranges in ranges.items():
+            for date_range in _merge_ranges(room_ranges):
+                groups.setdefault(date_range, []).append(room_id)
+        
+        runs: Dict[int, List[ARIRun]] = {}
+        for (start, end), room_ids in sorted(groups.items()):
+            rooms, dates, status, prices = self._calendar_window(start, end - timedelta(days=1), room_ids)
+            for row, room in enumerate(rooms):
+                runs.setdefault(room.id, []).extend(_run_length_encode(dates, status[row], prices[row]))
+        
+        return ARIDeltaResponse(
+            since=since,
+            version=version,
+            full_sync=full_sync,
+            has_more=bool(page and page.has_more and not full_sync),
+            rooms=[
+                ARIRoomDelta(
+                    room_id=room_id,
+                    room_number=catalog.by_id[room_id].room_number,
+                    runs=sorted(runs[room_id], key=lambda run: run.start_date)
+                )
+                for room_id in sorted(runs)
+            ],
+            status_legend=STATUS_LEGEND
+        )
+    
+    def _ari_rooms(self, event: InventoryEventResponse, catalog) -> List[int]:
+        """Rooms whose cells an event may have changed."""
+        room_ids = [room_id for room_id in event.room_ids if room_id in catalog.by_id]
+        if event.kind in OCCUPANCY_KINDS and get_price_cache(self.db) is not None:
+            # Occupancy-driven prices move for every room of the booked types
+            room_types = {catalog.by_id[room_id].room_type for room_id in room_ids}
+            room_ids = [room.id for room_type in room_types for room in catalog.by_type.get(room_type, ())]
+        return room_ids
+    
+    def _calendar_window(self, start_date: date, end_date: date, room_ids: Optional[List[int]]):
+        """(rooms, dates, status, prices) for ``start_date``..``end_date`` inclusive.
+        
+        Served from the shared inventory snapshot when it covers the range,
+        otherwise quoted from the database.
+        """
+        if end_date < start_date:
+            raise ValueError("end_date must not be before start_date")
+        if (end_date - start_date).days >= 366:
+            raise ValueError("Calendars are limited to 366 days")
+        
+        # Reopen expired holds' nights before reading cached cells
+        get_hold_expiry(self.db).expire_due()
+        snapshot = get_inventory_snapshot(self.db)
+        window = snapshot.window(self.db, start_date, end_date, room_ids) if snapshot else None
+        if window is not None:
+            by_id = get_room_catalog(self.db).by_id
+            rooms = [by_id[room_id] for room_id in window.room_ids.tolist()]
+            return rooms, window.dates, window.status, window.prices
+        
+        matrix = QuoteEngine(self.db).quote(start_date, end_date + timedelta(days=1), room_ids, stay_rules=False)
+        return matrix.rooms, matrix.dates, matrix.status, matrix.prices
+    
+    def _resolve_rooms(self, item: InventoryUpdateItem, catalog) -> List[int]:
+        """Room ids targeted by an update item."""
+        if item.room_ids:
+            for room_id in item.room_ids:
+                if room_id not in catalog.by_id:
+                    raise ValueError(f"Room with ID {room_id} not found")
+            return list(dict.fromkeys(item.room_ids))
+        return [room.id for room in catalog.by_type.get(item.room_type, ())]
+    
+    def _resolve_dates(self, item: InventoryUpdateItem) -> List[date]:
+        """Sorted, de-duplicated dates targeted by an update item."""
+        if item.dates:
+            return sorted(set(item.dates))
+        days = (item.end_date - item.start_date).days + 1
+        return [item.start_date + timedelta(days=offset) for offset in range(days)]
+    
+    def _upsert(self, room_ids: List[int], dates: List[date], columns: List[str], values: dict) -> int:
+        """Upsert every (room, date) cell, updating only ``columns`` on conflict.
+        
+        New cells get the column defaults for fields the item does not set.
+        Returns the number of cells written.
+        """
+        if not room_ids or not dates:
+            return 0
+        row_values = {
+            "price_override": None, "is_available": True, "is_maintenance": False, "notes": None
+        }
+        row_values.update(values)
+        dialect = self.db.get_bind().dialect.name
+        
+        if dialect == "sqlite":
+            # Raw executemany with positional tuples: SQLite stores dates as ISO strings
+            assignments = ", ".join(f"{column} = excluded.{column}" for column in columns)
+            sql = (
+                "INSERT INTO room_availability "
+                "(hotel_code, room_id, date, price_override, is_available, is_maintenance, notes, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP) "
+                f"ON CONFLICT (room_id, date) DO UPDATE SET {assignments}, "
+                "updated_at = CURRENT_TIMESTAMP"
+            )
+            tail = (
+                row_values["price_override"], row_values["is_available"],
+                row_values["is_maintenance"], row_values["notes"]
+            )
+            day_strings = [day.isoformat() for day in dates]
+            hotel_code = hotel_code_for(self.db.get_bind())
+            rows = [(hotel_code, room_id, day, *tail) for room_id in room_ids for day in day_strings]
+            self.db.connection().exec_driver_sql(sql, rows)
+            return len(rows)
+        
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            raise ValueError(f"Bulk inventory updates are not supported on {dialect}")
+        
+        statement = insert(RoomAvailability.__table__)
+        updates = {column: statement.excluded[column] for column in columns}
+        updates["updated_at"] = func.now()
+        statement = statement.on_conflict_do_update(index_elements=["room_id", "date"], set_=updates)
+        rows = [
+            dict(row_values, room_id=room_id, date=day)
+            for room_id in room_ids
+            for day in dates
+        ]
+        self.db.execute(statement, rows)
+        return len(rows)
+
+
+def _restriction_error(db: Session, room_type: RoomType, check_in: date, check_out: date) -> str:
+    """Error message for a stay that breaks the stay restrictions."""
+    reason = get_restrictions(db).violation(room_type, check_in, check_out)
+    return f"Room is not available for this stay: {reason[0].lower()}{reason[1:]}"
+
+
+def _merge_ranges(ranges: List[Tuple[date, date]]) -> List[Tuple[date, date]]:
+    """Merge overlapping or adjacent [start, end) date ranges."""
+    merged: List[Tuple[date, date]] = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def _run_length_encode(dates: List[date], status: np.ndarray, prices: np.ndarray) -> List[ARIRun]:
+    """Collapse consecutive nights with the same status and price into runs."""
+    prices = prices.round(2)
+    changes = np.flatnonzero((status[1:] != status[:-1]) | (prices[1:] != prices[:-1])) + 1
+    starts = [0, *changes.tolist()]
+    ends = [*changes.tolist(), len(dates)]
+    return [
+        ARIRun(start_date=dates[start], nights=end - start, status=int(status[start]), price=float(prices[start]))
+        for start, end in zip(starts, ends)
+    ]
+
+
+def _subtract_range(start: date, end: date, other_start: date, other_end: date) -> List[Tuple[date, date]]:
+    """Parts of [start, end) outside [other_start, other_end)."""
+    parts = []
+    if start < other_start:
+        parts.append((start, min(end, other_start)))
+    if end > other_end:
+        parts.append((max(start, other_end), end))
+    return parts
+
+
+class EventService:
+    """Service for reading the inventory event log."""
+    
+    def __init__(self, db: Session):
+        self.db = db
+    
+    def get_events_since(self, since: int, limit: int = 100) -> InventoryEventsResponse:
+        """Events with a sequence number greater than ``since``, oldest first."""
+        rows = (
+            self.db.query(InventoryEvent)
+            .filter(InventoryEvent.id > since)
+            .order_by(InventoryEvent.id)
+            .limit(limit + 1)
+            .all()
+        )
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        
+        # Sequence numbers are never reused, so a hole right after since means pruned history
+        reset_required = bool(rows) and rows[0].id > since + 1 and self._oldest_sequence() > since + 1
+        
+        # Outside SQLite a lower sequence can commit after a higher one: stop before a
+        # recent gap, so the client's next read starts from it instead of skipping the late event
+        settled_before = time.time() - settings.change_feed_gap_grace_ms / 1000
+        previous = rows[0].id - 1 if reset_required else since
+        for index, row in enumerate(rows):
+            if row.id != previous + 1 and row.created_at > settled_before:
+                rows, has_more = rows[:index], False
+                break
+            previous = row.id
+        
+        return InventoryEventsResponse(
+            events=[self._event_to_response(row) for row in rows],
+            last_sequence=rows[-1].id if rows else since,
+            has_more=has_more,
+            reset_required=reset_required
+        )
+    
+    async def stream_events(
+        self,
+        since: int,
+        is_disconnected: Callable[[], Awaitable[bool]],
+        poll_interval: float = 0.5,
+        heartbeat_interval: float = 15.0
+    ) -> AsyncIterator[str]:
+        """Server-Sent Events for every event after ``since``, until the client leaves."""
+        last_heartbeat = time.monotonic()
+        while not await is_disconnected():
+            page = self.get_events_since(since, limit=500)
+            # End the read transaction so the next poll sees new commits
+            self.db.rollback()
+            
+            if page.reset_required:
+                yield self._sse("reset", page.events[0].sequence - 1, {"last_sequence": page.events[0].sequence - 1})
+            for event in page.events:
+                yield self._sse(event.kind, event.sequence, json.loads(event.model_dump_json()))
+            since = page.last_sequence
+            
+            if page.events:
+                last_heartbeat = time.monotonic()
+            elif time.monotonic() - last_heartbeat >= heartbeat_interval:
+                # Comment line keeps proxies from closing an idle connection
+                yield ": keepalive\n\n"
+                last_heartbeat = time.monotonic()
+            
+            if not page.has_more:
+                await asyncio.sleep(poll_interval)
+    
+    def _oldest_sequence(self) -> int:
+        return self.db.query(func.min(InventoryEvent.id)).scalar() or 0
+    
+    def _event_to_response(self, row: InventoryEvent) -> InventoryEventResponse:
+        return InventoryEventResponse(
+            sequence=row.id,
+            kind=row.kind,
+            room_ids=[int(room_id) for room_id in row.room_ids.split(",")] if row.room_ids else [],
+            start_date=row.start_date,
+            end_date=row.end_date,
+            created_at=datetime.fromtimestamp(row.created_at, tz=timezone.utc),
+            waitlist_entry_id=row.waitlist_entry_id
+        )
+    
+    @staticmethod
+    def _sse(event: str, sequence: int, data: dict) -> str:
+        return f"id: {sequence}\nevent: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+
+class HoldService:
+    """Service for inventory holds behind booking links."""
+    
+    def __init__(self, db: Session):
+        self.db = db
+    
+    def create_hold(self, request: CreateHoldRequest) -> HoldResponse:
+        """Take the room off sale for the stay and remember the quoted price."""
+        expiry = get_hold_expiry(self.db)
+        expiry.expire_due()
+        
+        quote = QuoteEngine(self.db).quote(
+            request.check_in_date, request.check_out_date, room_ids=[request.room_id]
+        )
+        unavailable = quote.unavailable_dates(0)
+        if unavailable:
+            raise ValueError(f"Room is not available on {unavailable[0]}")
+        if quote.restricted[0]:
+            raise ValueError(_restriction_error(
+                self.db, quote.rooms[0].room_type, request.check_in_date, request.check_out_date
+            ))
+        
+        now = time.time()
+        ttl_minutes = request.ttl_minutes or settings.hold_ttl_minutes
+        hold = InventoryHold(
+            hold_token=secrets.token_urlsafe(16),
+            room_id=request.room_id,
+            check_in_date=request.check_in_date,
+            check_out_date=request.check_out_date,
+            guest_count=request.guest_count,
+            quoted_total=float(quote.totals[0]),
+            customer_email=request.customer_email,
+            created_at=now,
+            expires_at=now + ttl_minutes * 60
+        )
+        change = InventoryChange(
+            kind=HOLD_CREATED,
+            room_ids=(hold.room_id,),
+            start_date=hold.check_in_date,
+            end_date=hold.check_out_date
+        )
+        
+        self.db.add(hold)
+        record_change(self.db, change)
+        try:
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        self.db.refresh(hold)
+        
+        expiry.schedule(hold.id, hold.expires_at)
+        get_invalidation_bus().publish(change.in_hotel(hotel_code_for(self.db.get_bind())))
+        return self._hold_to_response(hold)
+    
+    def get_hold(self, hold_token: str) -> HoldResponse:
+        """An unexpired hold by token."""
+        return self._hold_to_response(self._get_hold(hold_token))
+    
+    def release_hold(self, hold_token: str) -> None:
+        """Put the held nights back on sale before the hold expires."""
+        hold = self._get_hold(hold_token)
+        change = InventoryChange(
+            kind=HOLD_RELEASED,
+            room_ids=(hold.room_id,),
+            start_date=hold.check_in_date,
+            end_date=hold.check_out_date
+        )
+        self.db.delete(hold)
+        record_change(self.db, change)
+        try:
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        get_invalidation_bus().publish(change.in_hotel(hotel_code_for(self.db.get_bind())))
+    
+    def _get_hold(self, hold_token: str) -> InventoryHold:
+        hold = (
+            self.db.query(InventoryHold)
+            .filter(InventoryHold.hold_token == hold_token, InventoryHold.expires_at > time.time())
+            .first()
+        )
+        if not hold:
+            raise ValueError(f"Hold {hold_token} not found or expired")
+        return hold
+    
+    def _hold_to_response(self, hold: InventoryHold) -> HoldResponse:
+        link = BookingLink(
+            hold_id=hold.id,
+            room_id=hold.room_id,
+            check_in_date=hold.check_in_date,
+            check_out_date=hold.check_out_date,
+            guest_count=hold.guest_count,
+            quoted_total=hold.quoted_total,
+            expires_at=int(hold.expires_at),
+            hold_nonce=hold_nonce(hold.hold_token),
+            hotel_code=hotel_code_for(self.db.get_bind())
+        )
+        return HoldResponse(
+            link_token=sign_link(link),
+            hold_token=hold.hold_token,
+            room_id=hold.room_id,
+            room_number=get_room_catalog(self.db).by_id[hold.room_id].room_number,
+            check_in_date=hold.check_in_date,
+            check_out_date=hold.check_out_date,
+            guest_count=hold.guest_count,
+            quoted_total=hold.quoted_total,
+            customer_email=hold.customer_email,
+            expires_at=datetime.fromtimestamp(hold.expires_at, tz=timezone.utc)
+        )
+
+
+class WaitlistService:
+    """Service for waitlisted availability requests."""
+    
+    def __init__(self, db: Session):
+        self.db = db
+    
+    def join_waitlist(self, request: WaitlistRequest) -> WaitlistEntryResponse:
+        """Store an unmet request; released inventory that satisfies it emits a waitlist_matched event."""
+        view_type = None
+        if request.view_preference:
+            view_type = VIEW_PREFERENCE_MAPPING.get(request.view_preference.strip().lower())
+            if view_type is None:
+                raise ValueError(f"Unknown view preference: {request.view_preference}")
+        
+        entry = WaitlistEntry(
+            check_in_date=request.check_in_date,
+            check_out_date=request.check_out_date,
+            room_count=request.room_count,
+            max_budget=request.max_budget,
+            view_type=view_type,
+            customer_email=request.customer_email,
+            status=WaitlistStatus.WAITING
+        )
+        self.db.add(entry)
+        try:
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        self.db.refresh(entry)
+        
+        get_waitlist_index(self.db).add(WaitingRequest(
+            entry.id, entry.check_in_date, entry.check_out_date,
+            entry.room_count, entry.max_budget, entry.view_type
+        ))
+        return self._entry_to_response(entry)
+    
+    def get_entry(self, entry_id: int) -> WaitlistEntryResponse:
+        """A waitlist entry by id."""
+        return self._entry_to_response(self._get_entry(entry_id))
+    
+    def leave_waitlist(self, entry_id: int) -> WaitlistEntryResponse:
+        """Stop waiting; matched entries stay matched."""
+        entry = self._get_entry(entry_id)
+        if entry.status == WaitlistStatus.WAITING:
+            entry.status = WaitlistStatus.CANCELLED
+            try:
+                self.db.commit()
+            except Exception:
+                self.db.rollback()
+                raise
+            get_waitlist_index(self.db).remove(entry.id)
+        return self._entry_to_response(entry)
+    
+    def _get_entry(self, entry_id: int) -> WaitlistEntry:
+        entry = self.db.query(WaitlistEntry).filter(WaitlistEntry.id == entry_id).first()
+        if not entry:
+            raise ValueError(f"Waitlist entry {entry_id} not found")
+        return entry
+    
+    @staticmethod
+    def _entry_to_response(entry: WaitlistEntry) -> WaitlistEntryResponse:
+        return WaitlistEntryResponse(
+            id=entry.id,
+            status=entry.status.value,
+            check_in_date=entry.check_in_date,
+            check_out_date=entry.check_out_date,
+            room_count=entry.room_count,
+            max_budget=entry.max_budget,
+            view_type=entry.view_type.value if entry.view_type else None,
+            customer_email=entry.customer_email,
+            matched_room_ids=[int(room_id) for room_id in entry.matched_room_ids.split(",")] if entry.matched_room_ids else [],
+            created_at=entry.created_at,
+            matched_at=entry.matched_at
+        )
+
+
 class BookingService:
     """Service for booking-related operations."""
     
@@ -294,69 +1242,304 @@ class BookingService:
         if not room:
             raise ValueError(f"Room with ID {request.room_id} not found")
         
-        # Check availability for all nights
+        # Check availability and price all nights in one shot
         nights = (request.check_out_date - request.check_in_date).days
         if nights <= 0:
             raise ValueError("Check-out date must be after check-in date")
         
-        for night in range(nights):
-            check_date = request.check_in_date + timedelta(days=night)
-            room_service = RoomService(self.db)
-            if not room_service._is_room_available(room.id, check_date):
-                raise ValueError(f"Room is not available on {check_date}")
+        if room.id not in get_room_catalog(self.db).by_id:
+            raise ValueError(f"Room {room.room_number} is not available")
+        
+        quote = QuoteEngine(self.db).quote(
+            request.check_in_date, request.check_out_date, room_ids=[room.id]
+        )
+        unavailable = quote.unavailable_dates(0)
+        if unavailable:
+            raise ValueError(f"Room is not available on {unavailable[0]}")
+        if quote.restricted[0]:
+            raise ValueError(_restriction_error(
+                self.db, room.room_type, request.check_in_date, request.check_out_date
+            ))
         
         # Calculate total amount
-        total_amount = 0.0
-        room_service = RoomService(self.db)
-        for night in range(nights):
-            check_date = request.check_in_date + timedelta(days=night)
-            price = room_service._calculate_room_price(room, check_date)
-            total_amount += price
+        total_amount = float(quote.totals[0])
+        
+        booking = self._add_booking(
+            customer, room.id, request.check_in_date, request.check_out_date,
+            request.guest_count, total_amount, request.special_requests
+        )
+        self._commit_changes(booking, [InventoryChange(
+            kind=BOOKING_CREATED,
+            room_ids=(room.id,),
+            start_date=request.check_in_date,
+            end_date=request.check_out_date
+        )])
+        return self._booking_to_response(booking)
+    
+    def book_hold(self, hold_token: str, request: BookHoldRequest) -> BookingResponse:
+        """Convert a hold into a booking at the held price, in one transaction."""
+        hold = (
+            self.db.query(InventoryHold)
+            .filter(InventoryHold.hold_token == hold_token, InventoryHold.expires_at > time.time())
+            .with_for_update()
+            .first()
+        )
+        if not hold:
+            raise ValueError(f"Hold {hold_token} not found or expired")
+        return self._convert_hold(hold, request)
+    
+    def book_link(self, link: BookingLink, request: BookHoldRequest) -> BookingResponse:
+        """Book the offer of a verified booking link (the hold it was issued with)."""
+        hotel_code = hotel_code_for(self.db.get_bind())
+        if link.hotel_code != hotel_code:
+            raise ValueError(f"The offer in this booking link was not found; it is for hotel {link.hotel_code}")
+        hold = (
+            self.db.query(InventoryHold)
+            .filter(InventoryHold.id == link.hold_id, InventoryHold.expires_at > time.time())
+            .with_for_update()
+            .first()
+        )
+        # Hold ids can be reused, so the hold must also be the one the link was signed for
+        if not hold or not self._is_linked_hold(hold, link):
+            raise ValueError("The offer in this booking link was not found; it was booked, released or expired")
+        return self._convert_hold(hold, request)
+    
+    @staticmethod
+    def _is_linked_hold(hold: InventoryHold, link: BookingLink) -> bool:
+        """Whether a hold is the one a link was issued with, still holding the signed offer."""
+        return (
+            hmac.compare_digest(hold_nonce(hold.hold_token), link.hold_nonce)
+            and hold.room_id == link.room_id
+            and hold.check_in_date == link.check_in_date
+            and hold.check_out_date == link.check_out_date
+            and hold.guest_count == link.guest_count
+            and round(hold.quoted_total * 100) == round(link.quoted_total * 100)
+        )
+    
+    def _convert_hold(self, hold: InventoryHold, request: BookHoldRequest) -> BookingResponse:
+        """Replace a locked hold with a booking at the held price."""
+        customer_email = request.customer_email or hold.customer_email
+        if not customer_email:
+            raise ValueError("A customer email is required")
+        
+        # The hold kept other guests out, but closures may have been added since;
+        # stay rules added since do not apply to an offer already made
+        quote = QuoteEngine(self.db).quote(
+            hold.check_in_date, hold.check_out_date, room_ids=[hold.room_id], exclude_hold_id=hold.id,
+            stay_rules=False
+        )
+        unavailable = quote.unavailable_dates(0)
+        if unavailable:
+            raise ValueError(f"Room is not available on {unavailable[0]}")
         
-        # Generate confirmation number
-        confirmation_number = self._generate_confirmation_number()
+        # Committing here would end the transaction that locks the hold
+        customer = self._get_or_create_customer(customer_email, commit=False)
+        booking = self._add_booking(
+            customer, hold.room_id, hold.check_in_date, hold.check_out_date,
+            hold.guest_count, hold.quoted_total, request.special_requests
+        )
+        self.db.delete(hold)
+        self._commit_changes(booking, [InventoryChange(
+            kind=BOOKING_CREATED,
+            room_ids=(hold.room_id,),
+            start_date=hold.check_in_date,
+            end_date=hold.check_out_date
+        )])
+        return self._booking_to_response(booking)
+    
+    def cancel_booking(self, confirmation_number: str) -> BookingResponse:
+        """Cancel a booking and release its nights."""
+        booking = self._get_open_booking(confirmation_number)
+        booking.status = BookingStatus.CANCELLED
+        booking.cancelled_at = func.now()
+        
+        self._commit_changes(booking, [InventoryChange(
+            kind=BOOKING_CANCELLED,
+            room_ids=(booking.room_id,),
+            start_date=booking.check_in_date,
+            end_date=booking.check_out_date
+        )])
+        return self._booking_to_response(booking)
+    
+    def modify_booking_dates(self, confirmation_number: str, request: ModifyBookingRequest) -> BookingResponse:
+        """Move a booking to new dates, touching only the nights that differ.
         
-        # Create booking
+        Added nights are checked and priced at current rates; kept nights keep
+        their booked price and released nights are refunded at the booked
+        average nightly rate.
+        """
+        booking = self._get_open_booking(confirmation_number)
+        old_in, old_out = booking.check_in_date, booking.check_out_date
+        new_in, new_out = request.check_in_date, request.check_out_date
+        added = _subtract_range(new_in, new_out, old_in, old_out)
+        released = _subtract_range(old_in, old_out, new_in, new_out)
+        if not added and not released:
+            return self._booking_to_response(booking)
+        
+        # Restrictions apply to the new stay as a whole
+        room_type = get_room_catalog(self.db).by_id[booking.room_id].room_type
+        if get_restrictions(self.db).violation(room_type, new_in, new_out):
+            raise ValueError(_restriction_error(self.db, room_type, new_in, new_out))
+        
+        quote_engine = QuoteEngine(self.db)
+        added_amount = 0.0
+        for start, end in added:
+            quote = quote_engine.quote(
+                start, end, room_ids=[booking.room_id], exclude_booking_id=booking.id, stay_rules=False
+            )
+            unavailable = quote.unavailable_dates(0)
+            if unavailable:
+                raise ValueError(f"Room is not available on {unavailable[0]}")
+            added_amount += float(quote.totals[0])
+        
+        released_nights = sum((end - start).days for start, end in released)
+        nightly_rate = booking.total_amount / (old_out - old_in).days
+        booking.total_amount = round(booking.total_amount - nightly_rate * released_nights + added_amount, 2)
+        booking.check_in_date, booking.check_out_date = new_in, new_out
+        
+        room_ids = (booking.room_id,)
+        changes = [InventoryChange(BOOKING_CANCELLED, room_ids, start, end) for start, end in released]
+        changes += [InventoryChange(BOOKING_CREATED, room_ids, start, end) for start, end in added]
+        self._commit_changes(booking, changes)
+        return self._booking_to_response(booking)
+    
+    def _add_booking(
+        self,
+        customer: Customer,
+        room_id: int,
+        check_in_date: date,
+        check_out_date: date,
+        guest_count: int,
+        total_amount: float,
+        special_requests: Optional[str]
+    ) -> Booking:
+        """Add a confirmed booking to the session."""
         booking = Booking(
-            confirmation_number=confirmation_number,
+            confirmation_number=self._generate_confirmation_number(),
             customer_id=customer.id,
-            room_id=room.id,
-            check_in_date=request.check_in_date,
-            check_out_date=request.check_out_date,
-            guest_count=request.guest_count,
+            room_id=room_id,
+            check_in_date=check_in_date,
+            check_out_date=check_out_date,
+            guest_count=guest_count,
             total_amount=total_amount,
             status=BookingStatus.CONFIRMED,
-            special_requests=request.special_requests,
+            special_requests=special_requests,
             booking_source="api"
         )
-        
         self.db.add(booking)
-        self.db.commit()
+        return booking
+    
+    def get_booking(self, confirmation_number: str) -> BookingResponse:
+        """Look up a booking by confirmation number."""
+        row = self._booking_rows().filter(Booking.confirmation_number == confirmation_number).first()
+        if not row:
+            raise ValueError(f"Booking {confirmation_number} not found")
+        return self._booking_response(*row)
+    
+    def get_customer_bookings(
+        self, customer_email: str, cursor: Optional[str] = None, limit: int = 20
+    ) -> CustomerBookingsResponse:
+        """A customer's bookings, newest first, resuming after ``cursor``."""
+        customer_id = self.db.query(Customer.id).filter(Customer.email == customer_email).scalar()
+        if customer_id is None:
+            raise ValueError(f"Customer {customer_email} not found")
+        
+        # Range scan on (customer_id, created_at, id); the cursor row's own
+        # created_at is compared so stored and bound timestamp formats never mix
+        query = self._booking_rows().filter(Booking.customer_id == customer_id)
+        if cursor:
+            after_id = decode_booking_cursor(cursor, customer_id)
+            after_created = (
+                select(Booking.created_at).where(Booking.id == after_id).scalar_subquery()
+            )
+            query = query.filter(or_(
+                Booking.created_at < after_created,
+                and_(Booking.created_at == after_created, Booking.id < after_id)
+            ))
+        rows = query.order_by(Booking.created_at.desc(), Booking.id.desc()).limit(limit + 1).all()
+        
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        return CustomerBookingsResponse(
+            customer_email=customer_email,
+            bookings=[self._booking_response(*row) for row in rows],
+            next_cursor=encode_booking_cursor(customer_id, rows[-1][0].id) if has_more else None,
+            has_more=has_more
+        )
+    
+    def _booking_rows(self):
+        """(booking, customer email, room number) rows in one joined query."""
+        return (
+            self.db.query(Booking, Customer.email, Room.room_number)
+            .join(Customer, Booking.customer_id == Customer.id)
+            .join(Room, Booking.room_id == Room.id)
+        )
+    
+    def _get_open_booking(self, confirmation_number: str) -> Booking:
+        """Booking that can still be changed, locked for the rest of the transaction."""
+        booking = (
+            self.db.query(Booking)
+            .filter(Booking.confirmation_number == confirmation_number)
+            .with_for_update()
+            .first()
+        )
+        if not booking:
+            raise ValueError(f"Booking {confirmation_number} not found")
+        if booking.status not in (BookingStatus.CONFIRMED, BookingStatus.PENDING):
+            raise ValueError(f"Booking {confirmation_number} is {booking.status.value} and cannot be changed")
+        return booking
+    
+    def _commit_changes(self, booking: Booking, changes: List[InventoryChange]) -> None:
+        """Commit a booking with its inventory events, then invalidate caches."""
+        try:
+            for change in changes:
+                record_change(self.db, change)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
         self.db.refresh(booking)
         
+        # Let caches recompute only the nights that changed
+        bus = get_invalidation_bus()
+        hotel_code = hotel_code_for(self.db.get_bind())
+        for change in changes:
+            bus.publish(change.in_hotel(hotel_code))
+    
+    def _booking_to_response(self, booking: Booking) -> BookingResponse:
+        """Convert a booking to its response schema."""
+        return self._booking_response(booking, booking.customer.email, booking.room.room_number)
+    
+    @staticmethod
+    def _booking_response(booking: Booking, customer_email: str, room_number: str) -> BookingResponse:
+        """Build a booking response from already-loaded values."""
         return BookingResponse(
             booking_id=booking.id,
             confirmation_number=booking.confirmation_number,
-            customer_email=customer.email,
-            room_number=room.room_number,
+            customer_email=customer_email,
+            room_number=room_number,
             check_in_date=booking.check_in_date,
             check_out_date=booking.check_out_date,
             guest_count=booking.guest_count,
             total_amount=booking.total_amount,
             status=booking.status.value,
             special_requests=booking.special_requests,
-            created_at=booking.created_at
+            created_at=booking.created_at,
+            cancelled_at=booking.cancelled_at
         )
     
-    def _get_or_create_customer(self, email: str) -> Customer:
-        """Get existing customer or create new one."""
+    def _get_or_create_customer(self, email: str, commit: bool = True) -> Customer:
+        """Get existing customer or create new one (without ``commit``, in the caller's transaction)."""
         customer = self.db.query(Customer).filter(Customer.email == email).first()
         
         if not customer:
             customer = Customer(email=email)
             self.db.add(customer)
-            self.db.commit()
-            self.db.refresh(customer)
+            if commit:
+                self.db.commit()
+                self.db.refresh(customer)
+            else:
+                self.db.flush()
         
         return customer
     
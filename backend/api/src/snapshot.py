@@ -0,0 +1,384 @@
+"""Host-wide inventory snapshot shared by all workers through an mmap'd file.
+
+Every prefork worker would otherwise hold (and keep invalidating) its own copy
+of the room x date occupancy and price grid. Instead the grid lives in one
+file that each worker maps read-only, so it exists once per host: 10k rooms x
+365 days is about 3.6 MB of status codes plus 29 MB of prices.
+
+Each hotel partition (and each replica) has its own file: the application
+database uses ``INVENTORY_SNAPSHOT_PATH`` and the others a sibling named after
+the partition (``inventory.harbor.snap``), since room ids repeat across hotels.
+The header records the hotel, and a file of another hotel is never used.
+
+Layout: a 64-byte header, then room ids (int32), status codes (int8,
+rooms x days, see ``quotes.STATUS_LEGEND``) and prices (float64, rooms x days).
+
+Writers serialize on an ``flock``'d lock file, so there is a single writer at
+a time. Small changes are patched in place under a seqlock: the writer makes
+the header generation odd, writes the cells, then makes it even again, and
+readers retry a copy whose generation was odd or changed underneath them.
+Full rebuilds write a new file and atomically ``rename`` it over the old one,
+then flag the old file as superseded so mapped readers switch over.
+"""
+
+import logging
+import mmap
+import os
+import re
+import struct
+import tempfile
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+from datetime import date, timedelta
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from .catalog import get_room_catalog
+from .config import get_settings
+from .database import hotel_code_for, partition_key
+from .dynamic_pricing import dynamic_pricing_enabled
+from .invalidation import CELL_NEUTRAL_KINDS, RESYNC, InventoryChange, get_invalidation_bus
+from .quotes import QuoteEngine
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX platforms
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+MAGIC = b"SDINVSN1"
+FORMAT_VERSION = 2
+# magic, format, flags, generation, rooms, days, start ordinal, built at, hotel code (first 16 bytes)
+HEADER = struct.Struct("<8sIIQIIqd16s")
+HEADER_SIZE = 64
+GENERATION_OFFSET = 16
+FLAGS_OFFSET = 12
+FLAG_SUPERSEDED = 1
+
+
+def _align(offset: int) -> int:
+    return (offset + 7) & ~7
+
+
+def _layout(rooms: int, days: int) -> Tuple[int, int, int, int]:
+    """Byte offsets of room ids, status and prices, and the total file size."""
+    ids_at = HEADER_SIZE
+    status_at = _align(ids_at + rooms * 4)
+    prices_at = _align(status_at + rooms * days)
+    return ids_at, status_at, prices_at, prices_at + rooms * days * 8
+
+
+class SnapshotWindow:
+    """A consistent copy of part of the snapshot."""
+    
+    __slots__ = ("generation", "room_ids", "dates", "status", "prices")
+    
+    def __init__(self, generation: int, room_ids: np.ndarray, dates: List[date],
+                 status: np.ndarray, prices: np.ndarray):
+        self.generation = generation
+        self.room_ids = room_ids
+        self.dates = dates
+        self.status = status
+        self.prices = prices
+
+
+class MappedSnapshot:
+    """Read-only mapping of one snapshot file."""
+    
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            self.inode = os.fstat(f.fileno()).st_ino
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, fmt, _, _, rooms, days, start, built_at, hotel_code = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or fmt != FORMAT_VERSION:
+            raise ValueError(f"{path} is not an inventory snapshot")
+        self.hotel_code = hotel_code.rstrip(b"\0").decode(errors="replace")
+        self.rooms = rooms
+        self.days = days
+        self.start_date = date.fromordinal(start)
+        self.built_at = built_at
+        ids_at, status_at, prices_at, _ = _layout(rooms, days)
+        self.room_ids = np.frombuffer(self._mm, dtype=np.int32, count=rooms, offset=ids_at)
+        self.status = np.frombuffer(self._mm, dtype=np.int8, count=rooms * days, offset=status_at).reshape(rooms, days)
+        self.prices = np.frombuffer(self._mm, dtype=np.float64, count=rooms * days, offset=prices_at).reshape(rooms, days)
+    
+    @property
+    def generation(self) -> int:
+        return struct.unpack_from("<Q", self._mm, GENERATION_OFFSET)[0]
+    
+    @property
+    def superseded(self) -> bool:
+        return bool(struct.unpack_from("<I", self._mm, FLAGS_OFFSET)[0] & FLAG_SUPERSEDED)
+    
+    def covers(self, start: date, end: date) -> bool:
+        """Whether ``start``..``end`` (inclusive) lies inside the snapshot."""
+        return self.start_date <= start and end < self.start_date + timedelta(days=self.days)
+    
+    def read(self, rows: np.ndarray, start: date, end: date, max_retries: int = 100) -> SnapshotWindow:
+        """Copy rows x [start, end] under the seqlock."""
+        lo = (start - self.start_date).days
+        hi = (end - self.start_date).days + 1
+        for _ in range(max_retries):
+            before = self.generation
+            if before % 2:
+                time.sleep(0)
+                continue
+            status = self.status[rows, lo:hi].copy()
+            prices = self.prices[rows, lo:hi].copy()
+            if self.generation == before:
+                dates = [self.start_date + timedelta(days=offset) for offset in range(lo, hi)]
+                return SnapshotWindow(before, self.room_ids[rows].copy(), dates, status, prices)
+        raise RuntimeError("Inventory snapshot is being rewritten too often to read")
+
+
+class InventorySnapshotStore:
+    """One snapshot file: lock-free reads, locked incremental patches and rebuilds."""
+    
+    def __init__(self, path: str, days: int, engine: Optional[Engine] = None, hotel_code: Optional[str] = None):
+        self.path = path
+        self.days = days
+        self.engine = engine
+        self.hotel_code = _header_hotel_code(hotel_code or hotel_code_for(engine))
+        self._mapped: Optional[MappedSnapshot] = None
+        self._map_lock = threading.Lock()
+        self._catalog_version: Optional[int] = None
+        self.stats = {"rebuilds": 0, "patches": 0, "cells_patched": 0, "remaps": 0}
+    
+    # Reading
+    
+    def current(self) -> Optional[MappedSnapshot]:
+        """The live snapshot, remapping after a rebuild; None if none has been built."""
+        mapped = self._mapped
+        if mapped is not None and not mapped.superseded:
+            return mapped
+        with self._map_lock:
+            mapped = self._mapped
+            if mapped is None or mapped.superseded:
+                try:
+                    mapped = MappedSnapshot(self.path)
+                except (FileNotFoundError, ValueError):
+                    return None
+                self._mapped = mapped
+                self.stats["remaps"] += 1
+        return mapped
+    
+    def ensure_current(self, db: Session) -> MappedSnapshot:
+        """Snapshot valid for today and the current room catalog, building it if needed."""
+        catalog = get_room_catalog(db)
+        mapped = self.current()
+        if (
+            mapped is not None and mapped.start_date == date.today()
+            and mapped.hotel_code == self.hotel_code and self._catalog_version == catalog.version
+        ):
+            return mapped
+        
+        if mapped is None or not self._matches(mapped, catalog):
+            with self._writer():
+                # Another worker may have rebuilt while we waited for the lock
+                mapped = self.current()
+                if mapped is None or not self._matches(mapped, catalog):
+                    self._rebuild(db)
+                    mapped = self.current()
+        self._catalog_version = catalog.version
+        return mapped
+    
+    def window(self, db: Session, start: date, end: date,
+               room_ids: Optional[Sequence[int]] = None) -> Optional[SnapshotWindow]:
+        """Rows for ``room_ids`` (all when None) over ``start``..``end``; None if not covered."""
+        mapped = self.ensure_current(db)
+        if not mapped.covers(start, end):
+            return None
+        if room_ids is None:
+            rows = np.arange(mapped.rooms)
+        else:
+            wanted = np.asarray(room_ids, dtype=np.int32)
+            rows = np.searchsorted(mapped.room_ids, wanted)
+            rows = np.minimum(rows, max(mapped.rooms - 1, 0))
+            missing = wanted[(mapped.rooms == 0) | (mapped.room_ids[rows] != wanted)]
+            if len(missing):
+                raise ValueError(f"Room with ID {int(missing[0])} not found")
+        return mapped.read(rows, start, end)
+    
+    # Writing
+    
+    def apply(self, change: InventoryChange) -> None:
+        """Patch the cells a committed change touched (runs after commit, own session)."""
+        if self.engine is None:
+            return
+        mapped = self.current()
+        if mapped is None:
+            return
+        
+        db = Session(bind=self.engine)
+        try:
+            with self._writer():
+                mapped = self.current()
+                end_of_snapshot = mapped.start_date + timedelta(days=mapped.days)
+                start = max(change.start_date or mapped.start_date, mapped.start_date)
+                end = min(change.end_date or end_of_snapshot, end_of_snapshot)
+                if start >= end:
+                    return
+                
+                # Dynamic factors move for every room of a type when occupancy changes
+                if dynamic_pricing_enabled() or not change.room_ids:
+                    room_ids = mapped.room_ids.tolist()
+                else:
+                    room_ids = sorted(change.room_ids)
+                    if not set(room_ids).issubset(mapped.room_ids.tolist()):
+                        # A room we have never seen: the catalog changed
+                        self._rebuild(db)
+                        return
+                try:
+                    matrix = QuoteEngine(db).quote(start, end, room_ids, stay_rules=False)
+                except ValueError:
+                    # A mapped room was deactivated
+                    self._rebuild(db)
+                    return
+                rows = np.searchsorted(mapped.room_ids, room_ids)
+                self._patch(rows, (start - mapped.start_date).days, matrix.status, matrix.prices)
+        finally:
+            db.close()
+    
+    def rebuild(self, db: Session) -> MappedSnapshot:
+        """Rebuild the whole snapshot and swap it in."""
+        with self._writer():
+            self._rebuild(db)
+        return self.current()
+    
+    # Internals
+    
+    def _matches(self, mapped: MappedSnapshot, catalog) -> bool:
+        return (
+            mapped.hotel_code == self.hotel_code
+            and mapped.start_date == date.today()
+            and mapped.days == self.days
+            and mapped.room_ids.tolist() == [room.id for room in catalog.rooms]
+        )
+    
+    @contextmanager
+    def _writer(self) -> Iterator[None]:
+        """Exclusive writer lock shared by every process on the host."""
+        with open(self.path + ".lock", "a+b") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+    
+    def _rebuild(self, db: Session) -> None:
+        start = date.today()
+        matrix = QuoteEngine(db).quote(start, start + timedelta(days=self.days), stay_rules=False)
+        rooms = len(matrix.rooms)
+        previous = self.current()
+        # Generations keep increasing across swaps so readers never see one repeat
+        generation = previous.generation + 2 if previous is not None else 0
+        ids_at, status_at, prices_at, size = _layout(rooms, self.days)
+        
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(prefix=".inventory-", dir=directory)
+        # Keep the old file open: it loses its name on swap but must still be flagged
+        try:
+            old_fd = os.open(self.path, os.O_RDWR)
+        except FileNotFoundError:
+            old_fd = None
+        try:
+            with os.fdopen(fd, "w+b") as f:
+                f.truncate(size)
+                with mmap.mmap(f.fileno(), size) as mm:
+                    HEADER.pack_into(mm, 0, MAGIC, FORMAT_VERSION, 0, generation,
+                                     rooms, self.days, start.toordinal(), time.time(), self.hotel_code.encode())
+                    mm[ids_at:ids_at + rooms * 4] = np.array([r.id for r in matrix.rooms], dtype=np.int32).tobytes()
+                    mm[status_at:status_at + rooms * self.days] = matrix.status.astype(np.int8).tobytes()
+                    mm[prices_at:prices_at + rooms * self.days * 8] = matrix.prices.astype(np.float64).tobytes()
+                    mm.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+            if old_fd is not None:
+                os.pwrite(old_fd, struct.pack("<I", FLAG_SUPERSEDED), FLAGS_OFFSET)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+        finally:
+            if old_fd is not None:
+                os.close(old_fd)
+        self.stats["rebuilds"] += 1
+    
+    def _patch(self, rows: np.ndarray, lo: int, status: np.ndarray, prices: np.ndarray) -> None:
+        """Write cells in place; the odd generation tells readers to retry."""
+        with open(self.path, "r+b") as f:
+            with mmap.mmap(f.fileno(), 0) as mm:
+                _, _, _, generation, rooms, days, _, _, _ = HEADER.unpack_from(mm, 0)
+                _, status_at, prices_at, _ = _layout(rooms, days)
+                status_view = np.frombuffer(mm, dtype=np.int8, count=rooms * days, offset=status_at).reshape(rooms, days)
+                prices_view = np.frombuffer(mm, dtype=np.float64, count=rooms * days, offset=prices_at).reshape(rooms, days)
+                hi = lo + status.shape[1]
+                struct.pack_into("<Q", mm, GENERATION_OFFSET, generation + 1)
+                status_view[rows, lo:hi] = status
+                prices_view[rows, lo:hi] = prices
+                struct.pack_into("<Q", mm, GENERATION_OFFSET, generation + 2)
+                # Views must be released before the mapping can close
+                del status_view, prices_view
+        self.stats["patches"] += 1
+        self.stats["cells_patched"] += status.size
+
+
+def _header_hotel_code(hotel_code: str) -> str:
+    # As stored in (and read back from) the header
+    return hotel_code.encode()[:16].decode(errors="ignore")
+
+
+def snapshot_path(engine: Optional[Engine]) -> str:
+    """Snapshot file of ``engine``'s partition (a sibling of ``INVENTORY_SNAPSHOT_PATH`` for other hotels and replicas)."""
+    key = partition_key(engine)
+    if key == settings.hotel_code.lower():
+        return settings.inventory_snapshot_path
+    root, ext = os.path.splitext(settings.inventory_snapshot_path)
+    return f"{root}.{re.sub(r'[^A-Za-z0-9_-]+', '.', key)}{ext}"
+
+
+_stores: "weakref.WeakKeyDictionary[Engine, InventorySnapshotStore]" = weakref.WeakKeyDictionary()
+_stores_lock = threading.Lock()
+
+
+def get_inventory_snapshot(db: Session) -> Optional[InventorySnapshotStore]:
+    """Snapshot store for the session's database, or None when disabled."""
+    if not settings.inventory_snapshot:
+        return None
+    engine = db.get_bind()
+    store = _stores.get(engine)
+    if store is None:
+        with _stores_lock:
+            store = _stores.get(engine)
+            if store is None:
+                store = InventorySnapshotStore(snapshot_path(engine), settings.inventory_snapshot_days, engine)
+                _stores[engine] = store
+    return store
+
+
+def _on_inventory_change(change: InventoryChange) -> None:
+    if change.kind in CELL_NEUTRAL_KINDS:
+        return
+    # Workers on this host share the file, so the originating worker has patched it
+    if change.kind != RESYNC and change.origin is not None and change.from_this_host:
+        return
+    for store in list(_stores.values()):
+        if not change.concerns(hotel_code_for(store.engine)):
+            continue
+        try:
+            store.apply(change)
+        except Exception:
+            # Readers keep the previous cells until the next rebuild
+            logger.exception("Inventory snapshot patch failed for %s", store.path)
+
+
+get_invalidation_bus().subscribe(_on_inventory_change)
@@ -1,19 +1,28 @@
 """Seed data utility for populating the database with sample data."""
 
 from datetime import date, datetime, timedelta
-from sqlalchemy.orm import sessionmaker
+from typing import Optional
 
-from ..database import engine, get_db
-from ..models import Room, RoomType, ViewType, Customer, RoomAvailability
+from sqlalchemy.orm import Session, sessionmaker
+
+from ..config import get_settings
+from ..database import engine, get_db, hotel_code_for
+from ..models import Hotel, Room, RoomType, ViewType, Customer, RoomAvailability
+
+settings = get_settings()
 
 # Create a session for seeding
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
-def initialize_sample_data():
-    """Initialize the database with sample rooms and data."""
+def initialize_sample_data(session: Optional[Session] = None):
+    """Initialize the database with sample rooms and data.
     
-    db = SessionLocal()
+    Uses its own session on the default engine unless ``session`` is given,
+    in which case the caller keeps ownership of it.
+    """
+    
+    db = session or SessionLocal()
     try:
         # Check if data already exists
         existing_rooms = db.query(Room).first()
@@ -23,6 +32,19 @@ def initialize_sample_data():
         
         print("📊 Creating sample room data...")
         
+        # Describe the property this database holds
+        hotel_code = hotel_code_for(db.get_bind())
+        if not db.query(Hotel).filter(Hotel.code == hotel_code).first():
+            if hotel_code == settings.hotel_code.lower():
+                db.add(Hotel(
+                    code=hotel_code,
+                    name=settings.hotel_name,
+                    location=settings.hotel_location,
+                    timezone=settings.hotel_timezone
+                ))
+            else:
+                db.add(Hotel(code=hotel_code, name=hotel_code.replace("-", " ").title()))
+        
         # Create sample rooms
         sample_rooms = [
             # Ocean View Suites
@@ -272,7 +294,8 @@ def initialize_sample_data():
         print(f"❌ Error initializing sample data: {e}")
         db.rollback()
     finally:
-        db.close()
+        if session is None:
+            db.close()
 
 
 def reset_database():
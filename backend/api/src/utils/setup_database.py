@@ -0,0 +1,51 @@
+"""Deploy step: create the schema (and optionally the sample hotel) in every hotel partition.
+
+Workers started with ``STARTUP_MODE=production`` neither create tables nor
+seed data, so run this once per deploy before starting them::
+
+    python -m src.utils.setup_database                 # tables only
+    python -m src.utils.setup_database --sample-data   # plus the sample hotel in empty partitions
+"""
+
+import argparse
+import sys
+from typing import Dict, List
+
+from ..database import create_tables, get_partition, partition_engines
+from .seed_data import initialize_sample_data
+
+
+def setup_database(sample_data: bool = False) -> Dict[str, str]:
+    """Create missing tables in every partition, seeding empty ones if asked; the database URL per hotel."""
+    engines = partition_engines()
+    for engine in engines.values():
+        create_tables(engine)
+    if sample_data:
+        for hotel_code in engines:
+            session = get_partition(hotel_code)()
+            try:
+                initialize_sample_data(session)
+            finally:
+                session.close()
+    return {hotel_code: engine.url.render_as_string() for hotel_code, engine in engines.items()}
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Command line options for the setup step."""
+    parser = argparse.ArgumentParser(description="Create the Staydesk schema in every hotel partition")
+    parser.add_argument(
+        "--sample-data", action="store_true", help="Also add the sample hotel to partitions without rooms"
+    )
+    return parser
+
+
+def main(argv: List[str] = None) -> int:
+    """Entry point; returns the process exit status."""
+    args = build_parser().parse_args(argv)
+    for hotel_code, database_url in setup_database(sample_data=args.sample_data).items():
+        print(f"✅ {hotel_code}: {database_url}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,263 @@
+"""Matching waitlisted availability requests against released inventory.
+
+A waitlist entry is a request that could not be met: a stay, a room count and
+optionally a budget and a view. Each worker keeps the waiting entries in a
+night index (night -> entries whose stay includes it), loaded incrementally by
+id. When this worker commits a change that can free inventory (cancellation,
+expired or released hold, override or stay-rule change), only the entries
+whose stays overlap the released nights, and whose view the released rooms
+can satisfy, are checked; entries with the same stay share one quote. A
+satisfied entry is marked matched with a conditional update, so it matches at
+most once across workers, and a ``waitlist_matched`` event is written to the
+event log for consumers of ``/api/events``.
+
+A match is a notification, not a reservation: several entries may match the
+same released room, and whoever books first gets it.
+"""
+
+import logging
+import threading
+import weakref
+from datetime import date, datetime, timezone
+from typing import Dict, List, NamedTuple, Optional, Set
+
+import numpy as np
+from sqlalchemy import update
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from .catalog import get_room_catalog
+from .change_feed import record_change
+from .database import hotel_code_for
+from .invalidation import (
+    BOOKING_CANCELLED, HOLD_RELEASED, OVERRIDES_CHANGED, RESTRICTIONS_CHANGED, WAITLIST_MATCHED,
+    InventoryChange, get_invalidation_bus
+)
+from .models import ViewType, WaitlistEntry, WaitlistStatus
+from .quotes import QuoteEngine
+from .ranking import VIEW_CODES
+
+logger = logging.getLogger(__name__)
+
+# Changes after which rooms may have become bookable
+RELEASE_KINDS = frozenset({BOOKING_CANCELLED, HOLD_RELEASED, OVERRIDES_CHANGED, RESTRICTIONS_CHANGED})
+
+
+class WaitingRequest(NamedTuple):
+    """The parts of a waiting entry needed for matching."""
+    
+    id: int
+    check_in_date: date
+    check_out_date: date
+    room_count: int
+    max_budget: Optional[float]
+    view_type: Optional[ViewType]
+
+
+class WaitlistMatch(NamedTuple):
+    """A waiting entry that released inventory now satisfies."""
+    
+    entry_id: int
+    room_ids: List[int]
+
+
+class WaitlistIndex:
+    """Waiting entries of one database, indexed by night."""
+    
+    def __init__(self, engine: Engine):
+        self.engine = engine
+        self._entries: Dict[int, WaitingRequest] = {}
+        self._by_night: Dict[int, Set[int]] = {}  # date ordinal -> entry ids
+        self._last_id = 0
+        self._lock = threading.Lock()
+        self.stats = {"releases": 0, "candidates": 0, "quotes": 0, "matched": 0}
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    @property
+    def hotel_code(self) -> str:
+        """Hotel whose database this index matches."""
+        return hotel_code_for(self.engine)
+    
+    # Index maintenance
+    
+    def add(self, entry: WaitingRequest) -> None:
+        """Index a waiting entry."""
+        with self._lock:
+            self._add(entry)
+    
+    def remove(self, entry_id: int) -> None:
+        """Drop an entry that matched or was cancelled."""
+        with self._lock:
+            self._remove(entry_id)
+    
+    def refresh(self, db: Session) -> None:
+        """Load waiting entries created since the last load (by any worker)."""
+        rows = (
+            db.query(
+                WaitlistEntry.id, WaitlistEntry.check_in_date, WaitlistEntry.check_out_date,
+                WaitlistEntry.room_count, WaitlistEntry.max_budget, WaitlistEntry.view_type
+            )
+            .filter(
+                WaitlistEntry.status == WaitlistStatus.WAITING,
+                WaitlistEntry.id > self._last_id,
+                WaitlistEntry.check_out_date > date.today()
+            )
+            .order_by(WaitlistEntry.id)
+            .all()
+        )
+        with self._lock:
+            for row in rows:
+                self._add(WaitingRequest(*row))
+    
+    def candidates(self, start: Optional[date], end: Optional[date]) -> List[WaitingRequest]:
+        """Waiting entries whose stays overlap [start, end) (all when unbounded), oldest first."""
+        today = date.today()
+        with self._lock:
+            if start is None or end is None:
+                ids = set(self._entries)
+            elif (end - start).days > len(self._by_night):
+                # Long ranges: scanning the entries beats walking empty nights
+                ids = {
+                    entry.id for entry in self._entries.values()
+                    if entry.check_in_date < end and entry.check_out_date > start
+                }
+            else:
+                ids = set()
+                for ordinal in range(max(start, today).toordinal(), end.toordinal()):
+                    ids |= self._by_night.get(ordinal, set())
+            entries = [self._entries[entry_id] for entry_id in sorted(ids)]
+            # Stays that have begun can no longer be offered
+            for entry in entries:
+                if entry.check_in_date < today:
+                    self._remove(entry.id)
+        return [entry for entry in entries if entry.check_in_date >= today]
+    
+    def _add(self, entry: WaitingRequest) -> None:
+        self._last_id = max(self._last_id, entry.id)
+        if entry.id in self._entries:
+            return
+        self._entries[entry.id] = entry
+        for ordinal in range(entry.check_in_date.toordinal(), entry.check_out_date.toordinal()):
+            self._by_night.setdefault(ordinal, set()).add(entry.id)
+    
+    def _remove(self, entry_id: int) -> None:
+        entry = self._entries.pop(entry_id, None)
+        if entry is None:
+            return
+        for ordinal in range(entry.check_in_date.toordinal(), entry.check_out_date.toordinal()):
+            bucket = self._by_night.get(ordinal)
+            if bucket is not None:
+                bucket.discard(entry_id)
+                if not bucket:
+                    del self._by_night[ordinal]
+    
+    # Matching
+    
+    def match_released(self, change: InventoryChange) -> List[WaitlistMatch]:
+        """Match waiting entries against inventory a committed change may have released."""
+        db = Session(bind=self.engine)
+        try:
+            self.refresh(db)
+            self.stats["releases"] += 1
+            candidates = self.candidates(change.start_date, change.end_date)
+            
+            # Released rooms must be able to satisfy the entry's view
+            if change.room_ids:
+                by_id = get_room_catalog(db).by_id
+                released_views = {by_id[r].view_type for r in change.room_ids if r in by_id}
+                candidates = [e for e in candidates if e.view_type is None or e.view_type in released_views]
+            self.stats["candidates"] += len(candidates)
+            
+            stays: Dict[tuple, List[WaitingRequest]] = {}
+            for entry in candidates:
+                stays.setdefault((entry.check_in_date, entry.check_out_date), []).append(entry)
+            
+            matches = []
+            for (check_in, check_out), entries in stays.items():
+                quote = QuoteEngine(db).quote(check_in, check_out)
+                self.stats["quotes"] += 1
+                bookable = quote.fully_available
+                highest_night = quote.prices.max(axis=1)
+                views = np.fromiter((VIEW_CODES[room.view_type] for room in quote.rooms), dtype=np.int8)
+                room_ids = np.array([room.id for room in quote.rooms], dtype=np.int64)
+                for entry in entries:
+                    fits = bookable.copy()
+                    if entry.max_budget:
+                        fits &= highest_night <= entry.max_budget
+                    if entry.view_type is not None:
+                        fits &= views == VIEW_CODES[entry.view_type]
+                    if fits.sum() >= entry.room_count and self._claim(db, entry, room_ids[fits].tolist()):
+                        matches.append(WaitlistMatch(entry.id, room_ids[fits].tolist()))
+            self.stats["matched"] += len(matches)
+            return matches
+        finally:
+            db.close()
+    
+    def _claim(self, db: Session, entry: WaitingRequest, room_ids: List[int]) -> bool:
+        """Mark the entry matched and log the event; False if it was no longer waiting."""
+        result = db.execute(
+            update(WaitlistEntry)
+            .where(WaitlistEntry.id == entry.id, WaitlistEntry.status == WaitlistStatus.WAITING)
+            .values(
+                status=WaitlistStatus.MATCHED,
+                matched_room_ids=",".join(str(room_id) for room_id in room_ids),
+                matched_at=datetime.now(timezone.utc)
+            )
+        )
+        claimed = result.rowcount == 1
+        if claimed:
+            change = InventoryChange(
+                kind=WAITLIST_MATCHED,
+                room_ids=tuple(room_ids),
+                start_date=entry.check_in_date,
+                end_date=entry.check_out_date
+            )
+            record_change(db, change, waitlist_entry_id=entry.id)
+        try:
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        self.remove(entry.id)
+        if claimed:
+            get_invalidation_bus().publish(change.in_hotel(self.hotel_code))
+        return claimed
+
+
+_indexes: "weakref.WeakKeyDictionary[Engine, WaitlistIndex]" = weakref.WeakKeyDictionary()
+_indexes_lock = threading.Lock()
+
+
+def get_waitlist_index(db: Session) -> WaitlistIndex:
+    """Waitlist index for the session's database."""
+    return register_waitlist(db.get_bind())
+
+
+def register_waitlist(engine: Engine) -> WaitlistIndex:
+    """Index for a database; releases committed through it are matched from now on."""
+    index = _indexes.get(engine)
+    if index is None:
+        with _indexes_lock:
+            index = _indexes.get(engine)
+            if index is None:
+                index = WaitlistIndex(engine)
+                _indexes[engine] = index
+    return index
+
+
+def _on_inventory_change(change: InventoryChange) -> None:
+    # The worker that committed a release matches it, so each release is matched once
+    if change.kind not in RELEASE_KINDS or change.origin is not None:
+        return
+    for index in list(_indexes.values()):
+        if not change.concerns(index.hotel_code):
+            continue
+        try:
+            index.match_released(change)
+        except Exception:
+            logger.exception("Waitlist matching failed for %s", change.kind)
+
+
+get_invalidation_bus().subscribe(_on_inventory_change)
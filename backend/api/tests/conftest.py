@@ -0,0 +1,48 @@
+"""Shared fixtures: a fresh sample hotel, an API client bound to it, and the invalidation bus."""
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from main import app
+from src.database import Base, get_db
+from src.invalidation import get_invalidation_bus
+from src.utils.seed_data import initialize_sample_data
+
+
+@pytest.fixture()
+def db():
+    """Fresh in-memory database with the sample hotel."""
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    initialize_sample_data(session)
+    yield session
+    session.close()
+    engine.dispose()
+
+
+@pytest.fixture()
+def client(db):
+    """Test client bound to the ``db`` fixture's database (modules may override ``db``)."""
+    previous = app.dependency_overrides.get(get_db)
+    app.dependency_overrides[get_db] = lambda: db
+    yield TestClient(app)
+    if previous is None:
+        app.dependency_overrides.pop(get_db, None)
+    else:
+        app.dependency_overrides[get_db] = previous
+
+
+@pytest.fixture()
+def published():
+    """Changes published on the invalidation bus during the test."""
+    received = []
+    bus = get_invalidation_bus()
+    bus.subscribe(received.append)
+    yield received
+    bus.unsubscribe(received.append)
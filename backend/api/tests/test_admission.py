@@ -0,0 +1,110 @@
+"""Tests for admission control and load shedding."""
+
+import asyncio
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from main import app as main_app
+from src.admission import (
+    BOOKINGS, STANDARD, AdmissionController, AdmissionMiddleware, AdmissionRejected,
+    RouteLimit, classify_request
+)
+
+
+def make_controller(total=1, queue=2, timeout=0.5):
+    return AdmissionController(
+        max_concurrency=total,
+        limits=[
+            RouteLimit(BOOKINGS, priority=0, max_concurrent=total, max_queue=queue, queue_timeout=timeout),
+            RouteLimit(STANDARD, priority=1, max_concurrent=total, max_queue=queue, queue_timeout=timeout),
+        ],
+    )
+
+
+class TestAdmissionController:
+    """Test slot accounting, queueing and priority."""
+    
+    def test_classification(self):
+        assert classify_request("POST", "/api/bookings") == BOOKINGS
+        assert classify_request("GET", "/api/bookings/ABC") == STANDARD
+        assert classify_request("POST", "/api/availability") == STANDARD
+        assert classify_request("GET", "/api/metrics") is None
+        assert classify_request("GET", "/health") is None
+    
+    def test_bookings_overtake_queued_searches(self):
+        controller = make_controller()
+        order = []
+        
+        async def request(name, label):
+            await controller.acquire(name)
+            order.append(label)
+            controller.release(name, 0.01)
+        
+        async def scenario():
+            await controller.acquire(STANDARD)
+            waiting = [
+                asyncio.create_task(request(STANDARD, "search")),
+                asyncio.create_task(request(BOOKINGS, "booking")),
+            ]
+            await asyncio.sleep(0.01)
+            controller.release(STANDARD)
+            await asyncio.gather(*waiting)
+        
+        asyncio.run(scenario())
+        assert order == ["booking", "search"]
+    
+    def test_full_queue_and_budget_are_shed(self):
+        controller = make_controller(queue=1, timeout=0.05)
+        
+        async def scenario():
+            await controller.acquire(STANDARD)
+            queued = asyncio.create_task(controller.acquire(STANDARD))
+            await asyncio.sleep(0)
+            with pytest.raises(AdmissionRejected, match="queue is full") as full:
+                await controller.acquire(STANDARD)
+            assert full.value.retry_after >= 1
+            with pytest.raises(AdmissionRejected, match="budget"):
+                await queued
+        
+        asyncio.run(scenario())
+        stats = controller.stats()[STANDARD]
+        assert stats["rejected"] == 2
+        assert stats["timed_out"] == 1
+        assert stats["active"] == 1 and stats["queued"] == 0
+
+
+class TestAdmissionMiddleware:
+    """Test the 503 responses."""
+    
+    def test_overload_returns_503_with_retry_after(self):
+        app = FastAPI()
+        
+        @app.get("/api/slow")
+        async def slow():
+            await asyncio.sleep(0.2)
+            return {"ok": True}
+        
+        app.add_middleware(AdmissionMiddleware, controller=make_controller(queue=1, timeout=0.05))
+        
+        async def burst():
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                return await asyncio.gather(*[client.get("/api/slow") for _ in range(3)])
+        
+        responses = asyncio.run(burst())
+        statuses = sorted(response.status_code for response in responses)
+        assert statuses == [200, 503, 503]
+        rejected = [response for response in responses if response.status_code == 503]
+        assert all(int(response.headers["retry-after"]) >= 1 for response in rejected)
+        assert rejected[0].json()["error"] == "Service overloaded"
+    
+    def test_limits_are_observable(self):
+        async def fetch():
+            transport = httpx.ASGITransport(app=main_app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                return (await client.get("/api/metrics")).json()
+        
+        admission = asyncio.run(fetch())["admission"]
+        assert set(admission) == {BOOKINGS, STANDARD}
+        assert admission[BOOKINGS]["priority"] < admission[STANDARD]["priority"]
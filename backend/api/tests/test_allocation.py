@@ -0,0 +1,141 @@
+"""Tests for multi-room allocation."""
+
+import random
+import time
+from datetime import date, timedelta
+
+from src.allocation import AllocationCandidate, allocate_rooms, room_location
+
+
+def room(room_id, number, price, occupancy=2, view="city"):
+    return AllocationCandidate(room_id, number, price, occupancy, view)
+
+
+def numbers(room_set):
+    return [r.room_number for r in room_set.rooms]
+
+
+class TestAllocateRooms:
+    """Test the allocation optimizer."""
+    
+    def test_room_location(self):
+        assert room_location("1204") == (12, 4)
+        assert room_location("101") == (1, 1)
+        assert room_location("PH-A") == (None, None)
+    
+    def test_prefers_neighbouring_rooms_with_one_view(self):
+        candidates = [
+            room(1, "101", 100.0), room(2, "102", 100.0), room(3, "103", 100.0),
+            room(4, "105", 95.0, view="pool"), room(5, "301", 96.0), room(6, "402", 96.0),
+        ]
+        best = allocate_rooms(candidates, 3)[0]
+        
+        assert numbers(best) == ["101", "102", "103"]
+        assert best.floors == (1,)
+        assert best.views == ("city",)
+        assert best.gaps == 0
+        assert best.score == best.total_price == 300.0
+    
+    def test_cheaper_rooms_win_when_savings_outweigh_spread(self):
+        candidates = [room(1, "101", 200.0), room(2, "102", 200.0), room(3, "110", 80.0), room(4, "120", 80.0)]
+        
+        assert numbers(allocate_rooms(candidates, 2)[0]) == ["110", "120"]
+    
+    def test_sets_seat_the_party(self):
+        candidates = [
+            room(1, "101", 80.0), room(2, "102", 80.0), room(3, "103", 80.0),
+            room(4, "201", 150.0, occupancy=4), room(5, "202", 150.0, occupancy=4),
+        ]
+        
+        assert numbers(allocate_rooms(candidates, 2)[0]) == ["101", "102"]
+        room_sets = allocate_rooms(candidates, 2, guest_count=7)
+        assert room_sets
+        assert all(room_set.total_occupancy >= 7 for room_set in room_sets)
+        assert numbers(room_sets[0]) == ["201", "202"]
+        assert allocate_rooms(candidates, 2, guest_count=9) == []
+    
+    def test_ranked_sets_are_distinct(self):
+        candidates = [room(i, f"1{i:02d}", 100.0 + i) for i in range(1, 9)]
+        room_sets = allocate_rooms(candidates, 3, max_sets=3)
+        
+        assert len(room_sets) == 3
+        assert len({tuple(numbers(room_set)) for room_set in room_sets}) == 3
+        assert [s.score for s in room_sets] == sorted(s.score for s in room_sets)
+    
+    def test_spreads_over_floors_when_one_is_not_enough(self):
+        candidates = [room(1, "101", 100.0), room(2, "301", 100.0), room(3, "302", 100.0), room(4, "501", 100.0)]
+        best = allocate_rooms(candidates, 4)[0]
+        
+        assert len(best.rooms) == 4
+        assert best.floors == (1, 3, 5)
+    
+    def test_too_few_rooms(self):
+        assert allocate_rooms([room(1, "101", 100.0)], 2) == []
+    
+    def test_rooms_without_numeric_numbers(self):
+        candidates = [room(1, "PH-A", 300.0), room(2, "PH-B", 300.0), room(3, "101", 500.0)]
+        best = allocate_rooms(candidates, 2)[0]
+        
+        assert numbers(best) == ["PH-A", "PH-B"]
+        assert best.floors == ()
+    
+    def test_thousands_of_rooms_in_milliseconds(self):
+        rng = random.Random(7)
+        views = ["ocean", "city", "garden", "pool", "mountain"]
+        candidates = [
+            room(i, f"{i // 50 + 1}{i % 50 + 1:02d}", round(rng.uniform(75, 500), 2), [2, 3, 4, 6][i % 4], views[i % 5])
+            for i in range(3000) if rng.random() > 0.35
+        ]
+        
+        elapsed = []
+        for _ in range(3):
+            started = time.perf_counter()
+            room_sets = allocate_rooms(candidates, 10, guest_count=30)
+            elapsed.append(time.perf_counter() - started)
+        
+        assert room_sets and all(len(room_set.rooms) == 10 for room_set in room_sets)
+        assert all(room_set.total_occupancy >= 30 for room_set in room_sets)
+        # A few milliseconds in practice; the bound leaves room for slow CI machines
+        assert min(elapsed) < 0.05
+
+
+def next_weekday():
+    day = date.today() + timedelta(days=8)
+    while day.weekday() >= 5:
+        day += timedelta(days=1)
+    return day
+
+
+class TestAvailabilityRoomSets:
+    """Test room sets in availability search."""
+    
+    def test_multi_room_search_returns_room_sets(self, client):
+        response = client.post("/api/availability", json={
+            "check_in_date": next_weekday().isoformat(), "room_count": 2, "guest_count": 8,
+        })
+        
+        assert response.status_code == 200
+        room_sets = response.json()["room_sets"]
+        assert room_sets
+        best = room_sets[0]
+        assert [r["room_id"] for r in best["rooms"]] == ["101", "102"]
+        assert best["total_occupancy"] == 8
+        assert best["floors"] == [1]
+        assert best["views"] == ["ocean"]
+        assert best["adjacent"] is True
+        assert best["total_price_per_night"] == sum(r["price_per_night"] for r in best["rooms"])
+    
+    def test_room_sets_respect_budget(self, client):
+        response = client.post("/api/availability", json={
+            "check_in_date": next_weekday().isoformat(), "room_count": 3, "max_budget": 125.0,
+        })
+        
+        for room_set in response.json()["room_sets"]:
+            assert all(r["price_per_night"] <= 125.0 for r in room_set["rooms"])
+    
+    def test_single_room_search_has_no_room_sets(self, client):
+        response = client.post("/api/availability", json={
+            "check_in_date": next_weekday().isoformat(), "room_count": 1,
+        })
+        
+        assert response.json()["room_sets"] == []
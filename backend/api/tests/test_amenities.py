@@ -0,0 +1,72 @@
+"""Tests for amenity normalization and amenity filtering."""
+
+import pytest
+from datetime import date, timedelta
+from pydantic import ValidationError
+
+from src.amenities import AMENITY_BITS, AMENITY_CODES, amenity_mask, normalize_amenity, room_amenity_mask
+from src.models import Room, RoomAmenity
+from src.schemas import AvailabilityRequest
+from src.services import RoomService, amenity_filter_clause
+
+
+class TestVocabulary:
+    """Test amenity name normalization."""
+    
+    def test_codes_normalize_to_themselves(self):
+        for code in AMENITY_CODES:
+            assert normalize_amenity(code) == code
+    
+    def test_synonyms(self):
+        assert normalize_amenity("Hot Tub") == "jacuzzi"
+        assert normalize_amenity(" Full  Kitchen ") == "kitchenette"
+        assert normalize_amenity("Wi-Fi") == "wifi"
+        assert normalize_amenity("helipad") is None
+    
+    def test_room_mask_includes_feature_flags(self):
+        mask = room_amenity_mask("WiFi,Mini Bar", has_jacuzzi=True)
+        assert mask == AMENITY_BITS["wifi"] | AMENITY_BITS["mini_bar"] | AMENITY_BITS["jacuzzi"]
+    
+    def test_strict_mask_rejects_unknown(self):
+        with pytest.raises(ValueError):
+            amenity_mask(["balcony", "helipad"], strict=True)
+    
+    def test_request_rejects_unknown_amenity(self):
+        with pytest.raises(ValidationError):
+            AvailabilityRequest(
+                check_in_date=date.today() + timedelta(days=5), room_count=1, amenities=["helipad"]
+            )
+
+
+class TestAmenityFiltering:
+    """Test amenity filters in search and in SQL."""
+    
+    def test_room_rows_are_normalized_on_write(self, db):
+        penthouse = db.query(Room).filter(Room.room_number == "301").one()
+        codes = {link.amenity for link in db.query(RoomAmenity).filter(RoomAmenity.room_id == penthouse.id)}
+        assert {"kitchenette", "jacuzzi", "terrace", "butler_service"} <= codes
+        
+        penthouse.amenities = "WiFi"
+        penthouse.has_jacuzzi = False
+        db.commit()
+        codes = {link.amenity for link in db.query(RoomAmenity).filter(RoomAmenity.room_id == penthouse.id)}
+        assert "jacuzzi" not in codes
+        assert penthouse.amenity_mask & AMENITY_BITS["jacuzzi"] == 0
+    
+    def test_search_filters_by_amenities(self, db):
+        request = AvailabilityRequest(
+            check_in_date=date.today() + timedelta(days=30),
+            room_count=1,
+            amenities=["kitchenette", "hot tub"],
+        )
+        response = RoomService(db).search_available_rooms(request)
+        assert [room.room_id for room in response.available_rooms] == ["301"]
+    
+    def test_sql_clause_matches_catalog_filter(self, db):
+        mask = amenity_mask(["balcony", "mini bar"])
+        sql_rooms = {room.room_number for room in db.query(Room).filter(amenity_filter_clause(mask))}
+        python_rooms = {
+            room.room_number for room in db.query(Room) if room.amenity_mask & mask == mask
+        }
+        assert sql_rooms == python_rooms
+        assert "105" not in sql_rooms and "103" in sql_rooms
@@ -0,0 +1,99 @@
+"""Tests for the benchmark harness helpers."""
+
+import asyncio
+import json
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from main import app
+from src.database import get_db
+from benchmarks.datasets import seed_dataset
+from benchmarks.bench_startup import summarize
+from benchmarks.harness import ScenarioResult, compare_results, percentile, run_scenario
+
+
+def _result(**overrides) -> ScenarioResult:
+    values = dict(
+        endpoint="/api/availability", dataset_rooms=12, concurrency=1, requests=10,
+        duration_s=1.0, throughput_rps=100.0, p50_ms=5.0, p95_ms=10.0, p99_ms=12.0,
+        max_ms=15.0, queries_total=30, queries_per_request=3.0,
+    )
+    values.update(overrides)
+    return ScenarioResult(**values)
+
+
+class TestPercentile:
+    """Test percentile interpolation."""
+    
+    def test_interpolates_between_ranks(self):
+        values = [1.0, 2.0, 3.0, 4.0]
+        assert percentile(values, 0) == 1.0
+        assert percentile(values, 50) == 2.5
+        assert percentile(values, 100) == 4.0
+    
+    def test_empty_and_single(self):
+        assert percentile([], 95) == 0.0
+        assert percentile([7.0], 99) == 7.0
+
+
+class TestCompareResults:
+    """Test regression detection against a baseline file."""
+    
+    def test_flags_latency_and_query_regressions(self, tmp_path):
+        baseline = tmp_path / "baseline.json"
+        baseline.write_text(json.dumps({"results": [dict(_result().__dict__, key=_result().key)]}))
+        
+        regressions = compare_results([_result(p95_ms=20.0, queries_per_request=4.0)], str(baseline))
+        assert len(regressions) == 1
+        assert len(regressions[0]["problems"]) == 2
+    
+    def test_within_threshold_is_not_flagged(self, tmp_path):
+        baseline = tmp_path / "baseline.json"
+        baseline.write_text(json.dumps({"results": [dict(_result().__dict__, key=_result().key)]}))
+        
+        assert compare_results([_result(p95_ms=11.0, throughput_rps=90.0)], str(baseline)) == []
+
+
+def test_run_scenario_counts_queries(tmp_path):
+    """A small in-process run reports latencies and per-request query counts."""
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'bench.db'}", connect_args={"check_same_thread": False}
+    )
+    seed_dataset(engine, 20, horizon_days=10)
+    BenchSession = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    
+    def override_get_db():
+        db = BenchSession()
+        try:
+            yield db
+        finally:
+            db.close()
+    
+    previous = app.dependency_overrides.get(get_db)
+    app.dependency_overrides[get_db] = override_get_db
+    try:
+        result = asyncio.run(run_scenario(
+            app, engine, "/api/rooms/context",
+            lambda i: {"method": "GET", "url": "/api/rooms/context"},
+            dataset_rooms=20, concurrency=2, total_requests=6,
+        ))
+    finally:
+        if previous is None:
+            app.dependency_overrides.pop(get_db, None)
+        else:
+            app.dependency_overrides[get_db] = previous
+        engine.dispose()
+    
+    assert result.status_codes == {"200": 6}
+    assert result.queries_total > 0
+    assert result.p50_ms <= result.p95_ms <= result.p99_ms <= result.max_ms
+
+
+def test_startup_summary():
+    result = summarize("production", 50, [300.0, 100.0, 200.0], [9.0, 3.0, 6.0])
+    
+    assert result.key == "startup|production|rooms=50"
+    assert result.runs == 3
+    assert (result.ready_p50_ms, result.ready_max_ms) == (200.0, 300.0)
+    assert (result.first_search_p50_ms, result.first_search_max_ms) == (6.0, 9.0)
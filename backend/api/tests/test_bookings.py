@@ -0,0 +1,134 @@
+"""Tests for booking cancellation and modification."""
+
+from datetime import date, timedelta
+
+from src.invalidation import BOOKING_CANCELLED, BOOKING_CREATED
+from src.quotes import QuoteEngine
+
+
+def book(client, room_id, check_in, nights):
+    response = client.post("/api/bookings", json={
+        "customer_email": "changes@example.com", "room_id": room_id,
+        "check_in_date": check_in.isoformat(),
+        "check_out_date": (check_in + timedelta(days=nights)).isoformat(),
+    })
+    assert response.status_code == 200
+    return response.json()
+
+
+def room_status(client, room_id, start, days):
+    return client.get(f"/api/rooms/{room_id}/calendar", params={
+        "start_date": start.isoformat(), "end_date": (start + timedelta(days=days - 1)).isoformat(),
+    }).json()["status"]
+
+
+class TestCancelBooking:
+    """Test booking cancellation."""
+    
+    def test_cancel_releases_nights(self, client, published):
+        check_in = date.today() + timedelta(days=40)
+        booking = book(client, 6, check_in, 3)
+        published.clear()
+        
+        response = client.post(f"/api/bookings/{booking['confirmation_number']}/cancel")
+        assert response.status_code == 200
+        data = response.json()
+        assert data["status"] == "cancelled" and data["cancelled_at"] is not None
+        assert room_status(client, 6, check_in, 3) == [0, 0, 0]
+        assert [(c.kind, c.room_ids, c.start_date, c.end_date) for c in published] == [
+            (BOOKING_CANCELLED, (6,), check_in, check_in + timedelta(days=3))
+        ]
+        
+        again = client.post(f"/api/bookings/{booking['confirmation_number']}/cancel")
+        assert again.status_code == 409
+        assert client.post("/api/bookings/STD-0000-000/cancel").status_code == 404
+
+
+class TestModifyBooking:
+    """Test changing booking dates."""
+    
+    def test_only_differing_nights_are_changed(self, client, db, published):
+        check_in = date.today() + timedelta(days=50)
+        booking = book(client, 6, check_in, 3)
+        published.clear()
+        
+        new_in, new_out = check_in + timedelta(days=1), check_in + timedelta(days=5)
+        response = client.patch(f"/api/bookings/{booking['confirmation_number']}", json={
+            "check_in_date": new_in.isoformat(), "check_out_date": new_out.isoformat(),
+        })
+        assert response.status_code == 200
+        data = response.json()
+        
+        added = float(QuoteEngine(db).quote(check_in + timedelta(days=3), new_out, [6]).totals[0])
+        assert data["total_amount"] == round(booking["total_amount"] * 2 / 3 + added, 2)
+        assert (data["check_in_date"], data["check_out_date"]) == (new_in.isoformat(), new_out.isoformat())
+        assert room_status(client, 6, check_in, 6) == [0, 1, 1, 1, 1, 0]
+        assert [(c.kind, c.start_date, c.end_date) for c in published] == [
+            (BOOKING_CANCELLED, check_in, new_in),
+            (BOOKING_CREATED, check_in + timedelta(days=3), new_out),
+        ]
+    
+    def test_conflict_on_added_night_leaves_booking_unchanged(self, client):
+        check_in = date.today() + timedelta(days=60)
+        booking = book(client, 6, check_in, 2)
+        book(client, 6, check_in + timedelta(days=3), 1)
+        
+        response = client.patch(f"/api/bookings/{booking['confirmation_number']}", json={
+            "check_in_date": check_in.isoformat(),
+            "check_out_date": (check_in + timedelta(days=4)).isoformat(),
+        })
+        assert response.status_code == 409
+        assert room_status(client, 6, check_in, 4) == [1, 1, 0, 1]
+    
+    def test_modify_cancelled_booking(self, client):
+        check_in = date.today() + timedelta(days=70)
+        booking = book(client, 6, check_in, 2)
+        client.post(f"/api/bookings/{booking['confirmation_number']}/cancel")
+        
+        response = client.patch(f"/api/bookings/{booking['confirmation_number']}", json={
+            "check_in_date": check_in.isoformat(),
+            "check_out_date": (check_in + timedelta(days=3)).isoformat(),
+        })
+        assert response.status_code == 409
+
+
+class TestBookingLookup:
+    """Test booking lookup and customer history."""
+    
+    def test_get_by_confirmation_number(self, client):
+        booking = book(client, 6, date.today() + timedelta(days=80), 2)
+        response = client.get(f"/api/bookings/{booking['confirmation_number']}")
+        assert response.status_code == 200
+        assert response.json() == booking
+        assert client.get("/api/bookings/STD-0000-000").status_code == 404
+    
+    def test_customer_history_pages_newest_first(self, client, db):
+        from benchmarks.harness import QueryCounter
+        
+        created = [
+            book(client, room_id, date.today() + timedelta(days=90 + offset), 1)["booking_id"]
+            for offset, room_id in enumerate((1, 2, 3, 4, 5, 6, 7))
+        ]
+        
+        seen, cursor = [], None
+        while True:
+            with QueryCounter(db.get_bind()) as queries:
+                page = client.get("/api/customers/changes@example.com/bookings", params={
+                    "limit": 3, "cursor": cursor
+                }).json()
+            # Customer id, then one joined query for the page, whatever its size
+            assert queries.count == 2
+            assert all(b["customer_email"] == "changes@example.com" and b["room_number"] for b in page["bookings"])
+            seen.extend(b["booking_id"] for b in page["bookings"])
+            if not page["has_more"]:
+                break
+            cursor = page["next_cursor"]
+        
+        # Bookings created within one second tie on created_at and fall back to id
+        assert seen == sorted(created, reverse=True)
+    
+    def test_customer_history_errors(self, client):
+        book(client, 6, date.today() + timedelta(days=100), 1)
+        assert client.get("/api/customers/nobody@example.com/bookings").status_code == 404
+        response = client.get("/api/customers/changes@example.com/bookings", params={"cursor": "bogus"})
+        assert response.status_code == 400
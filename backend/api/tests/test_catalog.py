@@ -0,0 +1,74 @@
+"""Tests for the room catalog snapshot and catalog-backed search."""
+
+from datetime import date, timedelta
+
+from src.catalog import bump_catalog_version, get_room_catalog
+from src.models import Room
+from src.schemas import AvailabilityRequest
+from src.services import RoomService
+
+
+class TestRoomCatalog:
+    """Test catalog loading and invalidation."""
+    
+    def test_catalog_is_shared_and_pre_parsed(self, db):
+        catalog = get_room_catalog(db)
+        assert get_room_catalog(db) is catalog
+        
+        room = catalog.rooms[0]
+        assert room.room_number == "101"
+        assert room.amenities[:2] == ("WiFi", "Air Conditioning")
+        assert room.room_type_display == "Suite"
+        assert catalog.by_id[room.id] is room
+    
+    def test_room_write_reloads_catalog(self, db):
+        catalog = get_room_catalog(db)
+        room = db.query(Room).filter(Room.room_number == "105").one()
+        room.base_price = 70.0
+        db.commit()
+        
+        reloaded = get_room_catalog(db)
+        assert reloaded is not catalog
+        assert reloaded.by_id[room.id].base_price == 70.0
+    
+    def test_explicit_bump_invalidates(self, db):
+        catalog = get_room_catalog(db)
+        bump_catalog_version()
+        assert get_room_catalog(db) is not catalog
+
+
+class TestCatalogSearch:
+    """Test availability search joined with occupancy data."""
+    
+    def test_search_matches_per_room_checks(self, db):
+        service = RoomService(db)
+        check_in = date.today() + timedelta(days=15)
+        response = service.search_available_rooms(
+            AvailabilityRequest(check_in_date=check_in, room_count=1, max_budget=400.0)
+        )
+        
+        expected = []
+        for room in db.query(Room).filter(Room.is_active == True).all():
+            if service._is_room_available(room.id, check_in):
+                price = service._calculate_room_price(room, check_in)
+                if price <= 400.0:
+                    expected.append((price, room.room_number))
+        
+        assert response.total_count == len(expected)
+        assert [r.price_per_night for r in response.available_rooms] == sorted(p for p, _ in expected)[:10]
+    
+    def test_maintenance_and_overrides_are_applied(self, db):
+        service = RoomService(db)
+        
+        maintenance_day = date.today() + timedelta(days=7)
+        response = service.search_available_rooms(
+            AvailabilityRequest(check_in_date=maintenance_day, room_count=1, view_preference="ocean")
+        )
+        assert "101" not in [r.room_id for r in response.available_rooms]
+        
+        holiday = date.today() + timedelta(days=15)
+        response = service.search_available_rooms(
+            AvailabilityRequest(check_in_date=holiday, room_count=1, view_preference="sea")
+        )
+        prices = {r.room_id: r.price_per_night for r in response.available_rooms}
+        assert prices["101"] == 300.0
@@ -0,0 +1,133 @@
+"""Tests for the cross-worker change feed."""
+
+import pytest
+from datetime import date, timedelta
+from sqlalchemy import create_engine, delete, insert, select, update
+from sqlalchemy.orm import sessionmaker
+
+from src.catalog import catalog_version
+from src.change_feed import ChangeFeed, record_change
+from src.database import Base, hotel_code_for
+from src.invalidation import (
+    BOOKING_CREATED, CATALOG_CHANGED, RESYNC, InvalidationBus, InventoryChange, get_invalidation_bus
+)
+from src.models import InventoryEvent, Room
+from src.utils.seed_data import initialize_sample_data
+
+
+@pytest.fixture()
+def engine(tmp_path):
+    """File database shared by simulated workers."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'feed.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+def start_worker(engine, worker_id):
+    """A feed with its own bus, as in a separate worker process."""
+    bus = InvalidationBus()
+    received = []
+    bus.subscribe(received.append)
+    feed = ChangeFeed(engine, worker_id=worker_id, bus=bus)
+    feed.start(background=False)
+    return feed, bus, received
+
+
+def commit_change(engine, change, origin):
+    """Record and commit a change as worker ``origin`` would."""
+    session = sessionmaker(bind=engine)()
+    record_change(session, change, origin=origin)
+    session.commit()
+    session.close()
+
+
+def booking_change(day=10):
+    check_in = date.today() + timedelta(days=day)
+    return InventoryChange(BOOKING_CREATED, (3,), check_in, check_in + timedelta(days=2))
+
+
+class TestChangeFeed:
+    """Test delivery between simulated workers."""
+    
+    def test_changes_reach_other_workers_only(self, engine):
+        feed_a, _, received_a = start_worker(engine, "host/1")
+        feed_b, _, received_b = start_worker(engine, "host/2")
+        
+        change = booking_change()
+        commit_change(engine, change, "host/1")
+        assert feed_a.poll() == 0
+        assert feed_b.poll() == 1
+        
+        assert received_b == [InventoryChange(
+            change.kind, change.room_ids, change.start_date, change.end_date, origin="host/1",
+            hotel_code=feed_b.hotel_code
+        )]
+        assert received_a == []
+        stats = feed_b.stats()
+        assert stats["received"] == 1 and stats["missed"] == 0
+        assert 0 <= stats["latency_p99_ms"] < 5000
+    
+    def test_gaps_trigger_a_resync_after_the_grace_window(self, engine):
+        feed_b, _, received_b = start_worker(engine, "host/2")
+        
+        for day in (10, 20, 30):
+            commit_change(engine, booking_change(day), "host/1")
+        with engine.begin() as conn:
+            conn.execute(delete(InventoryEvent).where(InventoryEvent.id == 2))
+        
+        # The cursor waits at the gap in case the missing event commits late
+        assert feed_b.poll() == 1
+        assert feed_b.last_seen_id == 1 and feed_b.stats()["resyncs"] == 0
+        
+        feed_b.gap_grace_seconds = 0
+        assert feed_b.poll() == 1
+        assert [change.kind for change in received_b] == [BOOKING_CREATED, RESYNC, BOOKING_CREATED]
+        assert feed_b.stats()["missed"] == 1
+        assert feed_b.stats()["resyncs"] == 1
+    
+    def test_late_commit_within_the_grace_window_is_applied_in_order(self, engine):
+        feed_b, _, received_b = start_worker(engine, "host/2")
+        
+        for day in (10, 20, 30):
+            commit_change(engine, booking_change(day), "host/1")
+        with engine.begin() as conn:
+            late = conn.execute(select(InventoryEvent).where(InventoryEvent.id == 2)).one()._asdict()
+            conn.execute(delete(InventoryEvent).where(InventoryEvent.id == 2))
+        assert feed_b.poll() == 1
+        
+        with engine.begin() as conn:
+            conn.execute(insert(InventoryEvent).values(**late))
+        assert feed_b.poll() == 2
+        assert [change.start_date for change in received_b] == [
+            booking_change(day).start_date for day in (10, 20, 30)
+        ]
+        assert feed_b.stats()["resyncs"] == 0
+    
+    def test_prune_removes_expired_events(self, engine):
+        feed, _, _ = start_worker(engine, "host/1")
+        commit_change(engine, booking_change(), "host/1")
+        with engine.begin() as conn:
+            conn.execute(update(InventoryEvent).values(created_at=0))
+        assert feed.prune() == 1
+    
+    def test_room_writes_are_logged_published_and_applied_remotely(self, engine):
+        session = sessionmaker(bind=engine)()
+        initialize_sample_data(session)
+        seen = []
+        bus = get_invalidation_bus()
+        bus.subscribe(seen.append)
+        try:
+            room = session.query(Room).first()
+            room.base_price += 10
+            session.commit()
+            assert InventoryChange(CATALOG_CHANGED, hotel_code=hotel_code_for(engine)) in seen
+            last = session.query(InventoryEvent).order_by(InventoryEvent.id.desc()).first()
+            assert last.kind == CATALOG_CHANGED
+            
+            before = catalog_version()
+            bus.publish(InventoryChange(CATALOG_CHANGED, origin="elsewhere/7"))
+            assert catalog_version() == before + 1
+        finally:
+            bus.unsubscribe(seen.append)
+            session.close()
@@ -0,0 +1,157 @@
+"""Tests for single-flight coalescing of availability searches."""
+
+import asyncio
+import time
+import httpx
+import pytest
+from datetime import date, timedelta
+from sqlalchemy.pool import NullPool
+
+from main import app
+from src.coalescing import SingleFlight, availability_key, get_availability_flight
+from src.database import Base, create_database_engine, get_db, get_thread_session, hotel_code_for
+from src.models import Room
+from src.schemas import AvailabilityRequest
+from src.services import RoomService
+
+
+class TestSingleFlight:
+    """Test the coalescing primitive."""
+    
+    def test_concurrent_calls_share_one_computation(self):
+        flight = SingleFlight()
+        calls = []
+        
+        async def compute():
+            calls.append(1)
+            await asyncio.sleep(0.02)
+            return "result"
+        
+        async def burst():
+            same = [flight.do("a", compute) for _ in range(5)]
+            return await asyncio.gather(*same, flight.do("b", compute))
+        
+        assert asyncio.run(burst()) == ["result"] * 6
+        assert len(calls) == 2
+        assert flight.stats()["coalesced"] == 4
+        assert flight.coalescing_ratio == pytest.approx(4 / 6)
+        assert flight.in_flight == 0
+    
+    def test_errors_reach_every_waiter(self):
+        flight = SingleFlight()
+        
+        async def compute():
+            await asyncio.sleep(0.01)
+            raise ValueError("boom")
+        
+        async def burst():
+            return await asyncio.gather(*[flight.do("k", compute) for _ in range(3)], return_exceptions=True)
+        
+        results = asyncio.run(burst())
+        assert all(isinstance(result, ValueError) for result in results)
+        assert flight.executions == 1
+    
+    def test_leader_cancellation_does_not_fail_followers(self):
+        flight = SingleFlight()
+        calls = []
+        
+        async def compute():
+            calls.append(1)
+            await asyncio.sleep(0.02)
+            return "result"
+        
+        async def burst():
+            leader = asyncio.ensure_future(flight.do("k", compute))
+            await asyncio.sleep(0)
+            followers = [asyncio.ensure_future(flight.do("k", compute)) for _ in range(3)]
+            await asyncio.sleep(0)
+            leader.cancel()
+            return await asyncio.gather(*followers), leader.cancelled()
+        
+        results, leader_cancelled = asyncio.run(burst())
+        assert results == ["result"] * 3
+        assert leader_cancelled
+        assert len(calls) == 1
+    
+    def test_cancelled_computation_is_retried(self):
+        flight = SingleFlight()
+        calls = []
+        
+        async def compute():
+            calls.append(1)
+            await asyncio.sleep(0.02)
+            return len(calls)
+        
+        async def burst():
+            waiters = [asyncio.ensure_future(flight.do("k", compute)) for _ in range(3)]
+            await asyncio.sleep(0.005)
+            flight._in_flight["k"].cancel()
+            return await asyncio.gather(*waiters)
+        
+        assert asyncio.run(burst()) == [2, 2, 2]
+        assert flight.executions == 2
+        assert flight.in_flight == 0
+    
+    def test_key_normalization(self):
+        check_in = date.today() + timedelta(days=3)
+        a = AvailabilityRequest(check_in_date=check_in, room_count=1, view_preference=" Ocean", amenities=["wifi", "balcony"])
+        b = AvailabilityRequest(check_in_date=check_in, room_count=1, view_preference="ocean", amenities=["Balcony", "Wi-Fi"])
+        c = AvailabilityRequest(check_in_date=check_in, room_count=2, view_preference="ocean")
+        d = AvailabilityRequest(check_in_date=check_in, room_count=1, view_preference="ocean", amenities=["wifi", "balcony"], sort_by="best_match")
+        assert availability_key(a) == availability_key(b)
+        assert availability_key(a) != availability_key(c)
+        assert availability_key(a) != availability_key(d)
+
+
+def test_thread_session_has_its_own_connection(tmp_path):
+    engine = create_database_engine(f"sqlite:///{tmp_path / 'thread.db'}")
+    Base.metadata.create_all(bind=engine)
+    session = get_thread_session(engine)
+    try:
+        # Caches and routing still see the partition's engine
+        assert session.get_bind() is engine
+        assert isinstance(session.get_bind(Room.__mapper__).pool, NullPool)
+        assert hotel_code_for(session.get_bind(Room.__mapper__)) == hotel_code_for(engine)
+        assert session.query(Room).count() == 0
+    finally:
+        session.close()
+        engine.dispose()
+    
+    memory = create_database_engine("sqlite://")
+    assert get_thread_session(memory) is None
+
+
+class TestAvailabilityCoalescing:
+    """Test coalescing through the availability endpoint."""
+    
+    def test_burst_of_identical_searches(self, db, monkeypatch):
+        search = RoomService.search_available_rooms
+        
+        def slow_search(self, request):
+            time.sleep(0.05)
+            return search(self, request)
+        
+        monkeypatch.setattr(RoomService, "search_available_rooms", slow_search)
+        monkeypatch.setitem(app.dependency_overrides, get_db, lambda: db)
+        flight = get_availability_flight()
+        flight.reset()
+        body = {"check_in_date": (date.today() + timedelta(days=3)).isoformat(), "room_count": 1}
+        
+        async def burst():
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                return await asyncio.gather(*[client.post("/api/availability", json=body) for _ in range(8)])
+        
+        responses = asyncio.run(burst())
+        assert {response.status_code for response in responses} == {200}
+        assert len({response.text for response in responses}) == 1
+        
+        async def metrics():
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                return (await client.get("/api/metrics")).json()["coalescing"]
+        
+        stats = asyncio.run(metrics())
+        assert stats["requests"] == 8
+        assert stats["executions"] < 8
+        assert stats["coalesced"] == 8 - stats["executions"]
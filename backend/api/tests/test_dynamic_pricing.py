@@ -0,0 +1,105 @@
+"""Tests for occupancy-driven dynamic pricing."""
+
+import numpy as np
+import pytest
+from datetime import date, timedelta
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from src.config import get_settings
+from src.database import Base
+from src.dynamic_pricing import PricingRules, get_price_cache
+from src.models import Room, RoomType
+from src.quotes import QuoteEngine
+from src.schemas import AvailabilityRequest, CreateBookingRequest
+from src.services import BookingService, RoomService
+from src.utils.seed_data import initialize_sample_data
+
+settings = get_settings()
+
+
+@pytest.fixture()
+def db(monkeypatch):
+    """Sample hotel with dynamic pricing switched on."""
+    monkeypatch.setattr(settings, "pricing_mode", "dynamic")
+    monkeypatch.setattr(settings, "pricing_occupancy_tiers", "0:1.0,0.5:1.5")
+    monkeypatch.setattr(settings, "pricing_lead_time_tiers", "0:1.0")
+    monkeypatch.setattr(settings, "pricing_weekday_multipliers", "1,1,1,1,1,1,1")
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    initialize_sample_data(session)
+    yield session
+    session.close()
+    engine.dispose()
+
+
+class TestPricingRules:
+    """Test the configurable factor function."""
+    
+    def test_tiers_and_clamping(self):
+        rules = PricingRules.from_settings(settings.model_copy(update={
+            "pricing_occupancy_tiers": "0:0.9,0.5:1.0,0.9:1.5",
+            "pricing_lead_time_tiers": "0:1.2,7:1.0",
+            "pricing_weekday_multipliers": "1,1,1,1,1,1.1,1",
+            "pricing_max_multiplier": 1.6,
+        }))
+        factors = rules.factors(
+            occupancy=np.array([0.1, 0.6, 0.95, 0.95]),
+            lead_days=np.array([30, 30, 30, 1]),
+            weekdays=np.array([0, 0, 5, 5]),
+        )
+        assert factors.tolist() == pytest.approx([0.9, 1.0, 1.6, 1.6])
+    
+    def test_bad_weekday_config(self):
+        with pytest.raises(ValueError):
+            PricingRules.from_settings(settings.model_copy(update={"pricing_weekday_multipliers": "1,1"}))
+
+
+class TestPriceCache:
+    """Test precomputation and targeted recomputation."""
+    
+    def test_booking_recomputes_only_its_dates(self, db):
+        cache = get_price_cache(db)
+        night = date.today() + timedelta(days=40)
+        assert cache.factor(RoomType.PENTHOUSE, night) == 1.0
+        
+        penthouse = db.query(Room).filter(Room.room_type == RoomType.PENTHOUSE).one()
+        BookingService(db).create_booking(CreateBookingRequest(
+            customer_email="dyn@example.com", room_id=penthouse.id,
+            check_in_date=night, check_out_date=night + timedelta(days=2),
+        ))
+        before = dict(cache.stats)
+        
+        cache = get_price_cache(db)
+        assert cache.stats["full_rebuilds"] == before["full_rebuilds"]
+        assert cache.stats["dates_recomputed"] - before["dates_recomputed"] == 2
+        # The only penthouse is now fully occupied on those nights
+        assert cache.factor(RoomType.PENTHOUSE, night) == 1.5
+        assert cache.factor(RoomType.PENTHOUSE, night + timedelta(days=2)) == 1.0
+    
+    def test_search_and_quotes_apply_factors(self, db):
+        night = date.today() + timedelta(days=45)
+        suites = db.query(Room).filter(Room.room_type == RoomType.SUITE).all()
+        for index, suite in enumerate(suites[:2]):
+            BookingService(db).create_booking(CreateBookingRequest(
+                customer_email=f"suite{index}@example.com", room_id=suite.id,
+                check_in_date=night, check_out_date=night + timedelta(days=1),
+            ))
+        
+        remaining = suites[2]
+        expected = round(remaining.base_price * 1.5, 2)
+        if night.weekday() >= 5:
+            expected = round(remaining.weekend_price * 1.5, 2)
+        
+        response = RoomService(db).search_available_rooms(
+            AvailabilityRequest(check_in_date=night, room_count=1, view_preference="ocean")
+        )
+        prices = {room.room_id: room.price_per_night for room in response.available_rooms}
+        assert prices[remaining.room_number] == expected
+        
+        quote = QuoteEngine(db).quote(night, night + timedelta(days=1), room_ids=[remaining.id])
+        assert quote.prices[0, 0] == expected
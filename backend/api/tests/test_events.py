@@ -0,0 +1,105 @@
+"""Tests for the inventory event log API."""
+
+import asyncio
+import time
+from datetime import date, timedelta
+from sqlalchemy import delete
+
+from src.invalidation import BOOKING_CREATED, OVERRIDES_CHANGED
+from src.models import InventoryEvent
+from src.services import EventService
+
+
+def make_changes(client):
+    """One booking and one bulk update."""
+    check_in = date.today() + timedelta(days=40)
+    client.post("/api/bookings", json={
+        "customer_email": "events@example.com", "room_id": 5,
+        "check_in_date": check_in.isoformat(),
+        "check_out_date": (check_in + timedelta(days=2)).isoformat(),
+    })
+    client.post("/api/inventory/bulk", json={"updates": [{
+        "room_ids": [2, 3], "dates": [check_in.isoformat()], "price_override": 120.0,
+    }]})
+    return check_in
+
+
+class TestEventLog:
+    """Test the changes-since endpoint."""
+    
+    def test_writes_are_logged_in_order(self, client, db):
+        since = client.get("/api/events").json()["last_sequence"]
+        check_in = make_changes(client)
+        
+        data = client.get("/api/events", params={"since": since}).json()
+        assert [event["kind"] for event in data["events"]] == [BOOKING_CREATED, OVERRIDES_CHANGED]
+        booking, override = data["events"]
+        assert booking["room_ids"] == [5]
+        assert booking["start_date"] == check_in.isoformat()
+        assert booking["end_date"] == (check_in + timedelta(days=2)).isoformat()
+        assert override["room_ids"] == [2, 3]
+        assert booking["sequence"] < override["sequence"] == data["last_sequence"]
+        assert data["has_more"] is False and data["reset_required"] is False
+    
+    def test_limit_and_has_more(self, client):
+        make_changes(client)
+        first = client.get("/api/events", params={"limit": 1}).json()
+        assert len(first["events"]) == 1 and first["has_more"] is True
+        
+        rest = client.get("/api/events", params={"since": first["last_sequence"]}).json()
+        assert rest["events"][0]["sequence"] > first["last_sequence"]
+        empty = client.get("/api/events", params={"since": rest["last_sequence"]}).json()
+        assert empty["events"] == [] and empty["last_sequence"] == rest["last_sequence"]
+        
+        assert client.get("/api/events", params={"limit": 0}).status_code == 422
+    
+    def test_pruned_history_requires_reset(self, client, db):
+        make_changes(client)
+        make_changes(client)
+        last = client.get("/api/events").json()["last_sequence"]
+        db.execute(delete(InventoryEvent).where(InventoryEvent.id <= last - 2))
+        db.commit()
+        
+        assert client.get("/api/events", params={"since": 1}).json()["reset_required"] is True
+        assert client.get("/api/events", params={"since": last - 2}).json()["reset_required"] is False
+    
+    def test_recent_gap_holds_back_later_events(self, client, db):
+        make_changes(client)
+        first, second = [event["sequence"] for event in client.get("/api/events").json()["events"][-2:]]
+        # A lower sequence that has not committed yet (as on PostgreSQL)
+        db.execute(delete(InventoryEvent).where(InventoryEvent.id == second))
+        db.add(InventoryEvent(id=second + 1, kind=BOOKING_CREATED, origin="host/2", created_at=time.time()))
+        db.commit()
+        
+        held = client.get("/api/events", params={"since": first - 1}).json()
+        assert [event["sequence"] for event in held["events"]] == [first]
+        assert held["last_sequence"] == first and held["has_more"] is False
+        
+        # Once the gap is older than the grace window it is treated as a rollback
+        db.query(InventoryEvent).filter(InventoryEvent.id == second + 1).update({"created_at": time.time() - 60})
+        db.commit()
+        settled = client.get("/api/events", params={"since": first}).json()
+        assert [event["sequence"] for event in settled["events"]] == [second + 1]
+
+
+class TestEventStream:
+    """Test the Server-Sent Events generator."""
+    
+    def test_stream_formats_events_and_resumes(self, client, db):
+        make_changes(client)
+        last = client.get("/api/events").json()["last_sequence"]
+        
+        async def collect(since, polls):
+            remaining = iter(range(polls, -1, -1))
+            
+            async def is_disconnected():
+                return next(remaining) == 0
+            
+            stream = EventService(db).stream_events(since, is_disconnected, poll_interval=0, heartbeat_interval=0)
+            return [message async for message in stream]
+        
+        messages = asyncio.run(collect(last - 1, polls=2))
+        assert messages[0].startswith(f"id: {last}\nevent: {OVERRIDES_CHANGED}\ndata: {{")
+        assert messages[0].endswith("\n\n")
+        # Nothing new on the second poll, so a comment keeps the connection alive
+        assert messages[1:] == [": keepalive\n\n"]
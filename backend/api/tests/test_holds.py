@@ -0,0 +1,199 @@
+"""Tests for booking-link inventory holds."""
+
+import pytest
+import time
+from datetime import date, timedelta
+
+from src.holds import get_hold_expiry
+from src.invalidation import BOOKING_CREATED, HOLD_CREATED, HOLD_RELEASED
+from src.links import BookingLink, InvalidLinkToken, hold_nonce, sign_link, verify_link
+from src.models import InventoryHold, Room
+
+
+def hold_body(check_in, room_id=6, nights=2, **extra):
+    body = {
+        "room_id": room_id, "check_in_date": check_in.isoformat(),
+        "check_out_date": (check_in + timedelta(days=nights)).isoformat(),
+        "customer_email": "link@example.com",
+    }
+    body.update(extra)
+    return body
+
+
+def available_room_numbers(client, check_in):
+    response = client.post("/api/availability/search", json={
+        "check_in_date": check_in.isoformat(), "room_count": 1, "limit": 100,
+    })
+    # Search responses identify rooms by number
+    return {room["room_id"] for room in response.json()["available_rooms"]}
+
+
+class TestHolds:
+    """Test creating, honouring and converting holds."""
+    
+    def test_hold_takes_room_off_sale(self, client, db):
+        check_in = date.today() + timedelta(days=20)
+        number = db.get(Room, 6).room_number
+        assert number in available_room_numbers(client, check_in)
+        
+        response = client.post("/api/holds", json=hold_body(check_in))
+        assert response.status_code == 200
+        hold = response.json()
+        assert hold["room_number"] and hold["quoted_total"] > 0
+        
+        assert number not in available_room_numbers(client, check_in)
+        calendar = client.get("/api/rooms/6/calendar", params={
+            "start_date": check_in.isoformat(), "end_date": (check_in + timedelta(days=2)).isoformat(),
+        }).json()
+        assert calendar["status"] == [4, 4, 0]
+        
+        booking = client.post("/api/bookings", json={
+            "customer_email": "other@example.com", "room_id": 6,
+            "check_in_date": check_in.isoformat(),
+            "check_out_date": (check_in + timedelta(days=1)).isoformat(),
+        })
+        assert booking.status_code == 409
+        assert client.post("/api/holds", json=hold_body(check_in)).status_code == 409
+        assert client.get(f"/api/holds/{hold['hold_token']}").json()["room_id"] == 6
+    
+    def test_hold_converts_to_booking_at_held_price(self, client, published):
+        check_in = date.today() + timedelta(days=25)
+        hold = client.post("/api/holds", json=hold_body(check_in)).json()
+        
+        response = client.post(f"/api/holds/{hold['hold_token']}/book", json={"special_requests": "Late arrival"})
+        assert response.status_code == 200
+        booking = response.json()
+        assert booking["customer_email"] == "link@example.com"
+        assert booking["total_amount"] == hold["quoted_total"]
+        assert [change.kind for change in published] == [HOLD_CREATED, BOOKING_CREATED]
+        
+        assert client.get(f"/api/holds/{hold['hold_token']}").status_code == 404
+        assert client.post(f"/api/holds/{hold['hold_token']}/book", json={}).status_code == 404
+    
+    def test_new_customer_is_created_in_the_conversion_transaction(self, client, db, monkeypatch):
+        check_in = date.today() + timedelta(days=27)
+        hold = client.post("/api/holds", json=hold_body(check_in)).json()
+        commits = []
+        commit = db.commit
+        monkeypatch.setattr(db, "commit", lambda: commits.append(1) or commit())
+        
+        response = client.post(f"/api/holds/{hold['hold_token']}/book", json={"customer_email": "new-guest@example.com"})
+        assert response.status_code == 200
+        assert response.json()["customer_email"] == "new-guest@example.com"
+        assert len(commits) == 1
+    
+    def test_release_reopens_nights(self, client, published):
+        check_in = date.today() + timedelta(days=30)
+        hold = client.post("/api/holds", json=hold_body(check_in)).json()
+        assert hold["room_number"] not in available_room_numbers(client, check_in)
+        
+        assert client.delete(f"/api/holds/{hold['hold_token']}").status_code == 204
+        assert hold["room_number"] in available_room_numbers(client, check_in)
+        assert published[-1].kind == HOLD_RELEASED
+
+
+class TestHoldExpiry:
+    """Test heap-driven bulk expiry."""
+    
+    def test_due_holds_expire_in_bulk(self, client, db, published):
+        from benchmarks.harness import QueryCounter
+        
+        check_in = date.today() + timedelta(days=35)
+        for room_id in (6, 7, 8):
+            client.post("/api/holds", json=hold_body(check_in, room_id=room_id, ttl_minutes=5))
+        expiry = get_hold_expiry(db)
+        
+        # Nothing due: a heap peek, no queries
+        with QueryCounter(db.get_bind()) as queries:
+            assert expiry.expire_due() == 0
+        assert queries.count == 0
+        
+        assert expiry.expire_due(now=time.time() + 5 * 60 + 1) == 3
+        assert db.query(InventoryHold).count() == 0
+        released = [change for change in published if change.kind == HOLD_RELEASED]
+        assert sorted(change.room_ids[0] for change in released) == [6, 7, 8]
+        assert expiry.expire_due(now=time.time() + 3600) == 0
+    
+    def test_expired_holds_do_not_block_search(self, client, db):
+        check_in = date.today() + timedelta(days=40)
+        hold = client.post("/api/holds", json=hold_body(check_in)).json()
+        db.query(InventoryHold).update({"expires_at": time.time() - 1})
+        db.commit()
+        
+        assert hold["room_number"] in available_room_numbers(client, check_in)
+
+
+class TestBookingLinks:
+    """Test signed booking-link tokens."""
+    
+    def test_link_round_trip_and_tampering(self):
+        link = BookingLink(
+            hold_id=12, room_id=7, check_in_date=date(2025, 8, 15), check_out_date=date(2025, 8, 18),
+            guest_count=2, quoted_total=612.5, expires_at=int(time.time()) + 600,
+            hold_nonce=hold_nonce("q3Xr9PZ0bTa1mK4wYc8uVg"), hotel_code="staydesk"
+        )
+        token = sign_link(link, secret="test-secret")
+        assert len(token) == 75 and token.replace("-", "").replace("_", "").isalnum()
+        assert verify_link(token, secret="test-secret") == link
+        
+        with pytest.raises(InvalidLinkToken, match="Invalid"):
+            verify_link(token, secret="other-secret")
+        tampered = ("A" if token[10] != "A" else "B").join((token[:10], token[11:]))
+        with pytest.raises(InvalidLinkToken, match="Invalid"):
+            verify_link(tampered, secret="test-secret")
+        with pytest.raises(InvalidLinkToken, match="expired"):
+            verify_link(token, now=link.expires_at, secret="test-secret")
+    
+    def test_verification_is_fast(self):
+        token = sign_link(BookingLink(1, 1, date(2025, 8, 15), date(2025, 8, 16), 1, 100.0, 2 ** 31, bytes(8), "staydesk"))
+        started = time.perf_counter()
+        for _ in range(10000):
+            verify_link(token)
+        assert (time.perf_counter() - started) / 10000 < 1e-4
+    
+    def test_open_and_book_from_link(self, client, db):
+        check_in = date.today() + timedelta(days=45)
+        hold = client.post("/api/holds", json=hold_body(check_in, guest_count=2)).json()
+        token = hold["link_token"]
+        
+        from benchmarks.harness import QueryCounter
+        with QueryCounter(db.get_bind()) as queries:
+            offer = client.get(f"/api/links/{token}").json()
+        assert queries.count == 0
+        assert offer["room_id"] == 6 and offer["guest_count"] == 2
+        assert offer["quoted_total"] == hold["quoted_total"]
+        assert offer["check_out_date"] == (check_in + timedelta(days=2)).isoformat()
+        
+        booking = client.post(f"/api/links/{token}/book", json={}).json()
+        assert booking["total_amount"] == hold["quoted_total"]
+        assert client.post(f"/api/links/{token}/book", json={}).status_code == 404
+        assert client.get("/api/links/not-a-token").status_code == 400
+    
+    def test_link_only_books_the_hold_it_was_issued_with(self, client, db):
+        check_in = date.today() + timedelta(days=50)
+        alice = client.post("/api/holds", json=hold_body(check_in, room_id=1)).json()
+        alice_hold = db.query(InventoryHold).filter(InventoryHold.hold_token == alice["hold_token"]).one()
+        alice_id = alice_hold.id
+        assert client.delete(f"/api/holds/{alice['hold_token']}").status_code == 204
+        
+        # Ids are not reused, but an id from another database (or a reused one) must not match
+        bob = client.post("/api/holds", json=hold_body(check_in, room_id=6)).json()
+        bob_hold = db.query(InventoryHold).filter(InventoryHold.hold_token == bob["hold_token"]).one()
+        assert bob_hold.id != alice_id
+        bob_hold.id = alice_id
+        db.commit()
+        
+        response = client.post(f"/api/links/{alice['link_token']}/book", json={})
+        assert response.status_code == 404
+        assert db.query(InventoryHold).filter(InventoryHold.id == alice_id).one().room_id == 6
+    
+    def test_link_for_another_hotel_is_not_booked_here(self, client):
+        check_in = date.today() + timedelta(days=55)
+        hold = client.post("/api/holds", json=hold_body(check_in)).json()
+        link = verify_link(hold["link_token"])
+        assert client.get(f"/api/links/{hold['link_token']}").json()["hotel_code"] == link.hotel_code
+        
+        elsewhere = sign_link(BookingLink(**{**link.__dict__, "hotel_code": "elsewhere"}))
+        response = client.post(f"/api/links/{elsewhere}/book", json={})
+        assert response.status_code == 404
+        assert client.get(f"/api/holds/{hold['hold_token']}").status_code == 200
@@ -0,0 +1,208 @@
+"""Tests for inventory (rates and availability) endpoints."""
+
+from datetime import date, timedelta
+from sqlalchemy import delete, func
+
+from src.config import get_settings
+from src.invalidation import get_invalidation_bus
+from src.models import InventoryEvent, Room, RoomAvailability
+
+settings = get_settings()
+
+
+class TestBulkInventoryUpdate:
+    """Test the bulk rate and availability endpoint."""
+    
+    def test_range_update_by_room_type(self, client, db):
+        start = date.today() + timedelta(days=60)
+        response = client.post("/api/inventory/bulk", json={"updates": [{
+            "room_type": "standard",
+            "start_date": start.isoformat(),
+            "end_date": (start + timedelta(days=9)).isoformat(),
+            "price_override": 55.0,
+        }]})
+        assert response.status_code == 200
+        assert response.json()["room_dates"] == 30
+        
+        availability = client.post("/api/availability", json={
+            "check_in_date": (start + timedelta(days=3)).isoformat(),
+            "room_count": 1,
+            "view_preference": "garden",
+        }).json()
+        assert {room["price_per_night"] for room in availability["available_rooms"]} == {55.0}
+    
+    def test_upsert_updates_only_given_fields(self, client, db):
+        holiday = date.today() + timedelta(days=14)
+        response = client.post("/api/inventory/bulk", json={"updates": [
+            {"room_ids": [1, 2], "dates": [holiday.isoformat()], "is_available": False},
+        ]})
+        assert response.status_code == 200
+        
+        row = db.query(RoomAvailability).filter_by(room_id=1, date=holiday).one()
+        db.refresh(row)
+        assert row.is_available is False
+        assert row.price_override == 300.0  # Seeded holiday price is kept
+        assert db.query(RoomAvailability).filter_by(room_id=1, date=holiday).count() == 1
+    
+    def test_later_items_win_and_zero_clears_override(self, client, db):
+        day = date.today() + timedelta(days=70)
+        response = client.post("/api/inventory/bulk", json={"updates": [
+            {"room_ids": [4], "dates": [day.isoformat()], "price_override": 99.0},
+            {"room_ids": [4], "dates": [day.isoformat()], "price_override": 0},
+        ]})
+        assert response.status_code == 200
+        row = db.query(RoomAvailability).filter_by(room_id=4, date=day).one()
+        assert row.price_override is None
+        assert row.is_available is True
+    
+    def test_publishes_affected_range(self, client):
+        received = []
+        bus = get_invalidation_bus()
+        bus.subscribe(received.append)
+        try:
+            start = date.today() + timedelta(days=80)
+            client.post("/api/inventory/bulk", json={"updates": [{
+                "room_ids": [3], "start_date": start.isoformat(),
+                "end_date": (start + timedelta(days=2)).isoformat(), "is_maintenance": True,
+            }]})
+        finally:
+            bus.unsubscribe(received.append)
+        
+        assert [(c.room_ids, c.start_date, c.end_date) for c in received] == [
+            ((3,), start, start + timedelta(days=3))
+        ]
+    
+    def test_room_type_without_active_rooms_writes_nothing(self, client, db):
+        for room in db.query(Room).filter(Room.room_type == "penthouse"):
+            room.is_active = False
+        db.commit()
+        received = []
+        bus = get_invalidation_bus()
+        bus.subscribe(received.append)
+        try:
+            response = client.post("/api/inventory/bulk", json={"updates": [{
+                "room_type": "penthouse", "dates": [(date.today() + timedelta(days=5)).isoformat()],
+                "is_available": False,
+            }]})
+        finally:
+            bus.unsubscribe(received.append)
+        
+        assert response.status_code == 200, response.text
+        assert response.json()["room_dates"] == 0
+        assert received == []
+        assert db.query(InventoryEvent).filter(InventoryEvent.kind == "overrides_changed").count() == 0
+    
+    def test_validation_and_unknown_rooms(self, client):
+        day = (date.today() + timedelta(days=5)).isoformat()
+        assert client.post("/api/inventory/bulk", json={"updates": [
+            {"room_ids": [1], "dates": [day]}
+        ]}).status_code == 422
+        assert client.post("/api/inventory/bulk", json={"updates": [
+            {"dates": [day], "is_available": False}
+        ]}).status_code == 422
+        assert client.post("/api/inventory/bulk", json={"updates": [
+            {"room_ids": [999], "dates": [day], "is_available": False}
+        ]}).status_code == 404
+
+
+class TestCalendars:
+    """Test the room calendar and hotel grid endpoints."""
+    
+    def test_room_calendar_is_columnar(self, client):
+        start = date.today() + timedelta(days=5)
+        response = client.get("/api/rooms/1/calendar", params={
+            "start_date": start.isoformat(),
+            "end_date": (start + timedelta(days=11)).isoformat(),
+        })
+        assert response.status_code == 200
+        
+        data = response.json()
+        assert len(data["dates"]) == len(data["status"]) == len(data["prices"]) == 12
+        # Seeded maintenance on day 7 and holiday pricing from day 14
+        assert data["status"][2] == 3
+        assert data["prices"][9] == 300.0
+        assert data["status_legend"]["3"] == "maintenance"
+    
+    def test_booked_nights_show_in_calendar(self, client):
+        check_in = date.today() + timedelta(days=30)
+        client.post("/api/bookings", json={
+            "customer_email": "cal@example.com", "room_id": 6,
+            "check_in_date": check_in.isoformat(),
+            "check_out_date": (check_in + timedelta(days=2)).isoformat(),
+        })
+        data = client.get("/api/rooms/6/calendar", params={
+            "start_date": (check_in - timedelta(days=1)).isoformat(),
+            "end_date": (check_in + timedelta(days=2)).isoformat(),
+        }).json()
+        assert data["status"] == [0, 1, 1, 0]
+    
+    def test_grid_and_query_count(self, client, db):
+        from benchmarks.harness import QueryCounter
+        
+        with QueryCounter(db.get_bind()) as queries:
+            response = client.get("/api/calendar", params={"room_type": "suite"})
+        assert response.status_code == 200
+        
+        data = response.json()
+        assert data["room_numbers"] == ["101", "102", "201"]
+        assert len(data["status"]) == 3 and len(data["status"][0]) == 30
+        # Catalog, overrides, bookings, holds, and the first load of hold deadlines
+        assert queries.count <= 5
+    
+    def test_calendar_errors(self, client):
+        assert client.get("/api/rooms/999/calendar").status_code == 404
+        assert client.get("/api/calendar", params={
+            "start_date": "2030-01-10", "end_date": "2030-01-01"
+        }).status_code == 400
+
+
+class TestARIDelta:
+    """Test the incremental ARI export."""
+    
+    def test_initial_export_is_full_and_run_length_encoded(self, client, db):
+        data = client.get("/api/inventory/ari").json()
+        assert data["full_sync"] is True
+        assert len(data["rooms"]) == db.query(Room).filter(Room.is_active == True).count()
+        for room in data["rooms"]:
+            assert sum(run["nights"] for run in room["runs"]) == settings.max_advance_booking_days
+            assert len(room["runs"]) < settings.max_advance_booking_days
+    
+    def test_delta_holds_only_changed_cells(self, client):
+        version = client.get("/api/inventory/ari").json()["version"]
+        check_in = date.today() + timedelta(days=30)
+        client.post("/api/bookings", json={
+            "customer_email": "ari@example.com", "room_id": 6,
+            "check_in_date": check_in.isoformat(),
+            "check_out_date": (check_in + timedelta(days=2)).isoformat(),
+        })
+        client.post("/api/inventory/bulk", json={"updates": [{
+            "room_ids": [2, 3], "start_date": (check_in + timedelta(days=5)).isoformat(),
+            "end_date": (check_in + timedelta(days=7)).isoformat(), "price_override": 111.0,
+        }]})
+        
+        data = client.get("/api/inventory/ari", params={"since": version}).json()
+        assert data["full_sync"] is False and data["version"] > version
+        runs = {room["room_id"]: room["runs"] for room in data["rooms"]}
+        assert set(runs) == {2, 3, 6}
+        assert [(run["start_date"], run["nights"], run["status"]) for run in runs[6]] == [
+            (check_in.isoformat(), 2, 1)
+        ]
+        assert runs[2] == [{
+            "start_date": (check_in + timedelta(days=5)).isoformat(), "nights": 3, "status": 0, "price": 111.0
+        }]
+        
+        assert client.get("/api/inventory/ari", params={"since": data["version"]}).json()["rooms"] == []
+    
+    def test_pruned_history_falls_back_to_full_export(self, client, db):
+        client.post("/api/inventory/bulk", json={"updates": [
+            {"room_ids": [1], "dates": [(date.today() + timedelta(days=3)).isoformat()], "price_override": 90.0},
+        ]})
+        client.post("/api/inventory/bulk", json={"updates": [
+            {"room_ids": [1], "dates": [(date.today() + timedelta(days=4)).isoformat()], "price_override": 90.0},
+        ]})
+        last = db.query(func.max(InventoryEvent.id)).scalar()
+        db.execute(delete(InventoryEvent).where(InventoryEvent.id < last))
+        db.commit()
+        
+        data = client.get("/api/inventory/ari", params={"since": last - 2}).json()
+        assert data["full_sync"] is True and data["version"] == last
@@ -0,0 +1,88 @@
+"""Tests for keyset-paginated and streamed availability search."""
+
+import json
+import pytest
+from datetime import date, timedelta
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from benchmarks.datasets import seed_dataset
+from src.schemas import AvailabilityRequest
+from src.services import RoomService, encode_cursor
+
+
+@pytest.fixture()
+def db():
+    """In-memory database with a synthetic 120-room hotel."""
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    seed_dataset(engine, room_count=120)
+    session = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+def search_body(**extra):
+    body = {"check_in_date": (date.today() + timedelta(days=3)).isoformat(), "room_count": 1}
+    body.update(extra)
+    return body
+
+
+class TestKeysetPagination:
+    """Test the cursor-paginated search endpoint."""
+    
+    def test_pages_cover_every_room_once_in_price_order(self, client):
+        total = client.post("/api/availability", json=search_body()).json()["total_count"]
+        
+        rooms, cursor = [], None
+        while True:
+            page = client.post("/api/availability/search", json=search_body(limit=25, cursor=cursor)).json()
+            rooms.extend(page["available_rooms"])
+            if not page["has_more"]:
+                assert page["next_cursor"] is None
+                break
+            cursor = page["next_cursor"]
+        
+        assert len(rooms) == total
+        assert len({room["room_id"] for room in rooms}) == total
+        prices = [room["price_per_night"] for room in rooms]
+        assert prices == sorted(prices)
+    
+    def test_first_page_matches_search(self, client):
+        top = client.post("/api/availability", json=search_body(max_budget=250.0)).json()
+        page = client.post("/api/availability/search", json=search_body(max_budget=250.0)).json()
+        assert page["available_rooms"] == top["available_rooms"]
+    
+    def test_bad_cursors_are_rejected(self, client):
+        response = client.post("/api/availability/search", json=search_body(cursor="not-a-cursor"))
+        assert response.status_code == 400
+        
+        other_day = encode_cursor(date.today() + timedelta(days=9), 100.0, 1)
+        response = client.post("/api/availability/search", json=search_body(cursor=other_day))
+        assert response.status_code == 400
+        assert "different check-in date" in response.json()["detail"]["details"]
+
+
+class TestStreamingExport:
+    """Test the NDJSON export."""
+    
+    def test_export_streams_all_rooms(self, client):
+        total = client.post("/api/availability", json=search_body(view_preference="ocean")).json()["total_count"]
+        
+        response = client.post("/api/availability/export", json=search_body(view_preference="ocean"))
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        
+        rooms = [json.loads(line) for line in response.text.splitlines()]
+        assert len(rooms) == total
+        assert {room["view_type"] for room in rooms} == {"ocean"}
+    
+    def test_batches_resume_without_gaps(self, db):
+        request = AvailabilityRequest(check_in_date=date.today() + timedelta(days=3), room_count=1)
+        service = RoomService(db)
+        small = [room.room_id for room in service.stream_available_rooms(request, batch_size=7)]
+        large = [room.room_id for room in service.stream_available_rooms(request, batch_size=1000)]
+        assert small == large
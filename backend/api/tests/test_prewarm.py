@@ -0,0 +1,95 @@
+"""Tests for background cache prewarming."""
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from src import prewarm
+from src.catalog import get_room_catalog
+from src.database import Base, create_database_engine, register_partition, unregister_partition
+from src.models import Customer
+from src.prewarm import prewarm_database, start_prewarm
+from src.restrictions import _caches as restriction_caches
+from src.utils.seed_data import initialize_sample_data
+
+
+@pytest.fixture()
+def factory(tmp_path):
+    """Session factory for a fresh database with the sample hotel."""
+    engine = create_database_engine(f"sqlite:///{tmp_path / 'prewarm.db'}")
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    session = factory()
+    initialize_sample_data(session)
+    session.close()
+    yield factory
+    engine.dispose()
+
+
+class TestPrewarmDatabase:
+    """Test prewarming one database."""
+    
+    def test_builds_caches_before_first_request(self, factory):
+        timings = prewarm_database(factory)
+        
+        assert set(timings) == {"catalog", "restrictions", "pricing", "search", "waitlist"}
+        db = factory()
+        try:
+            catalog = get_room_catalog(db)
+            compiles = restriction_caches[db.get_bind()].stats["compiles"]
+            assert compiles == 1
+            
+            # Searches reuse what the prewarm built
+            prewarm._warm_search(db)
+            assert get_room_catalog(db) is catalog
+            assert restriction_caches[db.get_bind()].stats["compiles"] == compiles
+        finally:
+            db.close()
+    
+    def test_replica_skips_primary_steps(self, factory):
+        timings = prewarm_database(factory, primary=False)
+        
+        assert "waitlist" not in timings
+        assert "search" in timings
+    
+    def test_uncommitted_writes_survive_a_prewarm(self, factory):
+        writer = factory()
+        try:
+            writer.add(Customer(email="pending@example.com"))
+            writer.flush()
+            prewarm_database(factory)
+            writer.commit()
+            
+            assert writer.query(Customer).filter(Customer.email == "pending@example.com").count() == 1
+        finally:
+            writer.close()
+    
+    def test_in_memory_database_is_not_prewarmed(self):
+        engine = create_database_engine("sqlite://")
+        try:
+            assert prewarm_database(sessionmaker(bind=engine)) == {}
+        finally:
+            engine.dispose()
+    
+    def test_failing_step_is_skipped(self, factory, monkeypatch):
+        def broken(db):
+            raise RuntimeError("boom")
+        
+        monkeypatch.setattr(prewarm, "READ_STEPS", [("broken", broken), *prewarm.READ_STEPS])
+        timings = prewarm_database(factory, primary=False)
+        
+        assert "broken" not in timings
+        assert "catalog" in timings
+
+
+def test_start_prewarm_covers_partitions(factory):
+    register_partition("prewarmed", factory.kw["bind"])
+    try:
+        finished = {}
+        thread = start_prewarm(lambda results, elapsed_ms: finished.update(results=results, elapsed_ms=elapsed_ms))
+        thread.join(timeout=30)
+        
+        assert thread.daemon
+        assert "catalog" in finished["results"]["prewarmed"]
+        assert finished["elapsed_ms"] >= 0
+    finally:
+        unregister_partition("prewarmed")
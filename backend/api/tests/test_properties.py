@@ -0,0 +1,164 @@
+"""Tests for hotel partitions and cross-property search."""
+
+import time
+
+import pytest
+from datetime import date, timedelta
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, update
+from sqlalchemy.pool import StaticPool
+
+from main import app
+from src import properties
+from src.database import (
+    Base, get_db, get_partition, hotel_code_for, parse_partitions, register_partition, unregister_partition
+)
+from src.models import Booking, Customer, Hotel, Room
+from src.schemas import PropertyAvailabilityRequest
+from src.utils.seed_data import initialize_sample_data
+
+CHECK_IN = date.today() + timedelta(days=40)
+
+
+def make_partition(hotel_code, price_factor=1.0, path=None):
+    engine = create_engine(
+        f"sqlite:///{path}" if path else "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    register_partition(hotel_code, engine)
+    session = get_partition(hotel_code)()
+    initialize_sample_data(session)
+    if price_factor != 1.0:
+        session.execute(update(Room).values(
+            base_price=Room.base_price * price_factor, weekend_price=Room.weekend_price * price_factor
+        ))
+        session.commit()
+    session.close()
+    return engine
+
+
+@pytest.fixture()
+def hotels(tmp_path):
+    """Two extra hotels, the second one 40% cheaper (and in memory, so searched inline)."""
+    engines = [make_partition("harbor", path=tmp_path / "harbor.db"), make_partition("alpine", price_factor=0.6)]
+    yield engines
+    for hotel_code in ("harbor", "alpine"):
+        unregister_partition(hotel_code)
+    for engine in engines:
+        engine.dispose()
+
+
+def search(client, **body):
+    body = {"check_in_date": CHECK_IN.isoformat(), "room_count": 1, "hotel_codes": ["harbor", "alpine"]} | body
+    return client.post("/api/properties/availability", json=body)
+
+
+class TestPartitions:
+    """Test partition parsing, routing and row stamping."""
+    
+    def test_parse_partitions(self):
+        assert parse_partitions("") == {}
+        assert parse_partitions("Harbor=sqlite:///./harbor.db, alpine=postgresql://u:p@db/alpine") == {
+            "harbor": "sqlite:///./harbor.db", "alpine": "postgresql://u:p@db/alpine",
+        }
+        with pytest.raises(ValueError):
+            parse_partitions("harbor")
+    
+    def test_rows_are_stamped_with_their_hotel(self, hotels):
+        harbor = get_partition("harbor")()
+        try:
+            assert hotel_code_for(harbor.get_bind()) == "harbor"
+            assert {code for (code,) in harbor.query(Room.hotel_code).distinct()} == {"harbor"}
+            assert harbor.query(Hotel).one().code == "harbor"
+        finally:
+            harbor.close()
+        
+        unregistered = create_engine("sqlite://")
+        assert hotel_code_for(unregistered) == "staydesk"
+        with pytest.raises(ValueError):
+            get_partition("nowhere")
+        with pytest.raises(ValueError):
+            unregister_partition("staydesk")
+    
+    def test_hotel_header_routes_requests(self, hotels):
+        client = TestClient(app)
+        previous = app.dependency_overrides.pop(get_db, None)
+        try:
+            response = client.post("/api/bookings", headers={"X-Hotel-Code": "alpine"}, json={
+                "room_id": 7, "customer_email": "guest@example.com", "guest_count": 2,
+                "check_in_date": CHECK_IN.isoformat(), "check_out_date": (CHECK_IN + timedelta(days=1)).isoformat(),
+            })
+            assert response.status_code == 200, response.text
+            context = client.get("/api/rooms/context", headers={"X-Hotel-Code": "harbor"}).json()
+            assert context["hotel_name"] == "Harbor"
+            assert client.get("/api/rooms/context", headers={"X-Hotel-Code": "nowhere"}).status_code == 404
+        finally:
+            if previous is not None:
+                app.dependency_overrides[get_db] = previous
+        
+        alpine, harbor = get_partition("alpine")(), get_partition("harbor")()
+        try:
+            assert [b.hotel_code for b in alpine.query(Booking).all()] == ["alpine"]
+            assert harbor.query(Booking).count() == 0
+        finally:
+            alpine.close()
+            harbor.close()
+
+
+class TestPropertySearch:
+    """Test the cross-property fan-out search."""
+    
+    def test_results_are_merged_by_price(self, hotels):
+        response = search(TestClient(app))
+        
+        assert response.status_code == 200, response.text
+        data = response.json()
+        prices = [room["price_per_night"] for room in data["available_rooms"]]
+        assert prices == sorted(prices)
+        assert len(prices) == 10
+        assert data["available_rooms"][0]["hotel_code"] == "alpine"
+        assert {room["hotel_code"] for room in data["available_rooms"]} == {"alpine", "harbor"}
+        assert [r["hotel_code"] for r in data["properties"]] == ["harbor", "alpine"]
+        assert [r["hotel_name"] for r in data["properties"]] == ["Harbor", "Alpine"]
+        assert data["total_count"] == sum(r["total_count"] for r in data["properties"]) == 24
+    
+    def test_best_match_merge(self, hotels):
+        data = search(TestClient(app), view_preference="ocean", sort_by="best_match").json()
+        scores = [room["match_score"] for room in data["available_rooms"]]
+        
+        assert scores == sorted(scores, reverse=True)
+        assert data["available_rooms"][0]["view_type"] == "ocean"
+    
+    def test_slow_hotel_times_out_alone(self, hotels, monkeypatch):
+        search_partition = properties._search_partition
+        
+        def slow_harbor(hotel_code, request):
+            if hotel_code == "harbor":
+                time.sleep(0.5)
+            return search_partition(hotel_code, request)
+        
+        monkeypatch.setattr(properties, "_search_partition", slow_harbor)
+        monkeypatch.setattr(properties.settings, "property_search_timeout_ms", 100)
+        data = search(TestClient(app)).json()
+        
+        harbor, alpine = data["properties"]
+        assert harbor["error"].startswith("Timed out") and harbor["total_count"] == 0
+        assert alpine["error"] is None and alpine["total_count"] == 12
+        assert {room["hotel_code"] for room in data["available_rooms"]} == {"alpine"}
+    
+    def test_search_leaves_other_sessions_work_alone(self, hotels):
+        writer = get_partition("harbor")()
+        try:
+            writer.add(Customer(email="pending@example.com"))
+            writer.flush()
+            properties._search_partition("harbor", PropertyAvailabilityRequest(check_in_date=CHECK_IN, room_count=1))
+            properties._describe_partition("harbor")
+            writer.commit()
+            
+            assert writer.query(Customer).filter(Customer.email == "pending@example.com").count() == 1
+        finally:
+            writer.close()
+    
+    def test_unknown_hotel(self, hotels):
+        assert search(TestClient(app), hotel_codes=["harbor", "nowhere"]).status_code == 404
+        assert search(TestClient(app), hotel_codes=[" "]).status_code == 422
@@ -0,0 +1,107 @@
+"""Tests for the stay-quote engine and the quotes endpoint."""
+
+import pytest
+from datetime import date, timedelta
+from sqlalchemy import event
+
+from src.models import Booking, BookingStatus, Room
+from src.quotes import QuoteEngine
+from src.services import RoomService
+
+
+class TestQuoteEngine:
+    """Test vectorized pricing against the per-night rules."""
+    
+    def test_matches_per_night_pricing(self, db):
+        check_in = date.today() + timedelta(days=12)
+        check_out = check_in + timedelta(days=10)
+        quote = QuoteEngine(db).quote(check_in, check_out)
+        
+        service = RoomService(db)
+        for index, catalog_room in enumerate(quote.rooms):
+            room = db.get(Room, catalog_room.id)
+            expected = [service._calculate_room_price(room, night) for night in quote.dates]
+            assert quote.prices[index].tolist() == expected
+            assert quote.available[index].tolist() == [
+                service._is_room_available(room.id, night) for night in quote.dates
+            ]
+    
+    def test_bookings_mark_only_their_nights(self, db):
+        check_in = date.today() + timedelta(days=40)
+        db.add(Booking(
+            confirmation_number="STD-TEST-001", customer_id=1, room_id=5,
+            check_in_date=check_in + timedelta(days=1), check_out_date=check_in + timedelta(days=3),
+            guest_count=1, total_amount=240.0, status=BookingStatus.CONFIRMED,
+        ))
+        db.commit()
+        
+        quote = QuoteEngine(db).quote(check_in, check_in + timedelta(days=4), room_ids=[5])
+        assert quote.booked[0].tolist() == [False, True, True, False]
+        assert not quote.fully_available[0]
+        assert quote.unavailable_dates(0) == [check_in + timedelta(days=1), check_in + timedelta(days=2)]
+    
+    def test_room_quote_reads_only_its_rows(self, db):
+        check_in = date.today() + timedelta(days=40)
+        statements = []
+        
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+        
+        engine = db.get_bind()
+        QuoteEngine(db).quote(check_in, check_in + timedelta(days=2), room_ids=[5])
+        event.listen(engine, "before_cursor_execute", capture)
+        try:
+            QuoteEngine(db).quote(check_in, check_in + timedelta(days=2), room_ids=[5])
+        finally:
+            event.remove(engine, "before_cursor_execute", capture)
+        
+        for table in ("room_availability", "bookings", "inventory_holds"):
+            query = next(s for s in statements if f"FROM {table}" in s)
+            assert f"{table}.room_id IN" in query
+    
+    def test_unknown_room_raises(self, db):
+        with pytest.raises(ValueError):
+            QuoteEngine(db).quote(date.today(), date.today() + timedelta(days=1), room_ids=[999])
+
+
+class TestQuotesEndpoint:
+    """Test the /api/quotes endpoint."""
+    
+    def test_quotes_all_rooms(self, client):
+        check_in = date.today() + timedelta(days=30)
+        response = client.post("/api/quotes", json={
+            "check_in_date": check_in.isoformat(),
+            "check_out_date": (check_in + timedelta(days=3)).isoformat(),
+        })
+        assert response.status_code == 200
+        
+        data = response.json()
+        assert len(data["dates"]) == 3
+        assert len(data["quotes"]) == 12
+        for quote in data["quotes"]:
+            assert len(quote["nightly_prices"]) == 3
+            assert quote["total_price"] == pytest.approx(sum(quote["nightly_prices"]))
+    
+    def test_unknown_room_is_404(self, client):
+        check_in = date.today() + timedelta(days=30)
+        response = client.post("/api/quotes", json={
+            "check_in_date": check_in.isoformat(),
+            "check_out_date": (check_in + timedelta(days=1)).isoformat(),
+            "room_ids": [999],
+        })
+        assert response.status_code == 404
+    
+    def test_booking_uses_quoted_total(self, client):
+        check_in = date.today() + timedelta(days=50)
+        stay = {
+            "check_in_date": check_in.isoformat(),
+            "check_out_date": (check_in + timedelta(days=3)).isoformat(),
+        }
+        quote = client.post("/api/quotes", json=dict(stay, room_ids=[7])).json()["quotes"][0]
+        
+        booking = client.post("/api/bookings", json=dict(stay, customer_email="q@example.com", room_id=7))
+        assert booking.status_code == 200
+        assert booking.json()["total_amount"] == quote["total_price"]
+        
+        again = client.post("/api/bookings", json=dict(stay, customer_email="q@example.com", room_id=7))
+        assert again.status_code == 409
@@ -0,0 +1,162 @@
+"""Tests for multi-criteria room ranking."""
+
+import random
+import time
+from datetime import date, timedelta
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from src.amenities import AMENITY_BITS, amenity_mask_from_text
+from src.models import ViewType
+from src.ranking import RankingPreferences, RoomFeatures, rank_rooms, top_k
+
+
+def room(room_id, view=ViewType.CITY, amenities=(), square_feet=300, occupancy=2, price=100.0):
+    mask = 0
+    for code in amenities:
+        mask |= AMENITY_BITS[code]
+    return SimpleNamespace(
+        id=room_id, view_type=view, amenity_mask=mask, square_feet=square_feet,
+        max_occupancy=occupancy, base_price=price
+    )
+
+
+def ranked_ids(features, rooms, preferences, k=10):
+    return [room_id for room_id, _, _ in rank_rooms(
+        features, [r.id for r in rooms], [r.base_price for r in rooms], preferences, k
+    )]
+
+
+class TestRankRooms:
+    """Test scoring and top-k selection."""
+    
+    def test_view_is_a_preference_not_a_filter(self):
+        rooms = [room(1, price=90.0), room(2, ViewType.OCEAN, price=120.0), room(3, price=80.0)]
+        features = RoomFeatures.from_rooms(rooms)
+        
+        assert ranked_ids(features, rooms, RankingPreferences()) == [3, 1, 2]
+        assert ranked_ids(features, rooms, RankingPreferences(view_type=ViewType.OCEAN)) == [2, 3, 1]
+    
+    def test_wanted_amenities_and_party_size(self):
+        rooms = [
+            room(1, amenities=("wifi",), occupancy=2),
+            room(2, amenities=("wifi", "jacuzzi", "balcony"), occupancy=6),
+            room(3, amenities=("jacuzzi", "balcony"), occupancy=4),
+        ]
+        features = RoomFeatures.from_rooms(rooms)
+        wanted = AMENITY_BITS["jacuzzi"] | AMENITY_BITS["balcony"]
+        
+        assert ranked_ids(features, rooms, RankingPreferences(amenity_mask=wanted))[-1] == 1
+        assert ranked_ids(features, rooms, RankingPreferences(amenity_mask=wanted, guest_count=4))[0] == 3
+    
+    def test_budget_closeness(self):
+        rooms = [room(1, price=60.0), room(2, price=140.0), room(3, price=195.0)]
+        features = RoomFeatures.from_rooms(rooms)
+        
+        assert ranked_ids(features, rooms, RankingPreferences(target_price=200.0)) == [3, 2, 1]
+    
+    def test_scores_are_normalized(self):
+        rooms = [room(1, ViewType.OCEAN, ("balcony",), 500, 4, 100.0), room(2, price=300.0, square_feet=0)]
+        features = RoomFeatures.from_rooms(rooms)
+        preferences = RankingPreferences(ViewType.OCEAN, AMENITY_BITS["balcony"], 4, None)
+        
+        scores = {room_id: score for room_id, _, score in rank_rooms(features, [1, 2], [100.0, 300.0], preferences, 2)}
+        assert scores == {1: 1.0, 2: 0.0}
+    
+    def test_top_k_matches_full_sort(self):
+        rng = np.random.default_rng(3)
+        scores = rng.random(5000).round(2)
+        prices = rng.uniform(50, 500, 5000)
+        
+        expected = np.lexsort((prices, -scores))[:25]
+        assert top_k(scores, prices, 25).tolist() == expected.tolist()
+        assert len(top_k(scores[:3], prices[:3], 10)) == 3
+    
+    def test_unknown_room(self):
+        features = RoomFeatures.from_rooms([room(1), room(3)])
+        with pytest.raises(KeyError):
+            rank_rooms(features, [2], [100.0], RankingPreferences(), 1)
+    
+    def test_amenities_from_special_requests(self):
+        mask = amenity_mask_from_text("Quiet room with a hot tub, and a work desk please")
+        assert mask == AMENITY_BITS["jacuzzi"] | AMENITY_BITS["work_desk"]
+        assert amenity_mask_from_text("A/C that works") == AMENITY_BITS["air_conditioning"]
+        assert amenity_mask_from_text("no backache please") == 0
+        assert amenity_mask_from_text("We check in late; the front desk has our place back") == 0
+        assert amenity_mask_from_text(None) == 0
+    
+    def test_thousands_of_rooms(self):
+        rng = random.Random(5)
+        views = list(ViewType)
+        rooms = [
+            room(i, views[i % 5], rng.sample(["wifi", "balcony", "jacuzzi", "terrace"], i % 4), rng.randint(200, 900),
+                 rng.choice([2, 3, 4, 6]), round(rng.uniform(75, 500), 2))
+            for i in range(1, 5001)
+        ]
+        features = RoomFeatures.from_rooms(rooms)
+        preferences = RankingPreferences(ViewType.OCEAN, AMENITY_BITS["jacuzzi"], 3, 250.0)
+        room_ids = [r.id for r in rooms]
+        prices = [r.base_price for r in rooms]
+        
+        elapsed = []
+        for _ in range(3):
+            started = time.perf_counter()
+            ranked = rank_rooms(features, room_ids, prices, preferences, 10)
+            elapsed.append(time.perf_counter() - started)
+        
+        assert len(ranked) == 10
+        assert [score for _, _, score in ranked] == sorted((score for _, _, score in ranked), reverse=True)
+        # About a millisecond in practice; the bound leaves room for slow CI machines
+        assert min(elapsed) < 0.02
+
+
+def next_weekday():
+    day = date.today() + timedelta(days=8)
+    while day.weekday() >= 5:
+        day += timedelta(days=1)
+    return day
+
+
+class TestBestMatchSearch:
+    """Test best_match ordering in availability search."""
+    
+    def test_best_match_ranks_preferences(self, client):
+        response = client.post("/api/availability", json={
+            "check_in_date": next_weekday().isoformat(), "room_count": 1, "view_preference": "ocean", "max_budget": 350.0,
+            "special_requests": "Somewhere with a jacuzzi and a butler would be lovely", "sort_by": "best_match",
+        })
+        
+        assert response.status_code == 200
+        data = response.json()
+        rooms = data["available_rooms"]
+        assert rooms[0]["room_id"] == "301"
+        assert {r["view_type"] for r in rooms} != {"ocean"}  # Other views still rank, just lower
+        assert data["total_count"] >= len(rooms) == 10
+        scores = [r["match_score"] for r in rooms]
+        assert scores == sorted(scores, reverse=True)
+    
+    def test_price_order_is_unchanged_by_default(self, client):
+        response = client.post("/api/availability", json={
+            "check_in_date": next_weekday().isoformat(), "room_count": 1, "view_preference": "ocean",
+        })
+        
+        rooms = response.json()["available_rooms"]
+        assert {r["view_type"] for r in rooms} == {"ocean"}
+        assert [r["price_per_night"] for r in rooms] == sorted(r["price_per_night"] for r in rooms)
+        assert all(r["match_score"] is None for r in rooms)
+    
+    def test_invalid_sort_order(self, client):
+        response = client.post("/api/availability", json={
+            "check_in_date": next_weekday().isoformat(), "room_count": 1, "sort_by": "rating",
+        })
+        
+        assert response.status_code == 422
+    
+    def test_paginated_search_rejects_best_match(self, client):
+        response = client.post("/api/availability/search", json={
+            "check_in_date": next_weekday().isoformat(), "room_count": 1, "sort_by": "best_match",
+        })
+        
+        assert response.status_code == 400
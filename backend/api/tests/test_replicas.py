@@ -0,0 +1,156 @@
+"""Tests for read replicas and read-your-writes session tokens."""
+
+import shutil
+import time
+
+import pytest
+from datetime import date, timedelta
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from main import app
+from src.database import (
+    Base, create_database_engine, get_db, get_partition, get_read_partition, register_partition, unregister_partition
+)
+from src.models import InventoryHold
+from src.restrictions import get_restrictions
+from src.schemas import StayRestrictionRequest
+from src.services import InventoryService
+from src.replicas import decode_token, encode_token, replica_progress
+from src.utils.seed_data import initialize_sample_data
+
+CHECK_IN = date.today() + timedelta(days=40)
+
+
+class TestSessionTokens:
+    """Test token encoding."""
+    
+    def test_round_trip(self):
+        token = encode_token({"staydesk": 42, "harbor": 7})
+        
+        assert token == "harbor.7,staydesk.42"
+        assert decode_token(token) == {"harbor": 7, "staydesk": 42}
+    
+    def test_malformed_parts_are_ignored(self):
+        assert decode_token(None) == {}
+        assert decode_token("garbage, staydesk.x, .5, Lake-Side.3, lake-side.9") == {"lake-side": 9}
+
+
+@pytest.fixture()
+def lakeside(tmp_path):
+    """A hotel whose replica is a read-only copy taken before any bookings (a lagging replica)."""
+    primary_path, replica_path = tmp_path / "lakeside.db", tmp_path / "lakeside-replica.db"
+    primary = create_database_engine(f"sqlite:///{primary_path}")
+    Base.metadata.create_all(bind=primary)
+    register_partition("lakeside", primary)
+    session = get_partition("lakeside")()
+    initialize_sample_data(session)
+    session.close()
+    shutil.copy(primary_path, replica_path)
+    
+    replica = create_database_engine(f"sqlite:///file:{replica_path}?mode=ro&uri=true")
+    register_partition("lakeside", primary, replica)
+    previous = app.dependency_overrides.pop(get_db, None)
+    yield TestClient(app, headers={"X-Hotel-Code": "lakeside"}), primary, replica
+    if previous is not None:
+        app.dependency_overrides[get_db] = previous
+    unregister_partition("lakeside")
+    primary.dispose()
+    replica.dispose()
+
+
+def book(client, room_id):
+    return client.post("/api/bookings", json={
+        "room_id": room_id, "customer_email": "guest@example.com", "guest_count": 2,
+        "check_in_date": CHECK_IN.isoformat(), "check_out_date": (CHECK_IN + timedelta(days=1)).isoformat(),
+    })
+
+
+def penthouse_listed(client, **headers):
+    response = client.post("/api/availability", headers=headers, json={
+        "check_in_date": CHECK_IN.isoformat(), "room_count": 1, "view_preference": "ocean", "max_budget": 1000,
+    })
+    assert response.status_code == 200, response.text
+    return "301" in [room["room_id"] for room in response.json()["available_rooms"]]
+
+
+class TestReadWriteSplitting:
+    """Test replica routing through the API."""
+    
+    def test_replica_is_read_only(self, lakeside):
+        _, _, replica = lakeside
+        
+        assert get_read_partition("lakeside").kw["bind"] is replica
+        with pytest.raises(OperationalError):
+            with replica.begin() as conn:
+                conn.execute(text("DELETE FROM rooms"))
+    
+    def test_writer_reads_its_write_others_read_the_replica(self, lakeside):
+        client, _, _ = lakeside
+        response = book(client, 12)
+        
+        assert response.status_code == 200, response.text
+        token = response.headers["X-Session-Token"]
+        assert token.startswith("lakeside.")
+        # The lagging replica still lists the penthouse; the writer's token routes it to the primary
+        assert penthouse_listed(client)
+        assert not penthouse_listed(client, **{"X-Session-Token": token})
+        assert client.get("/api/rooms/context").status_code == 200
+    
+    def test_token_accumulates_and_reads_return_to_caught_up_replica(self, lakeside, tmp_path):
+        client, _, replica = lakeside
+        first = book(client, 12).headers["X-Session-Token"]
+        second = client.post("/api/bookings", headers={"X-Session-Token": first + ",harbor.3"}, json={
+            "room_id": 1, "customer_email": "guest@example.com", "guest_count": 2,
+            "check_in_date": CHECK_IN.isoformat(), "check_out_date": (CHECK_IN + timedelta(days=1)).isoformat(),
+        }).headers["X-Session-Token"]
+        
+        assert decode_token(second)["harbor"] == 3
+        assert decode_token(second)["lakeside"] > decode_token(first)["lakeside"]
+        assert client.get("/health").headers.get("X-Session-Token") is None
+        
+        # Once the replica has applied the writes, token holders read from it again
+        shutil.copy(tmp_path / "lakeside.db", tmp_path / "lakeside-replica.db")
+        replica.dispose()
+        assert not penthouse_listed(client, **{"X-Session-Token": second})
+        assert replica_progress.caught_up(replica, decode_token(second)["lakeside"])
+    
+    def test_expired_holds_are_swept_on_the_primary(self, lakeside, tmp_path):
+        client, primary, replica = lakeside
+        session = get_partition("lakeside")()
+        session.add(InventoryHold(
+            hold_token="expired", room_id=12, check_in_date=CHECK_IN, check_out_date=CHECK_IN + timedelta(days=1),
+            quoted_total=500.0, created_at=time.time() - 120, expires_at=time.time() - 60,
+        ))
+        session.commit()
+        session.close()
+        shutil.copy(tmp_path / "lakeside.db", tmp_path / "lakeside-replica.db")
+        replica.dispose()
+        
+        # The search reads the read-only replica, which still has the hold, and sweeps on the primary
+        assert penthouse_listed(client)
+        with primary.connect() as conn:
+            assert conn.execute(text("SELECT COUNT(*) FROM inventory_holds")).scalar() == 0
+        with replica.connect() as conn:
+            assert conn.execute(text("SELECT COUNT(*) FROM inventory_holds")).scalar() == 1
+    
+    def test_replica_reads_never_cache_rules_it_has_not_applied(self, lakeside, tmp_path):
+        client, _, replica = lakeside
+        assert penthouse_listed(client)  # Compiles the rules before the change
+        primary = get_partition("lakeside")()
+        reader = get_read_partition("lakeside")()
+        try:
+            InventoryService(primary).create_restriction(StayRestrictionRequest(
+                room_type="penthouse", start_date=CHECK_IN, end_date=CHECK_IN, closed_to_arrival=True
+            ))
+            
+            # The replica has not applied the rule yet, but the rules come from the primary
+            assert not penthouse_listed(client)
+            shutil.copy(tmp_path / "lakeside.db", tmp_path / "lakeside-replica.db")
+            replica.dispose()
+            stay = (CHECK_IN, CHECK_IN + timedelta(days=1))
+            assert get_restrictions(reader).blocked_types(*stay) == get_restrictions(primary).blocked_types(*stay) != 0
+        finally:
+            reader.close()
+            primary.close()
@@ -0,0 +1,161 @@
+"""Tests for stay restrictions (min stay, closed to arrival and departure)."""
+
+from datetime import date, timedelta
+from types import SimpleNamespace
+
+import numpy as np
+
+from src.invalidation import RESTRICTIONS_CHANGED, get_invalidation_bus
+from src.models import RoomType
+from src.restrictions import ROOM_TYPE_BITS, RestrictionTable
+
+TODAY = date(2025, 3, 3)  # A Monday
+
+
+def rule(start, end, room_type=None, weekdays=0b1111111, min_stay=None, cta=False, ctd=False):
+    return SimpleNamespace(
+        room_type=room_type, start_date=TODAY + timedelta(days=start), end_date=TODAY + timedelta(days=end),
+        weekdays=weekdays, min_stay=min_stay, closed_to_arrival=cta, closed_to_departure=ctd
+    )
+
+
+def day(offset):
+    return TODAY + timedelta(days=offset)
+
+
+class TestRestrictionTable:
+    """Test rule compilation and stay checks."""
+    
+    def test_min_stay_applies_to_arrivals(self):
+        table = RestrictionTable.compile([rule(10, 12, RoomType.SUITE, min_stay=3)], TODAY, 60)
+        suite = ROOM_TYPE_BITS[RoomType.SUITE]
+        
+        assert table.blocked_types(day(10), day(12)) == suite
+        assert table.blocked_types(day(10), day(13)) == 0
+        assert table.blocked_types(day(9), day(11)) == 0  # Arrives before the rule
+        assert table.blocked_types(day(13), day(14)) == 0
+        assert "at least 3 nights" in table.violation(RoomType.SUITE, day(11), day(12))
+        assert table.violation(RoomType.DELUXE, day(11), day(12)) is None
+    
+    def test_closed_to_arrival_and_departure(self):
+        table = RestrictionTable.compile([rule(5, 5, cta=True), rule(8, 8, RoomType.STANDARD, ctd=True)], TODAY, 60)
+        
+        assert table.blocked_types(day(5), day(6)) == sum(ROOM_TYPE_BITS.values())
+        assert table.blocked_types(day(4), day(6)) == 0  # Staying through is fine
+        assert table.blocked_types(day(6), day(8)) == ROOM_TYPE_BITS[RoomType.STANDARD]
+        assert table.violation(RoomType.STANDARD, day(6), day(8)).startswith("Departure on")
+        assert table.violation(RoomType.SUITE, day(5), day(7)).startswith("Arrival on")
+    
+    def test_weekdays_and_strictest_rule_wins(self):
+        fridays_saturdays = (1 << 4) | (1 << 5)
+        table = RestrictionTable.compile([
+            rule(0, 30, RoomType.DELUXE, weekdays=fridays_saturdays, min_stay=2),
+            rule(0, 30, RoomType.DELUXE, weekdays=1 << 5, min_stay=4),
+        ], TODAY, 60)
+        deluxe = ROOM_TYPE_BITS[RoomType.DELUXE]
+        
+        assert table.blocked_types(day(4), day(5)) == deluxe  # Friday
+        assert table.blocked_types(day(4), day(6)) == 0
+        assert table.blocked_types(day(5), day(8)) == deluxe  # Saturday needs 4
+        assert table.blocked_types(day(3), day(4)) == 0  # Thursday
+    
+    def test_blocked_rooms_and_outside_horizon(self):
+        table = RestrictionTable.compile([rule(-5, 100, RoomType.SUITE, cta=True)], TODAY, 30)
+        rooms = np.array([ROOM_TYPE_BITS[RoomType.SUITE], ROOM_TYPE_BITS[RoomType.STANDARD]], dtype=np.uint16)
+        
+        assert table.blocked_rooms(rooms, day(0), day(2)).tolist() == [True, False]
+        assert table.blocked_types(day(45), day(46)) == 0
+
+
+CHECK_IN = date.today() + timedelta(days=40)
+
+
+def add_rule(client, **body):
+    body.setdefault("start_date", CHECK_IN.isoformat())
+    body.setdefault("end_date", CHECK_IN.isoformat())
+    response = client.post("/api/inventory/restrictions", json=body)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def booking_body(room_id, nights):
+    return {
+        "room_id": room_id, "customer_email": "rules@example.com", "guest_count": 2,
+        "check_in_date": CHECK_IN.isoformat(),
+        "check_out_date": (CHECK_IN + timedelta(days=nights)).isoformat(),
+    }
+
+
+class TestRestrictionEndpoints:
+    """Test restrictions through search, quotes and bookings."""
+    
+    def test_search_excludes_restricted_room_types(self, client):
+        add_rule(client, room_type="suite", min_stay=3)
+        
+        def room_types(nights):
+            response = client.post("/api/availability", json={
+                "check_in_date": CHECK_IN.isoformat(), "room_count": 1, "nights": nights,
+            })
+            assert response.status_code == 200
+            return {r["room_type"] for r in response.json()["available_rooms"]}
+        
+        assert "Suite" not in room_types(1)
+        assert "Suite" in room_types(3)
+    
+    def test_bookings_and_quotes_respect_rules(self, client):
+        add_rule(client, closed_to_arrival=True, room_type="standard")
+        
+        response = client.post("/api/bookings", json=booking_body(7, 2))
+        assert response.status_code == 409
+        assert "arrival on" in response.json()["detail"]["details"]
+        assert client.post("/api/bookings", json=booking_body(4, 2)).status_code == 200
+        
+        quotes = client.post("/api/quotes", json={
+            "check_in_date": CHECK_IN.isoformat(),
+            "check_out_date": (CHECK_IN + timedelta(days=2)).isoformat(),
+            "room_ids": [7, 5],
+        }).json()["quotes"]
+        assert [q["available"] for q in quotes] == [False, True]
+    
+    def test_date_change_must_meet_min_stay(self, client):
+        booking = client.post("/api/bookings", json=booking_body(8, 3)).json()
+        add_rule(client, min_stay=3)
+        
+        response = client.patch(f"/api/bookings/{booking['confirmation_number']}", json={
+            "check_in_date": CHECK_IN.isoformat(),
+            "check_out_date": (CHECK_IN + timedelta(days=2)).isoformat(),
+        })
+        assert response.status_code == 409
+    
+    def test_list_delete_and_invalidation(self, client):
+        received = []
+        bus = get_invalidation_bus()
+        bus.subscribe(received.append)
+        try:
+            created = add_rule(client, room_type="deluxe", closed_to_departure=True, weekdays=[0, 1, 2, 3, 4, 5, 6])
+            assert client.post("/api/bookings", json=booking_body(5, 1) | {
+                "check_in_date": (CHECK_IN - timedelta(days=1)).isoformat(), "check_out_date": CHECK_IN.isoformat(),
+            }).status_code == 409
+            
+            listed = client.get("/api/inventory/restrictions", params={
+                "start_date": CHECK_IN.isoformat(), "end_date": CHECK_IN.isoformat(), "room_type": "deluxe",
+            }).json()["restrictions"]
+            assert [r["id"] for r in listed] == [created["id"]]
+            
+            assert client.delete(f"/api/inventory/restrictions/{created['id']}").status_code == 204
+            assert client.delete(f"/api/inventory/restrictions/{created['id']}").status_code == 404
+            assert client.post("/api/bookings", json=booking_body(5, 1) | {
+                "check_in_date": (CHECK_IN - timedelta(days=1)).isoformat(), "check_out_date": CHECK_IN.isoformat(),
+            }).status_code == 200
+        finally:
+            bus.unsubscribe(received.append)
+        
+        changes = [c for c in received if c.kind == RESTRICTIONS_CHANGED]
+        assert len(changes) == 2
+        assert set(changes[0].room_ids) == {4, 5, 6, 10, 11}
+    
+    def test_rule_must_restrict_something(self, client):
+        response = client.post("/api/inventory/restrictions", json={
+            "start_date": CHECK_IN.isoformat(), "end_date": CHECK_IN.isoformat(), "min_stay": 1,
+        })
+        assert response.status_code == 422
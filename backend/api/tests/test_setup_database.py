@@ -0,0 +1,52 @@
+"""Tests for the deploy-time schema setup and startup mode validation."""
+
+import pytest
+from pydantic import ValidationError
+from sqlalchemy import inspect
+
+from src.config import Settings
+from src.database import create_database_engine, get_partition, register_partition, unregister_partition
+from src.models import Hotel, Room
+from src.utils import setup_database as setup
+
+
+@pytest.fixture()
+def harbor(tmp_path, monkeypatch):
+    """An empty partition, the only one setup sees."""
+    engine = create_database_engine(f"sqlite:///{tmp_path / 'harbor.db'}")
+    register_partition("harbor", engine)
+    monkeypatch.setattr(setup, "partition_engines", lambda: {"harbor": engine})
+    yield engine
+    unregister_partition("harbor")
+    engine.dispose()
+
+
+class TestSetupDatabase:
+    """Test the deploy step."""
+    
+    def test_creates_tables_without_data(self, harbor):
+        assert setup.main([]) == 0
+        
+        assert "rooms" in inspect(harbor).get_table_names()
+        with get_partition("harbor")() as session:
+            assert session.query(Room).count() == 0
+    
+    def test_sample_data_is_added_once(self, harbor):
+        setup.setup_database(sample_data=True)
+        setup.setup_database(sample_data=True)
+        
+        with get_partition("harbor")() as session:
+            assert session.query(Room).count() == 12
+            assert session.query(Hotel).one().code == "harbor"
+
+
+class TestStartupMode:
+    """Test STARTUP_MODE validation."""
+    
+    def test_known_modes(self):
+        assert Settings(startup_mode="development").startup_mode == "development"
+        assert Settings(startup_mode=" Production ").startup_mode == "production"
+    
+    def test_unknown_mode_is_rejected(self):
+        with pytest.raises(ValidationError):
+            Settings(startup_mode="prod")
@@ -0,0 +1,126 @@
+"""Tests for the shared mmap inventory snapshot."""
+
+import struct
+import pytest
+from datetime import date, timedelta
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from src.config import get_settings
+from src.database import Base, register_partition, unregister_partition
+from src.models import Room
+from src.quotes import STATUS_BOOKED, QuoteEngine
+from src.schemas import CreateBookingRequest
+from src.services import BookingService, InventoryService
+from src.snapshot import GENERATION_OFFSET, InventorySnapshotStore, get_inventory_snapshot, snapshot_path
+from src.utils.seed_data import initialize_sample_data
+
+settings = get_settings()
+
+
+@pytest.fixture()
+def db(tmp_path, monkeypatch):
+    """Sample hotel with the snapshot enabled in a temporary directory."""
+    monkeypatch.setattr(settings, "inventory_snapshot", True)
+    monkeypatch.setattr(settings, "inventory_snapshot_path", str(tmp_path / "inventory.snap"))
+    monkeypatch.setattr(settings, "inventory_snapshot_days", 90)
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    initialize_sample_data(session)
+    yield session
+    session.close()
+    engine.dispose()
+
+
+class TestInventorySnapshot:
+    """Test building, reading, patching and swapping the snapshot."""
+    
+    def test_snapshot_matches_quote_engine(self, db):
+        start = date.today() + timedelta(days=3)
+        end = start + timedelta(days=20)
+        window = get_inventory_snapshot(db).window(db, start, end)
+        matrix = QuoteEngine(db).quote(start, end + timedelta(days=1))
+        
+        assert window.room_ids.tolist() == [room.id for room in matrix.rooms]
+        assert window.dates == matrix.dates
+        assert (window.status == matrix.status).all()
+        assert (window.prices == matrix.prices).all()
+        assert get_inventory_snapshot(db).window(db, start, start + timedelta(days=400)) is None
+    
+    def test_bookings_are_patched_in_place_for_every_worker(self, db):
+        store = get_inventory_snapshot(db)
+        store.ensure_current(db)
+        # A second worker mapping the same file
+        other = InventorySnapshotStore(settings.inventory_snapshot_path, 90)
+        before = other.current().generation
+        
+        check_in = date.today() + timedelta(days=40)
+        room = db.query(Room).filter(Room.room_number == "301").one()
+        BookingService(db).create_booking(CreateBookingRequest(
+            customer_email="snap@example.com", room_id=room.id,
+            check_in_date=check_in, check_out_date=check_in + timedelta(days=2),
+        ))
+        
+        assert store.stats["patches"] == 1 and store.stats["rebuilds"] == 1
+        window = other.current().read([room.id - 1], check_in - timedelta(days=1), check_in + timedelta(days=2))
+        assert window.status[0].tolist() == [0, STATUS_BOOKED, STATUS_BOOKED, 0]
+        assert window.generation == before + 2
+        assert other.stats["remaps"] == 1
+    
+    def test_rebuild_swaps_file_for_mapped_readers(self, db):
+        store = get_inventory_snapshot(db)
+        reader = InventorySnapshotStore(settings.inventory_snapshot_path, 90)
+        old = store.ensure_current(db)
+        assert reader.current().inode == old.inode
+        
+        store.rebuild(db)
+        assert old.superseded
+        assert reader.current().inode != old.inode
+        assert reader.stats["remaps"] == 2
+        assert reader.current().generation > old.generation
+    
+    def test_readers_retry_while_a_write_is_in_progress(self, db):
+        mapped = get_inventory_snapshot(db).ensure_current(db)
+        with open(settings.inventory_snapshot_path, "r+b") as f:
+            f.seek(GENERATION_OFFSET)
+            f.write(struct.pack("<Q", mapped.generation + 1))
+        with pytest.raises(RuntimeError):
+            mapped.read([0], date.today(), date.today(), max_retries=3)
+    
+    def test_calendars_are_served_from_snapshot(self, db):
+        start = date.today() + timedelta(days=5)
+        grid = InventoryService(db).get_calendar_grid(start, start + timedelta(days=9))
+        assert len(grid.room_ids) == 12 and len(grid.dates) == 10
+        assert get_inventory_snapshot(db).stats["rebuilds"] == 1
+    
+    def test_each_hotel_has_its_own_snapshot(self, db):
+        engine = create_engine(
+            "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+        )
+        register_partition("harbor", engine)
+        try:
+            Base.metadata.create_all(bind=engine)
+            harbor = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+            initialize_sample_data(harbor)
+            for room in harbor.query(Room):
+                room.base_price, room.weekend_price = room.base_price * 2, None
+            harbor.commit()
+            
+            start = date.today() + timedelta(days=5)
+            ours = get_inventory_snapshot(db).window(db, start, start, room_ids=[1])
+            theirs = get_inventory_snapshot(harbor).window(harbor, start, start, room_ids=[1])
+            assert get_inventory_snapshot(harbor).path == snapshot_path(engine) != settings.inventory_snapshot_path
+            assert theirs.prices.tolist() == QuoteEngine(harbor).quote(start, start + timedelta(days=1), [1]).prices.tolist()
+            assert theirs.prices[0, 0] != ours.prices[0, 0]
+            
+            # A store never serves a file written for another hotel
+            misplaced = InventorySnapshotStore(settings.inventory_snapshot_path, 90, engine)
+            assert misplaced.ensure_current(harbor).hotel_code == "harbor"
+            harbor.close()
+        finally:
+            unregister_partition("harbor")
+            engine.dispose()
@@ -0,0 +1,146 @@
+"""Tests for the waitlist and matching on released inventory."""
+
+from datetime import date, timedelta
+
+from main import app
+from src.database import get_db, hotel_code_for
+from src.invalidation import BOOKING_CANCELLED, InventoryChange, get_invalidation_bus
+from src.models import Booking, BookingStatus, ViewType
+from src.waitlist import WaitingRequest, WaitlistIndex
+
+CHECK_IN = date.today() + timedelta(days=40)
+OCEAN_ROOMS = [1, 2, 3, 12]
+
+
+def day(offset):
+    return CHECK_IN + timedelta(days=offset)
+
+
+def waiting(entry_id, start, end, view_type=None):
+    return WaitingRequest(entry_id, day(start), day(end), 1, None, view_type)
+
+
+class TestWaitlistIndex:
+    """Test the night index."""
+    
+    def test_candidates_overlap_the_released_nights(self):
+        index = WaitlistIndex(engine=None)
+        index.add(waiting(1, 0, 2))
+        index.add(waiting(2, 2, 5, ViewType.OCEAN))
+        index.add(waiting(3, 10, 12))
+        
+        assert [e.id for e in index.candidates(day(1), day(3))] == [1, 2]
+        assert [e.id for e in index.candidates(day(5), day(10))] == []
+        assert [e.id for e in index.candidates(day(11), day(30))] == [3]
+        assert [e.id for e in index.candidates(None, None)] == [1, 2, 3]
+    
+    def test_remove_drops_every_night(self):
+        index = WaitlistIndex(engine=None)
+        index.add(waiting(1, 0, 3))
+        index.add(waiting(1, 0, 3))
+        index.remove(1)
+        
+        assert len(index) == 0
+        assert index.candidates(day(0), day(3)) == []
+    
+    def test_started_stays_are_dropped(self):
+        index = WaitlistIndex(engine=None)
+        index.add(WaitingRequest(1, date.today() - timedelta(days=1), date.today() + timedelta(days=2), 1, None, None))
+        
+        assert index.candidates(date.today(), date.today() + timedelta(days=1)) == []
+        assert len(index) == 0
+
+
+def book(client, room_id, start=0, nights=2):
+    response = client.post("/api/bookings", json={
+        "room_id": room_id, "customer_email": "guest@example.com", "guest_count": 2,
+        "check_in_date": day(start).isoformat(), "check_out_date": day(start + nights).isoformat(),
+    })
+    assert response.status_code == 200, response.text
+    return response.json()["confirmation_number"]
+
+
+def join(client, **body):
+    body.setdefault("check_in_date", day(0).isoformat())
+    body.setdefault("check_out_date", day(2).isoformat())
+    response = client.post("/api/waitlist", json=body)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def cancel(client, confirmation_number):
+    assert client.post(f"/api/bookings/{confirmation_number}/cancel").status_code == 200
+
+
+class TestWaitlistEndpoints:
+    """Test waitlist entries through bookings and cancellations."""
+    
+    def test_cancellation_matches_waiting_entry(self, client):
+        bookings = {room_id: book(client, room_id) for room_id in OCEAN_ROOMS}
+        entry = join(client, view_preference="ocean", customer_email="wait@example.com")
+        assert entry["status"] == "waiting"
+        since = client.get("/api/events", params={"since": 0, "limit": 1000}).json()["last_sequence"]
+        
+        cancel(client, bookings[2])
+        
+        matched = client.get(f"/api/waitlist/{entry['id']}").json()
+        assert matched["status"] == "matched"
+        assert matched["matched_room_ids"] == [2]
+        assert matched["matched_at"] is not None
+        events = client.get("/api/events", params={"since": since}).json()["events"]
+        assert [e["kind"] for e in events] == ["booking_cancelled", "waitlist_matched"]
+        assert events[1]["waitlist_entry_id"] == entry["id"]
+        assert events[1]["room_ids"] == [2]
+    
+    def test_release_elsewhere_does_not_match(self, client):
+        for room_id in OCEAN_ROOMS:
+            book(client, room_id)
+        garden = book(client, 7)
+        later = book(client, 1, start=10)
+        entry = join(client, view_preference="ocean")
+        over_budget = join(client, view_preference="ocean", check_in_date=day(10).isoformat(),
+                           check_out_date=day(12).isoformat(), room_count=4, max_budget=100.0)
+        
+        cancel(client, garden)  # Same nights, wrong view
+        cancel(client, later)  # Right view, other nights
+        
+        assert client.get(f"/api/waitlist/{entry['id']}").json()["status"] == "waiting"
+        assert client.get(f"/api/waitlist/{over_budget['id']}").json()["status"] == "waiting"
+    
+    def test_release_in_another_hotel_does_not_match(self, client):
+        bookings = {room_id: book(client, room_id) for room_id in OCEAN_ROOMS}
+        entry = join(client, view_preference="ocean")
+        db = app.dependency_overrides[get_db]()
+        db.query(Booking).filter(Booking.confirmation_number == bookings[2]).update(
+            {Booking.status: BookingStatus.CANCELLED}
+        )
+        db.commit()
+        release = InventoryChange(BOOKING_CANCELLED, (2,), day(0), day(2))
+        
+        get_invalidation_bus().publish(release.in_hotel("elsewhere"))
+        assert client.get(f"/api/waitlist/{entry['id']}").json()["status"] == "waiting"
+        get_invalidation_bus().publish(release.in_hotel(hotel_code_for(db.get_bind())))
+        assert client.get(f"/api/waitlist/{entry['id']}").json()["status"] == "matched"
+    
+    def test_room_count_must_be_met(self, client):
+        bookings = [book(client, room_id) for room_id in OCEAN_ROOMS]
+        entry = join(client, view_preference="ocean", room_count=2)
+        
+        cancel(client, bookings[0])
+        assert client.get(f"/api/waitlist/{entry['id']}").json()["status"] == "waiting"
+        cancel(client, bookings[1])
+        assert client.get(f"/api/waitlist/{entry['id']}").json()["matched_room_ids"] == OCEAN_ROOMS[:2]
+    
+    def test_leave_waitlist(self, client):
+        booking = book(client, 12)
+        entry = join(client, view_preference="ocean", room_count=4)
+        
+        response = client.delete(f"/api/waitlist/{entry['id']}")
+        assert response.status_code == 200
+        assert response.json()["status"] == "cancelled"
+        cancel(client, booking)
+        assert client.get(f"/api/waitlist/{entry['id']}").json()["status"] == "cancelled"
+        assert client.get("/api/waitlist/9999").status_code == 404
+        assert client.post("/api/waitlist", json={
+            "check_in_date": day(0).isoformat(), "check_out_date": day(1).isoformat(), "view_preference": "moon",
+        }).status_code == 400
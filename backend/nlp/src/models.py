@@ -84,6 +84,8 @@ class APIAvailabilityRequest:
     room_count: int = 1
     max_budget: Optional[float] = None
     view_preference: Optional[str] = None
+    special_requests: Optional[str] = None
+    sort_by: str = "price"  # "best_match" ranks by view, special requests and budget closeness
 
 
 @dataclass